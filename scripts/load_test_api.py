@@ -0,0 +1,550 @@
+"""Load test for the analytics API's WebSocket / SSE / long-poll fan-out.
+
+Starts the API (``create_app``) in a child process with fake sessions that emit
+metadata ticks and track events at ``--tick-hz`` (no cameras or models), then
+connects ``--ws-clients`` WebSocket clients, ``--sse-clients`` SSE clients and
+``--pollers`` long-polling HTTP clients for ``--duration`` seconds. The report
+gives per-client tick/event rates, end-to-end delivery latency (session emit
+to client receipt, including the ``publish_hz`` rate limit), server CPU and the
+"client too slow" disconnect rate.
+
+    pixi run load-test-api --ws-clients 200 --publish-hz 10 --duration 30
+
+Clients run in this process; if ``client_cpu_percent`` approaches 100 the
+clients, not the server, are the bottleneck.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.analytics.event_log import EventLog
+from src.analytics.events import TrackLifecycle
+from src.analytics.metadata import MetadataBuilder
+from src.api.encoding import decode_message
+from src.tracking.state import TrackerStatus
+
+STATS_PATH = "/_load/stats"
+
+
+class LoadSession:
+    """Session stand-in that emits ticks and track events from its own thread.
+
+    Ticks are built with the real ``MetadataBuilder`` and events with the real
+    ``TrackLifecycle``/``EventLog``, so payload sizes and the listener push path
+    match ``ThreadedAnalyticsSession``.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        camera_id: str,
+        *,
+        tick_hz: float,
+        tracks: int,
+        churn_per_s: float,
+        seed: int = 0,
+    ) -> None:
+        self.session_id = session_id
+        self.camera_id = camera_id
+        self.detection_id = camera_id
+        self.ticks = 0
+        self._period_s = 1.0 / tick_hz
+        self._churn_per_tick = churn_per_s / tick_hz
+        self._rng = np.random.default_rng(seed)
+        self._builder = MetadataBuilder(session_id=session_id, camera_id=camera_id)
+        self._lifecycle = TrackLifecycle(session_id=session_id, camera_id=camera_id)
+        self._event_log = EventLog()
+        self._status = TrackerStatus()
+        self._positions = self._rng.uniform(0.0, 0.9, size=(tracks, 2))
+        self._velocities = self._rng.uniform(-0.005, 0.005, size=(tracks, 2))
+        self._ids = list(range(1, tracks + 1))
+        self._next_id = tracks + 1
+        self._latest_tick: dict[str, Any] | None = None
+        self._listeners: list[Callable[..., None]] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"load-{camera_id}", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def set_target_id(self, target_id: int) -> None:
+        self._status.target_id = int(target_id)
+
+    def clear_target(self) -> None:
+        self._status.target_id = None
+
+    def get_latest_tick(self) -> dict[str, Any] | None:
+        with self._lock:
+            return self._latest_tick
+
+    def get_events_since(
+        self, last_seq: int | None
+    ) -> tuple[int | None, list[Mapping[str, Any]]]:
+        return self._event_log.read_since(last_seq)
+
+    def get_status(self) -> dict[str, Any]:
+        return {"running": self.is_running(), "ticks": self.ticks}
+
+    def add_listener(self, callback: Callable[..., None]) -> list[Mapping[str, Any]]:
+        with self._lock:
+            self._listeners.append(callback)
+            return self._event_log.read_since(None)[1]
+
+    def remove_listener(self, callback: Callable[..., None]) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _tracks(self) -> list[dict[str, Any]]:
+        # Random walk inside the frame; replace some tracks to produce events
+        self._positions = np.clip(self._positions + self._velocities, 0.0, 0.9)
+        for _ in range(self._rng.poisson(self._churn_per_tick)):
+            slot = int(self._rng.integers(len(self._ids))) if self._ids else None
+            if slot is None:
+                break
+            self._ids[slot] = self._next_id
+            self._next_id += 1
+        return [
+            {
+                "id": track_id,
+                "label": "drone",
+                "conf": 0.9,
+                "bbox": {"x": round(float(x), 6), "y": round(float(y), 6), "w": 0.05, "h": 0.05},
+            }
+            for track_id, (x, y) in zip(self._ids, self._positions, strict=True)
+        ]
+
+    def _run(self) -> None:
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            tick = self._builder.build_tick(
+                frame_index=self.ticks,
+                frame_w=1920,
+                frame_h=1080,
+                tracks=self._tracks(),
+                tracker_status=self._status,
+                ts_unix_ms=int(time.time() * 1000),
+                ts_mono_ms=int(time.monotonic() * 1000),
+            )
+            events = self._lifecycle.update(
+                tracks=tick["tracks"], ts_unix_ms=tick["ts_unix_ms"]
+            )
+            with self._lock:
+                self._latest_tick = tick
+                stored = [self._event_log.append(event)[1] for event in events]
+                listeners = tuple(self._listeners)
+            for listener in listeners:
+                listener(tick, stored)
+            self.ticks += 1
+            next_tick += self._period_s
+            self._stop_event.wait(max(0.0, next_tick - time.monotonic()))
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Child process: run the API with load sessions until stdin closes."""
+    from aiohttp import web  # noqa: PLC0415
+    from loguru import logger  # noqa: PLC0415
+
+    from src.api.app import create_app  # noqa: PLC0415
+    from src.api.session_manager import SessionManager  # noqa: PLC0415
+    from src.api.settings_manager import SettingsManager  # noqa: PLC0415
+    from src.settings import load_settings  # noqa: PLC0415
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    settings = load_settings(args.config)
+    settings.performance.publish_hz = args.publish_hz
+    settings_manager = SettingsManager(settings)
+    cameras = [f"load_{i}" for i in range(args.sessions)]
+
+    def factory(session_id: str, camera_id: str, _settings_manager: Any) -> LoadSession:
+        return LoadSession(
+            session_id,
+            camera_id,
+            tick_hz=args.tick_hz,
+            tracks=args.tracks,
+            churn_per_s=args.churn_per_s,
+            seed=cameras.index(camera_id),
+        )
+
+    manager = SessionManager(
+        cameras=cameras, session_factory=factory, settings_manager=settings_manager
+    )
+    sessions = []
+    for camera_id in cameras:
+        session = manager.get_or_create_session(camera_id=camera_id).session
+        session.start()
+        sessions.append(session)
+
+    app = create_app(
+        manager, settings_manager, publish_hz=args.publish_hz, auto_start_session=False
+    )
+
+    async def stats(_request: web.Request) -> web.Response:
+        hubs = app["session_hubs"]
+        return web.json_response(
+            {
+                "cpu_s": time.process_time(),
+                "wall_s": time.monotonic(),
+                "ticks": sum(s.ticks for s in sessions),
+                "subscribers": sum(hub.subscriber_count for hub in hubs.values()),
+            }
+        )
+
+    app.router.add_get(STATS_PATH, stats)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, args.host, args.port)
+    await site.start()
+    port = runner.addresses[0][1]
+    sys.stdout.write(
+        json.dumps({"port": port, "sessions": [s.session_id for s in sessions]}) + "\n"
+    )
+    sys.stdout.flush()
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, sys.stdin.read)
+    finally:
+        for session in sessions:
+            session.stop()
+        await runner.cleanup()
+
+
+@dataclass(slots=True)
+class ClientStats:
+    """Counters shared by all clients of one kind."""
+
+    clients: int
+    connected: int = 0
+    failed: int = 0
+    ticks: int = 0
+    events: int = 0
+    requests: int = 0
+    too_slow: int = 0
+    disconnects: int = 0
+    tick_latency_ms: list[float] = field(default_factory=list)
+    event_latency_ms: list[float] = field(default_factory=list)
+
+    def record_tick(self, tick: Mapping[str, Any]) -> None:
+        self.ticks += 1
+        self.tick_latency_ms.append(time.time() * 1000 - tick["ts_unix_ms"])
+
+    def record_event(self, event: Mapping[str, Any], *, latency: bool = True) -> None:
+        self.events += 1
+        if latency:
+            self.event_latency_ms.append(time.time() * 1000 - event["ts_unix_ms"])
+
+    def summary(self, duration_s: float) -> dict[str, Any]:
+        per_client = max(1, self.connected) * duration_s
+        return {
+            "clients": self.clients,
+            "connected": self.connected,
+            "failed": self.failed,
+            "ticks_per_client_s": round(self.ticks / per_client, 2),
+            "events": self.events,
+            "requests": self.requests,
+            "tick_latency_ms": _percentiles(self.tick_latency_ms),
+            "event_latency_ms": _percentiles(self.event_latency_ms),
+            "too_slow_disconnects": self.too_slow,
+            "other_disconnects": self.disconnects,
+            "too_slow_rate": round(self.too_slow / self.clients, 4) if self.clients else 0.0,
+        }
+
+
+def _percentiles(samples: list[float]) -> dict[str, float] | None:
+    if not samples:
+        return None
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 2),
+        "p95": round(float(p95), 2),
+        "p99": round(float(p99), 2),
+        "max": round(float(max(samples)), 2),
+    }
+
+
+async def ws_client(
+    http: Any,
+    url: str,
+    stats: ClientStats,
+    stop: asyncio.Event,
+    *,
+    encoding: str,
+    read_delay_s: float,
+) -> None:
+    import aiohttp  # noqa: PLC0415
+
+    try:
+        ws = await http.ws_connect(f"{url}?encoding={encoding}")
+    except aiohttp.ClientError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    try:
+        while not stop.is_set():
+            msg = await ws.receive()
+            if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                payload = decode_message(msg.data, encoding)
+                if payload.get("type") == "metadata_tick":
+                    stats.record_tick(payload)
+                elif payload.get("type") == "track_event":
+                    stats.record_event(payload)
+                if read_delay_s:
+                    await asyncio.sleep(read_delay_s)
+                continue
+            if not stop.is_set():
+                if "too slow" in str(msg.extra or ""):
+                    stats.too_slow += 1
+                else:
+                    stats.disconnects += 1
+            return
+    finally:
+        await ws.close()
+
+
+async def sse_client(
+    http: Any, url: str, stats: ClientStats, stop: asyncio.Event
+) -> None:
+    import aiohttp  # noqa: PLC0415
+
+    try:
+        response = await http.get(url)
+    except aiohttp.ClientError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    event = None
+    try:
+        async for raw in response.content:
+            line = raw.decode().rstrip("\r\n")
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:") and event == "metadata_tick":
+                stats.record_tick(json.loads(line[5:]))
+            elif line.startswith("data:") and event == "track_event":
+                stats.record_event(json.loads(line[5:]))
+            elif not line:
+                event = None
+        if not stop.is_set():
+            stats.disconnects += 1
+    except aiohttp.ClientError:
+        if not stop.is_set():
+            stats.disconnects += 1
+    finally:
+        response.release()
+
+
+async def poll_client(
+    http: Any, url: str, stats: ClientStats, stop: asyncio.Event, *, timeout_s: float
+) -> None:
+    import aiohttp  # noqa: PLC0415
+
+    cursor: int | None = None
+    first = True
+    while not stop.is_set():
+        params = {"timeout": str(timeout_s)}
+        if cursor is not None:
+            params["cursor"] = str(cursor)
+        try:
+            async with http.get(url, params=params) as response:
+                body = await response.json()
+        except aiohttp.ClientError:
+            stats.failed += 1
+            return
+        if first:
+            stats.connected += 1
+        stats.requests += 1
+        for event in body["events"]:
+            # The first response replays the backlog; it says nothing about latency
+            stats.record_event(event, latency=not first)
+        cursor = body["cursor"]
+        first = False
+
+
+async def run_clients(
+    args: argparse.Namespace, port: int, session_ids: list[str]
+) -> dict[str, Any]:
+    import aiohttp  # noqa: PLC0415
+
+    base = f"http://{args.host}:{port}"
+    stop = asyncio.Event()
+    ws_stats = ClientStats(args.ws_clients)
+    sse_stats = ClientStats(args.sse_clients)
+    poll_stats = ClientStats(args.pollers)
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=None)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+
+        async def server_stats() -> dict[str, Any]:
+            async with http.get(base + STATS_PATH) as response:
+                return await response.json()
+
+        def session(i: int) -> str:
+            return session_ids[i % len(session_ids)]
+
+        tasks = []
+        for i in range(args.ws_clients):
+            slow = i < args.slow_clients
+            tasks.append(
+                ws_client(
+                    http,
+                    f"{base}/ws/sessions/{session(i)}",
+                    ws_stats,
+                    stop,
+                    encoding=args.encoding,
+                    read_delay_s=args.slow_read_delay if slow else 0.0,
+                )
+            )
+        tasks.extend(
+            sse_client(http, f"{base}/sessions/{session(i)}/stream", sse_stats, stop)
+            for i in range(args.sse_clients)
+        )
+        tasks.extend(
+            poll_client(
+                http,
+                f"{base}/sessions/{session(i)}/events",
+                poll_stats,
+                stop,
+                timeout_s=args.poll_timeout,
+            )
+            for i in range(args.pollers)
+        )
+        running = [asyncio.create_task(task) for task in tasks]
+
+        await asyncio.sleep(args.warmup)
+        for stats in (ws_stats, sse_stats, poll_stats):
+            stats.tick_latency_ms.clear()
+            stats.event_latency_ms.clear()
+            stats.ticks = stats.events = stats.requests = 0
+        start = await server_stats()
+        client_cpu = time.process_time()
+        await asyncio.sleep(args.duration)
+        end = await server_stats()
+        client_cpu = time.process_time() - client_cpu
+
+        stop.set()
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    wall = end["wall_s"] - start["wall_s"]
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "tick_hz": args.tick_hz,
+            "publish_hz": args.publish_hz,
+            "tracks": args.tracks,
+            "encoding": args.encoding,
+            "duration_s": args.duration,
+        },
+        "server": {
+            "cpu_percent": round(100 * (end["cpu_s"] - start["cpu_s"]) / wall, 1),
+            "ticks_emitted_per_s": round((end["ticks"] - start["ticks"]) / wall, 1),
+            "subscribers": end["subscribers"],
+        },
+        "client_cpu_percent": round(100 * client_cpu / wall, 1),
+        "websocket": ws_stats.summary(wall),
+        "sse": sse_stats.summary(wall),
+        "poll": poll_stats.summary(wall),
+    }
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Load-test the analytics API's tick fan-out with fake sessions"
+    )
+    parser.add_argument("--config", type=Path, default=None, help="config.yaml path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--tick-hz", type=float, default=30.0, help="Session tick rate")
+    parser.add_argument("--publish-hz", type=float, default=10.0)
+    parser.add_argument("--tracks", type=int, default=10, help="Tracks per tick")
+    parser.add_argument(
+        "--churn-per-s", type=float, default=1.0, help="Tracks replaced per second"
+    )
+    parser.add_argument("--ws-clients", type=int, default=50)
+    parser.add_argument("--sse-clients", type=int, default=0)
+    parser.add_argument("--pollers", type=int, default=0, help="Long-polling clients")
+    parser.add_argument("--poll-timeout", type=float, default=5.0)
+    parser.add_argument(
+        "--encoding", choices=("json", "msgpack", "cbor"), default="json"
+    )
+    parser.add_argument(
+        "--slow-clients",
+        type=int,
+        default=0,
+        help="WebSocket clients that sleep --slow-read-delay after every message",
+    )
+    parser.add_argument("--slow-read-delay", type=float, default=0.5)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the JSON report here"
+    )
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    args = _parser().parse_args(argv)
+    if args.serve:
+        asyncio.run(serve(args))
+        return 0
+
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", *argv],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        ready = server.stdout.readline() if server.stdout else ""
+        if not ready:
+            sys.stderr.write("API server failed to start\n")
+            return 1
+        info = json.loads(ready)
+        report = asyncio.run(run_clients(args, info["port"], info["sessions"]))
+    finally:
+        if server.stdin:
+            server.stdin.close()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    payload = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload + "\n")
+    sys.stdout.write(payload + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,12 +7,31 @@ This package provides computer vision-based drone tracking with PTZ camera contr
 __version__ = "1.0.0"
 __author__ = "Drone PTZ Team"
 
+import importlib
+from typing import Any
+
 # Public API exports
 from loguru import logger
 
-from src.detection import DetectionService
-from src.ptz_controller import PTZService
-from src.settings import Settings, load_settings
+# Resolved on first access so importing any ``src.*`` module (e.g. the API
+# server) does not pull in the detection and PTZ stacks
+_LAZY_EXPORTS = {
+    "DetectionService": "src.detection",
+    "PTZService": "src.ptz_controller",
+    "Settings": "src.settings",
+    "load_settings": "src.settings",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "DetectionService",
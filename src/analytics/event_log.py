@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only view of a JSON-like value (mappings and lists, recursively).
+
+    Frozen payloads can be handed to any number of readers without copying.
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list | tuple):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of ``freeze``: return plain, mutable dicts and lists."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+@dataclass(slots=True)
+class EventLog:
+    """Fixed-capacity, sequence-indexed ring of frozen event payloads.
+
+    Sequence numbers start at 1 and increase by one per event, so a cursor maps
+    directly to a ring offset and reads cost O(new events), not O(capacity).
+    Thread-safe: the session thread appends while API handlers read.
+    """
+
+    capacity: int = 1_000
+    _buf: list[Mapping[str, Any] | None] = field(init=False, repr=False)
+    _next_seq: int = field(default=1, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.capacity < 1:
+            msg = "capacity must be >= 1"
+            raise ValueError(msg)
+        self._buf = [None] * self.capacity
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._next_seq - self._first_seq_locked()
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest event (0 when empty)."""
+        return self._next_seq - 1
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained event."""
+        with self._lock:
+            return self._first_seq_locked()
+
+    def _first_seq_locked(self) -> int:
+        return max(1, self._next_seq - self.capacity)
+
+    def append(self, event: Mapping[str, Any]) -> tuple[int, Mapping[str, Any]]:
+        """Freeze and store an event; return its sequence number and frozen payload."""
+        frozen = freeze(event)
+        with self._lock:
+            seq = self._next_seq
+            self._buf[seq % self.capacity] = frozen
+            self._next_seq = seq + 1
+        return seq, frozen
+
+    def read_since(
+        self, cursor: int | None, limit: int | None = None
+    ) -> tuple[int | None, list[Mapping[str, Any]]]:
+        """Return ``(new_cursor, events)`` for events with seq > ``cursor``.
+
+        ``cursor=None`` reads every retained event. A cursor older than the oldest
+        retained event also starts there (older events were overwritten). The
+        returned cursor is the seq of the last returned event, or ``cursor``
+        unchanged when nothing is new.
+        """
+        with self._lock:
+            first = self._first_seq_locked()
+            start = first if cursor is None else max(cursor + 1, first)
+            end = self._next_seq
+            if limit is not None:
+                end = min(end, start + max(0, limit))
+            if start >= end:
+                return cursor, []
+            events = [self._buf[seq % self.capacity] for seq in range(start, end)]
+        return end - 1, events  # type: ignore[return-value]
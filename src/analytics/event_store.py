@@ -0,0 +1,264 @@
+"""Persistent, append-only store for track lifecycle events (SQLite, WAL mode).
+
+Writes never happen on the session thread: ``append`` only enqueues, and a
+single writer thread commits events in batches. Old events are deleted by a
+periodic retention pass on the same thread.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from src.analytics.event_log import thaw
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS track_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    camera_id TEXT NOT NULL,
+    session_id TEXT,
+    ts_unix_ms INTEGER NOT NULL,
+    track_id INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    label TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_track_events_camera_ts_track
+    ON track_events (camera_id, ts_unix_ms, track_id);
+CREATE INDEX IF NOT EXISTS idx_track_events_camera_track_ts
+    ON track_events (camera_id, track_id, ts_unix_ms);
+"""
+
+_INSERT = (
+    "INSERT INTO track_events "
+    "(camera_id, session_id, ts_unix_ms, track_id, event, label, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_STOP = object()
+
+
+def _row(event: Mapping[str, Any]) -> tuple[Any, ...]:
+    after = event.get("after") or {}
+    return (
+        str(event.get("camera_id", "")),
+        event.get("session_id"),
+        int(event.get("ts_unix_ms", 0)),
+        int(after.get("id", -1)),
+        str(event.get("event", "")),
+        after.get("label"),
+        json.dumps(thaw(event), separators=(",", ":")),
+    )
+
+
+@dataclass(slots=True)
+class EventStore:
+    """SQLite-backed track event history with a batching writer thread.
+
+    Args:
+        path: Database file (created with parent directories if missing).
+        retention_days: Events older than this are deleted by compaction.
+        batch_size: Maximum events per write transaction.
+        flush_interval_s: Maximum time an event waits before being committed.
+        queue_maxsize: Pending-event bound; events are dropped (and counted) when
+            the writer falls this far behind, so the control loop never blocks.
+        compact_interval_s: How often the retention pass runs.
+    """
+
+    path: Path
+    retention_days: float = 30.0
+    batch_size: int = 256
+    flush_interval_s: float = 1.0
+    queue_maxsize: int = 10_000
+    compact_interval_s: float = 3600.0
+
+    dropped: int = field(default=0, init=False)
+    _queue: queue.Queue[Any] = field(init=False, repr=False)
+    _thread: threading.Thread | None = field(default=None, init=False, repr=False)
+    _read_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    _reader: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path)
+        self._queue = queue.Queue(maxsize=self.queue_maxsize)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        self._reader = conn
+        self._thread = threading.Thread(
+            target=self._writer, name="event-store-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info("Event store started: {}", self.path)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush pending events and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def append(self, event: Mapping[str, Any]) -> bool:
+        """Enqueue an event for writing; never blocks. Returns False if dropped."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def listener(
+        self, _tick: Mapping[str, Any] | None, events: list[Mapping[str, Any]]
+    ) -> None:
+        """Session listener (see ``ThreadedAnalyticsSession.add_listener``)."""
+        for event in events:
+            self.append(event)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every event enqueued so far has been committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _writer(self) -> None:
+        conn = self._connect()
+        next_compact = time.monotonic()
+        try:
+            while True:
+                batch: list[tuple[Any, ...]] = []
+                waiters: list[threading.Event] = []
+                stop = False
+                deadline = time.monotonic() + self.flush_interval_s
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                        break
+                    try:
+                        batch.append(_row(item))
+                    except (TypeError, ValueError) as exc:
+                        logger.warning("Skipping malformed track event: {}", exc)
+
+                if batch:
+                    try:
+                        with conn:
+                            conn.executemany(_INSERT, batch)
+                    except sqlite3.Error as exc:
+                        logger.error("Event store write failed: {}", exc)
+                for waiter in waiters:
+                    waiter.set()
+
+                if time.monotonic() >= next_compact:
+                    self._compact(conn)
+                    next_compact = time.monotonic() + self.compact_interval_s
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _compact(self, conn: sqlite3.Connection, now_ms: int | None = None) -> int:
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        cutoff = now_ms - int(self.retention_days * 86_400_000)
+        try:
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM track_events WHERE ts_unix_ms < ?", (cutoff,)
+                ).rowcount
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as exc:
+            logger.error("Event store compaction failed: {}", exc)
+            return 0
+        if deleted:
+            logger.info("Event store compaction removed {} events", deleted)
+        return deleted
+
+    def compact(self, now_ms: int | None = None) -> int:
+        """Delete events older than the retention window; return rows removed."""
+        with self._read_lock:
+            if self._reader is None:
+                return 0
+            return self._compact(self._reader, now_ms)
+
+    def query(
+        self,
+        *,
+        camera_id: str | None = None,
+        since_ms: int | None = None,
+        until_ms: int | None = None,
+        track_id: int | None = None,
+        event: str | None = None,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Return stored events matching the filters, oldest first."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if camera_id is not None:
+            clauses.append("camera_id = ?")
+            params.append(camera_id)
+        if since_ms is not None:
+            clauses.append("ts_unix_ms >= ?")
+            params.append(int(since_ms))
+        if until_ms is not None:
+            clauses.append("ts_unix_ms < ?")
+            params.append(int(until_ms))
+        if track_id is not None:
+            clauses.append("track_id = ?")
+            params.append(int(track_id))
+        if event is not None:
+            clauses.append("event = ?")
+            params.append(event)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT id, payload FROM track_events {where} "
+            "ORDER BY ts_unix_ms, id LIMIT ?"
+        )
+        params.append(max(0, int(limit)))
+
+        with self._read_lock:
+            if self._reader is None:
+                msg = "Event store is not started"
+                raise RuntimeError(msg)
+            rows = self._reader.execute(sql, params).fetchall()
+        return [{**json.loads(row["payload"]), "id": row["id"]} for row in rows]
+
+    def track_history(self, camera_id: str, track_id: int) -> list[dict[str, Any]]:
+        """All stored lifecycle events for one track, oldest first."""
+        return self.query(camera_id=camera_id, track_id=track_id, limit=10_000)
@@ -11,11 +11,13 @@ from src.analytics.types import (
     NormalizedBBox,
     PtzCommand,
     PtzControlMode,
+    PtzPose,
     PtzState,
     SchemaName,
     Track,
     TrackingPhaseValue,
 )
+from src.tracking.motion_compensation import ptz_pose
 from src.tracking.selector import parse_track_id
 from src.tracking.state import TrackerStatus
 
@@ -148,6 +150,15 @@ def _ptz_cmd_from_obj(ptz: Any) -> PtzCommand:
     return {"pan": _round6(pan), "tilt": _round6(tilt), "zoom": _round6(zoom)}
 
 
+def _ptz_pose_from_obj(ptz: Any) -> PtzPose | None:
+    # "pose" is the reported position (pan/tilt in camera units, zoom normalized).
+    pose = ptz_pose(ptz)
+    if pose is None:
+        return None
+    pan, tilt, zoom = pose
+    return {"pan": _round6(pan), "tilt": _round6(tilt), "zoom": _round6(zoom)}
+
+
 def _ptz_state_from_obj(ptz: Any) -> PtzState:
     state: PtzState = {
         "control_mode": _ptz_control_mode_from_obj(ptz),
@@ -155,6 +166,9 @@ def _ptz_state_from_obj(ptz: Any) -> PtzState:
         "active": bool(getattr(ptz, "active", False)),
         "cmd": _ptz_cmd_from_obj(ptz),
     }
+    pose = _ptz_pose_from_obj(ptz)
+    if pose is not None:
+        state["pose"] = pose
 
     return state
 
@@ -0,0 +1,274 @@
+"""Per-track trajectory recording into compact columnar ``.npz`` files.
+
+Each active track gets a struct-of-arrays buffer (``int64`` timestamps plus one
+``float32`` row per field) that grows geometrically. When the track's ``end``
+event arrives the buffer is handed to a background writer and saved as one
+compressed ``.npz`` file:
+
+    <output_dir>/<camera_id>/<YYYY-MM-DD>/<start_ts_unix_ms>_<track_id>.npz
+
+``pan``/``tilt``/``zoom`` hold the camera pose reported in the tick
+(``ptz.pose``), so a sample's absolute target angle is the pose plus the bbox
+offset from the frame center times the field of view. They are NaN when the
+tick carries no pose. ``cmd_pan``/``cmd_tilt``/``cmd_zoom`` hold the commanded
+velocities (``ptz.cmd``) and are zero without a command.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+FIELDS: tuple[str, ...] = (
+    "x",
+    "y",
+    "w",
+    "h",
+    "conf",
+    "pan",
+    "tilt",
+    "zoom",
+    "cmd_pan",
+    "cmd_tilt",
+    "cmd_zoom",
+)
+
+_INITIAL_CAPACITY = 64
+_UNSAFE_PATH_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+@dataclass(slots=True)
+class TrackBuffer:
+    """Growable struct-of-arrays sample buffer for one track."""
+
+    camera_id: str
+    track_id: int
+    label: str
+    max_samples: int
+    size: int = 0
+    dropped: int = 0
+    last_seen_ms: int = 0
+    ts: np.ndarray = field(init=False, repr=False)
+    data: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        capacity = min(_INITIAL_CAPACITY, self.max_samples)
+        self.ts = np.empty(capacity, dtype=np.int64)
+        self.data = np.empty((len(FIELDS), capacity), dtype=np.float32)
+
+    def append(self, ts_unix_ms: int, values: tuple[float, ...]) -> None:
+        if self.size >= self.max_samples:
+            self.dropped += 1
+            return
+        if self.size == self.ts.shape[0]:
+            capacity = min(self.ts.shape[0] * 2, self.max_samples)
+            ts = np.empty(capacity, dtype=np.int64)
+            ts[: self.size] = self.ts
+            data = np.empty((len(FIELDS), capacity), dtype=np.float32)
+            data[:, : self.size] = self.data
+            self.ts, self.data = ts, data
+        self.ts[self.size] = ts_unix_ms
+        self.data[:, self.size] = values
+        self.size += 1
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Trimmed copies of every column, keyed by name."""
+        out = {"ts_unix_ms": self.ts[: self.size].copy()}
+        for i, name in enumerate(FIELDS):
+            out[name] = self.data[i, : self.size].copy()
+        return out
+
+
+def _ptz_columns(tick: Mapping[str, Any]) -> tuple[float, ...]:
+    ptz = tick.get("ptz") or {}
+    pose = ptz.get("pose") or {}
+    cmd = ptz.get("cmd") or {}
+    return (
+        float(pose.get("pan", np.nan)),
+        float(pose.get("tilt", np.nan)),
+        float(pose.get("zoom", np.nan)),
+        float(cmd.get("pan", 0.0)),
+        float(cmd.get("tilt", 0.0)),
+        float(cmd.get("zoom", 0.0)),
+    )
+
+
+def trajectory_path(
+    output_dir: Path, camera_id: str, track_id: int, start_ts_unix_ms: int
+) -> Path:
+    day = datetime.fromtimestamp(start_ts_unix_ms / 1000, tz=UTC).strftime("%Y-%m-%d")
+    camera_dir = _UNSAFE_PATH_CHARS.sub("_", camera_id) or "unknown"
+    return output_dir / camera_dir / day / f"{start_ts_unix_ms}_{track_id}.npz"
+
+
+def save_trajectory(path: Path, buffer: TrackBuffer) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        camera_id=np.array(buffer.camera_id),
+        track_id=np.array(buffer.track_id, dtype=np.int64),
+        label=np.array(buffer.label),
+        **buffer.columns(),
+    )
+    return path
+
+
+def load_trajectory(path: Path) -> dict[str, Any]:
+    """Load a saved trajectory; scalar metadata is returned as Python values."""
+    with np.load(path, allow_pickle=False) as data:
+        out: dict[str, Any] = {key: data[key] for key in data.files}
+    for key in ("camera_id", "track_id", "label"):
+        if key in out:
+            out[key] = out[key].item()
+    return out
+
+
+@dataclass(slots=True)
+class TrajectoryRecorder:
+    """Records per-frame samples for every track and saves them on track end.
+
+    Use ``listener`` as a session listener. Sampling runs on the session thread
+    and only writes into preallocated arrays; file writes run on a single
+    background worker.
+
+    Args:
+        output_dir: Root directory for ``.npz`` files.
+        max_samples_per_track: Samples beyond this are dropped (and counted).
+        min_samples: Tracks with fewer samples are discarded instead of saved.
+        stale_after_ms: Buffers of tracks missing from ticks for longer than
+            this are discarded unsaved. ``TrackLifecycle`` emits no ``end``
+            for tracks that never confirm, so use ``tracking.end_after_ms``.
+    """
+
+    output_dir: Path
+    max_samples_per_track: int = 100_000
+    min_samples: int = 2
+    stale_after_ms: int = 1_000
+    saved: int = field(default=0, init=False)
+    discarded: int = field(default=0, init=False)
+    _buffers: dict[tuple[str, int], TrackBuffer] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _executor: ThreadPoolExecutor = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.output_dir = Path(self.output_dir)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="trajectory-writer"
+        )
+
+    @property
+    def active_tracks(self) -> int:
+        with self._lock:
+            return len(self._buffers)
+
+    def record_tick(self, tick: Mapping[str, Any]) -> None:
+        camera_id = str(tick.get("camera_id", ""))
+        ts = int(tick.get("ts_unix_ms", 0))
+        ptz = _ptz_columns(tick)
+        with self._lock:
+            for track in tick.get("tracks", ()):
+                key = (camera_id, int(track["id"]))
+                buffer = self._buffers.get(key)
+                if buffer is None:
+                    buffer = TrackBuffer(
+                        camera_id=camera_id,
+                        track_id=key[1],
+                        label=str(track.get("label", "")),
+                        max_samples=self.max_samples_per_track,
+                    )
+                    self._buffers[key] = buffer
+                buffer.last_seen_ms = ts
+                bbox = track["bbox"]
+                buffer.append(
+                    ts,
+                    (
+                        bbox["x"],
+                        bbox["y"],
+                        bbox["w"],
+                        bbox["h"],
+                        track.get("conf", 0.0),
+                        *ptz,
+                    ),
+                )
+
+    def handle_events(
+        self, events: list[Mapping[str, Any]]
+    ) -> list[Future[Path | None]]:
+        """Schedule a save for every track that ended."""
+        futures: list[Future[Path | None]] = []
+        for event in events:
+            if event.get("event") != "end":
+                continue
+            after = event.get("after") or {}
+            key = (str(event.get("camera_id", "")), int(after.get("id", -1)))
+            with self._lock:
+                buffer = self._buffers.pop(key, None)
+            if buffer is not None:
+                futures.append(self._executor.submit(self._save, buffer))
+        return futures
+
+    def listener(
+        self, tick: Mapping[str, Any] | None, events: list[Mapping[str, Any]]
+    ) -> None:
+        """Session listener (see ``ThreadedAnalyticsSession.add_listener``)."""
+        if tick is not None:
+            self.record_tick(tick)
+        if events:
+            self.handle_events(events)
+        if tick is not None:
+            # After handle_events, so tracks ending on this tick are saved first
+            self.evict_stale(
+                str(tick.get("camera_id", "")), int(tick.get("ts_unix_ms", 0))
+            )
+
+    def evict_stale(self, camera_id: str, ts_unix_ms: int) -> int:
+        """Discard ``camera_id`` buffers unseen for over ``stale_after_ms``."""
+        with self._lock:
+            stale = [
+                key
+                for key, buffer in self._buffers.items()
+                if key[0] == camera_id
+                and ts_unix_ms - buffer.last_seen_ms > self.stale_after_ms
+            ]
+            for key in stale:
+                del self._buffers[key]
+            self.discarded += len(stale)
+        return len(stale)
+
+    def close(self) -> None:
+        """Save every still-open track and wait for pending writes."""
+        with self._lock:
+            buffers = list(self._buffers.values())
+            self._buffers.clear()
+        for buffer in buffers:
+            self._executor.submit(self._save, buffer)
+        self._executor.shutdown(wait=True)
+
+    def _save(self, buffer: TrackBuffer) -> Path | None:
+        if buffer.size < self.min_samples:
+            return None
+        path = trajectory_path(
+            self.output_dir, buffer.camera_id, buffer.track_id, int(buffer.ts[0])
+        )
+        try:
+            save_trajectory(path, buffer)
+        except OSError as exc:
+            logger.error("Failed to save trajectory {}: {}", path, exc)
+            return None
+        self.saved += 1
+        if buffer.dropped:
+            logger.warning(
+                "Trajectory {} truncated: {} samples dropped", path, buffer.dropped
+            )
+        return path
@@ -40,11 +40,18 @@ class PtzCommand(TypedDict):
     zoom: float
 
 
+class PtzPose(TypedDict):
+    pan: float
+    tilt: float
+    zoom: float
+
+
 class PtzState(TypedDict):
     control_mode: PtzControlMode
     connected: bool
     active: bool
     cmd: PtzCommand
+    pose: NotRequired[PtzPose]
 
 
 class MetadataTick(TypedDict):
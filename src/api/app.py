@@ -2,13 +2,24 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-import json
+import threading
 from typing import Any
 from urllib.parse import urlparse
 
 from aiohttp import WSCloseCode, WSMsgType, web
 from loguru import logger
 
+from src.api.broadcast import SessionHub
+from src.api.debug_routes import get_spans, run_profile, update_spans
+from src.api.delta import DeltaEncoder
+from src.api.encoding import (
+    EncodingError,
+    decode_message,
+    encode_message,
+    encoding_from_subprotocol,
+    resolve_encoding,
+    subprotocols,
+)
 from src.api.session_manager import SessionManager
 from src.api.settings_routes import (
     get_settings,
@@ -31,10 +42,27 @@ from src.api.model_routes import (
 )
 
 
+# Long-poll for track events: the request is held for at most this long.
+LONG_POLL_MAX_TIMEOUT_S = 30.0
+LONG_POLL_INTERVAL_S = 0.05
+
+# Server-Sent Events: client reconnect delay and idle keepalive comment period.
+SSE_RETRY_MS = 2000
+SSE_KEEPALIVE_S = 15.0
+
+# Persistent event history queries.
+HISTORY_DEFAULT_LIMIT = 1000
+HISTORY_MAX_LIMIT = 10_000
+
+
 def _json_error(*, status: int, message: str) -> web.Response:
     return web.json_response({"error": message}, status=status)
 
 
+def _optional_int(value: str | None) -> int | None:
+    return int(value) if value not in (None, "") else None
+
+
 def _session_view(session: Any, *, created: bool | None = None) -> dict[str, Any]:
     status = session.get_status()
     payload: dict[str, Any] = {
@@ -48,6 +76,37 @@ def _session_view(session: Any, *, created: bool | None = None) -> dict[str, Any
     return payload
 
 
+def _session_ready(session: Any) -> bool:
+    # Sessions without a readiness signal count as ready once running
+    is_ready = getattr(session, "is_ready", None)
+    return bool(is_ready()) if callable(is_ready) else bool(session.is_running())
+
+
+def _session_hub(
+    app: web.Application, session_id: str, session: Any, poll_interval_s: float
+) -> SessionHub:
+    hubs: dict[str, SessionHub] = app["session_hubs"]
+    hub = hubs.get(session_id)
+    if hub is None:
+        hub = SessionHub(session, poll_interval_s=poll_interval_s)
+        hubs[session_id] = hub
+    return hub
+
+
+async def _send_payload(ws: web.WebSocketResponse, payload: str | bytes) -> None:
+    if isinstance(payload, bytes):
+        await ws.send_bytes(payload)
+    else:
+        await ws.send_str(payload)
+
+
+def _sse_frame(event: str, data: str | bytes, *, event_id: int | None = None) -> str:
+    if isinstance(data, bytes):
+        data = data.decode()
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {data}\n\n"
+
+
 def _is_allowed_origin(origin: str) -> bool:
     parsed = urlparse(origin)
     if parsed.scheme not in {"http", "https"}:
@@ -94,51 +153,140 @@ def create_app(
     app["publish_hz"] = float(publish_hz)
     app["auto_start_enabled"] = auto_start_session
     app["auto_start_camera_id"] = camera_id or "default"
+    app["session_hubs"] = {}
+    app["preview_streams"] = {}
+
+    app["warmup"] = {
+        "phase": "pending",
+        "error": None,
+        "session_ids": [],
+        "task": None,
+        # Cancelling the warm-up task can't interrupt its worker thread, so
+        # cleanup sets this and the worker stops before the next session
+        "stop": threading.Event(),
+    }
 
-    async def startup_handler(app: web.Application) -> None:
-        """Auto-start WebRTC/camera connection on server startup if enabled."""
-        if app.get("auto_start_enabled", False):
-            from src.detection_profiles import get_detection_profiles  # noqa: PLC0415
-
-            settings = settings_manager.get_settings()
-            profiles = get_detection_profiles(settings)
-            camera_ids = [p.camera_id for p in profiles]
-            if not camera_ids:
-                camera_ids = [app.get("auto_start_camera_id", "default")]
-
-            manager: SessionManager = app["session_manager"]
-            for camera_id_to_use in camera_ids:
-                logger.info(
-                    "Auto-starting WebRTC/camera connection for camera_id={}",
-                    camera_id_to_use,
-                )
-                try:
-                    result = manager.get_or_create_session(camera_id=camera_id_to_use)
+    def auto_start_sessions(app: web.Application) -> None:
+        """Create and start a session per detection profile (blocking)."""
+        from src.detection_profiles import get_detection_profiles  # noqa: PLC0415
+
+        settings = settings_manager.get_settings()
+        profiles = get_detection_profiles(settings)
+        camera_ids = [p.camera_id for p in profiles]
+        if not camera_ids:
+            camera_ids = [app.get("auto_start_camera_id", "default")]
+
+        manager: SessionManager = app["session_manager"]
+        stop: threading.Event = app["warmup"]["stop"]
+        for camera_id_to_use in camera_ids:
+            if stop.is_set():
+                logger.info("Server shutting down; skipping remaining auto-start sessions")
+                return
+            logger.info(
+                "Auto-starting WebRTC/camera connection for camera_id={}",
+                camera_id_to_use,
+            )
+            try:
+                result = manager.get_or_create_session(camera_id=camera_id_to_use)
+                if stop.is_set():
                     if result.created:
-                        result.session.start()
-                        logger.info(
-                            "Auto-started session: session_id={}, camera_id={}",
-                            result.session.session_id,
-                            camera_id_to_use,
-                        )
-                    else:
-                        logger.info(
-                            "Session already running: session_id={}, camera_id={}",
-                            result.session.session_id,
-                            camera_id_to_use,
-                        )
-                except Exception as exc:  # pragma: no cover
-                    logger.error(
-                        "Failed to auto-start session for camera_id={}: {}",
+                        manager.delete_session(result.session.session_id)
+                    return
+                app["warmup"]["session_ids"].append(result.session.session_id)
+                if result.created:
+                    result.session.start()
+                    logger.info(
+                        "Auto-started session: session_id={}, camera_id={}",
+                        result.session.session_id,
+                        camera_id_to_use,
+                    )
+                else:
+                    logger.info(
+                        "Session already running: session_id={}, camera_id={}",
+                        result.session.session_id,
                         camera_id_to_use,
-                        exc,
                     )
+            except Exception as exc:
+                logger.error(
+                    "Failed to auto-start session for camera_id={}: {}",
+                    camera_id_to_use,
+                    exc,
+                )
+                app["warmup"]["error"] = str(exc)
+
+    async def warm_up(app: web.Application) -> None:
+        # Session creation imports the detection stack and each session loads
+        # its models on its own thread; both stay off the request path so
+        # /healthz and the settings routes answer while this runs.
+        app["warmup"]["phase"] = "warming"
+        try:
+            await asyncio.to_thread(auto_start_sessions, app)
+        finally:
+            app["warmup"]["phase"] = "done"
+
+    async def startup_handler(app: web.Application) -> None:
+        """Auto-start WebRTC/camera connections in the background if enabled."""
+        if app.get("auto_start_enabled", False):
+            app["warmup"]["task"] = asyncio.create_task(warm_up(app))
+        else:
+            app["warmup"]["phase"] = "done"
 
     app.on_startup.append(startup_handler)
 
+    async def cleanup_handler(app: web.Application) -> None:
+        app["warmup"]["stop"].set()
+        task = app["warmup"]["task"]
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for hub in app["session_hubs"].values():
+            hub.close()
+        app["session_hubs"].clear()
+        for stream in app["preview_streams"].values():
+            stream.close()
+        app["preview_streams"].clear()
+
+    app.on_cleanup.append(cleanup_handler)
+
     async def healthz(_request: web.Request) -> web.Response:
         return web.json_response({"status": "ok"})
 
+    async def readyz(request: web.Request) -> web.Response:
+        """200 once auto-started sessions have loaded their models, else 503.
+
+        A failed auto-start, or an auto-started session that has since been
+        deleted, reports ``"failed"`` until the server is restarted.
+        """
+        warmup = request.app["warmup"]
+        manager: SessionManager = request.app["session_manager"]
+        sessions = {}
+        missing = []
+        for session_id in list(warmup["session_ids"]):
+            session = manager.get_session(session_id)
+            if session is None:
+                missing.append(session_id)
+            else:
+                sessions[session_id] = _session_ready(session)
+        failed = warmup["error"] is not None or bool(missing)
+        ready = not failed and warmup["phase"] == "done" and all(sessions.values())
+        if ready:
+            status = "ready"
+        elif failed:
+            status = "failed"
+        else:
+            status = "starting"
+        return web.json_response(
+            {
+                "status": status,
+                "phase": warmup["phase"],
+                "error": warmup["error"],
+                "sessions": sessions,
+                "missing": missing,
+            },
+            status=200 if ready else 503,
+        )
+
     async def list_cameras(request: web.Request) -> web.Response:
         from src.detection_profiles import get_detection_profiles  # noqa: PLC0415
 
@@ -200,8 +348,218 @@ def create_app(
         deleted = manager.delete_session(session_id)
         if not deleted:
             return _json_error(status=404, message="Unknown session")
+        hub = request.app["session_hubs"].pop(session_id, None)
+        if hub is not None:
+            hub.close()
+        stream = request.app["preview_streams"].pop(session_id, None)
+        if stream is not None:
+            stream.close()
         return web.json_response({"deleted": True, "session_id": session_id})
 
+    async def get_session_events(request: web.Request) -> web.Response:
+        """Replay track events after ``cursor``, optionally long-polling for new ones."""
+        manager: SessionManager = request.app["session_manager"]
+        session_id = request.match_info["session_id"]
+        session = manager.get_session(session_id)
+        if session is None:
+            return _json_error(status=404, message="Unknown session")
+
+        try:
+            raw_cursor = request.query.get("cursor")
+            cursor = int(raw_cursor) if raw_cursor not in (None, "") else None
+            timeout_s = float(request.query.get("timeout", "0"))
+        except ValueError:
+            return _json_error(
+                status=400, message="cursor must be an int and timeout a number"
+            )
+        timeout_s = max(0.0, min(timeout_s, LONG_POLL_MAX_TIMEOUT_S))
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        next_cursor, events = session.get_events_since(cursor)
+        while not events and loop.time() < deadline:
+            await asyncio.sleep(LONG_POLL_INTERVAL_S)
+            next_cursor, events = session.get_events_since(cursor)
+
+        body = encode_message(
+            {"session_id": session_id, "cursor": next_cursor, "events": events},
+            "json",
+        )
+        return web.Response(text=body, content_type="application/json")
+
+    async def query_event_history(request: web.Request) -> web.Response:
+        """Time-range query over the persistent track event store."""
+        manager: SessionManager = request.app["session_manager"]
+        store = manager.event_store
+        if store is None:
+            return _json_error(status=503, message="Event store disabled")
+
+        query = request.query
+        try:
+            filters = {
+                "camera_id": query.get("camera_id") or None,
+                "since_ms": _optional_int(query.get("since")),
+                "until_ms": _optional_int(query.get("until")),
+                "track_id": _optional_int(query.get("track_id")),
+                "event": query.get("event") or None,
+                "limit": min(
+                    _optional_int(query.get("limit")) or HISTORY_DEFAULT_LIMIT,
+                    HISTORY_MAX_LIMIT,
+                ),
+            }
+        except ValueError:
+            return _json_error(
+                status=400, message="since, until, track_id and limit must be ints"
+            )
+
+        events = await asyncio.to_thread(store.query, **filters)
+        return web.json_response({"events": events, "count": len(events)})
+
+    async def get_track_history(request: web.Request) -> web.Response:
+        """All stored lifecycle events for one track."""
+        manager: SessionManager = request.app["session_manager"]
+        store = manager.event_store
+        if store is None:
+            return _json_error(status=503, message="Event store disabled")
+
+        camera_id = request.match_info["camera_id"]
+        try:
+            track_id = int(request.match_info["track_id"])
+        except ValueError:
+            return _json_error(status=400, message="track_id must be an int")
+
+        events = await asyncio.to_thread(store.track_history, camera_id, track_id)
+        if not events:
+            return _json_error(status=404, message="Unknown track")
+        return web.json_response(
+            {"camera_id": camera_id, "track_id": track_id, "events": events}
+        )
+
+    async def sse_session(request: web.Request) -> web.StreamResponse:
+        """Server-Sent Events stream of ticks and track events for one session.
+
+        Track events carry ``id: <seq>`` so clients resume with ``Last-Event-ID``
+        (or ``?last_event_id=`` / ``?since=`` on the first connect). Without a
+        cursor the stream starts at the current head, like the WebSocket hub, and
+        only carries new events. Ticks are rate-limited to
+        ``performance.publish_hz`` and share the hub's JSON encoding.
+        """
+        manager: SessionManager = request.app["session_manager"]
+        settings = request.app["settings_manager"].get_settings()
+        publish_interval_s = 1.0 / max(0.1, settings.performance.publish_hz)
+        session_id = request.match_info["session_id"]
+        session = manager.get_session(session_id)
+        if session is None:
+            return _json_error(status=404, message="Unknown session")
+
+        raw_last_id = (
+            request.headers.get("Last-Event-ID")
+            or request.query.get("last_event_id")
+            or request.query.get("since")
+        )
+        try:
+            cursor = int(raw_last_id) if raw_last_id else None
+        except ValueError:
+            return _json_error(status=400, message="Last-Event-ID must be an int")
+        if cursor is None:
+            cursor, _ = session.get_events_since(None)
+
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+            }
+        )
+        await response.prepare(request)
+        hub = _session_hub(request.app, session_id, session, publish_interval_s)
+        subscriber = hub.subscribe(events=False)
+        try:
+            await response.write(f"retry: {SSE_RETRY_MS}\n\n".encode())
+            while True:
+                try:
+                    tick, _ = await asyncio.wait_for(
+                        subscriber.get(), timeout=SSE_KEEPALIVE_S
+                    )
+                except TimeoutError:
+                    await response.write(b": keepalive\n\n")
+                    tick = None
+
+                chunks: list[str] = []
+                if tick is not None:
+                    chunks.append(_sse_frame("metadata_tick", tick.get("json")))
+                last_seq, events = session.get_events_since(cursor)
+                if events and last_seq is not None:
+                    # Event seqs are contiguous, ending at last_seq.
+                    first_seq = last_seq - len(events) + 1
+                    for offset, event in enumerate(events):
+                        chunks.append(
+                            _sse_frame(
+                                "track_event",
+                                encode_message(event, "json"),
+                                event_id=first_seq + offset,
+                            )
+                        )
+                    cursor = last_seq
+                if chunks:
+                    await response.write("".join(chunks).encode())
+                if tick is not None:
+                    await asyncio.sleep(publish_interval_s)
+        except ConnectionResetError:
+            pass
+        finally:
+            hub.unsubscribe(subscriber)
+        return response
+
+    async def preview_session(request: web.Request) -> web.StreamResponse:
+        """Annotated MJPEG preview of the session's frames.
+
+        One encoder per session runs only while viewers are connected; every
+        viewer receives the same JPEGs (see ``src/api/preview.py``).
+        """
+        manager: SessionManager = request.app["session_manager"]
+        session_id = request.match_info["session_id"]
+        session = manager.get_session(session_id)
+        if session is None:
+            return _json_error(status=404, message="Unknown session")
+        if not hasattr(session, "get_preview_frame"):
+            return _json_error(status=501, message="Session has no preview")
+
+        # Deferred so the API starts without loading OpenCV
+        from src.api.preview import MJPEG_BOUNDARY, PreviewStream, mjpeg_part  # noqa: PLC0415
+
+        streams: dict[str, PreviewStream] = request.app["preview_streams"]
+        stream = streams.get(session_id)
+        if stream is None:
+            performance = request.app["settings_manager"].get_settings().performance
+            stream = PreviewStream(
+                session,
+                max_width=performance.preview_max_width,
+                max_fps=performance.preview_max_fps,
+                quality=performance.preview_jpeg_quality,
+            )
+            streams[session_id] = stream
+
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+            }
+        )
+        await response.prepare(request)
+        stream.subscribe()
+        seq = 0
+        try:
+            while True:
+                seq, jpeg = await stream.next_jpeg(seq)
+                await response.write(mjpeg_part(jpeg))
+        except ConnectionResetError:
+            pass
+        finally:
+            stream.unsubscribe()
+        return response
+
     async def ws_session(request: web.Request) -> web.StreamResponse:
         manager: SessionManager = request.app["session_manager"]
         settings_manager = request.app["settings_manager"]
@@ -215,69 +573,85 @@ def create_app(
         if session is None:
             return _json_error(status=404, message="Unknown session")
 
-        ws = web.WebSocketResponse(heartbeat=30.0)
+        try:
+            query_encoding = resolve_encoding(request.query.get("encoding"))
+        except EncodingError as exc:
+            return _json_error(status=400, message=str(exc))
+        mode = request.query.get("mode", "full")
+        if mode not in ("full", "delta"):
+            return _json_error(status=400, message=f"Unknown mode: {mode}")
+        delta_encoder = (
+            DeltaEncoder(
+                keyframe_interval=settings.performance.delta_keyframe_interval
+            )
+            if mode == "delta"
+            else None
+        )
+
+        ws = web.WebSocketResponse(heartbeat=30.0, protocols=subprotocols())
         await ws.prepare(request)
+        encoding = encoding_from_subprotocol(ws.ws_protocol) or query_encoding
+        hub = _session_hub(request.app, session_id, session, publish_interval_s)
+        subscriber = hub.subscribe()
+
+        async def send(message: dict[str, Any]) -> None:
+            await _send_payload(ws, encode_message(message, encoding))
 
         async def publisher() -> None:
-            last_sent_key: int | None = None
-            last_event_seq: int | None = None
-            while True:
-                if ws.closed:
+            while not ws.closed:
+                tick, events = await subscriber.get()
+                if subscriber.overflowed:
+                    await ws.close(
+                        code=WSCloseCode.GOING_AWAY, message=b"client too slow"
+                    )
                     return
 
-                tick = session.get_latest_tick()
+                payloads: list[str | bytes] = []
                 if tick is not None:
-                    key = tick.get("ts_mono_ms") or tick.get("ts_unix_ms")
-                    try:
-                        key_i = int(key) if key is not None else None
-                    except (TypeError, ValueError):
-                        key_i = None
-
-                    if key_i is None or key_i != last_sent_key:
-                        try:
-                            await asyncio.wait_for(ws.send_json(tick), timeout=1.0)
-                        except TimeoutError:
-                            await ws.close(
-                                code=WSCloseCode.GOING_AWAY,
-                                message=b"client too slow",
-                            )
-                            return
-                        last_sent_key = key_i
-
-                if hasattr(session, "get_events_since"):
-                    last_event_seq, events = session.get_events_since(last_event_seq)
-                    for event in events:
-                        try:
-                            await asyncio.wait_for(ws.send_json(event), timeout=1.0)
-                        except TimeoutError:
-                            await ws.close(
-                                code=WSCloseCode.GOING_AWAY,
-                                message=b"client too slow",
-                            )
-                            return
+                    if delta_encoder is not None:
+                        message = delta_encoder.encode(tick.message)
+                        payloads.append(encode_message(message, encoding))
+                    else:
+                        payloads.append(tick.get(encoding))
+                payloads.extend(event.get(encoding) for event in events)
+                try:
+                    for payload in payloads:
+                        await asyncio.wait_for(
+                            _send_payload(ws, payload), timeout=1.0
+                        )
+                except TimeoutError:
+                    await ws.close(
+                        code=WSCloseCode.GOING_AWAY, message=b"client too slow"
+                    )
+                    return
 
-                await asyncio.sleep(publish_interval_s)
+                if tick is not None:
+                    # Rate-limit ticks; newer ticks replace the pending one meanwhile.
+                    await asyncio.sleep(publish_interval_s)
 
         pub_task = asyncio.create_task(publisher())
         try:
             async for msg in ws:
-                if msg.type == WSMsgType.TEXT:
+                if msg.type in (WSMsgType.TEXT, WSMsgType.BINARY):
                     try:
-                        payload = json.loads(msg.data)
-                    except json.JSONDecodeError:
-                        await ws.send_json({"type": "error", "error": "invalid_json"})
+                        payload = decode_message(msg.data, encoding)
+                    except (ValueError, TypeError):
+                        await send({"type": "error", "error": "invalid_json"})
+                        continue
+                    if not isinstance(payload, dict):
+                        await send({"type": "error", "error": "unknown_command"})
                         continue
 
                     cmd_type = payload.get("type")
                     if cmd_type == "set_target_id":
                         target_id = payload.get("target_id")
                         if not isinstance(target_id, int):
-                            await ws.send_json(
+                            await send(
                                 {"type": "error", "error": "target_id_must_be_int"}
                             )
                             continue
                         session.set_target_id(target_id)
-                        await ws.send_json(
+                        await send(
                             {
                                 "type": "ack",
                                 "command": "set_target_id",
@@ -286,11 +660,14 @@ def create_app(
                         )
                     elif cmd_type == "clear_target":
                         session.clear_target()
-                        await ws.send_json({"type": "ack", "command": "clear_target"})
+                        await send({"type": "ack", "command": "clear_target"})
+                    elif cmd_type == "resync":
+                        if delta_encoder is not None:
+                            delta_encoder.request_keyframe()
+                        subscriber.request_tick(hub.latest_tick)
+                        await send({"type": "ack", "command": "resync"})
                     else:
-                        await ws.send_json(
-                            {"type": "error", "error": "unknown_command"}
-                        )
+                        await send({"type": "error", "error": "unknown_command"})
 
                 elif msg.type == WSMsgType.ERROR:
                     break
@@ -298,19 +675,19 @@ def create_app(
             pub_task.cancel()
             with contextlib.suppress(Exception):
                 await pub_task
+            hub.unsubscribe(subscriber)
 
         return ws
 
     async def get_global_tick(request: web.Request) -> web.Response:
         """Debug endpoint to get the latest tick from the first active session."""
         manager: SessionManager = request.app["session_manager"]
-        # Find the first running session
-        # We access the internal dictionary carefully
-        if not manager._sessions_by_id:
+        sessions = manager.list_sessions()
+        if not sessions:
              return _json_error(status=404, message="No active sessions")
-        
-        # Taking the most recently created one or just the first
-        session = list(manager._sessions_by_id.values())[-1]
+
+        # Taking the most recently created one
+        _, session = sessions[-1]
         tick = session.get_latest_tick()
         if tick is None:
              return web.json_response({"status": "no_tick_data", "camera_id": session.camera_id})
@@ -318,14 +695,25 @@ def create_app(
         return web.json_response(tick)
 
     app.router.add_get("/healthz", healthz)
+    app.router.add_get("/readyz", readyz)
     app.router.add_get("/cameras", list_cameras)
     app.router.add_post("/sessions", create_session)
     app.router.add_get("/sessions/{session_id}", get_session)
     app.router.add_delete("/sessions/{session_id}", delete_session)
+    app.router.add_get("/sessions/{session_id}/events", get_session_events)
+    app.router.add_get("/sessions/{session_id}/stream", sse_session)
+    app.router.add_get("/sessions/{session_id}/preview.mjpg", preview_session)
+    app.router.add_get("/history/events", query_event_history)
+    app.router.add_get(
+        "/history/cameras/{camera_id}/tracks/{track_id}", get_track_history
+    )
     app.router.add_get("/ws/sessions/{session_id}", ws_session)
 
     # Debug routes
     app.router.add_get("/tick", get_global_tick)
+    app.router.add_get("/debug/spans", get_spans)
+    app.router.add_post("/debug/spans", update_spans)
+    app.router.add_post("/debug/profile", run_profile)
 
     # Settings management routes
     app.router.add_get("/settings", get_settings)
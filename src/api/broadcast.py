@@ -0,0 +1,237 @@
+"""Per-session fan-out of metadata ticks and track events to WebSocket clients.
+
+A ``SessionHub`` receives each tick/event once and hands the same
+``EncodedMessage`` to every subscriber, so serialization cost and session lock
+contention stay flat as clients are added.
+
+Sessions that support ``add_listener``/``remove_listener`` push updates from
+their worker thread (coalesced into one loop callback per burst). Other
+sessions are polled by a single task per hub instead of one per client.
+New subscribers are replayed the hub's most recent events (up to
+``max_events``); the replay does not count against their event budget.
+
+Backpressure is per subscriber:
+
+- ticks are latest-only: an unsent tick is replaced by a newer one
+- events are queued up to ``max_events``; overflowing marks the subscriber as
+  too slow so the caller can disconnect it
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from src.api.encoding import EncodedMessage, TickPayloadCache
+
+DEFAULT_MAX_EVENTS = 256
+
+
+@dataclass(slots=True, eq=False)
+class Subscriber:
+    """Bounded per-client mailbox fed by a ``SessionHub``."""
+
+    max_events: int = DEFAULT_MAX_EVENTS
+    wants_events: bool = True
+    overflowed: bool = field(default=False, init=False)
+    dropped_ticks: int = field(default=0, init=False)
+    _tick: EncodedMessage | None = field(default=None, init=False, repr=False)
+    _events: deque[EncodedMessage] = field(
+        default_factory=deque, init=False, repr=False
+    )
+    # Leading entries of _events that are replayed history, not live events
+    _replayed: int = field(default=0, init=False, repr=False)
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+
+    def offer_tick(self, tick: EncodedMessage) -> None:
+        if self._tick is not None:
+            self.dropped_ticks += 1
+        self._tick = tick
+        self._wakeup.set()
+
+    def offer_event(self, event: EncodedMessage) -> None:
+        if not self.wants_events:
+            return
+        if len(self._events) - self._replayed >= self.max_events:
+            self.overflowed = True
+        else:
+            self._events.append(event)
+        self._wakeup.set()
+
+    def replay(self, events: Iterable[EncodedMessage]) -> None:
+        """Queue history for a new subscriber outside the ``max_events`` budget."""
+        if not self.wants_events:
+            return
+        self._events.extend(events)
+        self._replayed = len(self._events)
+        if self._events:
+            self._wakeup.set()
+
+    def request_tick(self, tick: EncodedMessage | None) -> None:
+        """Re-queue ``tick`` unless a newer one is already pending (resync)."""
+        if tick is not None and self._tick is None:
+            self._tick = tick
+            self._wakeup.set()
+
+    async def get(self) -> tuple[EncodedMessage | None, list[EncodedMessage]]:
+        """Wait for new data; return the latest pending tick and queued events."""
+        await self._wakeup.wait()
+        self._wakeup.clear()
+        tick, self._tick = self._tick, None
+        events = list(self._events)
+        self._events.clear()
+        self._replayed = 0
+        return tick, events
+
+
+class SessionHub:
+    """Fan-out point for one session; lives on the aiohttp event loop.
+
+    Args:
+        session: The analytics session to read ticks/events from.
+        poll_interval_s: Poll interval used for sessions without listener support.
+        max_events: Per-subscriber event queue bound.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        *,
+        poll_interval_s: float = 0.1,
+        max_events: int = DEFAULT_MAX_EVENTS,
+    ) -> None:
+        self._session = session
+        self._poll_interval_s = poll_interval_s
+        self._max_events = max_events
+        self._loop = asyncio.get_running_loop()
+        self._subscribers: set[Subscriber] = set()
+        self._tick_cache = TickPayloadCache()
+        self._latest: EncodedMessage | None = None
+        self._recent_events: deque[EncodedMessage] = deque(maxlen=max_events)
+        self._poll_task: asyncio.Task[None] | None = None
+        self._listening = False
+
+        # Written by the session thread, drained on the loop.
+        self._pending_lock = threading.Lock()
+        self._pending_tick: Mapping[str, Any] | None = None
+        self._pending_events: list[Mapping[str, Any]] = []
+        self._flush_scheduled = False
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def latest_tick(self) -> EncodedMessage | None:
+        return self._latest
+
+    def subscribe(self, *, events: bool = True) -> Subscriber:
+        """Add a subscriber; ``events=False`` subscribes to ticks only."""
+        if not self._subscribers:
+            self._start_feed()
+        sub = Subscriber(max_events=self._max_events, wants_events=events)
+        self._subscribers.add(sub)
+        sub.replay(self._recent_events)
+        if self._latest is None:
+            tick = self._session.get_latest_tick()
+            if tick is not None:
+                self._latest = self._tick_cache.payload_for(tick)
+        if self._latest is not None:
+            sub.offer_tick(self._latest)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self._subscribers.discard(sub)
+        if not self._subscribers:
+            self._stop_feed()
+
+    def close(self) -> None:
+        self._subscribers.clear()
+        self._stop_feed()
+
+    def publish(
+        self,
+        tick: Mapping[str, Any] | None,
+        events: Iterable[Mapping[str, Any]] = (),
+    ) -> None:
+        """Fan out one tick and/or events to all subscribers (loop thread only)."""
+        for event in events:
+            encoded = EncodedMessage(event)
+            self._recent_events.append(encoded)
+            for sub in self._subscribers:
+                sub.offer_event(encoded)
+        if tick is not None:
+            payload = self._tick_cache.payload_for(tick)
+            if payload is self._latest:
+                return
+            self._latest = payload
+            for sub in self._subscribers:
+                sub.offer_tick(payload)
+
+    def _start_feed(self) -> None:
+        self._recent_events.clear()
+        add_listener = getattr(self._session, "add_listener", None)
+        if callable(add_listener):
+            # The backlog is returned atomically with registration, so nothing
+            # is missed or delivered twice.
+            backlog = add_listener(self._on_session_update)
+            self._listening = True
+            self.publish(None, backlog or ())
+            return
+
+        cursor: int | None = None
+        if hasattr(self._session, "get_events_since"):
+            cursor, backlog = self._session.get_events_since(None)
+            self.publish(None, backlog)
+        self._poll_task = self._loop.create_task(self._poll(cursor))
+
+    def _stop_feed(self) -> None:
+        if self._listening:
+            with contextlib.suppress(Exception):
+                self._session.remove_listener(self._on_session_update)
+            self._listening = False
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    def _on_session_update(
+        self, tick: Mapping[str, Any] | None, events: list[Mapping[str, Any]]
+    ) -> None:
+        """Listener called from the session thread; coalesces into one flush."""
+        with self._pending_lock:
+            if tick is not None:
+                self._pending_tick = tick
+            self._pending_events.extend(events)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        with contextlib.suppress(RuntimeError):  # loop closed during shutdown
+            self._loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            tick, self._pending_tick = self._pending_tick, None
+            events, self._pending_events = self._pending_events, []
+            self._flush_scheduled = False
+        self.publish(tick, events)
+
+    async def _poll(self, last_event_seq: int | None) -> None:
+        has_events = hasattr(self._session, "get_events_since")
+        while True:
+            try:
+                events: list[dict[str, Any]] = []
+                if has_events:
+                    last_event_seq, events = self._session.get_events_since(
+                        last_event_seq
+                    )
+                self.publish(self._session.get_latest_tick(), events)
+            except Exception as exc:  # pragma: no cover - keep the feed alive
+                logger.warning("Session hub poll failed: {}", exc)
+            await asyncio.sleep(self._poll_interval_s)
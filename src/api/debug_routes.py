@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+
+from aiohttp import web
+
+from src.profiling import SPANS, sample_stacks
+
+PROFILE_MAX_SECONDS = 60.0
+PROFILE_DEFAULT_SECONDS = 10.0
+PROFILE_DEFAULT_INTERVAL_MS = 5.0
+
+# One sampling profile at a time; overlapping samplers would skew each other
+_profile_lock = threading.Lock()
+
+
+def _spans_view() -> dict[str, object]:
+    return {"enabled": SPANS.enabled, "spans": SPANS.snapshot()}
+
+
+async def get_spans(_request: web.Request) -> web.Response:
+    """GET /debug/spans - Timing span percentiles and whether spans are on."""
+    return web.json_response(_spans_view())
+
+
+async def update_spans(request: web.Request) -> web.Response:
+    """POST /debug/spans - Body ``{"enabled": bool, "reset": bool}`` (both optional)."""
+    try:
+        body = await request.json()
+    except ValueError:
+        return web.json_response({"error": "Invalid JSON body"}, status=400)
+    if not isinstance(body, dict):
+        return web.json_response({"error": "Body must be a JSON object"}, status=400)
+
+    enabled = body.get("enabled")
+    if enabled is not None and not isinstance(enabled, bool):
+        return web.json_response({"error": "'enabled' must be a boolean"}, status=400)
+    if body.get("reset"):
+        SPANS.reset()
+    if enabled is not None:
+        SPANS.enabled = enabled
+    return web.json_response(_spans_view())
+
+
+async def run_profile(request: web.Request) -> web.Response:
+    """POST /debug/profile - Sample thread stacks and return folded stacks.
+
+    Query: ``seconds`` (default 10, max 60), ``interval_ms`` (default 5) and
+    ``threads`` (thread-name prefix, e.g. ``session-``). The plain-text body
+    feeds flamegraph.pl or speedscope directly.
+    """
+    try:
+        seconds = float(request.query.get("seconds", PROFILE_DEFAULT_SECONDS))
+        interval_ms = float(request.query.get("interval_ms", PROFILE_DEFAULT_INTERVAL_MS))
+    except ValueError:
+        return web.json_response(
+            {"error": "seconds and interval_ms must be numbers"}, status=400
+        )
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        return web.json_response(
+            {"error": f"seconds must be in (0, {PROFILE_MAX_SECONDS:g}]"}, status=400
+        )
+    if not 1 <= interval_ms <= 1000:
+        return web.json_response(
+            {"error": "interval_ms must be in [1, 1000]"}, status=400
+        )
+
+    if not _profile_lock.acquire(blocking=False):
+        return web.json_response({"error": "A profile is already running"}, status=409)
+    try:
+        profile = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                sample_stacks,
+                seconds,
+                interval_s=interval_ms / 1000.0,
+                thread_prefix=request.query.get("threads") or None,
+            ),
+        )
+    finally:
+        _profile_lock.release()
+
+    return web.Response(
+        text=profile.folded(),
+        content_type="text/plain",
+        headers={
+            "X-Profile-Samples": str(profile.samples),
+            "X-Profile-Duration-S": f"{profile.duration_s:.3f}",
+        },
+    )
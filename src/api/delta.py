@@ -0,0 +1,183 @@
+"""Delta compression for metadata ticks published over the WebSocket.
+
+In delta mode a client first receives a keyframe (a regular ``metadata_tick``
+with ``seq`` and ``keyframe: true``) followed by ``metadata_delta`` messages
+that only carry what changed since the previous message: new or changed
+tracks, removed track ids, changed PTZ fields and changed top-level fields.
+
+Every message carries a ``seq``; deltas also carry ``base_seq`` (the ``seq`` the
+delta applies to) so a client can detect a gap and send ``{"type": "resync"}``
+to get a fresh keyframe.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+DELTA_TYPE = "metadata_delta"
+
+# Sent with every delta so clients can keep time/frame counters current.
+_ALWAYS_FIELDS = ("ts_unix_ms", "ts_mono_ms", "frame_index")
+
+# Top-level tick fields that are only sent when they change.
+_DIFFED_FIELDS = ("space", "frame_size", "selected_target_id", "tracking_phase")
+
+
+def _diff_mapping(
+    prev: Mapping[str, Any] | None, cur: Mapping[str, Any]
+) -> dict[str, Any]:
+    """Return the keys of ``cur`` that differ from ``prev`` (nested mappings recurse)."""
+    if prev is None:
+        return dict(cur)
+    out: dict[str, Any] = {}
+    for key, value in cur.items():
+        old = prev.get(key)
+        if isinstance(value, Mapping) and isinstance(old, Mapping):
+            nested = _diff_mapping(old, value)
+            if nested:
+                out[key] = nested
+        elif old != value or key not in prev:
+            out[key] = value
+    return out
+
+
+@dataclass(slots=True)
+class DeltaEncoder:
+    """Turns a stream of full ticks into keyframes and deltas for one client.
+
+    Args:
+        keyframe_interval: Number of messages between forced keyframes
+            (1 means every message is a keyframe).
+    """
+
+    keyframe_interval: int = 50
+
+    _seq: int = field(default=0, init=False, repr=False)
+    _since_keyframe: int = field(default=0, init=False, repr=False)
+    _prev: dict[str, Any] | None = field(default=None, init=False, repr=False)
+    _prev_tracks: dict[int, Mapping[str, Any]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.keyframe_interval < 1:
+            msg = "keyframe_interval must be >= 1"
+            raise ValueError(msg)
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def request_keyframe(self) -> None:
+        """Make the next encoded message a keyframe (used on client resync)."""
+        self._prev = None
+
+    def encode(self, tick: Mapping[str, Any]) -> dict[str, Any]:
+        """Encode the next tick as either a keyframe or a delta."""
+        self._seq += 1
+        tracks = {int(t["id"]): t for t in tick.get("tracks", [])}
+
+        if self._prev is None or self._since_keyframe >= self.keyframe_interval:
+            message = dict(tick)
+            message["seq"] = self._seq
+            message["keyframe"] = True
+            self._since_keyframe = 1
+        else:
+            message = self._delta(tick, tracks)
+            self._since_keyframe += 1
+
+        self._prev = dict(tick)
+        self._prev_tracks = tracks
+        return message
+
+    def _delta(
+        self, tick: Mapping[str, Any], tracks: dict[int, Mapping[str, Any]]
+    ) -> dict[str, Any]:
+        prev = self._prev or {}
+        message: dict[str, Any] = {
+            "type": DELTA_TYPE,
+            "seq": self._seq,
+            "base_seq": self._seq - 1,
+        }
+        for key in _ALWAYS_FIELDS:
+            if key in tick:
+                message[key] = tick[key]
+        for key in _DIFFED_FIELDS:
+            if key in tick and tick[key] != prev.get(key):
+                message[key] = tick[key]
+
+        ptz = tick.get("ptz")
+        if ptz is None:
+            if prev.get("ptz") is not None:
+                message["ptz"] = None
+        else:
+            ptz_delta = _diff_mapping(prev.get("ptz"), ptz)
+            if ptz_delta:
+                message["ptz"] = ptz_delta
+
+        changed = [
+            t for tid, t in tracks.items() if self._prev_tracks.get(tid) != t
+        ]
+        if changed:
+            message["tracks"] = changed
+        removed = [tid for tid in self._prev_tracks if tid not in tracks]
+        if removed:
+            message["removed"] = removed
+        return message
+
+
+def _merge_mapping(base: dict[str, Any], delta: Mapping[str, Any]) -> None:
+    for key, value in delta.items():
+        if isinstance(value, Mapping) and isinstance(base.get(key), dict):
+            _merge_mapping(base[key], value)
+        else:
+            base[key] = copy.deepcopy(value)
+
+
+def apply_delta(
+    state: Mapping[str, Any] | None, message: Mapping[str, Any]
+) -> dict[str, Any]:
+    """Reference client: apply a keyframe or delta to the last reconstructed tick.
+
+    Returns the reconstructed full tick, including the ``seq`` it corresponds to.
+
+    Raises:
+        ValueError: If a delta does not apply to ``state`` (gap in ``seq``); the
+            client should send ``{"type": "resync"}``.
+    """
+    if message.get("type") != DELTA_TYPE:
+        full = copy.deepcopy(dict(message))
+        full.pop("keyframe", None)
+        return full
+
+    if state is None or state.get("seq") != message.get("base_seq"):
+        msg = "Delta does not apply to current state; resync required"
+        raise ValueError(msg)
+
+    out = copy.deepcopy(dict(state))
+    out["seq"] = message["seq"]
+    for key in (*_ALWAYS_FIELDS, *_DIFFED_FIELDS):
+        if key in message:
+            out[key] = copy.deepcopy(message[key])
+
+    if "ptz" in message:
+        if message["ptz"] is None:
+            out.pop("ptz", None)
+        else:
+            out.setdefault("ptz", {})
+            _merge_mapping(out["ptz"], message["ptz"])
+
+    removed = set(message.get("removed", ()))
+    changed = {int(t["id"]): t for t in message.get("tracks", ())}
+    tracks = []
+    for track in out.get("tracks", []):
+        tid = int(track["id"])
+        if tid in removed:
+            continue
+        tracks.append(copy.deepcopy(dict(changed.pop(tid, track))))
+    tracks.extend(copy.deepcopy(dict(t)) for t in changed.values())
+    out["tracks"] = tracks
+    return out
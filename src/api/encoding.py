@@ -0,0 +1,211 @@
+"""Wire encodings for messages published over the analytics WebSocket.
+
+JSON stays the default. Clients may negotiate a compact binary encoding
+(MessagePack or CBOR) at connect time, either through the WebSocket
+subprotocol (``drone-ptz.msgpack``) or the ``?encoding=`` query parameter.
+Binary encodings carry bbox values as fixed-point integers (see
+``BBOX_SCALE``) instead of floats.
+
+MessagePack also packs every remaining float as float32 (``conf``,
+``ptz.cmd``, ``ptz.pose``, ...); timestamps are integers and unaffected. CBOR
+keeps float64.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from typing import Any, Literal
+
+WireEncoding = Literal["json", "msgpack", "cbor"]
+
+SUBPROTOCOL_PREFIX = "drone-ptz."
+
+# Normalized bbox values in [0..1] are sent as integers in [0..BBOX_SCALE].
+BBOX_SCALE = 10_000
+
+_BBOX_KEYS = ("x", "y", "w", "h")
+
+
+class EncodingError(ValueError):
+    """Raised when an encoding is unknown or its codec is not installed."""
+
+
+def get_msgpack():
+    """Lazy import for msgpack (optional dependency)."""
+    import msgpack  # noqa: PLC0415 - Optional dependency
+
+    return msgpack
+
+
+def get_cbor2():
+    """Lazy import for cbor2 (optional dependency)."""
+    import cbor2  # noqa: PLC0415 - Optional dependency
+
+    return cbor2
+
+
+def _codec_available(encoding: str) -> bool:
+    try:
+        if encoding == "msgpack":
+            get_msgpack()
+        elif encoding == "cbor":
+            get_cbor2()
+        elif encoding != "json":
+            return False
+    except ImportError:
+        return False
+    return True
+
+
+def available_encodings() -> list[WireEncoding]:
+    """Return the encodings usable in this process (JSON is always available)."""
+    binary: tuple[WireEncoding, ...] = ("msgpack", "cbor")
+    return ["json", *[name for name in binary if _codec_available(name)]]
+
+
+def subprotocols() -> tuple[str, ...]:
+    """WebSocket subprotocols offered by the server, binary encodings first."""
+    encodings = available_encodings()
+    ordered = [e for e in encodings if e != "json"] + ["json"]
+    return tuple(f"{SUBPROTOCOL_PREFIX}{e}" for e in ordered)
+
+
+def encoding_from_subprotocol(protocol: str | None) -> WireEncoding | None:
+    if not protocol or not protocol.startswith(SUBPROTOCOL_PREFIX):
+        return None
+    name = protocol[len(SUBPROTOCOL_PREFIX) :]
+    return resolve_encoding(name)
+
+
+def resolve_encoding(name: str | None) -> WireEncoding:
+    """Validate an encoding name and check that its codec is installed."""
+    normalized = (name or "json").strip().lower()
+    if normalized not in ("json", "msgpack", "cbor"):
+        msg = f"Unknown encoding: {name}"
+        raise EncodingError(msg)
+    if not _codec_available(normalized):
+        msg = f"Encoding not available on this server: {normalized}"
+        raise EncodingError(msg)
+    return normalized  # type: ignore[return-value]
+
+
+def _fixed_bbox(bbox: Mapping[str, Any]) -> list[int]:
+    return [round(float(bbox[k]) * BBOX_SCALE) for k in _BBOX_KEYS]
+
+
+def _fixed_summary(summary: Mapping[str, Any] | None) -> dict[str, Any] | None:
+    if summary is None:
+        return None
+    out = dict(summary)
+    if out.get("best_bbox") is not None:
+        out["best_bbox"] = _fixed_bbox(out["best_bbox"])
+    return out
+
+
+def to_fixed_point(message: Mapping[str, Any]) -> dict[str, Any]:
+    """Return a shallow-copied message with bbox fields as fixed-point ints.
+
+    Bboxes become ``[x, y, w, h]`` lists scaled by ``BBOX_SCALE`` and the scale is
+    advertised in a top-level ``bbox_scale`` field. The input is not modified.
+    """
+    out = dict(message)
+    msg_type = out.get("type")
+    if msg_type in ("metadata_tick", "metadata_delta") and "tracks" in out:
+        tracks = []
+        for track in out["tracks"]:
+            fixed = dict(track)
+            fixed["bbox"] = _fixed_bbox(track["bbox"])
+            tracks.append(fixed)
+        out["tracks"] = tracks
+        out["bbox_scale"] = BBOX_SCALE
+    elif msg_type == "track_event":
+        out["before"] = _fixed_summary(out.get("before"))
+        out["after"] = _fixed_summary(out.get("after"))
+        out["bbox_scale"] = BBOX_SCALE
+    return out
+
+
+def _plain(value: Any) -> Any:
+    # Read-only payloads (see ``src.analytics.event_log.freeze``) are mappings,
+    # not dicts; codecs call this for types they do not know.
+    if isinstance(value, Mapping):
+        return dict(value)
+    msg = f"Object of type {type(value).__name__} is not serializable"
+    raise TypeError(msg)
+
+
+def _cbor_default(encoder: Any, value: Any) -> None:
+    encoder.encode(_plain(value))
+
+
+def encode_message(message: Mapping[str, Any], encoding: WireEncoding) -> str | bytes:
+    """Encode one message. JSON returns ``str``; binary encodings return ``bytes``."""
+    if encoding == "json":
+        return json.dumps(_plain(message), separators=(",", ":"), default=_plain)
+    fixed = to_fixed_point(message)
+    if encoding == "msgpack":
+        return get_msgpack().packb(
+            fixed, use_bin_type=True, use_single_float=True, default=_plain
+        )
+    if encoding == "cbor":
+        return get_cbor2().dumps(fixed, default=_cbor_default)
+    msg = f"Unknown encoding: {encoding}"
+    raise EncodingError(msg)
+
+
+def decode_message(data: str | bytes, encoding: WireEncoding) -> Any:
+    """Decode a client message received in the negotiated encoding."""
+    if encoding == "json" or isinstance(data, str):
+        return json.loads(data)
+    if encoding == "msgpack":
+        return get_msgpack().unpackb(data, raw=False)
+    if encoding == "cbor":
+        return get_cbor2().loads(data)
+    msg = f"Unknown encoding: {encoding}"
+    raise EncodingError(msg)
+
+
+class EncodedMessage:
+    """A message plus its lazily encoded forms, shared by every subscriber.
+
+    The first subscriber asking for an encoding pays for it; later subscribers
+    get the same ``str``/``bytes`` object.
+    """
+
+    __slots__ = ("_encoded", "message")
+
+    def __init__(self, message: Mapping[str, Any]) -> None:
+        self.message = message
+        self._encoded: dict[str, str | bytes] = {}
+
+    def get(self, encoding: WireEncoding) -> str | bytes:
+        cached = self._encoded.get(encoding)
+        if cached is None:
+            cached = encode_message(self.message, encoding)
+            self._encoded[encoding] = cached
+        return cached
+
+
+def tick_key(tick: Mapping[str, Any]) -> int | None:
+    """Identity of a tick used to detect whether it changed since the last send."""
+    key = tick.get("ts_mono_ms") or tick.get("ts_unix_ms")
+    try:
+        return int(key) if key is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TickPayloadCache:
+    """Per-session cache so each tick is encoded once for all WebSocket clients."""
+
+    def __init__(self) -> None:
+        self._key: int | None = None
+        self._payload: EncodedMessage | None = None
+
+    def payload_for(self, tick: Mapping[str, Any]) -> EncodedMessage:
+        key = tick_key(tick)
+        if key is None or key != self._key or self._payload is None:
+            self._key = key
+            self._payload = EncodedMessage(tick)
+        return self._payload
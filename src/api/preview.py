@@ -0,0 +1,172 @@
+"""Annotated MJPEG preview of a session's frames.
+
+Sessions keep a reference to their latest frame and detections
+(``get_preview_frame``); that costs nothing while nobody watches. A
+``PreviewStream`` exists per session on the aiohttp loop. It runs one encoder
+task only while at least one viewer is connected. The task downscales to
+``performance.preview_max_width``, draws the detections (locked target
+highlighted), JPEG-encodes off the loop at up to
+``performance.preview_max_fps``, and shares each JPEG with every viewer.
+Viewers that fall behind skip straight to the newest JPEG.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from src.overlay import draw_detection_boxes
+from src.tracking.control import extract_pixel_coords
+
+MJPEG_BOUNDARY = "frame"
+
+
+@dataclass(frozen=True, slots=True)
+class PreviewFrame:
+    """A session frame plus what to draw on it.
+
+    ``frame`` is shared with the session and must not be modified.
+    """
+
+    frame: np.ndarray
+    boxes: list[Any]
+    target_id: int | None
+    class_names: dict[int, str]
+    frame_index: int
+
+
+def encode_preview(
+    preview: PreviewFrame, *, max_width: int = 640, quality: int = 70
+) -> bytes | None:
+    """Downscale, annotate and JPEG-encode a preview frame."""
+    frame_h, frame_w = preview.frame.shape[:2]
+    scale = min(1.0, max_width / frame_w)
+    if scale < 1.0:
+        image = cv2.resize(
+            preview.frame,
+            (max(1, round(frame_w * scale)), max(1, round(frame_h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+    else:
+        image = preview.frame.copy()
+
+    # Boxes are drawn on the downscaled image, so move them into its pixel space
+    boxes = []
+    for det in preview.boxes:
+        x1, y1, x2, y2 = extract_pixel_coords(det, frame_w, frame_h)
+        boxes.append(
+            SimpleNamespace(
+                cls=getattr(det, "cls", 0),
+                conf=getattr(det, "conf", 1.0),
+                id=getattr(det, "id", None),
+                xyxy=[(x1 * scale, y1 * scale, x2 * scale, y2 * scale)],
+            )
+        )
+    draw_detection_boxes(image, preview.class_names, boxes, highlight_id=preview.target_id)
+
+    ok, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+    return jpeg.tobytes() if ok else None
+
+
+def mjpeg_part(jpeg: bytes) -> bytes:
+    """One ``multipart/x-mixed-replace`` part carrying ``jpeg``."""
+    head = (
+        f"--{MJPEG_BOUNDARY}\r\n"
+        "Content-Type: image/jpeg\r\n"
+        f"Content-Length: {len(jpeg)}\r\n\r\n"
+    ).encode()
+    return head + jpeg + b"\r\n"
+
+
+class PreviewStream:
+    """Shared preview encoder for one session; lives on the aiohttp event loop.
+
+    Args:
+        session: Session exposing ``get_preview_frame()``.
+        max_width: Encoded frames are downscaled to at most this width.
+        max_fps: Encoding rate cap.
+        quality: JPEG quality (1-100).
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        *,
+        max_width: int = 640,
+        max_fps: float = 5.0,
+        quality: int = 70,
+    ) -> None:
+        self._session = session
+        self.max_width = max_width
+        self.period_s = 1.0 / max_fps
+        self.quality = quality
+        self.encoded = 0
+        self._viewers = 0
+        self._seq = 0
+        self._jpeg: bytes | None = None
+        self._changed = asyncio.Condition()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def viewer_count(self) -> int:
+        return self._viewers
+
+    def subscribe(self) -> None:
+        """Register a viewer; starts the encoder for the first one."""
+        self._viewers += 1
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._encode_loop())
+
+    def unsubscribe(self) -> None:
+        self._viewers = max(0, self._viewers - 1)
+        if self._viewers == 0:
+            self._stop_encoder()
+
+    def close(self) -> None:
+        self._viewers = 0
+        self._stop_encoder()
+
+    async def next_jpeg(self, after_seq: int) -> tuple[int, bytes]:
+        """Wait for a JPEG newer than ``after_seq``; return ``(seq, jpeg)``."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._seq > after_seq)
+            assert self._jpeg is not None
+            return self._seq, self._jpeg
+
+    def _stop_encoder(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _encode_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_index: int | None = None
+        while True:
+            started = loop.time()
+            try:
+                preview = self._session.get_preview_frame()
+                if preview is not None and preview.frame_index != last_index:
+                    last_index = preview.frame_index
+                    jpeg = await asyncio.to_thread(
+                        encode_preview,
+                        preview,
+                        max_width=self.max_width,
+                        quality=self.quality,
+                    )
+                    if jpeg is not None:
+                        async with self._changed:
+                            self._seq += 1
+                            self._jpeg = jpeg
+                            self.encoded += 1
+                            self._changed.notify_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - keep the stream alive
+                logger.warning("Preview encoding failed: {}", exc)
+            await asyncio.sleep(max(0.0, self.period_s - (loop.time() - started)))
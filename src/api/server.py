@@ -3,22 +3,33 @@ from __future__ import annotations
 import argparse
 import logging
 import asyncio
+from pathlib import Path
+from typing import Any
 from urllib.parse import urlparse
 
 from aiohttp import web
 from loguru import logger
 
+from src.analytics.event_store import EventStore
+from src.analytics.trajectory import TrajectoryRecorder
 from src.api.app import create_app
-from src.api.session import default_session_factory
 from src.api.session_manager import SessionManager
 from src.api.settings_manager import SettingsManager
 from src.detection_profiles import get_detection_profiles
 from src.logging_config import setup_logging
-from src.settings import load_settings
+from src.profiling import SPANS
+from src.settings import Settings, load_settings
 
 
-def _derive_camera_id_from_settings() -> str:
-    settings = load_settings()
+def _session_factory(session_id: str, camera_id: str, settings_manager: SettingsManager) -> Any:
+    # Deferred: src.api.session pulls in OpenCV, aiortc and the detection stack,
+    # which the API does not need before the first session starts
+    from src.api.session import default_session_factory  # noqa: PLC0415
+
+    return default_session_factory(session_id, camera_id, settings_manager)
+
+
+def _derive_camera_id_from_settings(settings: Settings) -> str:
     # Use visible_detection camera as primary source for camera ID
     vis_cam = settings.visible_detection.camera
     if vis_cam.source == "webrtc" and vis_cam.webrtc_url:
@@ -31,12 +42,11 @@ def _derive_camera_id_from_settings() -> str:
     return "default"
 
 
-def _derive_camera_ids_from_settings() -> list[str]:
-    settings = load_settings()
+def _derive_camera_ids_from_settings(settings: Settings) -> list[str]:
     profiles = get_detection_profiles(settings)
     if profiles:
         return [profile.camera_id for profile in profiles]
-    return [_derive_camera_id_from_settings()]
+    return [_derive_camera_id_from_settings(settings)]
 
 
 def main() -> None:
@@ -65,14 +75,39 @@ def main() -> None:
     # Load initial settings and configure logging
     settings = load_settings()
     setup_logging(settings)
+    SPANS.enabled = settings.performance.timing_spans
     settings_manager = SettingsManager(settings)
 
-    camera_ids = _derive_camera_ids_from_settings()
+    camera_ids = _derive_camera_ids_from_settings(settings)
+
+    event_store: EventStore | None = None
+    if settings.event_store.enabled:
+        store_cfg = settings.event_store
+        event_store = EventStore(
+            path=Path(store_cfg.path),
+            retention_days=store_cfg.retention_days,
+            batch_size=store_cfg.batch_size,
+            flush_interval_s=store_cfg.flush_interval_s,
+            queue_maxsize=store_cfg.queue_maxsize,
+        )
+        event_store.start()
+
+    trajectory_recorder: TrajectoryRecorder | None = None
+    if settings.trajectory.enabled:
+        trajectory_recorder = TrajectoryRecorder(
+            output_dir=Path(settings.trajectory.output_dir),
+            max_samples_per_track=settings.trajectory.max_samples_per_track,
+            stale_after_ms=settings.tracking.end_after_ms,
+        )
 
     manager = SessionManager(
         cameras=camera_ids,
-        session_factory=default_session_factory,
+        session_factory=_session_factory,
         settings_manager=settings_manager,
+        event_store=event_store,
+        session_listeners=(
+            [trajectory_recorder.listener] if trajectory_recorder else []
+        ),
     )
     app = create_app(
         manager,
@@ -81,7 +116,19 @@ def main() -> None:
         auto_start_session=args.auto_start,
         camera_id=camera_ids[0] if camera_ids else None,
     )
-    
+    if event_store is not None:
+
+        async def _stop_event_store(_app: web.Application) -> None:
+            await asyncio.to_thread(event_store.stop)
+
+        app.on_cleanup.append(_stop_event_store)
+    if trajectory_recorder is not None:
+
+        async def _close_trajectory_recorder(_app: web.Application) -> None:
+            await asyncio.to_thread(trajectory_recorder.close)
+
+        app.on_cleanup.append(_close_trajectory_recorder)
+
     web.run_app(app, host=args.host, port=args.port)
 
 
@@ -5,6 +5,7 @@ import queue
 import threading
 import time
 from collections import deque
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -12,15 +13,29 @@ import cv2
 from loguru import logger
 
 from src.analytics.engine import AnalyticsEngine
+from src.analytics.event_log import EventLog
 from src.analytics.events import TrackLifecycle
 from src.analytics.metadata import MetadataBuilder
+from src.api.preview import PreviewFrame
+from src.clock import SYSTEM_CLOCK, Clock
 from src.detection_manager import DetectionManager, DetectionMode, DetectionResult
+from src.profiling import span
 from src.ptz_controller import PTZService
 from src.settings import Settings
+from src.tracking.acquisition import SnapAcquisition
+from src.tracking.control import (
+    extract_pixel_coords,
+    normalized_zoom,
+    proportional_command,
+)
 from src.tracking.state import TrackerStatus, TrackingPhase
 from src.webrtc_client import start_webrtc_client
 
 
+# Called from the session thread with (tick, new_track_events) after each tick.
+SessionListener = Callable[[dict[str, Any], list[Mapping[str, Any]]], None]
+
+
 # Removed legacy _frame_grabber and _calculate_coverage as DetectionManager handles them
 
 
@@ -31,8 +46,10 @@ class ThreadedAnalyticsSession:
     settings: Settings
     detection_id: str = "visible"
     publish_debug_logs: bool = False
+    clock: Clock = field(default=SYSTEM_CLOCK, repr=False)
     _lock: threading.Lock = field(init=False, repr=False)
     _running: bool = field(init=False, repr=False)
+    _ready: bool = field(init=False, repr=False)
     _latest_tick: dict[str, Any] | None = field(init=False, repr=False)
     _stop_event: threading.Event = field(init=False, repr=False)
     _thread: threading.Thread | None = field(init=False, repr=False)
@@ -45,19 +62,23 @@ class ThreadedAnalyticsSession:
     _frame_index: int = field(init=False, repr=False)
     _fps_window: deque[float] = field(init=False, repr=False)
     _track_lifecycle: TrackLifecycle = field(init=False, repr=False)
-    _events: deque[tuple[int, dict[str, Any]]] = field(init=False, repr=False)
-    _event_seq: int = field(init=False, repr=False)
+    _event_log: EventLog = field(init=False, repr=False)
+    _listeners: list[SessionListener] = field(init=False, repr=False)
+    _acquisition: SnapAcquisition = field(init=False, repr=False)
+    _preview: PreviewFrame | None = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         self._lock = threading.Lock()
         self._running = False
+        self._ready = False
         self._latest_tick = None
         self._stop_event = threading.Event()
         self._thread = None
         self._commands = queue.Queue()
 
         self._tracker_status = TrackerStatus(
-            loss_grace_s=self.settings.tracking.end_after_ms / 1000.0
+            loss_grace_s=self.settings.tracking.end_after_ms / 1000.0,
+            clock=self.clock,
         )
         self._detection_manager = None
         self._class_names = None
@@ -68,13 +89,20 @@ class ThreadedAnalyticsSession:
         self._track_lifecycle = TrackLifecycle(
             session_id=self.session_id, camera_id=self.camera_id
         )
-        self._events = deque(maxlen=1_000)
-        self._event_seq = 0
+        self._event_log = EventLog(capacity=1_000)
+        self._listeners = []
+        self._acquisition = SnapAcquisition(self.settings, clock=self.clock)
+        self._preview = None
 
     def is_running(self) -> bool:
         with self._lock:
             return self._running
 
+    def is_ready(self) -> bool:
+        """True once detection models are loaded and inputs are started."""
+        with self._lock:
+            return self._running and self._ready
+
     def start(self) -> None:
         with self._lock:
             if self._running:
@@ -82,7 +110,9 @@ class ThreadedAnalyticsSession:
             self._running = True
             self._stop_event.clear()
 
-        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread = threading.Thread(
+            target=self._run, name=f"session-{self.session_id}", daemon=True
+        )
         self._thread.start()
 
     def stop(self) -> None:
@@ -106,6 +136,11 @@ class ThreadedAnalyticsSession:
                 return None
             return dict(self._latest_tick)
 
+    def get_preview_frame(self) -> PreviewFrame | None:
+        """Latest priority frame with its detections, for the preview stream."""
+        with self._lock:
+            return self._preview
+
     def get_status(self) -> dict[str, Any]:
         with self._lock:
             tick = self._latest_tick
@@ -115,6 +150,7 @@ class ThreadedAnalyticsSession:
 
         return {
             "running": self.is_running(),
+            "ready": self.is_ready(),
             "selected_target_id": target_id,
             "tracking_phase": phase,
             "last_tick_ts_unix_ms": last_ts,
@@ -122,20 +158,25 @@ class ThreadedAnalyticsSession:
 
     def get_events_since(
         self, last_seq: int | None
-    ) -> tuple[int | None, list[dict[str, Any]]]:
-        with self._lock:
-            if not self._events:
-                return last_seq, []
+    ) -> tuple[int | None, list[Mapping[str, Any]]]:
+        """Return events newer than ``last_seq`` as shared, read-only mappings."""
+        return self._event_log.read_since(last_seq)
+
+    def add_listener(self, callback: SessionListener) -> list[Mapping[str, Any]]:
+        """Register a callback invoked from the session thread after each tick.
 
-            events: list[dict[str, Any]] = []
-            max_seq: int | None = last_seq
-            for seq, payload in self._events:
-                if last_seq is not None and seq <= last_seq:
-                    continue
-                events.append(dict(payload))
-                max_seq = seq if max_seq is None else max(max_seq, seq)
+        The callback receives the stored tick and the new (read-only) track
+        events; the tick must be treated as read-only too. Returns the currently
+        buffered events, taken atomically with registration so callers can seed
+        without gaps.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+            return self._event_log.read_since(None)[1]
 
-        return max_seq, events
+    def remove_listener(self, callback: SessionListener) -> None:
+        with self._lock, contextlib.suppress(ValueError):
+            self._listeners.remove(callback)
 
     def reload_services(self, new_settings: Settings) -> dict[str, Any]:
         """Hot-reload detection and camera services with new settings.
@@ -173,6 +214,7 @@ class ThreadedAnalyticsSession:
             
             # Update settings reference
             self.settings = new_settings
+            self._acquisition = SnapAcquisition(self.settings, clock=self.clock)
             logger.info(f"Session {self.session_id} reloading with thermal method: {self.settings.thermal_detection.detection_method}")
             
             # Reload detection service if mode changed
@@ -209,16 +251,25 @@ class ThreadedAnalyticsSession:
 
     def _ensure_services(self) -> None:
         if self._detection_manager is None:
-            self._detection_manager = DetectionManager(settings=self.settings)
+            self._detection_manager = DetectionManager(
+                settings=self.settings, clock=self.clock
+            )
             logger.info(f"API Session {self.session_id}: DetectionManager initialized")
             # Class names are resolved after the detection manager starts.
         if self._ptz is None and self._should_control_ptz():
             if self.settings.simulator.use_ptz_simulation:
                 from src.ptz_simulator import SimulatedPTZService  # noqa: PLC0415
 
-                self._ptz = SimulatedPTZService(settings=self.settings)
+                self._ptz = SimulatedPTZService(settings=self.settings, clock=self.clock)
             else:
                 self._ptz = PTZService(settings=self.settings)
+            if self.settings.ptz.control_strategy == "predictive":
+                # Sessions steer with proportional_command; the PID/predictive
+                # servo (and its latency lead) only runs in main()
+                logger.warning(
+                    f"API Session {self.session_id}: ptz.control_strategy=predictive "
+                    "is not applied to API sessions; using proportional control"
+                )
         elif self._ptz is not None and not self._should_control_ptz():
             # Drop PTZ control if this session is no longer the tracking source.
             with contextlib.suppress(Exception):
@@ -310,7 +361,7 @@ class ThreadedAnalyticsSession:
                 cmd = self._commands.get_nowait()
                 if cmd.get("type") == "set_target_id":
                     self._tracker_status.set_target(
-                        int(cmd["target_id"]), now=time.time()
+                        int(cmd["target_id"]), now=self.clock.time()
                     )
                 elif cmd.get("type") == "clear_target":
                     self._tracker_status.clear_target()
@@ -321,6 +372,8 @@ class ThreadedAnalyticsSession:
         try:
             self._ensure_services()
             self._start_input()
+            with self._lock:
+                self._ready = True
             self._loop()
         except Exception as exc:  # pragma: no cover - best-effort error isolation
             logger.exception("Session {} crashed: {}", self.session_id, exc)
@@ -328,26 +381,23 @@ class ThreadedAnalyticsSession:
             self._stop_event.set()
             with self._lock:
                 self._running = False
+                self._ready = False
 
     def _loop(self) -> None:
         assert self._detection_manager is not None
         assert self._analytics is not None
         
-        ptz_movement_gain = self.settings.ptz.ptz_movement_gain
-        ptz_movement_threshold = self.settings.ptz.ptz_movement_threshold
-        zoom_target_coverage = self.settings.ptz.zoom_target_coverage
-        zoom_dead_zone = self.settings.performance.zoom_dead_zone
-        zoom_velocity_gain = self.settings.ptz.zoom_velocity_gain
-
         while not self._stop_event.is_set():
             self._drain_commands()
             
-            results = self._detection_manager.get_detections()
+            now = self.clock.time()
+            results = self._detection_manager.get_detections(
+                now=now, ptz=self._ptz
+            )
             if not results:
                 time.sleep(0.01)
                 continue
 
-            now = time.time()
             self._fps_window.append(now)
 
             # Determine tracking priority
@@ -355,7 +405,6 @@ class ThreadedAnalyticsSession:
             priority_result = next((r for r in results if r.mode == priority_mode), results[0])
             
             frame_h, frame_w = priority_result.frame_shape
-            frame_center = (frame_w // 2, frame_h // 2)
 
             # Update analytics engine priority service if it changed
             # (e.g. if priority was switched via API)
@@ -364,38 +413,27 @@ class ThreadedAnalyticsSession:
                 self._analytics.detection = p_service
 
             priority_boxes = priority_result.boxes
-            best_det = self._analytics.update_tracking(priority_boxes, now=now)
+            with span("association"):
+                best_det = self._analytics.update_tracking(priority_boxes, now=now)
+            self._acquisition.observe(
+                self._tracker_status.phase, self._tracker_status.target_id
+            )
 
             # PTZ Control
             if self._ptz is not None and self._tracker_status.phase == TrackingPhase.TRACKING:
-                tracking_bbox = None
                 if best_det is not None:
                     # best_det might be a YOLO box or a ThermalTarget
-                    # Both are handled by normalize_bbox_xyxy in MetadataBuilder
-                    # For PTZ control we need pixel coords
-                    x1, y1, x2, y2 = _extract_pixel_coords(best_det, frame_w, frame_h)
-                    tracking_bbox = (x1, y1, x2, y2)
-
-                if tracking_bbox is not None:
-                    x1, y1, x2, y2 = tracking_bbox
-                    cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-                    dx = (cx - frame_center[0]) / frame_w
-                    dy = (cy - frame_center[1]) / frame_h
-
-                    pan = dx * ptz_movement_gain if abs(dx) > ptz_movement_threshold else 0.0
-                    tilt = -dy * ptz_movement_gain if abs(dy) > ptz_movement_threshold else 0.0
-                    
-                    # Zoom logic
-                    box_w, box_h = x2 - x1, y2 - y1
-                    coverage = max(box_w / frame_w, box_h / frame_h)
-                    diff = zoom_target_coverage - coverage
-                    zoom = diff * zoom_velocity_gain if abs(diff) > zoom_dead_zone else 0.0
-                    
-                    self._ptz.continuous_move(
-                        max(-1.0, min(1.0, pan)), 
-                        max(-1.0, min(1.0, tilt)), 
-                        max(-1.0, min(1.0, zoom))
-                    )
+                    bbox = extract_pixel_coords(best_det, frame_w, frame_h)
+                    if not self._acquisition.update(self._ptz, bbox, frame_w, frame_h):
+                        self._ptz.continuous_move(
+                            *proportional_command(
+                                bbox,
+                                frame_w,
+                                frame_h,
+                                self.settings,
+                                zoom_level=normalized_zoom(self._ptz),
+                            )
+                        )
                 else:
                     self._ptz.stop()
             elif self._ptz is not None and getattr(self._ptz, "active", False):
@@ -407,46 +445,47 @@ class ThreadedAnalyticsSession:
             for res in results:
                 all_boxes.extend(res.boxes)
             
-            tick = self._analytics.build_tick(
-                all_boxes,
-                frame_index=self._frame_index,
-                frame_w=frame_w,
-                frame_h=frame_h,
-                class_names=self._class_names_list(),
-                ptz=self._ptz,
-                ts_unix_ms=int(time.time() * 1000),
-                ts_mono_ms=int(time.monotonic() * 1000),
-            )
-
-            track_events = self._track_lifecycle.update(
-                tracks=tick["tracks"], ts_unix_ms=tick["ts_unix_ms"]
-            )
+            with span("metadata"):
+                tick = self._analytics.build_tick(
+                    all_boxes,
+                    frame_index=self._frame_index,
+                    frame_w=frame_w,
+                    frame_h=frame_h,
+                    class_names=self._class_names_list(),
+                    ptz=self._ptz,
+                    ts_unix_ms=int(self.clock.time() * 1000),
+                    ts_mono_ms=int(self.clock.monotonic() * 1000),
+                )
+
+            with span("lifecycle"):
+                track_events = self._track_lifecycle.update(
+                    tracks=tick["tracks"], ts_unix_ms=tick["ts_unix_ms"]
+                )
+            stored_tick = dict(tick)
+            preview = None
+            if priority_result.frame is not None:
+                preview = PreviewFrame(
+                    frame=priority_result.frame,
+                    boxes=priority_boxes,
+                    target_id=self._tracker_status.target_id,
+                    class_names=self._class_names or {},
+                    frame_index=self._frame_index,
+                )
             with self._lock:
-                self._latest_tick = dict(tick)
-                for event in track_events:
-                    self._event_seq += 1
-                    self._events.append((self._event_seq, dict(event)))
+                self._latest_tick = stored_tick
+                self._preview = preview
+                stored_events = [
+                    self._event_log.append(event)[1] for event in track_events
+                ]
+                listeners = tuple(self._listeners)
+            for listener in listeners:
+                try:
+                    listener(stored_tick, stored_events)
+                except Exception as exc:
+                    logger.warning("Session {} listener failed: {}", self.session_id, exc)
             self._frame_index += 1
 
 
-def _extract_pixel_coords(det: Any, frame_w: int, frame_h: int) -> tuple[int, int, int, int]:
-    """Extract pixel coordinates from any detection type (YOLO or Thermal)."""
-    # Try YOLO xyxy attribute first
-    xyxy = getattr(det, "xyxy", None)
-    if xyxy is not None:
-        x1, y1, x2, y2 = xyxy[0]
-        if all(0 <= v <= 1.0 for v in [x1, y1, x2, y2]):
-            return int(x1 * frame_w), int(y1 * frame_h), int(x2 * frame_w), int(y2 * frame_h)
-        return int(x1), int(y1), int(x2), int(y2)
-    
-    # Try Thermal target attributes
-    x = getattr(det, "x", 0)
-    y = getattr(det, "y", 0)
-    w = getattr(det, "w", 0)
-    h = getattr(det, "h", 0)
-    return x, y, x + w, y + h
-
-
 def default_session_factory(
     session_id: str, camera_id: str, settings_manager: Any
 ) -> ThreadedAnalyticsSession:
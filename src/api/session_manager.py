@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any, Protocol
 
@@ -26,7 +26,7 @@ class Session(Protocol):
 
     def get_events_since(
         self, last_seq: int | None
-    ) -> tuple[int | None, list[dict[str, Any]]]: ...
+    ) -> tuple[int | None, list[Mapping[str, Any]]]: ...
 
     def get_status(self) -> dict[str, Any]: ...
 
@@ -44,14 +44,25 @@ class SessionManager:
         cameras: list[str],
         session_factory: Callable[[str, str, Any], Session],
         settings_manager: Any,
+        event_store: Any | None = None,
+        session_listeners: Sequence[Callable[..., None]] = (),
     ) -> None:
         self._cameras = list(cameras)
         self._session_factory = session_factory
         self._settings_manager = settings_manager
+        self._event_store = event_store
+        # Attached to every session that supports add_listener (see session.py).
+        self._listeners: list[Callable[..., None]] = list(session_listeners)
+        if event_store is not None:
+            self._listeners.append(event_store.listener)
         self._lock = threading.Lock()
         self._sessions_by_id: dict[str, Session] = {}
         self._session_id_by_camera: dict[str, str] = {}
 
+    @property
+    def event_store(self) -> Any | None:
+        return self._event_store
+
     def list_cameras(self) -> list[str]:
         return list(self._cameras)
 
@@ -72,6 +83,9 @@ class SessionManager:
             )
             self._sessions_by_id[session_id] = session
             self._session_id_by_camera[camera_id] = session_id
+            if hasattr(session, "add_listener"):
+                for listener in self._listeners:
+                    session.add_listener(listener)
             return CreateSessionResult(session=session, created=True)
 
     def delete_session(self, session_id: str) -> bool:
@@ -83,6 +97,9 @@ class SessionManager:
             if self._session_id_by_camera.get(camera_id) == session_id:
                 self._session_id_by_camera.pop(camera_id, None)
 
+        if hasattr(session, "remove_listener"):
+            for listener in self._listeners:
+                session.remove_listener(listener)
         session.stop()
         return True
 
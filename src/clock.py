@@ -0,0 +1,82 @@
+"""Injectable time sources.
+
+Components that integrate motion or measure timeouts take a ``Clock`` instead of
+calling ``time.time()`` directly, so the same code runs live (``SystemClock``)
+or faster than real time under replay (``VirtualClock``).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Protocol
+
+
+class Clock(Protocol):
+    def time(self) -> float:
+        """Wall-clock seconds since the epoch."""
+        ...
+
+    def monotonic(self) -> float:
+        """Monotonic seconds (arbitrary origin)."""
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class SystemClock:
+    """The real clock (``time.time`` / ``time.monotonic``)."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+@dataclass(slots=True)
+class VirtualClock:
+    """Manually driven clock for replay and simulation.
+
+    Time only moves when ``advance`` or ``set`` is called. ``monotonic`` starts
+    at zero and advances in lockstep with ``time``.
+
+    Args:
+        start: Initial wall-clock time in seconds since the epoch.
+    """
+
+    start: float = 0.0
+    _now: float = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._now = float(self.start)
+
+    def time(self) -> float:
+        with self._lock:
+            return self._now
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self._now - self.start
+
+    def advance(self, seconds: float) -> float:
+        """Move time forward by ``seconds``; return the new time."""
+        if seconds < 0:
+            msg = f"cannot advance a clock backwards ({seconds}s)"
+            raise ValueError(msg)
+        with self._lock:
+            self._now += seconds
+            return self._now
+
+    def set(self, now: float) -> float:
+        """Jump to ``now`` (seconds since the epoch); time never moves backwards."""
+        with self._lock:
+            if now < self._now:
+                msg = f"cannot move a clock backwards ({now} < {self._now})"
+                raise ValueError(msg)
+            self._now = float(now)
+            return self._now
@@ -77,12 +77,14 @@ class DetectionService:
         self.model = yolo_class(model_path)
         self.class_names = self.model.names
 
-    def detect(self, frame: Any) -> Any:
+    def detect(self, frame: Any, motion: Any | None = None) -> Any:
         """
         Run detection on a single frame.
 
         Args:
             frame: Input frame to detect objects in.
+            motion: Optional ``CameraMotion`` since the previous frame; tracker
+                predictions are warped by it before association.
 
         Returns:
             Boxes object from YOLO results, or empty list if detection fails.
@@ -129,6 +131,9 @@ class DetectionService:
                 conf_threshold,
             )
 
+            if motion is not None and not motion.is_identity():
+                self._compensate_tracker_motion(motion)
+
             with torch.no_grad():
                 results = self.model.track(
                     source=frame,
@@ -144,6 +149,26 @@ class DetectionService:
             boxes = results.boxes if results.boxes is not None else []
             return self.filter_by_target_labels(boxes)
 
+    def _compensate_tracker_motion(self, motion: Any) -> None:
+        """
+        Warp the persisted Ultralytics tracks by the camera's ego-motion.
+
+        Uses the trackers' own GMC hook (``STrack.multi_gmc``). Trackers that
+        already run image-based GMC (BoT-SORT with ``gmc_method`` set) are left
+        alone so the motion is not applied twice.
+        """
+        predictor = getattr(self.model, "predictor", None)
+        for tracker in getattr(predictor, "trackers", None) or []:
+            gmc = getattr(tracker, "gmc", None)
+            if gmc is not None and getattr(gmc, "method", None) not in (None, "none"):
+                continue
+            stracks = [
+                *getattr(tracker, "tracked_stracks", []),
+                *getattr(tracker, "lost_stracks", []),
+            ]
+            if stracks:
+                type(stracks[0]).multi_gmc(stracks, motion.affine())
+
     def get_class_names(self) -> dict[int, str]:
         """
         Get the dict of class names from the model.
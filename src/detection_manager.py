@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+import contextlib
 import queue
 import threading
 import time
 from dataclasses import dataclass
 from enum import StrEnum
-from typing import Any
+from typing import Any, NamedTuple
 
 from loguru import logger
 
+from src.clock import SYSTEM_CLOCK, Clock
 from src.detection import DetectionService
+from src.logging_config import hot_log
+from src.profiling import span
 from src.thermal_detection import ThermalDetectionService
+from src.tracking.motion_compensation import MotionCompensator
 from src.settings import Settings, CameraSourceConfig
+from src.synthetic_scene import (
+    GroundTruth,
+    SyntheticFrame,
+    SyntheticScene,
+    synthetic_frame_source,
+)
 from src.webrtc_client import start_webrtc_client
 import cv2
 
@@ -30,6 +41,41 @@ class DetectionResult:
     frame: Any
     frame_shape: tuple[int, int]
     timestamp: float
+    # Clock time the frame left its source; timestamp - capture_ts is the
+    # queueing delay, and clock.time() - capture_ts the detection's age
+    capture_ts: float
+    # Known targets when the frame came from a synthetic source
+    ground_truth: GroundTruth | None = None
+
+
+class _Captured(NamedTuple):
+    item: Any
+    capture_ts: float
+
+
+class _CaptureQueue(queue.Queue):
+    """Single-slot frame queue that stamps each frame when its source queues it.
+
+    Sources keep putting bare frames (or ``SyntheticFrame``s); items come out
+    as ``_Captured``. Items already wrapped keep their capture time (replay).
+    """
+
+    def __init__(self, clock: Clock) -> None:
+        super().__init__(maxsize=1)
+        self.clock = clock
+
+    def _put(self, item: Any) -> None:
+        if not isinstance(item, _Captured):
+            item = _Captured(item, self.clock.time())
+        super()._put(item)
+
+
+def _unpack(captured: _Captured) -> tuple[Any, float, GroundTruth | None]:
+    # Synthetic sources queue the frame with its ground truth, cameras bare frames
+    item = captured.item
+    if isinstance(item, SyntheticFrame):
+        return item.image, captured.capture_ts, item.ground_truth
+    return item, captured.capture_ts, None
 
 
 def _frame_grabber(
@@ -71,9 +117,12 @@ def _frame_grabber(
     logger.info(f"{debug_name}: Started frame grabber")
     
     while not stop_event.is_set():
-        ret, frame = cap.read()
+        with span("capture"):
+            ret, frame = cap.read()
         if not ret:
-            logger.warning(f"{debug_name}: Failed to read frame, retrying...")
+            hot_log.warning(
+                "{}: Failed to read frame, retrying...", debug_name, key=(debug_name, "read")
+            )
             time.sleep(0.1)
             continue
 
@@ -94,15 +143,17 @@ def _frame_grabber(
 class DetectionManager:
     """Manages concurrent visible and thermal detection pipelines."""
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, clock: Clock | None = None):
         self.settings = settings
+        # Stamps frames at capture; use the clock the pipeline runs on
+        self.clock = clock or SYSTEM_CLOCK
         self._visible_service: DetectionService | None = None
         self._thermal_service: ThermalDetectionService | None = None
         self._secondary_service: DetectionService | None = None
         
-        self._visible_frame_queue = queue.Queue(maxsize=1)
-        self._thermal_frame_queue = queue.Queue(maxsize=1)
-        self._secondary_frame_queue = queue.Queue(maxsize=1)
+        self._visible_frame_queue = _CaptureQueue(self.clock)
+        self._thermal_frame_queue = _CaptureQueue(self.clock)
+        self._secondary_frame_queue = _CaptureQueue(self.clock)
         
         self._visible_input_thread: threading.Thread | None = None
         self._thermal_input_thread: threading.Thread | None = None
@@ -110,6 +161,9 @@ class DetectionManager:
         self._visible_webrtc_stop: threading.Event | None = None
         self._thermal_webrtc_stop: threading.Event | None = None
         self._secondary_webrtc_stop: threading.Event | None = None
+
+        # One ego-motion estimator per stream (each remembers its own last frame/pose)
+        self._motion = {mode: MotionCompensator(settings) for mode in DetectionMode}
         
         self._stop_event = threading.Event()
         self._lock = threading.Lock()
@@ -122,8 +176,20 @@ class DetectionManager:
         self, 
         config: CameraSourceConfig, 
         frame_queue: queue.Queue, 
-        debug_name: str
+        debug_name: str,
+        mode: DetectionMode,
     ) -> tuple[threading.Thread | None, threading.Event | None]:
+        if config.source == "synthetic":
+            scene = SyntheticScene.from_camera_config(config)
+            thread = threading.Thread(
+                target=synthetic_frame_source,
+                args=(frame_queue, self._stop_event, scene),
+                kwargs={"realtime": config.synthetic.realtime, "debug_name": debug_name},
+                name=f"capture-{mode}",
+                daemon=True,
+            )
+            thread.start()
+            return thread, None
         if config.source == "webrtc" or (config.source == "skyshield" and config.skyshield_camera_id is not None):
             url = config.webrtc_url
             if config.source == "skyshield":
@@ -143,26 +209,35 @@ class DetectionManager:
             thread = threading.Thread(
                 target=_frame_grabber,
                 args=(frame_queue, self._stop_event, config, debug_name),
+                name=f"capture-{mode}",
                 daemon=True,
             )
             thread.start()
             return thread, None
 
-    def start(self) -> None:
-        """Start enabled detection services and their camera inputs."""
+    def start(self, *, start_inputs: bool = True) -> None:
+        """Start enabled detection services and their camera inputs.
+
+        Args:
+            start_inputs: When False only the services are created; frames are
+                then supplied with ``submit_frame`` (offline replay).
+        """
         logger.info(f"DetectionManager starting with thermal method: {self.settings.thermal_detection.detection_method}")
         with self._lock:
             self._stop_event.clear()
+            self._motion = {mode: MotionCompensator(self.settings) for mode in DetectionMode}
             
             # Start Visible Detection
             if self.settings.visible_detection.enabled:
                 logger.info("Starting VISIBLE detection pipeline")
                 self._visible_service = DetectionService(settings=self.settings)
-                self._visible_input_thread, self._visible_webrtc_stop = self._start_source(
-                    self.settings.visible_detection.camera,
-                    self._visible_frame_queue,
-                    "Visible Camera"
-                )
+                if start_inputs:
+                    self._visible_input_thread, self._visible_webrtc_stop = self._start_source(
+                        self.settings.visible_detection.camera,
+                        self._visible_frame_queue,
+                        "Visible Camera",
+                        DetectionMode.VISIBLE,
+                    )
             else:
                 logger.info("VISIBLE detection pipeline is DISABLED")
                 
@@ -170,11 +245,13 @@ class DetectionManager:
             if self.settings.thermal_detection.enabled:
                 logger.info("Starting THERMAL detection pipeline")
                 self._thermal_service = ThermalDetectionService(settings=self.settings)
-                self._thermal_input_thread, self._thermal_webrtc_stop = self._start_source(
-                    self.settings.thermal_detection.camera,
-                    self._thermal_frame_queue,
-                    "Thermal Camera"
-                )
+                if start_inputs:
+                    self._thermal_input_thread, self._thermal_webrtc_stop = self._start_source(
+                        self.settings.thermal_detection.camera,
+                        self._thermal_frame_queue,
+                        "Thermal Camera",
+                        DetectionMode.THERMAL,
+                    )
             else:
                 logger.info("THERMAL detection pipeline is DISABLED")
 
@@ -186,11 +263,13 @@ class DetectionManager:
                     detection_config=self.settings.secondary_detection,
                     config_label="secondary",
                 )
-                self._secondary_input_thread, self._secondary_webrtc_stop = self._start_source(
-                    self.settings.secondary_detection.camera,
-                    self._secondary_frame_queue,
-                    "Secondary Camera"
-                )
+                if start_inputs:
+                    self._secondary_input_thread, self._secondary_webrtc_stop = self._start_source(
+                        self.settings.secondary_detection.camera,
+                        self._secondary_frame_queue,
+                        "Secondary Camera",
+                        DetectionMode.SECONDARY,
+                    )
             else:
                 logger.info("SECONDARY detection pipeline is DISABLED")
 
@@ -219,22 +298,60 @@ class DetectionManager:
             self._thermal_input_thread = None
             self._secondary_input_thread = None
 
-    def get_detections(self) -> list[DetectionResult]:
-        """Run inference on both pipelines and return combined results."""
+    def submit_frame(
+        self, mode: DetectionMode, frame: Any, capture_ts: float | None = None
+    ) -> None:
+        """Queue a frame for ``mode``, replacing any frame not yet consumed.
+
+        ``capture_ts`` defaults to now on the manager's clock.
+        """
+        frame_queue = {
+            DetectionMode.VISIBLE: self._visible_frame_queue,
+            DetectionMode.THERMAL: self._thermal_frame_queue,
+            DetectionMode.SECONDARY: self._secondary_frame_queue,
+        }[mode]
+        with contextlib.suppress(queue.Empty):
+            frame_queue.get_nowait()
+        if capture_ts is not None:
+            frame = _Captured(frame, capture_ts)
+        with contextlib.suppress(queue.Full):
+            frame_queue.put_nowait(frame)
+
+    def get_detections(
+        self, now: float | None = None, ptz: Any | None = None
+    ) -> list[DetectionResult]:
+        """Run inference on both pipelines and return combined results.
+
+        Args:
+            now: Timestamp for the results (defaults to ``time.time()``).
+            ptz: PTZ service whose pose drives camera-motion compensation
+                (``tracking.motion_compensation: ptz``). It steers the camera
+                of the tracking-priority stream only; the other streams get
+                no PTZ-based compensation.
+        """
         results = []
-        now = time.time()
+        if now is None:
+            now = time.time()
+        # The PTZ head moves the tracking-priority camera only
+        head_ptz = {self.get_tracking_priority(): ptz}
         
         # Visible Inference
         if self._visible_service:
             try:
-                frame = self._visible_frame_queue.get_nowait()
-                boxes = self._visible_service.detect(frame)
+                frame, capture_ts, truth = _unpack(self._visible_frame_queue.get_nowait())
+                motion = self._motion[DetectionMode.VISIBLE].estimate(
+                    frame, head_ptz.get(DetectionMode.VISIBLE), now
+                )
+                with span("inference.visible"):
+                    boxes = self._visible_service.detect(frame, motion=motion)
                 results.append(DetectionResult(
                     mode=DetectionMode.VISIBLE,
                     boxes=boxes,
                     frame=frame,
                     frame_shape=frame.shape[:2],
-                    timestamp=now
+                    timestamp=now,
+                    capture_ts=capture_ts,
+                    ground_truth=truth,
                 ))
             except queue.Empty:
                 pass
@@ -242,14 +359,20 @@ class DetectionManager:
         # Thermal Inference
         if self._thermal_service:
             try:
-                frame = self._thermal_frame_queue.get_nowait()
-                targets = self._thermal_service.detect(frame)
+                frame, capture_ts, truth = _unpack(self._thermal_frame_queue.get_nowait())
+                motion = self._motion[DetectionMode.THERMAL].estimate(
+                    frame, head_ptz.get(DetectionMode.THERMAL), now
+                )
+                with span("inference.thermal"):
+                    targets = self._thermal_service.detect(frame, motion=motion)
                 results.append(DetectionResult(
                     mode=DetectionMode.THERMAL,
                     boxes=targets,
                     frame=frame,
                     frame_shape=frame.shape[:2],
-                    timestamp=now
+                    timestamp=now,
+                    capture_ts=capture_ts,
+                    ground_truth=truth,
                 ))
             except queue.Empty:
                 pass
@@ -257,14 +380,20 @@ class DetectionManager:
         # Secondary YOLO Inference
         if self._secondary_service:
             try:
-                frame = self._secondary_frame_queue.get_nowait()
-                boxes = self._secondary_service.detect(frame)
+                frame, capture_ts, truth = _unpack(self._secondary_frame_queue.get_nowait())
+                motion = self._motion[DetectionMode.SECONDARY].estimate(
+                    frame, head_ptz.get(DetectionMode.SECONDARY), now
+                )
+                with span("inference.secondary"):
+                    boxes = self._secondary_service.detect(frame, motion=motion)
                 results.append(DetectionResult(
                     mode=DetectionMode.SECONDARY,
                     boxes=boxes,
                     frame=frame,
                     frame_shape=frame.shape[:2],
-                    timestamp=now
+                    timestamp=now,
+                    capture_ts=capture_ts,
+                    ground_truth=truth,
                 ))
             except queue.Empty:
                 pass
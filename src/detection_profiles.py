@@ -30,6 +30,9 @@ def derive_camera_id(config: CameraSourceConfig) -> str:
     if config.source == "rtsp" and config.rtsp_url:
         return f"rtsp:{config.rtsp_url}"
 
+    if config.source == "synthetic":
+        return f"synthetic_{config.synthetic.seed}"
+
     return f"local_{config.camera_index}"
 
 
@@ -3,7 +3,12 @@ from __future__ import annotations
 import contextlib
 import logging
 import sys
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from loguru import logger
 
@@ -39,6 +44,113 @@ class InterceptHandler(logging.Handler):
         logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
 
+@dataclass(slots=True)
+class _CallSite:
+    calls: int = 0
+    last_emit: float = float("-inf")
+    suppressed: int = 0
+
+
+class HotPathLogger:
+    """Sampled, rate-limited logging for per-frame call sites.
+
+    Messages use Loguru's ``{}`` placeholders and are only formatted when a
+    line is emitted; calls below the configured level return before touching
+    any state. Each call site (caller file and line, or ``key``) is limited
+    independently: ``every`` keeps one call in N and ``max_per_s`` caps the
+    emission rate (default ``logging.hot_path_max_per_s``, 0 for no cap).
+    Emitted lines report how many calls the rate cap dropped since the previous
+    one, and keyword arguments are bound as structured fields (``record["extra"]``).
+    """
+
+    def __init__(
+        self,
+        *,
+        level: str = "DEBUG",
+        max_per_s: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._sites: dict[Hashable, _CallSite] = {}
+        self._levels: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.min_level_no = 0
+        self.max_per_s = 0.0
+        self.configure(level=level, max_per_s=max_per_s)
+
+    def configure(self, *, level: str | None = None, max_per_s: float | None = None) -> None:
+        if level is not None:
+            self.min_level_no = self._level_no(level)
+        if max_per_s is not None:
+            self.max_per_s = max(0.0, float(max_per_s))
+
+    def enabled(self, level: str) -> bool:
+        return self._level_no(level) >= self.min_level_no
+
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._log("DEBUG", message, args, kwargs)
+
+    def info(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._log("INFO", message, args, kwargs)
+
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._log("WARNING", message, args, kwargs)
+
+    def error(self, message: str, *args: Any, **kwargs: Any) -> bool:
+        return self._log("ERROR", message, args, kwargs)
+
+    def log(self, level: str, message: str, *args: Any, **kwargs: Any) -> bool:
+        """Log ``message`` at ``level`` subject to sampling; True if emitted.
+
+        Keyword arguments ``every``, ``max_per_s`` and ``key`` control
+        sampling; any others become structured fields.
+        """
+        return self._log(level, message, args, kwargs)
+
+    def _log(
+        self, level: str, message: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> bool:
+        if self._level_no(level) < self.min_level_no:
+            return False
+        every = kwargs.pop("every", 1)
+        max_per_s = kwargs.pop("max_per_s", None)
+        key = kwargs.pop("key", None)
+        if key is None:
+            # Frame 0 is this method, 1 the public wrapper, 2 the call site
+            caller = sys._getframe(2)  # noqa: SLF001
+            key = (caller.f_code, caller.f_lineno)
+        rate = self.max_per_s if max_per_s is None else max_per_s
+
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = _CallSite()
+            site.calls += 1
+            if every > 1 and (site.calls - 1) % every:
+                return False
+            now = self._clock()
+            if rate > 0 and now - site.last_emit < 1.0 / rate:
+                site.suppressed += 1
+                return False
+            site.last_emit = now
+            suppressed, site.suppressed = site.suppressed, 0
+
+        if suppressed:
+            message = f"{message} (+{suppressed} suppressed)"
+        logger.opt(depth=2).bind(**kwargs).log(level, message, *args)
+        return True
+
+    def _level_no(self, level: str) -> int:
+        level_no = self._levels.get(level)
+        if level_no is None:
+            level_no = self._levels[level] = logger.level(level).no
+        return level_no
+
+
+# Shared by the frame loops; setup_logging applies the configured level and cap
+hot_log = HotPathLogger()
+
+
 def _normalize_level(level: str | None) -> str:
     if not level:
         return "INFO"
@@ -88,8 +200,11 @@ def setup_logging(
             enqueue=log_cfg.log_enqueue,
             backtrace=log_cfg.log_backtrace,
             diagnose=log_cfg.log_diagnose,
+            serialize=log_cfg.log_json,
         )
 
+    hot_log.configure(level=level, max_per_s=log_cfg.hot_path_max_per_s)
+
     logging.root.handlers = [InterceptHandler()]
     logging.root.setLevel(logging.getLevelName(level))
     for name in list(logging.root.manager.loggerDict.keys()):
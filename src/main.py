@@ -10,14 +10,23 @@ import cv2
 import numpy as np
 from loguru import logger
 
+from src.clock import SYSTEM_CLOCK, Clock
 from src.detection_manager import DetectionManager, DetectionMode, DetectionResult
 from src.frame_buffer import FrameBuffer
 from src.latency_monitor import LatencyMonitor
 from src.metadata_manager import MetadataManager
+from src.overlay import draw_overlay, draw_viewport_on_original
+from src.profiling import SPANS, span
 from src.ptz_controller import PTZService
-from src.logging_config import setup_logging
-from src.ptz_servo import PIDGains, PTZServo
+from src.logging_config import hot_log, setup_logging
+from src.ptz_servo import PIDGains, PredictivePTZServo, PTZServo
 from src.settings import load_settings
+from src.sim_view import SimulatedViewport
+from src.tracking.acquisition import SnapAcquisition
+from src.renderer import OverlayRenderer, OverlaySnapshot
+from src.tracking.control import extract_pixel_coords, field_of_view, zoom_compensation
+from src.tracking.control_loop import PTZControlLoop
+from src.tracking.motion_compensation import PoseTracker
 from src.tracking.state import (
     TrackerStatus,
     TrackingPhase,
@@ -51,6 +60,9 @@ def simulate_ptz_view(
     """
     Crop and resize frame to simulate PTZ viewport based on pan/tilt/zoom.
 
+    One-off version of ``SimulatedViewport.render``; the main loop keeps a
+    ``SimulatedViewport`` so geometry and output buffer are reused.
+
     Args:
         frame: Original input frame.
         ptz: PTZ service object with pan_pos, tilt_pos, zoom_level attributes.
@@ -60,73 +72,7 @@ def simulate_ptz_view(
         Tuple of (simulated_frame, viewport_rect) where viewport_rect is (x1, y1, x2, y2)
         in original frame coordinates.
     """
-    frame_h, frame_w = frame.shape[:2]
-
-    # Map zoom_level to viewport scale
-    if hasattr(ptz, "zmin") and hasattr(ptz, "zmax"):
-        z_normalized = (ptz.zoom_level - ptz.zmin) / (ptz.zmax - ptz.zmin + 1e-6)
-    else:
-        z_normalized = 0.0
-    z_normalized = max(0.0, min(1.0, z_normalized))
-
-    # Get zoom_min_scale from Settings
-    zoom_min_scale = settings.simulator.sim_zoom_min_scale
-
-    scale = 1.0 - z_normalized * (1.0 - zoom_min_scale)
-
-    crop_w = max(1, round(frame_w * scale))
-    crop_h = max(1, round(frame_h * scale))
-
-    # Map pan/tilt to viewport center
-    pan_pos = getattr(ptz, "pan_pos", 0.0)
-    tilt_pos = getattr(ptz, "tilt_pos", 0.0)
-    cx = frame_w / 2 + pan_pos * (frame_w / 2 - crop_w / 2)
-    cy = frame_h / 2 - tilt_pos * (frame_h / 2 - crop_h / 2)
-
-    # Convert to top-left corner and clamp
-    x1 = max(0, min(frame_w - crop_w, round(cx - crop_w / 2)))
-    y1 = max(0, min(frame_h - crop_h, round(cy - crop_h / 2)))
-    x2 = min(frame_w, x1 + crop_w)
-    y2 = min(frame_h, y1 + crop_h)
-
-    # Crop
-    roi = frame[y1:y2, x1:x2] if x1 < x2 and y1 < y2 else frame
-
-    # Get resolution from Settings (use visible detection camera)
-    resolution_width = settings.visible_detection.camera.resolution_width
-    resolution_height = settings.visible_detection.camera.resolution_height
-
-    # Resize to configured resolution
-    sim_frame = cv2.resize(roi, (resolution_width, resolution_height))
-
-    return sim_frame, (x1, y1, x2, y2)
-
-
-def draw_viewport_on_original(
-    frame: np.ndarray, rect: tuple[int, int, int, int]
-) -> None:
-    """
-    Draw viewport rectangle on the original frame for reference.
-
-    Args:
-        frame: Frame to draw on.
-        rect: Viewport rectangle (x1, y1, x2, y2) in frame coordinates.
-    """
-    x1, y1, x2, y2 = rect
-    # Use contrasting color (cyan)
-    color = (255, 255, 0)
-    thickness = 2
-    cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
-    cv2.putText(
-        frame,
-        "Viewport",
-        (x1 + 5, max(y1 - 5, 15)),
-        cv2.FONT_HERSHEY_SIMPLEX,
-        0.6,
-        color,
-        1,
-        cv2.LINE_AA,
-    )
+    return SimulatedViewport(settings, reuse_output=False).render(frame, ptz)
 
 
 # Removed legacy frame_grabber as DetectionManager handles it
@@ -149,389 +95,100 @@ def _derive_camera_id(settings: Any) -> str:
     return "default"
 
 
-def draw_detection_boxes(
-    frame: np.ndarray,
+def render_overlay(
+    snapshot: OverlaySnapshot,
     class_names: dict[int, str],
-    tracked_boxes: Any,
-    highlight_id: int | None = None,
-) -> list[int]:
-    """
-    Draw bounding boxes for all detections on the frame.
-
-    Args:
-        frame: Frame to draw on.
-        class_names: List of class names from the model.
-        tracked_boxes: Detected boxes from YOLO.
-        highlight_id: ID to highlight with green color and thicker border, or None.
-
-    Returns:
-        List of tracking IDs.
-    """
-    frame_h, frame_w = frame.shape[:2]
-    tracking_ids = []
-
-    for det in tracked_boxes:
-        cls_id = int(det.cls)
-        conf = float(det.conf)
-        label = class_names.get(cls_id, str(cls_id))
-        x1, y1, x2, y2 = det.xyxy[0]
-        if all(0 <= v <= 1.0 for v in [x1, y1, x2, y2]):
-            x1, y1, x2, y2 = (
-                int(x1 * frame_w),
-                int(y1 * frame_h),
-                int(x2 * frame_w),
-                int(y2 * frame_h),
-            )
-        else:
-            x1, y1, x2, y2 = map(int, [x1, y1, x2, y2])
-
-        track_id = getattr(det, "id", None)
-        if track_id is not None and hasattr(track_id, "item"):
-            track_id = track_id.item()
-        track_id_int = int(track_id) if track_id is not None else None
-
-        # Determine color and thickness based on highlight
-        if highlight_id is not None and track_id_int == highlight_id:
-            color = (0, 255, 0)  # Green for highlighted target
-            thickness = 3
-        else:
-            color = (0, 255, 255) if label == "drone" else (255, 0, 0)
-            thickness = 2
-
-        cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
-
-        label_text = f"{label} {conf:.2f}"
-        if track_id_int is not None:
-            label_text += f" ID:{track_id_int}"
-            tracking_ids.append(track_id_int)
-
-        cv2.putText(
-            frame,
-            label_text,
-            (x1, max(y1 - 10, 0)),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
-            color,
-            2,
-            cv2.LINE_AA,
-        )
-
-    return tracking_ids
-
-
-def draw_detection_info(
-    frame: np.ndarray,
-    detection_count: int,
-    tracking_ids: list[int],
-    fps: float,
-    proc_time: float,
-    settings: Any = None,
-) -> None:
-    """Draw detection statistics on the top-left of the frame."""
-    # Get confidence threshold from Settings
-    confidence_threshold = settings.visible_detection.confidence_threshold
-
-    detection_lines = [
-        f"Detections: {detection_count}",
-        f"Tracking IDs: {tracking_ids}",
-        f"FPS: {fps:.2f}",
-        f"Proc Time: {proc_time * 1000:.1f} ms",
-        f"Confidence: {confidence_threshold}",
-    ]
-    y0, dy = 30, 25
-    for i, line in enumerate(detection_lines):
-        cv2.putText(
-            frame,
-            line,
-            (10, y0 + i * dy),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
-            (0, 255, 0),
-            2,
-            cv2.LINE_AA,
-        )
-
-
-def draw_ptz_status(
-    frame: np.ndarray,
     ptz: Any,
-    last_ptz_command: str,
-    coverage: float,
-    tracker_status: Any = None,
-    settings: Any = None,
-) -> None:
-    """
-    Draw PTZ status information on the top-right of the frame.
-
-    Args:
-        frame: Frame to draw on.
-        ptz: PTZ service instance.
-        last_ptz_command: Last PTZ command issued.
-        coverage: Current target coverage.
-        tracker_status: Optional TrackerStatus instance for target info.
-        settings: Settings object.
-    """
-    _frame_h, frame_w = frame.shape[:2]
-
-    zoom_target_coverage = settings.ptz.zoom_target_coverage
-
-    status_text = "idle"
-    if hasattr(ptz, "control_mode") and ptz.control_mode == "onvif" and not getattr(ptz, "connected", False):
-        status_text = "DISCONNECTED"
-    elif getattr(ptz, "active", False):
-        status_text = "active"
-    elif hasattr(ptz, "control_mode") and ptz.control_mode == "none":
-        status_text = "disabled"
-
-    ptz_lines = [
-        f"PTZ Status: {status_text}",
-        f"Last PTZ Cmd: {last_ptz_command}",
-        f"Current Coverage: {coverage * 100:.1f}%",
-        f"Target Coverage: {zoom_target_coverage * 100:.1f}%",
-    ]
-
-    # Add tracker status if provided
-    if tracker_status is not None:
-        if tracker_status.target_id is not None:
-            ptz_lines.append(
-                f"Target: ID={tracker_status.target_id} ({tracker_status.phase.value})"
-            )
-        else:
-            ptz_lines.append("Target: cleared (idle)")
-
-    y0, dy = 30, 25
-    y0, dy = 30, 25
-    for i, line in enumerate(ptz_lines):
-        textsize = cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
-        x = frame_w - textsize[0] - 10
-        y = y0 + i * dy
-        
-        # Use Red color for DISCONNECTED status or important warnings
-        if "DISCONNECTED" in line or "disabled" in line:
-            color = (0, 0, 255) # Red
-        else:
-            color = (255, 128, 0) # Default Blue-ish
-
-        cv2.putText(
-            frame,
-            line,
-            (x, y),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
-            color,
-            2,
-            cv2.LINE_AA,
-        )
-
-
-def draw_system_info(
-    frame: np.ndarray,
-    frame_index: int,
     detection: Any,
-    ptz: Any,
-    settings: Any = None,
-) -> None:
-    """Draw system information on the bottom-left of the frame."""
-    frame_h, _frame_w = frame.shape[:2]
-
-    # Get config values from Settings
-    model_path = settings.visible_detection.model_path
-    camera_index = settings.visible_detection.camera.camera_index
-    resolution_width = settings.visible_detection.camera.resolution_width
-    resolution_height = settings.visible_detection.camera.resolution_height
-
-    is_thermal = settings.thermal_detection.enabled
-    detection_mode = "Thermal" if is_thermal else "Visible (YOLO)"
-    model_label = (
-        f"Algorithm: {settings.thermal_detection.detection_method}"
-        if is_thermal
-        else f"Model: {model_path}"
-    )
-    device_label = (
-        "n/a"
-        if is_thermal
-        else (
-            "cuda"
-            if hasattr(detection.model, "device")
-            and str(detection.model.device) == "cuda:0"
-            else "cpu"
-        )
-    )
-
-    sys_lines = [
-        f"Frame: {frame_index}",
-        f"Mode: {detection_mode}",
-        model_label,
-        f"Camera: {camera_index}",
-        f"Resolution: {resolution_width}x{resolution_height}",
-        f"Device: {device_label}",
-        f"Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())}",
-        f"ONVIF: {'connected' if hasattr(ptz, 'connected') and ptz.connected else 'unknown'}",
-    ]
-    dy = 25
-    y_bl = frame_h - dy * len(sys_lines) - 10
-    for i, line in enumerate(sys_lines):
-        cv2.putText(
-            frame,
-            line,
-            (10, y_bl + i * dy),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
-            (0, 128, 255),
-            2,
-            cv2.LINE_AA,
-        )
-
-
-def draw_sot_bbox(
-    frame: np.ndarray,
-    sot_bbox: tuple[int, int, int, int],
-) -> None:
+    settings: Any,
+) -> dict[str, np.ndarray]:
     """
-    Draw SOT bounding box on the frame with distinct magenta color.
+    Draw a published frame snapshot.
 
     Args:
-        frame: Frame to draw on.
-        sot_bbox: SOT bounding box (x1, y1, x2, y2).
-    """
-    x1, y1, x2, y2 = sot_bbox
-    color = (255, 0, 255)  # Magenta for SOT
-    thickness = 3
-
-    cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
-    cv2.putText(
-        frame,
-        "SOT",
-        (x1, max(y1 - 10, 15)),
-        cv2.FONT_HERSHEY_SIMPLEX,
-        0.7,
-        color,
-        2,
-        cv2.LINE_AA,
-    )
-
-
-def draw_input_mode_overlay(frame: np.ndarray, input_buf: str) -> None:
-    """
-    Draw input mode overlay prompting for ID entry.
+        snapshot: Frame and loop state captured by ``main()``.
+        class_names: Model class names.
+        ptz: PTZ controller (status is read live).
+        detection: Detection service of the priority stream.
+        settings: Settings object.
 
-    Args:
-        frame: Frame to draw on.
-        input_buf: Current input buffer (digits typed).
+    Returns:
+        Images to show, keyed by window name.
     """
-    frame_h, frame_w = frame.shape[:2]
-
-    # Display at top-center, below detection/PTZ info
-    y = 170
-    font_scale = 1.2
-    color = (0, 255, 255)  # Yellow
-    bg_color = (0, 0, 0)  # Black for semi-transparent background
-
-    text = f"Enter ID: {input_buf}_"  # Underscore shows cursor
-
-    # Get text size for background
-    textsize, baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 2)
-    text_w, text_h = textsize
-
-    # Draw semi-transparent background
-    padding = 10
-    x_center = frame_w // 2
-    x1 = max(0, x_center - text_w // 2 - padding)
-    y1 = max(0, y - text_h - padding)
-    x2 = min(frame_w, x_center + text_w // 2 + padding)
-    y2 = min(frame_h, y + baseline + padding)
-
-    # Draw filled rectangle with transparency
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (x1, y1), (x2, y2), bg_color, -1)
-    cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
-
-    # Draw text centered
-    text_x = x_center - text_w // 2
-    cv2.putText(
+    frame = snapshot.frame
+    draw_overlay(
         frame,
-        text,
-        (text_x, y),
-        cv2.FONT_HERSHEY_SIMPLEX,
-        font_scale,
-        color,
-        3,
-        cv2.LINE_AA,
+        class_names,
+        snapshot.tracked_boxes,
+        snapshot.fps,
+        snapshot.proc_time,
+        ptz,
+        snapshot.last_ptz_command,
+        snapshot.coverage,
+        snapshot.frame_index,
+        detection,
+        snapshot,
+        snapshot.input_mode,
+        snapshot.input_buf,
+        settings,
     )
+    windows = {"Detection": frame}
+
+    # Display original frame with viewport rectangle if simulation is enabled
+    if snapshot.orig_frame is None or snapshot.viewport_rect is None:
+        return windows
+    draw_box = settings.simulator.sim_draw_original_viewport_box
+    # Only copy the source frame when something is drawn on it
+    if draw_box or snapshot.target_bbox is not None:
+        orig_display = snapshot.orig_frame.copy()
+    else:
+        orig_display = snapshot.orig_frame
+    if draw_box:
+        draw_viewport_on_original(orig_display, snapshot.viewport_rect)
+    if snapshot.target_bbox is not None:
+        # Map the target bbox from the simulated frame back to the original
+        # for visual verification (magenta)
+        frame_h, frame_w = frame.shape[:2]
+        bx1, by1, bx2, by2 = snapshot.target_bbox
+        vx1, vy1, vx2, vy2 = snapshot.viewport_rect
+        scale_x = max(1, vx2 - vx1) / frame_w
+        scale_y = max(1, vy2 - vy1) / frame_h
+        cv2.rectangle(
+            orig_display,
+            (int(vx1 + bx1 * scale_x), int(vy1 + by1 * scale_y)),
+            (int(vx1 + bx2 * scale_x), int(vy1 + by2 * scale_y)),
+            (255, 0, 255),
+            2,
+        )
+    windows["Original"] = orig_display
+    return windows
 
 
-def draw_overlay(
-    frame: np.ndarray,
-    class_names: dict[int, str],
-    tracked_boxes: Any,
-    fps: float,
-    proc_time: float,
-    ptz: Any,
-    last_ptz_command: str,
-    coverage: float,
-    frame_index: int,
-    detection: Any,
-    tracker_status: Any = None,
-    input_mode: bool = False,
-    input_buf: str = "",
-    settings: Any = None,
-) -> None:
-    """
-    Draw bounding boxes and informational overlay on the frame.
+def main(clock: Clock | None = None) -> None:
+    """Main entry point for the PTZ tracking system.
 
     Args:
-        frame: Frame to draw on.
-        class_names: Model class names.
-        tracked_boxes: Detected boxes.
-        fps: Frames per second.
-        proc_time: Processing time for frame.
-        ptz: PTZ controller.
-        last_ptz_command: Last PTZ command.
-        coverage: Current target coverage.
-        frame_index: Current frame index.
-        detection: Detection service.
-        tracker_status: Optional TrackerStatus for target tracking info.
-        input_mode: Whether in ID input mode.
-        input_buf: Current input buffer.
-        settings: Settings object.
+        clock: Time source for tracking, servo and simulator timing. Defaults to
+            the system clock; pass a ``VirtualClock`` to run off wall time.
     """
-    # Determine highlight_id based on tracking phase
-    highlight_id = None
-    if tracker_status is not None and tracker_status.phase == TrackingPhase.TRACKING:
-        highlight_id = tracker_status.target_id
-
-    tracking_ids = draw_detection_boxes(
-        frame, class_names, tracked_boxes, highlight_id=highlight_id
-    )
-    detection_count = len(tracked_boxes)
-
-    draw_detection_info(frame, detection_count, tracking_ids, fps, proc_time, settings)
-    draw_ptz_status(frame, ptz, last_ptz_command, coverage, tracker_status, settings)
-    draw_system_info(frame, frame_index, detection, ptz, settings)
-
-    # Draw input mode overlay if active
-    if input_mode:
-        draw_input_mode_overlay(frame, input_buf)
-
-
-def main() -> None:
-    """Main entry point for the PTZ tracking system."""
+    clock = clock or SYSTEM_CLOCK
     # Load Settings from config.yaml
     settings = load_settings()
     setup_logging(settings)
+    SPANS.enabled = settings.performance.timing_spans
 
     # Select PTZ service implementation
     if settings.simulator.use_ptz_simulation:
         from src.ptz_simulator import SimulatedPTZService  # noqa: PLC0415
 
-        ptz = SimulatedPTZService(settings=settings)
+        ptz = SimulatedPTZService(settings=settings, clock=clock)
         logger.info("Using SimulatedPTZService (PTZ_SIMULATION enabled)")
     else:
         ptz = PTZService(settings=settings)
         logger.info("Using real PTZService (connecting to ONVIF camera)")
 
     # Initialize detection manager for concurrent monitoring
-    detection_manager = DetectionManager(settings=settings)
+    detection_manager = DetectionManager(settings=settings, clock=clock)
     detection_manager.start()
     
     # Legacy class_names for drawing compatibility
@@ -542,7 +199,7 @@ def main() -> None:
         class_names = {0: "target"}
 
     # Initialize tracker status for ID-based targeting
-    tracker_status = TrackerStatus(loss_grace_s=2.0)
+    tracker_status = TrackerStatus(loss_grace_s=2.0, clock=clock)
 
     # Re-initialize analytics engine using legacy priority logic
     # (In a full refactor, we'd update this for multi-stream support)
@@ -553,7 +210,7 @@ def main() -> None:
     priority_service = detection_manager.get_service(priority_mode)
     
     camera_id = _derive_camera_id(settings)
-    session_id = f"session-{camera_id}-{int(time.time())}"
+    session_id = f"session-{camera_id}-{int(clock.time())}"
     metadata_builder = MetadataBuilder(session_id=session_id, camera_id=camera_id)
     analytics_engine = AnalyticsEngine(
         detection=priority_service,
@@ -589,7 +246,27 @@ def main() -> None:
         integral_limit=settings.ptz.pid_integral_limit,
         dead_band=settings.ptz.pid_dead_band,
     )
-    ptz_servo = PTZServo(pid_gains)
+    if settings.ptz.control_strategy == "predictive":
+        ptz_servo: PTZServo = PredictivePTZServo(
+            pid_gains,
+            clock=clock,
+            window_s=settings.ptz.prediction_window_s,
+            max_lead_s=settings.ptz.prediction_max_lead_s,
+            actuation_latency_s=settings.ptz.actuation_latency_s,
+        )
+        logger.info("Using predictive (latency-compensated) PTZ servo")
+    else:
+        ptz_servo = PTZServo(pid_gains, clock=clock)
+    acquisition = SnapAcquisition(settings, clock=clock)
+    # Camera pose between position polls, for pairing offsets with capture time
+    pose_tracker = PoseTracker(settings)
+    control_loop: PTZControlLoop | None = None
+    if settings.ptz.control_loop == "threaded":
+        control_loop = PTZControlLoop(settings, ptz, ptz_servo, clock=clock)
+        control_loop.start()
+        logger.info(
+            f"PTZ control thread running at {settings.ptz.control_rate_hz:.0f} Hz"
+        )
     frame_buffer = FrameBuffer(max_size=2)  # Minimal buffer for non-blocking behavior
     latency_monitor = LatencyMonitor(window_size=256)
 
@@ -611,12 +288,23 @@ def main() -> None:
     )
     watchdog.start()
 
+    renderer = OverlayRenderer(
+        lambda snapshot: render_overlay(
+            snapshot, class_names, ptz, priority_service, settings
+        ),
+        mode=settings.performance.display,
+        max_fps=settings.performance.display_max_fps,
+    )
+    renderer.start()
+    if renderer.headless:
+        logger.info("Headless mode: overlay rendering and display disabled")
+
     # Input threads are managed by DetectionManager
     grabber_thread = None
     webrtc_thread = None
 
     frame_index = 0
-    last_time = time.time()
+    last_time = clock.time()
 
     # Allow longer to receive the first frame for RTSP/WebRTC
     vis_cam = settings.visible_detection.camera
@@ -641,24 +329,23 @@ def main() -> None:
         no_detection_home_timeout = settings.ptz.no_detection_home_timeout
         use_ptz_simulation = settings.simulator.use_ptz_simulation
         sim_viewport = settings.simulator.sim_viewport
-        sim_draw_original_viewport_box = (
-            settings.simulator.sim_draw_original_viewport_box
+        show_original = settings.simulator.sim_show_original
+        # The threaded renderer draws on a published frame while the next one
+        # is being produced, so it needs a fresh view per frame
+        viewport = SimulatedViewport(
+            settings, reuse_output=renderer.mode != "threaded"
         )
-        resolution_width = vis_cam.resolution_width
-        resolution_height = vis_cam.resolution_height
         
         # New PTZ control parameters
         invert_pan = settings.ptz.invert_pan
         invert_tilt = settings.ptz.invert_tilt
-        enable_zoom_compensation = settings.ptz.enable_zoom_compensation
-        zoom_max_mag = settings.ptz.zoom_max_magnification
 
         while True:
             loop_start = time.perf_counter()
-            now = time.time()
+            now = clock.time()
 
             # Get combined detections from manager
-            results = detection_manager.get_detections()
+            results = detection_manager.get_detections(now=now, ptz=ptz)
             if not results:
                 time.sleep(0.01)
                 continue
@@ -674,7 +361,7 @@ def main() -> None:
 
             # Apply PTZ simulation if enabled
             if use_ptz_simulation and sim_viewport:
-                frame, viewport_rect = simulate_ptz_view(orig_frame, ptz, settings)
+                frame, viewport_rect = viewport.render(orig_frame, ptz)
                 # Detection runs on simulated viewport
             else:
                 frame = orig_frame
@@ -698,14 +385,19 @@ def main() -> None:
             # Uses ONVIF GetStatus or Octagon API depending on position_mode
             if frame_index % 10 == 0 and hasattr(ptz, "update_position"):
                 ptz.update_position()
+            pose_tracker.update(ptz, clock.time())
 
             # Debug logging: frame-level PTZ state and detection count
             pan_pos = getattr(ptz, "pan_pos", getattr(ptz, "last_pan", 0.0))
             tilt_pos = getattr(ptz, "tilt_pos", getattr(ptz, "last_tilt", 0.0))
             zoom_val = getattr(ptz, "zoom_level", getattr(ptz, "last_zoom", 0.0))
-            logger.debug(
-                f"Frame {frame_index}: detections={len(tracked_boxes)}, "
-                f"zoom={zoom_val:.3f}, pan={pan_pos:.3f}, tilt={tilt_pos:.3f}"
+            hot_log.debug(
+                "Frame {}: detections={}, zoom={:.3f}, pan={:.3f}, tilt={:.3f}",
+                frame_index,
+                len(tracked_boxes),
+                zoom_val,
+                pan_pos,
+                tilt_pos,
             )
 
             # ===== Target Selection: ID-locked or label-based =====
@@ -715,48 +407,54 @@ def main() -> None:
 
             if tracker_status.target_id is not None:
                 # ID-lock mode: find the target by ID only
-                best_det = analytics_engine.update_tracking(tracked_boxes, now=now)
+                with span("association"):
+                    best_det = analytics_engine.update_tracking(tracked_boxes, now=now)
                 target_found = best_det is not None
 
-                if target_found:
-                    logger.debug(
-                        f"Target ID {tracker_status.target_id} found in frame "
-                        f"{frame_index} (phase: {tracker_status.phase.value})"
-                    )
-                else:
-                    logger.debug(
-                        f"Target ID {tracker_status.target_id} not found in frame "
-                        f"{frame_index} (phase: {tracker_status.phase.value})"
-                    )
+                hot_log.debug(
+                    "Target ID {} {} in frame {} (phase: {})",
+                    tracker_status.target_id,
+                    "found" if target_found else "not found",
+                    frame_index,
+                    tracker_status.phase.value,
+                )
             else:
                 # IDLE mode: no label-based auto selection
                 tracker_status.phase = TrackingPhase.IDLE
-                logger.debug(
-                    f"Frame {frame_index}: IDLE mode (no target locked), "
-                    f"{len(tracked_boxes)} detections available"
+                hot_log.debug(
+                    "Frame {}: IDLE mode (no target locked), {} detections available",
+                    frame_index,
+                    len(tracked_boxes),
                 )
 
             # Reset PID servo on phase or target transitions to prevent state leakage and "wind-up"
             if tracker_status.phase != old_phase or tracker_status.target_id != old_target_id:
                 logger.info(
-                    f"Transition: phase({old_phase.value}->{tracker_status.phase.value}), "
-                    f"target({old_target_id}->{tracker_status.target_id}). "
-                    "Resetting PID servo state."
+                    "Transition: phase({}->{}), target({}->{}). Resetting PID servo state.",
+                    old_phase.value,
+                    tracker_status.phase.value,
+                    old_target_id,
+                    tracker_status.target_id,
                 )
-                ptz_servo.reset()
+                if control_loop is not None:
+                    control_loop.reset()
+                else:
+                    ptz_servo.reset()
+            acquisition.observe(tracker_status.phase, tracker_status.target_id)
 
             # Emit a structured metadata snapshot for this frame (Phase 1).
             # This is not sent anywhere yet; it enables a Phase 2 API/WebSocket layer.
-            tick_data = analytics_engine.build_tick(
-                tracked_boxes,
-                frame_index=frame_index,
-                frame_w=frame_w,
-                frame_h=frame_h,
-                class_names=class_names,
-                ptz=ptz,
-                ts_unix_ms=int(time.time() * 1000),
-                ts_mono_ms=int(time.monotonic() * 1000),
-            )
+            with span("metadata"):
+                tick_data = analytics_engine.build_tick(
+                    tracked_boxes,
+                    frame_index=frame_index,
+                    frame_w=frame_w,
+                    frame_h=frame_h,
+                    class_names=class_names,
+                    ptz=ptz,
+                    ts_unix_ms=int(clock.time() * 1000),
+                    ts_mono_ms=int(clock.monotonic() * 1000),
+                )
             # Use thread-safe metadata manager instead of global variable
             metadata_manager.update(tick_data)
 
@@ -781,8 +479,9 @@ def main() -> None:
                 idle_home_triggered = False
                 detection_loss_home_triggered = False
 
-                if frame_index % 30 == 0:
-                    logger.info(f"TRACKING phase: target ID={tracker_status.target_id}")
+                hot_log.info(
+                    "TRACKING phase: target ID={}", tracker_status.target_id, every=30
+                )
 
                 # Get tracking bbox from YOLO detection
                 tracking_bbox: tuple[int, int, int, int] | None = None
@@ -800,7 +499,23 @@ def main() -> None:
                     tracking_bbox = (x1, y1, x2, y2)
 
                 # Drive PTZ using tracking bbox from YOLO
-                if tracking_bbox is not None:
+                if tracking_bbox is not None and acquisition.update(
+                    ptz, tracking_bbox, frame_w, frame_h
+                ):
+                    # Snap move just issued; detections in flight predate it
+                    last_ptz_command = "absolute_move()"
+                elif tracking_bbox is not None and control_loop is not None:
+                    # The control thread steers from the filtered estimate
+                    control_loop.submit(
+                        tracking_bbox,
+                        frame_w,
+                        frame_h,
+                        capture_ts=priority_result.capture_ts,
+                    )
+                    coverage = calculate_coverage(*tracking_bbox, frame_w, frame_h)
+                    zoom_active = abs(zoom_target_coverage - coverage) > zoom_dead_zone
+                    last_ptz_command = control_loop.last_command
+                elif tracking_bbox is not None:
                     x1, y1, x2, y2 = tracking_bbox
 
                     cx = int((x1 + x2) / 2)
@@ -809,22 +524,36 @@ def main() -> None:
                     dx = (cx - frame_center[0]) / frame_w
                     dy = (cy - frame_center[1]) / frame_h
 
-                    # Calculate current magnification for zoom compensation
-                    zoom_factor = 1.0
-                    if enable_zoom_compensation:
-                        z_range = ptz.zmax - ptz.zmin
-                        if z_range > 0:
-                            z_norm = (ptz.zoom_level - ptz.zmin) / z_range
-                            zoom_factor = 1.0 + z_norm * (zoom_max_mag - 1.0)
-                    
+                    z_range = ptz.zmax - ptz.zmin
+                    z_norm = (ptz.zoom_level - ptz.zmin) / z_range if z_range > 0 else 0.0
+
+                    if isinstance(ptz_servo, PredictivePTZServo):
+                        # Lead the target by the frame's age since capture plus actuation delay
+                        # and pair it with the camera pose at capture time
+                        fov_x, fov_y = field_of_view(settings, z_norm)
+                        pose = pose_tracker.at(
+                            ptz, clock.time(), priority_result.capture_ts
+                        ) or (0.0, 0.0, z_norm)
+                        dx, dy = ptz_servo.lead_offsets(
+                            dx,
+                            dy,
+                            capture_ts=priority_result.capture_ts,
+                            camera_pan=pose[0],
+                            camera_tilt=pose[1],
+                            fov_x=fov_x,
+                            fov_y=fov_y,
+                        )
+
+                    # Convert the frame offset to an angle error using the
+                    # (calibrated) field of view at the current zoom
+                    pan_scale, tilt_scale = zoom_compensation(settings, z_norm)
+
                     # Apply zoom compensation and inversion to gains
                     # Pan: dx > 0 (Right) -> positive speed (Right)
                     # Tilt: dy > 0 (Down) -> negative speed (Down)
                     # Compensation reduces speed at high zoom to maintain visual stability
-                    effective_gain = ptz_movement_gain / zoom_factor
-                    
-                    err_x = dx * effective_gain
-                    err_y = -dy * effective_gain
+                    err_x = dx * ptz_movement_gain * pan_scale
+                    err_y = -dy * ptz_movement_gain * tilt_scale
                     
                     if invert_pan:
                         err_x = -err_x
@@ -860,16 +589,22 @@ def main() -> None:
                     if x_speed != 0 or y_speed != 0 or zoom_velocity != 0:
                         ptz.continuous_move(x_speed, y_speed, zoom_velocity)
                         last_ptz_command = f"continuous_move({x_speed:.2f}, {y_speed:.2f}, {zoom_velocity:.2f})"
-                        if frame_index % 30 == 0:
-                            logger.info(
-                                f"PTZ command: pan={x_speed:.2f}, tilt={y_speed:.2f}, "
-                                f"zoom_vel={zoom_velocity:.2f}, coverage={coverage:.3f}"
-                            )
+                        hot_log.info(
+                            "PTZ command: pan={:.2f}, tilt={:.2f}, zoom_vel={:.2f}, "
+                            "coverage={:.3f}",
+                            x_speed,
+                            y_speed,
+                            zoom_velocity,
+                            coverage,
+                            every=30,
+                        )
                     else:
                         ptz.stop()
                         last_ptz_command = "stop()"
                 elif ptz.active:
                     # No tracking bbox available
+                    if control_loop is not None:
+                        control_loop.reset()
                     ptz.stop()
                     last_ptz_command = "stop()"
 
@@ -895,79 +630,43 @@ def main() -> None:
                     last_ptz_command = "set_home_position()"
                     detection_loss_home_triggered = True
                     logger.warning(
-                        f"No detection for {now - last_detection_time:.1f}s, "
-                        f"homing (phase: {tracker_status.phase.value})"
+                        "No detection for {:.1f}s, homing (phase: {})",
+                        now - last_detection_time,
+                        tracker_status.phase.value,
                     )
 
-            draw_overlay(
-                frame,
-                class_names,
-                tracked_boxes,
-                fps,
-                proc_time,
-                ptz,
-                last_ptz_command,
-                coverage,
-                frame_index,
-                detection,
-                tracker_status,
-                input_mode,
-                input_buf,
-                settings,
-            )
-
-            cv2.imshow("Detection", frame)
-
-            # Display original frame with viewport rectangle if simulation is enabled
-            if use_ptz_simulation and viewport_rect is not None:
-                orig_display = orig_frame.copy()
-                if sim_draw_original_viewport_box:
-                    draw_viewport_on_original(orig_display, viewport_rect)
-                # If we have a best detection in simulated frame, map its bbox back to original for debugging
-                try:
-                    if best_det is not None:
-                        # best_det coordinates are in the simulated frame (resolution_width x resolution_height)
-                        bx1, by1, bx2, by2 = best_det.xyxy[0]
-                        # Convert normalized coords if necessary
-                        if all(0 <= v <= 1.0 for v in [bx1, by1, bx2, by2]):
-                            bx1, by1, bx2, by2 = (
-                                int(bx1 * resolution_width),
-                                int(by1 * resolution_height),
-                                int(bx2 * resolution_width),
-                                int(by2 * resolution_height),
-                            )
-                        else:
-                            bx1, by1, bx2, by2 = map(int, [bx1, by1, bx2, by2])
-                        vx1, vy1, vx2, vy2 = viewport_rect
-                        crop_w = max(1, vx2 - vx1)
-                        crop_h = max(1, vy2 - vy1)
-                        scale_x = crop_w / resolution_width
-                        scale_y = crop_h / resolution_height
-
-                        orig_bx1 = int(vx1 + bx1 * scale_x)
-                        orig_by1 = int(vy1 + by1 * scale_y)
-                        orig_bx2 = int(vx1 + bx2 * scale_x)
-                        orig_by2 = int(vy1 + by2 * scale_y)
-
-                        # Draw mapped bbox on original for visual verification (magenta)
-                        cv2.rectangle(
-                            orig_display,
-                            (orig_bx1, orig_by1),
-                            (orig_bx2, orig_by2),
-                            (255, 0, 255),
-                            2,
-                        )
-                except Exception:
-                    # Ignore mapping errors in hot path
-                    pass
-
-                cv2.imshow("Original", orig_display)
+            if not renderer.headless:
+                renderer.publish(
+                    OverlaySnapshot(
+                        frame=frame,
+                        tracked_boxes=tracked_boxes,
+                        fps=fps,
+                        proc_time=proc_time,
+                        last_ptz_command=last_ptz_command,
+                        coverage=coverage,
+                        frame_index=frame_index,
+                        phase=tracker_status.phase,
+                        target_id=tracker_status.target_id,
+                        input_mode=input_mode,
+                        input_buf=input_buf,
+                        orig_frame=(
+                            orig_frame
+                            if viewport_rect is not None and show_original
+                            else None
+                        ),
+                        viewport_rect=viewport_rect,
+                        target_bbox=(
+                            extract_pixel_coords(best_det, frame_w, frame_h)
+                            if best_det is not None
+                            else None
+                        ),
+                    )
+                )
 
-            # Check for 'q' key press or window close
-            key = cv2.waitKey(1) & 0xFF
+            key = renderer.poll_key()
 
             # ===== Keyboard input handling =====
-            if key != 0xFF:
+            if key is not None:
                 if input_mode:
                     # In input mode: collect digits, Backspace to delete, Enter to confirm, Esc to cancel
                     if key in (
@@ -1030,7 +729,7 @@ def main() -> None:
                     break
 
             # Check if any window was closed
-            if cv2.getWindowProperty("Detection", cv2.WND_PROP_VISIBLE) < 1:
+            if renderer.closed:
                 logger.info("Detection window closed, exiting...")
                 break
 
@@ -1055,6 +754,8 @@ def main() -> None:
             frame_index += 1
     finally:
         stop_event.set()
+        if control_loop is not None:
+            control_loop.stop()
         if grabber_thread is not None:
             grabber_thread.join(timeout=2.0)
             if grabber_thread.is_alive():
@@ -1067,7 +768,7 @@ def main() -> None:
             if webrtc_thread.is_alive():
                 logger.warning("WebRTC thread did not stop gracefully within timeout")
         watchdog.stop()
-        cv2.destroyAllWindows()
+        renderer.stop()
         logger.info("Application shut down cleanly.")
 
 
@@ -0,0 +1,387 @@
+"""Overlay drawing shared by the desktop window and the API preview stream.
+
+``main()`` draws the full overlay (boxes, detection/PTZ/system status, input
+prompt) through ``draw_overlay``; ``src/api/preview.py`` reuses
+``draw_detection_boxes``. Keeping them here lets the preview path import the
+helpers without loading the ``main`` entry point and its PTZ/ONVIF stack.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import cv2
+import numpy as np
+
+from src.text_sprites import TextSpriteCache
+from src.text_sprites import blit as blit_text
+from src.tracking.state import TrackingPhase
+
+# Rasterized overlay text, shared by the renderer thread and preview encoding
+TEXT_SPRITES = TextSpriteCache()
+
+
+def draw_viewport_on_original(
+    frame: np.ndarray, rect: tuple[int, int, int, int]
+) -> None:
+    """
+    Draw viewport rectangle on the original frame for reference.
+
+    Args:
+        frame: Frame to draw on.
+        rect: Viewport rectangle (x1, y1, x2, y2) in frame coordinates.
+    """
+    x1, y1, x2, y2 = rect
+    # Use contrasting color (cyan)
+    color = (255, 255, 0)
+    thickness = 2
+    cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
+    TEXT_SPRITES.put_text(
+        frame,
+        "Viewport",
+        (x1 + 5, max(y1 - 5, 15)),
+        0.6,
+        color,
+        1,
+    )
+
+
+def draw_detection_boxes(
+    frame: np.ndarray,
+    class_names: dict[int, str],
+    tracked_boxes: Any,
+    highlight_id: int | None = None,
+) -> list[int]:
+    """
+    Draw bounding boxes for all detections on the frame.
+
+    Args:
+        frame: Frame to draw on.
+        class_names: List of class names from the model.
+        tracked_boxes: Detected boxes from YOLO.
+        highlight_id: ID to highlight with green color and thicker border, or None.
+
+    Returns:
+        List of tracking IDs.
+    """
+    frame_h, frame_w = frame.shape[:2]
+    tracking_ids = []
+
+    for det in tracked_boxes:
+        cls_id = int(det.cls)
+        conf = float(det.conf)
+        label = class_names.get(cls_id, str(cls_id))
+        x1, y1, x2, y2 = det.xyxy[0]
+        if all(0 <= v <= 1.0 for v in [x1, y1, x2, y2]):
+            x1, y1, x2, y2 = (
+                int(x1 * frame_w),
+                int(y1 * frame_h),
+                int(x2 * frame_w),
+                int(y2 * frame_h),
+            )
+        else:
+            x1, y1, x2, y2 = map(int, [x1, y1, x2, y2])
+
+        track_id = getattr(det, "id", None)
+        if track_id is not None and hasattr(track_id, "item"):
+            track_id = track_id.item()
+        track_id_int = int(track_id) if track_id is not None else None
+
+        # Determine color and thickness based on highlight
+        if highlight_id is not None and track_id_int == highlight_id:
+            color = (0, 255, 0)  # Green for highlighted target
+            thickness = 3
+        else:
+            color = (0, 255, 255) if label == "drone" else (255, 0, 0)
+            thickness = 2
+
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
+
+        label_text = f"{label} {conf:.2f}"
+        if track_id_int is not None:
+            label_text += f" ID:{track_id_int}"
+            tracking_ids.append(track_id_int)
+
+        TEXT_SPRITES.put_text(
+            frame,
+            label_text,
+            (x1, max(y1 - 10, 0)),
+            0.7,
+            color,
+            2,
+        )
+
+    return tracking_ids
+
+
+def draw_detection_info(
+    frame: np.ndarray,
+    detection_count: int,
+    tracking_ids: list[int],
+    fps: float,
+    proc_time: float,
+    settings: Any = None,
+) -> None:
+    """Draw detection statistics on the top-left of the frame."""
+    # Get confidence threshold from Settings
+    confidence_threshold = settings.visible_detection.confidence_threshold
+
+    detection_lines = [
+        f"Detections: {detection_count}",
+        f"Tracking IDs: {tracking_ids}",
+        f"FPS: {fps:.2f}",
+        f"Proc Time: {proc_time * 1000:.1f} ms",
+        f"Confidence: {confidence_threshold}",
+    ]
+    y0, dy = 30, 25
+    for i, line in enumerate(detection_lines):
+        TEXT_SPRITES.put_text(
+            frame,
+            line,
+            (10, y0 + i * dy),
+            0.7,
+            (0, 255, 0),
+            2,
+        )
+
+
+def draw_ptz_status(
+    frame: np.ndarray,
+    ptz: Any,
+    last_ptz_command: str,
+    coverage: float,
+    tracker_status: Any = None,
+    settings: Any = None,
+) -> None:
+    """
+    Draw PTZ status information on the top-right of the frame.
+
+    Args:
+        frame: Frame to draw on.
+        ptz: PTZ service instance.
+        last_ptz_command: Last PTZ command issued.
+        coverage: Current target coverage.
+        tracker_status: Optional TrackerStatus instance for target info.
+        settings: Settings object.
+    """
+    _frame_h, frame_w = frame.shape[:2]
+
+    zoom_target_coverage = settings.ptz.zoom_target_coverage
+
+    status_text = "idle"
+    if hasattr(ptz, "control_mode") and ptz.control_mode == "onvif" and not getattr(ptz, "connected", False):
+        status_text = "DISCONNECTED"
+    elif getattr(ptz, "active", False):
+        status_text = "active"
+    elif hasattr(ptz, "control_mode") and ptz.control_mode == "none":
+        status_text = "disabled"
+
+    ptz_lines = [
+        f"PTZ Status: {status_text}",
+        f"Last PTZ Cmd: {last_ptz_command}",
+        f"Current Coverage: {coverage * 100:.1f}%",
+        f"Target Coverage: {zoom_target_coverage * 100:.1f}%",
+    ]
+
+    # Add tracker status if provided
+    if tracker_status is not None:
+        if tracker_status.target_id is not None:
+            ptz_lines.append(
+                f"Target: ID={tracker_status.target_id} ({tracker_status.phase.value})"
+            )
+        else:
+            ptz_lines.append("Target: cleared (idle)")
+
+    y0, dy = 30, 25
+    y0, dy = 30, 25
+    for i, line in enumerate(ptz_lines):
+        # Use Red color for DISCONNECTED status or important warnings
+        if "DISCONNECTED" in line or "disabled" in line:
+            color = (0, 0, 255) # Red
+        else:
+            color = (255, 128, 0) # Default Blue-ish
+
+        # Right-aligned: the sprite carries its own text size
+        sprite = TEXT_SPRITES.sprite(line, 0.7, color, 2)
+        x = frame_w - sprite.size[0] - 10
+        y = y0 + i * dy
+        blit_text(frame, sprite, (x, y))
+
+
+def draw_system_info(
+    frame: np.ndarray,
+    frame_index: int,
+    detection: Any,
+    ptz: Any,
+    settings: Any = None,
+) -> None:
+    """Draw system information on the bottom-left of the frame."""
+    frame_h, _frame_w = frame.shape[:2]
+
+    # Get config values from Settings
+    model_path = settings.visible_detection.model_path
+    camera_index = settings.visible_detection.camera.camera_index
+    resolution_width = settings.visible_detection.camera.resolution_width
+    resolution_height = settings.visible_detection.camera.resolution_height
+
+    is_thermal = settings.thermal_detection.enabled
+    detection_mode = "Thermal" if is_thermal else "Visible (YOLO)"
+    model_label = (
+        f"Algorithm: {settings.thermal_detection.detection_method}"
+        if is_thermal
+        else f"Model: {model_path}"
+    )
+    device_label = (
+        "n/a"
+        if is_thermal
+        else (
+            "cuda"
+            if hasattr(detection.model, "device")
+            and str(detection.model.device) == "cuda:0"
+            else "cpu"
+        )
+    )
+
+    sys_lines = [
+        f"Frame: {frame_index}",
+        f"Mode: {detection_mode}",
+        model_label,
+        f"Camera: {camera_index}",
+        f"Resolution: {resolution_width}x{resolution_height}",
+        f"Device: {device_label}",
+        f"Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())}",
+        f"ONVIF: {'connected' if hasattr(ptz, 'connected') and ptz.connected else 'unknown'}",
+    ]
+    dy = 25
+    y_bl = frame_h - dy * len(sys_lines) - 10
+    for i, line in enumerate(sys_lines):
+        TEXT_SPRITES.put_text(
+            frame,
+            line,
+            (10, y_bl + i * dy),
+            0.7,
+            (0, 128, 255),
+            2,
+        )
+
+
+def draw_sot_bbox(
+    frame: np.ndarray,
+    sot_bbox: tuple[int, int, int, int],
+) -> None:
+    """
+    Draw SOT bounding box on the frame with distinct magenta color.
+
+    Args:
+        frame: Frame to draw on.
+        sot_bbox: SOT bounding box (x1, y1, x2, y2).
+    """
+    x1, y1, x2, y2 = sot_bbox
+    color = (255, 0, 255)  # Magenta for SOT
+    thickness = 3
+
+    cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
+    TEXT_SPRITES.put_text(
+        frame,
+        "SOT",
+        (x1, max(y1 - 10, 15)),
+        0.7,
+        color,
+        2,
+    )
+
+
+def draw_input_mode_overlay(frame: np.ndarray, input_buf: str) -> None:
+    """
+    Draw input mode overlay prompting for ID entry.
+
+    Args:
+        frame: Frame to draw on.
+        input_buf: Current input buffer (digits typed).
+    """
+    frame_h, frame_w = frame.shape[:2]
+
+    # Display at top-center, below detection/PTZ info
+    y = 170
+    font_scale = 1.2
+    color = (0, 255, 255)  # Yellow
+    bg_color = (0, 0, 0)  # Black for semi-transparent background
+
+    text = f"Enter ID: {input_buf}_"  # Underscore shows cursor
+
+    # Get text size for background
+    sprite = TEXT_SPRITES.sprite(text, font_scale, color, 3)
+    text_w, text_h = sprite.size
+    baseline = sprite.baseline
+
+    # Draw semi-transparent background
+    padding = 10
+    x_center = frame_w // 2
+    x1 = max(0, x_center - text_w // 2 - padding)
+    y1 = max(0, y - text_h - padding)
+    x2 = min(frame_w, x_center + text_w // 2 + padding)
+    y2 = min(frame_h, y + baseline + padding)
+
+    # Draw filled rectangle with transparency
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (x1, y1), (x2, y2), bg_color, -1)
+    cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+
+    # Draw text centered
+    text_x = x_center - text_w // 2
+    blit_text(frame, sprite, (text_x, y))
+
+
+def draw_overlay(
+    frame: np.ndarray,
+    class_names: dict[int, str],
+    tracked_boxes: Any,
+    fps: float,
+    proc_time: float,
+    ptz: Any,
+    last_ptz_command: str,
+    coverage: float,
+    frame_index: int,
+    detection: Any,
+    tracker_status: Any = None,
+    input_mode: bool = False,
+    input_buf: str = "",
+    settings: Any = None,
+) -> None:
+    """
+    Draw bounding boxes and informational overlay on the frame.
+
+    Args:
+        frame: Frame to draw on.
+        class_names: Model class names.
+        tracked_boxes: Detected boxes.
+        fps: Frames per second.
+        proc_time: Processing time for frame.
+        ptz: PTZ controller.
+        last_ptz_command: Last PTZ command.
+        coverage: Current target coverage.
+        frame_index: Current frame index.
+        detection: Detection service.
+        tracker_status: Optional TrackerStatus for target tracking info.
+        input_mode: Whether in ID input mode.
+        input_buf: Current input buffer.
+        settings: Settings object.
+    """
+    # Determine highlight_id based on tracking phase
+    highlight_id = None
+    if tracker_status is not None and tracker_status.phase == TrackingPhase.TRACKING:
+        highlight_id = tracker_status.target_id
+
+    tracking_ids = draw_detection_boxes(
+        frame, class_names, tracked_boxes, highlight_id=highlight_id
+    )
+    detection_count = len(tracked_boxes)
+
+    draw_detection_info(frame, detection_count, tracking_ids, fps, proc_time, settings)
+    draw_ptz_status(frame, ptz, last_ptz_command, coverage, tracker_status, settings)
+    draw_system_info(frame, frame_index, detection, ptz, settings)
+
+    # Draw input mode overlay if active
+    if input_mode:
+        draw_input_mode_overlay(frame, input_buf)
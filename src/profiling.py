@@ -0,0 +1,183 @@
+"""Runtime instrumentation: hot-path timing spans and an in-process stack sampler.
+
+Spans are off by default. ``span(name)`` then returns a shared no-op context
+manager, so an instrumented block costs one attribute check and an empty
+``with``. Enabled spans keep a sliding window of durations per name
+(``SPANS.snapshot()``), toggled at runtime through the API.
+
+``sample_stacks`` profiles running threads from inside the process by polling
+``sys._current_frames()`` for a bounded time. ``StackProfile.folded()`` gives
+the collapsed-stack format read by flamegraph.pl, speedscope and inferno, so
+diagnosing a slow deployment needs neither shell access nor py-spy.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from types import CodeType, FrameType
+from typing import Any
+
+from src.latency_monitor import LatencyMonitor
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("_name", "_recorder", "_start")
+
+    def __init__(self, recorder: SpanRecorder, name: str) -> None:
+        self._recorder = recorder
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *_exc: object) -> None:
+        self._recorder.record(self._name, time.perf_counter() - self._start)
+
+
+class SpanRecorder:
+    """Named timing spans with per-name latency percentiles.
+
+    Args:
+        window_size: Samples kept per span name.
+        enabled: Initial state; flip ``enabled`` at any time.
+    """
+
+    def __init__(self, window_size: int = 512, *, enabled: bool = False) -> None:
+        self.window_size = window_size
+        self.enabled = enabled
+        self._monitors: dict[str, LatencyMonitor] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str) -> contextlib.AbstractContextManager[None]:
+        """Context manager timing its block as ``name`` (no-op while disabled)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, duration_s: float) -> None:
+        with self._lock:
+            monitor = self._monitors.get(name)
+            if monitor is None:
+                monitor = self._monitors[name] = LatencyMonitor(self.window_size)
+            monitor.record(duration_s)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Percentiles (ms) per span name over the recent window."""
+        with self._lock:
+            return {
+                name: asdict(monitor.snapshot())
+                for name, monitor in sorted(self._monitors.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._monitors.clear()
+
+
+# Process-wide recorder used by the instrumented pipeline stages
+SPANS = SpanRecorder()
+span = SPANS.span
+
+
+@dataclass(slots=True)
+class StackProfile:
+    """Stack samples aggregated by thread and call stack."""
+
+    samples: int = 0
+    duration_s: float = 0.0
+    interval_s: float = 0.0
+    stacks: Counter[str] = field(default_factory=Counter)
+
+    def folded(self) -> str:
+        """Collapsed stacks (``thread;outer;...;inner count`` per line)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _frame_label(code: CodeType, module: str, cache: dict[CodeType, str]) -> str:
+    label = cache.get(code)
+    if label is None:
+        # ';' separates frames and the last ' ' separates the count
+        label = f"{module}:{code.co_qualname}".replace(";", ":").replace(" ", "_")
+        cache[code] = label
+    return label
+
+
+def _fold(thread_name: str, frame: FrameType | None, cache: dict[CodeType, str]) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(
+            _frame_label(frame.f_code, frame.f_globals.get("__name__", "?"), cache)
+        )
+        frame = frame.f_back
+    labels.append(thread_name.replace(";", ":").replace(" ", "_"))
+    return ";".join(reversed(labels))
+
+
+def _sample_once(
+    profile: StackProfile,
+    own: int,
+    thread_prefix: str | None,
+    names: dict[int, str],
+    labels: dict[CodeType, str],
+) -> None:
+    # Kept separate so no frame reference outlives the sample
+    for ident, frame in sys._current_frames().items():  # noqa: SLF001
+        if ident == own:
+            continue
+        name = names.get(ident)
+        if name is None:
+            names.update((t.ident, t.name) for t in threading.enumerate() if t.ident)
+            name = names.setdefault(ident, f"thread-{ident}")
+        if thread_prefix is not None and not name.startswith(thread_prefix):
+            continue
+        profile.stacks[_fold(name, frame, labels)] += 1
+    profile.samples += 1
+
+
+def sample_stacks(
+    duration_s: float,
+    *,
+    interval_s: float = 0.005,
+    thread_prefix: str | None = None,
+    stop_event: threading.Event | None = None,
+) -> StackProfile:
+    """Sample the stacks of running threads for ``duration_s`` seconds.
+
+    Args:
+        duration_s: How long to sample.
+        interval_s: Pause between samples.
+        thread_prefix: Only sample threads whose name starts with this (for
+            example ``"session-"``); all other threads when None.
+        stop_event: Ends sampling early when set.
+
+    Returns:
+        The aggregated profile; the calling thread is never sampled.
+    """
+    if duration_s <= 0 or interval_s <= 0:
+        msg = "duration_s and interval_s must be positive"
+        raise ValueError(msg)
+
+    own = threading.get_ident()
+    names: dict[int, str] = {}
+    labels: dict[CodeType, str] = {}
+    profile = StackProfile(interval_s=interval_s)
+    started = time.monotonic()
+    deadline = started + duration_s
+    while time.monotonic() < deadline:
+        _sample_once(profile, own, thread_prefix, names, labels)
+        wait = min(interval_s, deadline - time.monotonic())
+        if stop_event is not None:
+            if stop_event.wait(max(0.0, wait)):
+                break
+        elif wait > 0:
+            time.sleep(wait)
+    profile.duration_s = time.monotonic() - started
+    return profile
@@ -0,0 +1,257 @@
+"""Field-of-view calibration: pixel offsets to pan/tilt angle errors.
+
+The control law needs the target's offset from the frame center as an
+*angle*. That angle is the pixel offset times the field of view at the current
+zoom. The default model assumes magnification grows linearly with zoom
+(``ptz.zoom_max_magnification``). Real lenses, and the simulator's crop-based
+view, are far from linear. ``FOVTable`` holds a measured per-camera table of
+horizontal/vertical FOV versus normalized zoom and interpolates it, vectorized,
+in log space (FOV shrinks roughly geometrically with zoom).
+
+``calibrate_fov`` measures such a table against ``SimulatedPTZService``. At
+each zoom level it nudges pan and tilt by a known step and measures the image
+shift with phase correlation. The result goes under ``ptz.fov_table`` in
+``config.yaml``::
+
+    python -m src.ptz_calibration --levels 11
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.settings import Settings, load_settings
+
+# Shifts smaller than this (pixels) are too small to measure an FOV from.
+_MIN_SHIFT_PX = 0.25
+
+
+@dataclass(frozen=True, slots=True)
+class FOVTable:
+    """Visible pan/tilt span (position units) per normalized zoom level.
+
+    Samples are sorted by zoom on construction. Lookups outside the measured
+    range clamp to the nearest sample.
+    """
+
+    zoom: np.ndarray
+    pan: np.ndarray
+    tilt: np.ndarray
+
+    def __post_init__(self) -> None:
+        zoom = np.asarray(self.zoom, dtype=np.float64).reshape(-1)
+        pan = np.asarray(self.pan, dtype=np.float64).reshape(-1)
+        tilt = np.asarray(self.tilt, dtype=np.float64).reshape(-1)
+        if zoom.size == 0 or not zoom.size == pan.size == tilt.size:
+            msg = "FOV table needs matching, non-empty zoom/pan/tilt samples"
+            raise ValueError(msg)
+        if (pan <= 0).any() or (tilt <= 0).any() or not np.isfinite([pan, tilt]).all():
+            msg = "FOV table spans must be finite and positive"
+            raise ValueError(msg)
+        order = np.argsort(zoom, kind="stable")
+        object.__setattr__(self, "zoom", zoom[order])
+        object.__setattr__(self, "pan", pan[order])
+        object.__setattr__(self, "tilt", tilt[order])
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[Sequence[float]]) -> FOVTable:
+        """Build from ``(zoom, pan, tilt)`` rows."""
+        rows = np.asarray(list(samples), dtype=np.float64).reshape(-1, 3)
+        return cls(zoom=rows[:, 0], pan=rows[:, 1], tilt=rows[:, 2])
+
+    @classmethod
+    def linear(
+        cls, fov_pan: float, fov_tilt: float, max_magnification: float, levels: int = 11
+    ) -> FOVTable:
+        """The uncalibrated model: magnification ``1 + z * (max - 1)``."""
+        zoom = np.linspace(0.0, 1.0, max(2, levels))
+        magnification = 1.0 + zoom * (max_magnification - 1.0)
+        return cls(zoom=zoom, pan=fov_pan / magnification, tilt=fov_tilt / magnification)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> FOVTable:
+        """The configured ``ptz.fov_table``, or the linear model when it is empty."""
+        ptz = settings.ptz
+        if ptz.fov_table:
+            return _cached_table(tuple((s.zoom, s.pan, s.tilt) for s in ptz.fov_table))
+        return cls.linear(ptz.fov_pan, ptz.fov_tilt, ptz.zoom_max_magnification)
+
+    def lookup(self, zoom: Any) -> tuple[Any, Any]:
+        """Return ``(fov_pan, fov_tilt)`` for a zoom level or an array of them."""
+        zoom = np.clip(zoom, 0.0, 1.0)
+        return (
+            np.exp(np.interp(zoom, self.zoom, np.log(self.pan))),
+            np.exp(np.interp(zoom, self.zoom, np.log(self.tilt))),
+        )
+
+    def zoom_for_pan_fov(self, fov_pan: Any) -> Any:
+        """Inverse of ``lookup`` on the pan axis: the zoom giving ``fov_pan``.
+
+        Assumes the FOV shrinks monotonically with zoom; clamps to the table.
+        """
+        log_fov = np.log(np.maximum(fov_pan, np.finfo(np.float64).tiny))
+        return np.interp(log_fov, np.log(self.pan)[::-1], self.zoom[::-1])
+
+    def angle_error(self, dx: Any, dy: Any, zoom: Any) -> tuple[Any, Any]:
+        """Convert frame-normalized offsets (``[-0.5, 0.5]``) to pan/tilt errors.
+
+        Image y grows downwards, so a target below center is a negative tilt
+        error.
+        """
+        fov_pan, fov_tilt = self.lookup(zoom)
+        return np.multiply(dx, fov_pan), -np.multiply(dy, fov_tilt)
+
+    def pixel_to_angle(
+        self, px: Any, py: Any, frame_w: int, frame_h: int, zoom: Any
+    ) -> tuple[Any, Any]:
+        """Convert pixel offsets from the frame center to pan/tilt errors."""
+        return self.angle_error(np.divide(px, frame_w), np.divide(py, frame_h), zoom)
+
+    def to_rows(self) -> list[dict[str, float]]:
+        return [
+            {"zoom": float(z), "pan": float(p), "tilt": float(t)}
+            for z, p, t in zip(self.zoom, self.pan, self.tilt, strict=True)
+        ]
+
+
+@lru_cache(maxsize=8)
+def _cached_table(rows: tuple[tuple[float, float, float], ...]) -> FOVTable:
+    return FOVTable.from_samples(rows)
+
+
+def _measure_shift(before: np.ndarray, after: np.ndarray) -> tuple[float, float]:
+    import cv2  # noqa: PLC0415
+
+    def prepare(image: np.ndarray) -> np.ndarray:
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image.astype(np.float32)
+
+    a, b = prepare(before), prepare(after)
+    window = cv2.createHanningWindow((a.shape[1], a.shape[0]), cv2.CV_32F)
+    (dx, dy), _ = cv2.phaseCorrelate(a, b, window)
+    return float(dx), float(dy)
+
+
+def calibrate_fov(
+    ptz: Any,
+    render: Callable[[Any], np.ndarray],
+    zoom_levels: Iterable[float] = tuple(np.linspace(0.0, 1.0, 11)),
+    *,
+    step: float = 0.05,
+) -> FOVTable:
+    """Measure FOV versus zoom on a simulated PTZ.
+
+    Args:
+        ptz: ``SimulatedPTZService`` (positions are set directly).
+        render: Returns the camera image for the PTZ's current pose, e.g.
+            ``lambda p: simulate_ptz_view(scene, p, settings)[0]``.
+        zoom_levels: Normalized zoom levels to measure.
+        step: Pan/tilt nudge in position units.
+
+    Returns:
+        The measured table. Levels where the nudge does not move the image
+        (e.g. a crop-based simulator at full width) are skipped.
+
+    Raises:
+        ValueError: If no zoom level produced a measurable shift.
+    """
+    rows = []
+    for level in zoom_levels:
+        ptz.stop()
+        ptz.set_zoom_absolute(ptz.zmin + float(level) * (ptz.zmax - ptz.zmin))
+        ptz.pan_pos = ptz.tilt_pos = 0.0
+        base = render(ptz)
+        frame_h, frame_w = base.shape[:2]
+
+        ptz.pan_pos = step
+        shift_x, _ = _measure_shift(base, render(ptz))
+        ptz.pan_pos, ptz.tilt_pos = 0.0, step
+        _, shift_y = _measure_shift(base, render(ptz))
+        ptz.tilt_pos = 0.0
+
+        # Panning right moves the scene left; tilting up moves it down.
+        if -shift_x < _MIN_SHIFT_PX or shift_y < _MIN_SHIFT_PX:
+            continue
+        rows.append((float(level), step * frame_w / -shift_x, step * frame_h / shift_y))
+
+    if not rows:
+        msg = "no zoom level produced a measurable image shift"
+        raise ValueError(msg)
+    return FOVTable.from_samples(rows)
+
+
+def synthetic_scene(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """Textured BGR test scene with enough detail for phase correlation."""
+    import cv2  # noqa: PLC0415
+
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (height, width), dtype=np.uint8)
+    return cv2.cvtColor(cv2.GaussianBlur(noise, (7, 7), 0), cv2.COLOR_GRAY2BGR)
+
+
+def format_table(table: FOVTable) -> str:
+    """``config.yaml`` snippet for ``ptz.fov_table``."""
+    lines = ["ptz:", "  fov_table:"]
+    lines.extend(
+        f"    - {{zoom: {row['zoom']:.3f}, pan: {row['pan']:.5f}, tilt: {row['tilt']:.5f}}}"
+        for row in table.to_rows()
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the simulated PTZ's field of view versus zoom"
+    )
+    parser.add_argument("--config", type=Path, default=None, help="config.yaml path")
+    parser.add_argument(
+        "--scene", type=Path, default=None, help="Scene image (default: synthetic texture)"
+    )
+    parser.add_argument("--levels", type=int, default=11)
+    parser.add_argument("--step", type=float, default=0.05)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the table as JSON here"
+    )
+    args = parser.parse_args(argv)
+
+    import cv2  # noqa: PLC0415
+
+    from src.main import simulate_ptz_view  # noqa: PLC0415
+    from src.ptz_simulator import SimulatedPTZService  # noqa: PLC0415
+
+    settings = load_settings(args.config)
+    if args.scene is not None:
+        scene = cv2.imread(str(args.scene))
+        if scene is None:
+            parser.error(f"cannot read scene image {args.scene}")
+    else:
+        camera = settings.visible_detection.camera
+        scene = synthetic_scene(camera.resolution_width * 2, camera.resolution_height * 2)
+
+    ptz = SimulatedPTZService(settings=settings)
+    table = calibrate_fov(
+        ptz,
+        lambda p: simulate_ptz_view(scene, p, settings)[0],
+        np.linspace(0.0, 1.0, args.levels),
+        step=args.step,
+    )
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(table.to_rows(), indent=2) + "\n")
+    sys.stdout.write(format_table(table) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
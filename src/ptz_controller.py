@@ -3,6 +3,8 @@ import requests
 from pathlib import Path
 from loguru import logger
 
+from src.logging_config import hot_log
+from src.profiling import span
 from src.settings import Settings
 
 
@@ -324,8 +326,9 @@ class PTZService:
 
         try:
             # Log the request payload before sending
-            logger.debug(f"Executing ContinuousMove with request: {self.request}")
-            self.ptz.ContinuousMove(self.request)
+            hot_log.debug("Executing ContinuousMove with request: {}", self.request)
+            with span("ptz_io"):
+                self.ptz.ContinuousMove(self.request)
             self.active = pan != 0 or tilt != 0 or zoom != 0
             self.last_vel_pan = pan
             self.last_vel_tilt = tilt
@@ -369,7 +372,8 @@ class PTZService:
             if not (pan and tilt and zoom):
                 stop_req["PanTilt"] = pan or tilt
                 stop_req["Zoom"] = zoom
-            self.ptz.Stop(stop_req)
+            with span("ptz_io"):
+                self.ptz.Stop(stop_req)
             self.active = False
             # Only reset the axes that are being stopped
             if pan:
@@ -415,6 +419,58 @@ class PTZService:
         except Exception as e:
             logger.error(f"set_zoom_absolute error: {e}")
 
+    def absolute_move(
+        self, pan: float, tilt: float, zoom: float | None = None
+    ) -> bool:
+        """
+        Move straight to an absolute pan/tilt (and optionally zoom) position.
+
+        Uses ONVIF AbsoluteMove. Not supported when control_mode is "octagon":
+        the Octagon API has no confirmed absolute position command, so snap
+        acquisition falls back to continuous tracking there.
+
+        Args:
+            pan: Target pan position in the camera's position units.
+            tilt: Target tilt position in the camera's position units.
+            zoom: Target zoom position, or None to keep the current zoom.
+
+        Returns:
+            True if the command was sent, False otherwise.
+        """
+        control_mode = getattr(self, "control_mode", "onvif")
+        if control_mode == "none":
+            return False
+        if control_mode == "octagon":
+            logger.warning("Absolute move is not supported in Octagon control mode")
+            return False
+
+        try:
+            pan = max(self.xmin, min(self.xmax, float(pan)))
+            tilt = max(self.ymin, min(self.ymax, float(tilt)))
+            zoom_value = self.zoom_level if zoom is None else zoom
+            zoom_value = max(self.zmin, min(self.zmax, float(zoom_value)))
+            request = self.ptz.create_type("AbsoluteMove")
+            request.ProfileToken = self.profile.token
+            request.Position = self.ptz.create_type("PTZVector")
+            request.Position.PanTilt = self.ptz.create_type("Vector2D")
+            request.Position.PanTilt.x = pan
+            request.Position.PanTilt.y = tilt
+            request.Position.Zoom = zoom_value
+            self.ptz.AbsoluteMove(request)
+        except Exception as e:
+            logger.error(f"AbsoluteMove error: {e}")
+            return False
+        self.abs_zoom = zoom_value
+        self.zoom_level = zoom_value
+        self.abs_pan = pan
+        self.abs_tilt = tilt
+        self.last_vel_pan = 0.0
+        self.last_vel_tilt = 0.0
+        self.last_vel_zoom = 0.0
+        self.active = False
+        logger.debug(f"absolute_move: pan={pan:.3f}, tilt={tilt:.3f}, zoom={zoom}")
+        return True
+
     def set_zoom_home(self) -> None:
         """Set zoom to the home (widest) position defined by self.zmin."""
         self.set_zoom_absolute(self.zmin)
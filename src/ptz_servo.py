@@ -7,9 +7,12 @@ Replaces simple proportional control with full PID for:
 - D: Damping overshoot
 """
 
-import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional
+
+import numpy as np
+
+from src.clock import SYSTEM_CLOCK, Clock
 
 
 @dataclass
@@ -30,22 +33,27 @@ class PIDGains:
 class PTZServo:
     """PID servo controller for PTZ pan/tilt axes."""
 
-    def __init__(self, gains: Optional[PIDGains] = None) -> None:
+    def __init__(
+        self, gains: PIDGains | None = None, clock: Clock | None = None
+    ) -> None:
         """
         Initialize servo controller.
 
         Args:
             gains: PID tuning parameters. Defaults are well-tuned for typical
                    camera servo responses.
+            clock: Time source for the control interval (defaults to the
+                   system clock).
         """
         self.gains = gains or PIDGains()
+        self.clock = clock or SYSTEM_CLOCK
 
         # State tracking
         self.last_error_x = 0.0
         self.last_error_y = 0.0
         self.integral_x = 0.0
         self.integral_y = 0.0
-        self.last_time = time.time()
+        self.last_time = self.clock.time()
 
     def control(self, error_x: float, error_y: float) -> tuple[float, float]:
         """
@@ -59,7 +67,7 @@ class PTZServo:
             Tuple of (pan_velocity, tilt_velocity) in range [-1.0, 1.0].
         """
         # Calculate time delta
-        now = time.time()
+        now = self.clock.time()
         dt = now - self.last_time
         self.last_time = now
 
@@ -76,13 +84,13 @@ class PTZServo:
 
         # PAN (X axis) control
         pan_velocity, self.integral_x = self._pid_update(
-            error_x, self.last_error_x, self.integral_x, dt, axis="pan"
+            error_x, self.last_error_x, self.integral_x, dt
         )
         self.last_error_x = error_x
 
         # TILT (Y axis) control
         tilt_velocity, self.integral_y = self._pid_update(
-            error_y, self.last_error_y, self.integral_y, dt, axis="tilt"
+            error_y, self.last_error_y, self.integral_y, dt
         )
         self.last_error_y = error_y
 
@@ -94,7 +102,6 @@ class PTZServo:
         last_error: float,
         integral: float,
         dt: float,
-        axis: str,
     ) -> tuple[float, float]:
         """
         Calculate PID output for a single axis.
@@ -104,7 +111,6 @@ class PTZServo:
             last_error: Previous error (for derivative).
             integral: Accumulated integral.
             dt: Time delta.
-            axis: "pan" or "tilt" (for logging).
 
         Returns:
             Tuple of (control_output, updated_integral) where output is in
@@ -138,7 +144,151 @@ class PTZServo:
         self.last_error_y = 0.0
         self.integral_x = 0.0
         self.integral_y = 0.0
-        self.last_time = time.time()
+        self.last_time = self.clock.time()
+
+
+class PredictivePTZServo(PTZServo):
+    """PID servo that steers toward where the target will be, not where it was.
+
+    Each observation converts the target's frame offset into absolute pan/tilt
+    angles using the camera position and field of view at capture time. A
+    least-squares fit over the recent history then gives the target's angular
+    velocity and the camera's own velocity. The offset handed to the PID is
+    extrapolated by the lead time: the measured age of the detection plus a
+    fixed actuation latency, capped at ``max_lead_s``.
+    """
+
+    def __init__(
+        self,
+        gains: PIDGains | None = None,
+        clock: Clock | None = None,
+        *,
+        window_s: float = 0.5,
+        min_samples: int = 3,
+        max_lead_s: float = 0.5,
+        actuation_latency_s: float = 0.1,
+        history_size: int = 64,
+    ) -> None:
+        """
+        Initialize predictive servo.
+
+        Args:
+            gains: PID tuning parameters.
+            clock: Time source (defaults to the system clock).
+            window_s: Age of the oldest observation used for velocity fits.
+            min_samples: Observations needed before any lead is applied.
+            max_lead_s: Upper bound on the extrapolation horizon.
+            actuation_latency_s: Fixed delay added to the measured detection
+                   age (stream transport plus PTZ command response).
+            history_size: Maximum stored observations.
+        """
+        super().__init__(gains, clock)
+        self.window_s = window_s
+        self.min_samples = min_samples
+        self.max_lead_s = max_lead_s
+        self.actuation_latency_s = actuation_latency_s
+        # Rows of capture time, target pan/tilt and camera pan/tilt
+        self._history: deque[tuple[float, float, float, float, float]] = deque(
+            maxlen=history_size
+        )
+        self.last_lead_s = 0.0
+
+    def observe(
+        self,
+        dx: float,
+        dy: float,
+        *,
+        capture_ts: float,
+        camera_pan: float,
+        camera_tilt: float,
+        fov_x: float,
+        fov_y: float,
+    ) -> None:
+        """
+        Record one detection.
+
+        Args:
+            dx: Horizontal target offset from frame center (fraction, right > 0).
+            dy: Vertical target offset from frame center (fraction, down > 0).
+            capture_ts: Timestamp of the frame the detection came from.
+            camera_pan: Camera pan position when the frame was captured.
+            camera_tilt: Camera tilt position when the frame was captured.
+            fov_x: Horizontal field of view in pan units at the current zoom.
+            fov_y: Vertical field of view in tilt units at the current zoom.
+        """
+        if self._history and capture_ts <= self._history[-1][0]:
+            return
+        self._history.append(
+            (
+                capture_ts,
+                camera_pan + dx * fov_x,
+                camera_tilt - dy * fov_y,
+                camera_pan,
+                camera_tilt,
+            )
+        )
+
+    def velocities(self) -> tuple[float, float, float, float]:
+        """
+        Fit angular velocities over the recent window.
+
+        Returns:
+            ``(target_pan_v, target_tilt_v, camera_pan_v, camera_tilt_v)`` in
+            position units per second; all zero with too little history.
+        """
+        if len(self._history) < self.min_samples:
+            return (0.0, 0.0, 0.0, 0.0)
+        samples = np.asarray(self._history, dtype=np.float64)
+        recent = samples[samples[:, 0] >= samples[-1, 0] - self.window_s]
+        if recent.shape[0] < self.min_samples:
+            return (0.0, 0.0, 0.0, 0.0)
+        t = recent[:, 0] - recent[:, 0].mean()
+        denom = float(t @ t)
+        if denom <= 0.0:
+            return (0.0, 0.0, 0.0, 0.0)
+        slopes = t @ (recent[:, 1:] - recent[:, 1:].mean(axis=0)) / denom
+        return tuple(float(v) for v in slopes)  # type: ignore[return-value]
+
+    def lead_offsets(
+        self,
+        dx: float,
+        dy: float,
+        *,
+        capture_ts: float,
+        camera_pan: float,
+        camera_tilt: float,
+        fov_x: float,
+        fov_y: float,
+    ) -> tuple[float, float]:
+        """
+        Observe a detection and return latency-compensated frame offsets.
+
+        The result has the same units and sign convention as ``dx``/``dy`` so it
+        can replace them in the existing error computation.
+        """
+        self.observe(
+            dx,
+            dy,
+            capture_ts=capture_ts,
+            camera_pan=camera_pan,
+            camera_tilt=camera_tilt,
+            fov_x=fov_x,
+            fov_y=fov_y,
+        )
+        age = max(0.0, self.clock.time() - capture_ts)
+        lead = min(age + self.actuation_latency_s, self.max_lead_s)
+        self.last_lead_s = lead
+        target_pan_v, target_tilt_v, camera_pan_v, camera_tilt_v = self.velocities()
+        # Apparent motion in the frame is target motion minus camera motion.
+        lead_dx = dx + (target_pan_v - camera_pan_v) * lead / fov_x if fov_x > 0 else dx
+        lead_dy = dy - (target_tilt_v - camera_tilt_v) * lead / fov_y if fov_y > 0 else dy
+        return (lead_dx, lead_dy)
+
+    def reset(self) -> None:
+        """Reset servo state and forget the target's motion history."""
+        super().reset()
+        self._history.clear()
+        self.last_lead_s = 0.0
 
 
 # Presets for different scenarios
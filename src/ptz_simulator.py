@@ -5,10 +5,10 @@ Provides a drop-in replacement for PTZService that simulates pan/tilt/zoom
 behavior using a simple, smooth motion model.
 """
 
-import time
-
 from loguru import logger
 
+from src.clock import SYSTEM_CLOCK, Clock
+from src.logging_config import hot_log
 from src.settings import Settings, load_settings
 
 
@@ -21,18 +21,22 @@ class SimulatedPTZService:
     are sent.
     """
 
-    def __init__(self, settings: Settings | None = None) -> None:
+    def __init__(
+        self, settings: Settings | None = None, clock: Clock | None = None
+    ) -> None:
         """
         Initialize the simulated PTZ service.
 
         Args:
             settings: Settings object containing PTZ configuration. If None, defaults are used.
+            clock: Time source for motion integration (defaults to the system clock).
         """
         # Create default settings if not provided
         if settings is None:
             settings = load_settings()
 
         self.settings = settings
+        self.clock = clock or SYSTEM_CLOCK
         self.connected = True
         self.active = False  # Pan/tilt ranges (normalized to [-1, 1])
         self.xmin = -1.0
@@ -75,7 +79,7 @@ class SimulatedPTZService:
         )
 
         # Timestamp for dt calculation
-        self._last_update = time.time()
+        self._last_update = self.clock.time()
 
         logger.info(
             f"SimulatedPTZService initialized: pan=[{self.xmin}, {self.xmax}], "
@@ -111,7 +115,8 @@ class SimulatedPTZService:
             pan: Pan velocity, range [-1.0, 1.0]. Positive = right.
             tilt: Tilt velocity, range [-1.0, 1.0]. Positive = up.
             zoom: Zoom velocity. Positive = zoom in.
-            threshold: Minimum change to send command (default 0.01).
+            threshold: Minimum change to accept a new command (default 0.01);
+                smaller changes keep the previous command while motion continues.
         """
         # Convert inputs to float
         pan = float(pan)
@@ -123,21 +128,20 @@ class SimulatedPTZService:
         tilt = round(self.ramp(tilt, self.last_tilt), 2)
         zoom = round(max(-self.zmax, min(self.zmax, zoom)), 2)
 
-        # Only update if significant change
+        # Only accept a new command on a significant change. Like a real head,
+        # the camera keeps moving at the last commanded velocity meanwhile.
         if (
-            abs(pan - self.last_pan) < threshold
-            and abs(tilt - self.last_tilt) < threshold
-            and abs(zoom - self.last_zoom) < threshold
+            abs(pan - self.last_pan) >= threshold
+            or abs(tilt - self.last_tilt) >= threshold
+            or abs(zoom - self.last_zoom) >= threshold
         ):
-            return
-
-        # Update last values
-        self.last_pan = pan
-        self.last_tilt = tilt
-        self.last_zoom = zoom
+            self.last_pan = pan
+            self.last_tilt = tilt
+            self.last_zoom = zoom
+        pan, tilt, zoom = self.last_pan, self.last_tilt, self.last_zoom
 
         # Calculate time delta for integration
-        now = time.time()
+        now = self.clock.time()
         dt = now - self._last_update
         self._last_update = now
 
@@ -229,7 +233,7 @@ class SimulatedPTZService:
         self.last_tilt = 0.0
         self.last_zoom = 0.0
 
-        logger.debug(f"stop called: pan={pan}, tilt={tilt}, zoom={zoom}")
+        hot_log.debug("stop called: pan={}, tilt={}, zoom={}", pan, tilt, zoom)
 
     def set_zoom_absolute(self, zoom_value: float) -> None:
         """
@@ -241,7 +245,7 @@ class SimulatedPTZService:
         zoom_value = max(self.zmin, min(self.zmax, float(zoom_value)))
         self.zoom_level = zoom_value
         self.last_zoom = zoom_value
-        logger.debug(f"set_zoom_absolute: {zoom_value:.3f}")
+        logger.debug("set_zoom_absolute: {:.3f}", zoom_value)
 
     def set_zoom_relative(self, zoom_delta: float) -> None:
         """
@@ -272,6 +276,40 @@ class SimulatedPTZService:
         self.active = False
         logger.debug("set_home_position: pan=0, tilt=0, zoom=zmin")
 
+    def absolute_move(
+        self, pan: float, tilt: float, zoom: float | None = None
+    ) -> bool:
+        """
+        Jump to an absolute pan/tilt (and optionally zoom) position.
+
+        Like ``set_home_position``, the move completes instantly and stops any
+        continuous motion.
+
+        Args:
+            pan: Target pan position.
+            tilt: Target tilt position.
+            zoom: Target zoom position, or None to keep the current zoom.
+
+        Returns:
+            True (the simulator always accepts the move).
+        """
+        self.pan_pos = max(self.xmin, min(self.xmax, float(pan)))
+        self.tilt_pos = max(self.ymin, min(self.ymax, float(tilt)))
+        if zoom is not None:
+            self.zoom_level = max(self.zmin, min(self.zmax, float(zoom)))
+        self.pan_vel = 0.0
+        self.tilt_vel = 0.0
+        self.zoom_vel = 0.0
+        self.last_pan = 0.0
+        self.last_tilt = 0.0
+        self.last_zoom = 0.0
+        self.active = False
+        logger.debug(
+            f"absolute_move: pan={self.pan_pos:.3f}, tilt={self.tilt_pos:.3f}, "
+            f"zoom={self.zoom_level:.3f}"
+        )
+        return True
+
     def get_zoom(self) -> float:
         """
         Get current zoom position.
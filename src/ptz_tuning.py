@@ -0,0 +1,523 @@
+"""Vectorized closed-loop PID gain tuning.
+
+``simulate`` runs thousands of ``PIDGains`` candidates in parallel against a
+target trajectory. Each candidate gets its own camera state, and one NumPy
+operation advances all of them per time step. The step reproduces the
+tracking branch of ``main()``:
+
+* the error is scaled by ``ptz_movement_gain`` with optional zoom compensation;
+* ``PTZServo.control`` supplies dead band, clamped ``dt``, anti-windup
+  integral, derivative and output saturation;
+* ``SimulatedPTZService.continuous_move`` supplies ramp rate, 2-decimal
+  rounding, the command-change threshold, acceleration limit, integration and
+  position clamping. ``stop()`` is used when both outputs are zero.
+
+Targets are angles in the simulator's normalized pan/tilt space. ``NaN`` marks
+frames where the target is not visible: the camera stops, and the servo resets
+when the target reappears, as on a tracking phase change. For a single
+candidate the result matches the scalar classes driven by a ``VirtualClock``.
+
+Each candidate is scored on RMS error, settling time, overshoot and command
+jitter. The best candidates can be exported as ``PIDGains`` presets::
+
+    python -m src.ptz_tuning data/trajectories/cam/2026-01-01/*.npz --samples 4096
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.ptz_servo import PIDGains
+from src.settings import Settings, load_settings
+from src.tracking.control import field_of_view, zoom_compensation
+
+GAIN_FIELDS: tuple[str, ...] = ("kp", "ki", "kd", "integral_limit", "dead_band")
+
+# Search ranges used by ``random_candidates`` when none are given.
+DEFAULT_BOUNDS: dict[str, tuple[float, float]] = {
+    "kp": (0.5, 5.0),
+    "ki": (0.0, 0.5),
+    "kd": (0.0, 2.0),
+    "integral_limit": (0.25, 2.0),
+    "dead_band": (0.0, 0.05),
+}
+
+# Mirrors of the constants hard-coded in PTZServo / SimulatedPTZService.
+_SERVO_MIN_DT = 0.001
+_SERVO_FALLBACK_DT = 0.016
+_SERVO_MAX_DT = 0.1
+_SIM_FALLBACK_DT = 0.016
+_SIM_MAX_DT = 0.5
+_MOVE_THRESHOLD = 0.01
+
+
+@dataclass(frozen=True, slots=True)
+class Candidates:
+    """Struct-of-arrays batch of PID gain candidates (all arrays shape ``(N,)``)."""
+
+    kp: np.ndarray
+    ki: np.ndarray
+    kd: np.ndarray
+    integral_limit: np.ndarray
+    dead_band: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.kp.shape[0])
+
+    def gains(self, index: int) -> PIDGains:
+        return PIDGains(
+            **{name: float(getattr(self, name)[index]) for name in GAIN_FIELDS}
+        )
+
+    @classmethod
+    def from_gains(cls, gains: Sequence[PIDGains]) -> Candidates:
+        return cls(
+            **{
+                name: np.array([getattr(g, name) for g in gains], dtype=np.float64)
+                for name in GAIN_FIELDS
+            }
+        )
+
+
+def grid_candidates(**axes: Iterable[float]) -> Candidates:
+    """Cartesian product of per-field values; missing fields use ``PIDGains`` defaults."""
+    defaults = PIDGains()
+    values = [
+        np.asarray(list(axes.get(name, (getattr(defaults, name),))), dtype=np.float64)
+        for name in GAIN_FIELDS
+    ]
+    mesh = np.meshgrid(*values, indexing="ij")
+    return Candidates(**{name: m.ravel() for name, m in zip(GAIN_FIELDS, mesh, strict=True)})
+
+
+def random_candidates(
+    n: int,
+    bounds: dict[str, tuple[float, float]] | None = None,
+    *,
+    seed: int = 0,
+) -> Candidates:
+    """``n`` candidates sampled uniformly within ``bounds`` (see ``DEFAULT_BOUNDS``)."""
+    bounds = {**DEFAULT_BOUNDS, **(bounds or {})}
+    rng = np.random.default_rng(seed)
+    return Candidates(
+        **{name: rng.uniform(*bounds[name], size=n) for name in GAIN_FIELDS}
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Trajectory:
+    """Target angles over time: ``ts`` shape ``(T,)`` seconds, ``target`` ``(T, 2)``."""
+
+    ts: np.ndarray
+    target: np.ndarray
+    name: str = ""
+
+    def __post_init__(self) -> None:
+        if self.ts.ndim != 1 or self.target.shape != (self.ts.shape[0], 2):
+            msg = "Trajectory needs ts of shape (T,) and target of shape (T, 2)"
+            raise ValueError(msg)
+        if self.ts.shape[0] < 2:
+            msg = "Trajectory needs at least two samples"
+            raise ValueError(msg)
+
+
+def step_trajectory(
+    pan: float = 0.3,
+    tilt: float = -0.2,
+    *,
+    duration_s: float = 4.0,
+    rate_hz: float = 30.0,
+) -> Trajectory:
+    """A target that jumps to ``(pan, tilt)`` and stays there."""
+    ts = np.arange(0.0, duration_s, 1.0 / rate_hz)
+    target = np.tile(np.array([pan, tilt], dtype=np.float64), (ts.shape[0], 1))
+    return Trajectory(ts=ts, target=target, name="step")
+
+
+def sweep_trajectory(
+    speed: float = 0.25,
+    *,
+    duration_s: float = 4.0,
+    rate_hz: float = 30.0,
+) -> Trajectory:
+    """A target crossing in pan at constant angular ``speed`` (units/s)."""
+    ts = np.arange(0.0, duration_s, 1.0 / rate_hz)
+    target = np.zeros((ts.shape[0], 2), dtype=np.float64)
+    target[:, 0] = np.clip(-0.5 + speed * ts, -1.0, 1.0)
+    return Trajectory(ts=ts, target=target, name="sweep")
+
+
+def trajectory_from_npz(path: Path, *, fov: float = 0.5) -> Trajectory:
+    """Build a trajectory from a recorded track (see ``src.analytics.trajectory``).
+
+    The target is the recorded camera pose plus the bbox center's offset from
+    the frame center scaled by ``fov`` (the normalized pan/tilt span visible in
+    one frame). Samples recorded without a pose count as pose zero.
+    """
+    from src.analytics.trajectory import load_trajectory  # noqa: PLC0415
+
+    data = load_trajectory(Path(path))
+    ts = (data["ts_unix_ms"] - data["ts_unix_ms"][0]).astype(np.float64) / 1000.0
+    cx = data["x"].astype(np.float64) + data["w"].astype(np.float64) / 2.0
+    cy = data["y"].astype(np.float64) + data["h"].astype(np.float64) / 2.0
+    pan = np.nan_to_num(data["pan"].astype(np.float64))
+    tilt = np.nan_to_num(data["tilt"].astype(np.float64))
+    target = np.column_stack((pan + (cx - 0.5) * fov, tilt - (cy - 0.5) * fov))
+    return Trajectory(ts=ts, target=target, name=Path(path).stem)
+
+
+@dataclass(frozen=True, slots=True)
+class PlantModel:
+    """Simulator and control-law constants shared by every candidate.
+
+    ``zoom_fov_ratio`` (``fov(zoom) / fov(widest)``) and ``zoom_gain_scale``
+    (the ``zoom_compensation`` factor) describe the pan axis at
+    ``zoom_level``; ``from_settings`` takes both from ``field_of_view``, so a
+    calibrated ``ptz.fov_table`` is honored.
+    """
+
+    movement_gain: float = 2.0
+    fov: float = 0.5
+    zoom_level: float = 0.0
+    zoom_fov_ratio: float = 1.0
+    zoom_gain_scale: float = 1.0
+    ramp_rate: float = 0.2
+    accel: float = 0.5
+    pan_rate: float = 2.0
+    tilt_rate: float = 2.0
+    pos_min: float = -1.0
+    pos_max: float = 1.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **overrides: Any) -> PlantModel:
+        from src.ptz_simulator import SimulatedPTZService  # noqa: PLC0415
+
+        sim = SimulatedPTZService(settings=settings)
+        zoom_level = float(overrides.get("zoom_level", 0.0))
+        values: dict[str, Any] = {
+            "movement_gain": settings.ptz.ptz_movement_gain,
+            "zoom_fov_ratio": (
+                field_of_view(settings, zoom_level)[0] / field_of_view(settings, 0.0)[0]
+            ),
+            "zoom_gain_scale": zoom_compensation(settings, zoom_level)[0],
+            "ramp_rate": sim.ramp_rate,
+            "accel": sim.sim_accel,
+            "pan_rate": sim.sim_pan_rate,
+            "tilt_rate": sim.sim_tilt_rate,
+            "pos_min": sim.xmin,
+            "pos_max": sim.xmax,
+        }
+        values.update(overrides)
+        return cls(**values)
+
+    @property
+    def error_scale(self) -> float:
+        """Angle error -> servo error (frame offset x movement gain x zoom compensation)."""
+        # Field of view narrows with zoom, so a given angle offset fills more of
+        # the frame; zoom compensation scales the gain back by the same ratio.
+        return self.movement_gain / (self.fov * self.zoom_fov_ratio) * self.zoom_gain_scale
+
+
+@dataclass(slots=True)
+class Metrics:
+    """Per-candidate scores (all arrays shape ``(N,)``)."""
+
+    rms_error: np.ndarray
+    settling_s: np.ndarray
+    overshoot: np.ndarray
+    jitter: np.ndarray
+
+    def cost(
+        self,
+        *,
+        settle_weight: float = 0.1,
+        overshoot_weight: float = 1.0,
+        jitter_weight: float = 1.0,
+        settle_cap_s: float = 10.0,
+    ) -> np.ndarray:
+        """Weighted scalar cost; lower is better. Unsettled runs count as ``settle_cap_s``."""
+        settling = np.minimum(self.settling_s, settle_cap_s)
+        return (
+            self.rms_error
+            + settle_weight * settling
+            + overshoot_weight * self.overshoot
+            + jitter_weight * self.jitter
+        )
+
+    def row(self, index: int) -> dict[str, float]:
+        return {
+            "rms_error": float(self.rms_error[index]),
+            "settling_s": float(self.settling_s[index]),
+            "overshoot": float(self.overshoot[index]),
+            "jitter": float(self.jitter[index]),
+        }
+
+
+@dataclass(slots=True)
+class SimulationResult:
+    metrics: Metrics
+    final_position: np.ndarray = field(repr=False)
+    commands: np.ndarray | None = field(default=None, repr=False)
+
+
+def _ramp(target: np.ndarray, current: np.ndarray, rate: float) -> np.ndarray:
+    delta = target - current
+    return np.where(np.abs(delta) > rate, current + rate * np.sign(delta), target)
+
+
+def _accel(cmd: np.ndarray, vel: np.ndarray, limit: np.ndarray) -> np.ndarray:
+    stepped = np.where(
+        np.abs(cmd - vel) > limit, vel + limit * np.where(cmd > vel, 1.0, -1.0), cmd
+    )
+    return np.clip(stepped, -1.0, 1.0)
+
+
+def simulate(
+    candidates: Candidates,
+    trajectory: Trajectory,
+    plant: PlantModel | None = None,
+    *,
+    settle_tolerance: float = 0.02,
+    record_commands: bool = False,
+) -> SimulationResult:
+    """Run every candidate against ``trajectory`` and score it.
+
+    Args:
+        candidates: Gain batch of size ``N``.
+        trajectory: Target angles over time.
+        plant: Control-law and simulator constants (defaults to ``PlantModel()``).
+        settle_tolerance: Per-axis angle error regarded as settled.
+        record_commands: Also return the ``(T, N, 2)`` commanded velocities
+            (memory grows with ``T * N``).
+    """
+    plant = plant or PlantModel()
+    n = len(candidates)
+    steps = trajectory.ts.shape[0]
+
+    kp = candidates.kp[:, None]
+    ki = candidates.ki[:, None]
+    kd = candidates.kd[:, None]
+    i_limit = candidates.integral_limit[:, None]
+    dead_band = candidates.dead_band[:, None]
+    rates = np.array([plant.pan_rate, plant.tilt_rate], dtype=np.float64)
+    error_scale = plant.error_scale
+
+    pos = np.zeros((n, 2))
+    vel = np.zeros((n, 2))
+    last_cmd = np.zeros((n, 2))
+    integral = np.zeros((n, 2))
+    last_error = np.zeros((n, 2))
+    t0 = float(trajectory.ts[0])
+    servo_last = np.full(n, t0)
+    sim_last = np.full(n, t0)
+
+    sq_error = np.zeros(n)
+    samples = np.zeros(n)
+    last_outside = np.full(n, -1, dtype=np.int64)
+    overshoot = np.zeros(n)
+    jitter_sq = np.zeros(n)
+    initial_sign: np.ndarray | None = None
+    hidden = False
+    commands = np.zeros((steps, n, 2)) if record_commands else None
+
+    for i in range(steps):
+        now = float(trajectory.ts[i])
+        target = trajectory.target[i]
+
+        if np.isnan(target).any():
+            # Target not visible: the servo resets and a moving camera stops.
+            was_moving = np.any(last_cmd != 0.0, axis=1)
+            jitter_sq += np.sum(last_cmd**2, axis=1)
+            vel = np.where(was_moving[:, None], 0.0, vel)
+            last_cmd[:] = 0.0
+            hidden = True
+            if commands is not None:
+                commands[i] = 0.0
+            continue
+        if hidden:
+            # Reacquired: main() resets the servo on the phase change.
+            integral[:] = 0.0
+            last_error[:] = 0.0
+            servo_last[:] = now
+            hidden = False
+
+        angle_error = target[None, :] - pos
+        if initial_sign is None:
+            initial_sign = np.sign(angle_error)
+
+        # --- Performance metrics (before this step's motion, like a live frame) ---
+        abs_error = np.abs(angle_error)
+        sq_error += np.sum(angle_error**2, axis=1)
+        samples += 1
+        outside = np.any(abs_error > settle_tolerance, axis=1)
+        last_outside = np.where(outside, i, last_outside)
+        overshoot = np.maximum(
+            overshoot, np.max(np.maximum(-initial_sign * angle_error, 0.0), axis=1)
+        )
+
+        # --- PTZServo.control ---
+        error = angle_error * error_scale
+        dt = now - servo_last
+        servo_last[:] = now
+        dt = np.where(dt < _SERVO_MIN_DT, _SERVO_FALLBACK_DT, dt)
+        dt = np.minimum(dt, _SERVO_MAX_DT)[:, None]
+        error = np.where(np.abs(error) < dead_band, 0.0, error)
+        integral = np.clip(integral + error * dt, -i_limit, i_limit)
+        output = kp * error + ki * integral + kd * (error - last_error) / dt
+        output = np.clip(output, -1.0, 1.0)
+        last_error = error
+
+        # --- main(): continuous_move unless both outputs are zero ---
+        stop = np.all(output == 0.0, axis=1)
+        cmd = np.round(_ramp(output, last_cmd, plant.ramp_rate), 2)
+        changed = np.any(np.abs(cmd - last_cmd) >= _MOVE_THRESHOLD, axis=1)
+        new_cmd = np.where(changed[:, None], cmd, last_cmd)
+        new_cmd = np.where(stop[:, None], 0.0, new_cmd)
+        jitter_sq += np.sum((new_cmd - last_cmd) ** 2, axis=1)
+
+        sim_dt = now - sim_last
+        sim_dt = np.where(sim_dt <= 0, _SIM_FALLBACK_DT, sim_dt)
+        sim_dt = np.minimum(sim_dt, _SIM_MAX_DT)
+        sim_last = np.where(stop, sim_last, now)
+        moved_vel = _accel(new_cmd, vel, (plant.accel * sim_dt)[:, None])
+        moved_pos = np.clip(
+            pos + moved_vel * rates[None, :] * sim_dt[:, None],
+            plant.pos_min,
+            plant.pos_max,
+        )
+
+        vel = np.where(stop[:, None], 0.0, moved_vel)
+        pos = np.where(stop[:, None], pos, moved_pos)
+        last_cmd = new_cmd
+        if commands is not None:
+            commands[i] = new_cmd
+
+    duration = float(trajectory.ts[-1] - trajectory.ts[0])
+    settle_index = last_outside + 1
+    settling = np.where(
+        last_outside >= steps - 1,
+        np.inf,
+        np.where(
+            last_outside < 0,
+            0.0,
+            trajectory.ts[np.minimum(settle_index, steps - 1)] - trajectory.ts[0],
+        ),
+    )
+    metrics = Metrics(
+        rms_error=np.sqrt(sq_error / np.maximum(samples, 1) / 2.0),
+        settling_s=settling,
+        overshoot=overshoot,
+        jitter=np.sqrt(jitter_sq / max(duration, 1e-9)),
+    )
+    return SimulationResult(metrics=metrics, final_position=pos, commands=commands)
+
+
+@dataclass(slots=True)
+class TuningResult:
+    """Candidates ranked by mean cost over all trajectories."""
+
+    candidates: Candidates
+    cost: np.ndarray
+    metrics: list[Metrics]
+    order: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.order = np.argsort(self.cost, kind="stable")
+
+    def best(self, k: int = 3) -> list[tuple[PIDGains, dict[str, float]]]:
+        out: list[tuple[PIDGains, dict[str, float]]] = []
+        for index in self.order[:k]:
+            summary = {"cost": float(self.cost[index])}
+            for name in ("rms_error", "settling_s", "overshoot", "jitter"):
+                summary[name] = float(
+                    np.mean([getattr(m, name)[index] for m in self.metrics])
+                )
+            out.append((self.candidates.gains(int(index)), summary))
+        return out
+
+
+def tune(
+    candidates: Candidates,
+    trajectories: Sequence[Trajectory],
+    plant: PlantModel | None = None,
+    **cost_weights: float,
+) -> TuningResult:
+    """Simulate every candidate on every trajectory and rank by mean cost."""
+    if not trajectories:
+        msg = "At least one trajectory is required"
+        raise ValueError(msg)
+    metrics = [simulate(candidates, t, plant).metrics for t in trajectories]
+    cost = np.mean([m.cost(**cost_weights) for m in metrics], axis=0)
+    return TuningResult(candidates=candidates, cost=cost, metrics=metrics)
+
+
+def format_presets(
+    best: Sequence[tuple[PIDGains, dict[str, float]]], prefix: str = "GAINS_TUNED"
+) -> str:
+    """Python preset lines to paste next to ``GAINS_BALANCED`` in ``ptz_servo.py``."""
+    lines = []
+    for rank, (gains, summary) in enumerate(best, start=1):
+        lines.append(
+            f"{prefix}_{rank} = PIDGains(kp={gains.kp:.3f}, ki={gains.ki:.3f}, "
+            f"kd={gains.kd:.3f}, integral_limit={gains.integral_limit:.3f}, "
+            f"dead_band={gains.dead_band:.4f})  "
+            f"# rms={summary['rms_error']:.4f} settle={summary['settling_s']:.2f}s "
+            f"overshoot={summary['overshoot']:.4f} jitter={summary['jitter']:.4f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Tune PTZ PID gains against recorded or synthetic trajectories"
+    )
+    parser.add_argument(
+        "trajectories",
+        nargs="*",
+        type=Path,
+        help="Recorded trajectory .npz files (default: synthetic step + sweep)",
+    )
+    parser.add_argument("--config", type=Path, default=None, help="config.yaml path")
+    parser.add_argument("--samples", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=3)
+    parser.add_argument("--fov", type=float, default=0.5)
+    parser.add_argument(
+        "--zoom", type=float, default=0.0, help="Normalized zoom level to tune at"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the ranking as JSON here"
+    )
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.config)
+    plant = PlantModel.from_settings(settings, fov=args.fov, zoom_level=args.zoom)
+    if args.trajectories:
+        trajectories = [trajectory_from_npz(p, fov=args.fov) for p in args.trajectories]
+    else:
+        trajectories = [step_trajectory(), sweep_trajectory()]
+    candidates = random_candidates(args.samples, seed=args.seed)
+    result = tune(candidates, trajectories, plant)
+    best = result.best(args.top)
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        payload = [
+            {"gains": {name: getattr(g, name) for name in GAIN_FIELDS}, **summary}
+            for g, summary in best
+        ]
+        args.output.write_text(json.dumps(payload, indent=2) + "\n")
+    sys.stdout.write(format_presets(best) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+"""Overlay rendering decoupled from the control loop.
+
+Drawing the overlay and pushing it through ``cv2.imshow``/``waitKey`` costs
+several milliseconds per frame. ``main()`` pays that cost on the thread that
+also steers the camera. The loop now publishes an ``OverlaySnapshot`` per
+frame and ``OverlayRenderer`` decides what happens to it
+(``performance.display``):
+
+* ``inline``: draw and show immediately on the calling thread (previous
+  behaviour).
+* ``threaded``: a background thread draws the most recent snapshot at up to
+  ``performance.display_max_fps``; older snapshots are dropped unseen.
+* ``headless``: nothing is drawn or shown and no window is opened.
+
+Key presses and window closes are collected by whichever thread owns the
+window; the control loop reads them with ``poll_key()`` and ``closed``.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from src.tracking.state import TrackingPhase
+
+DisplayMode = Literal["inline", "threaded", "headless"]
+
+
+@dataclass(slots=True)
+class OverlaySnapshot:
+    """State needed to draw one frame, as published by the control loop.
+
+    The renderer draws on ``frame`` and ``orig_frame`` in place. The publisher
+    must not reuse them afterwards.
+
+    ``phase`` and ``target_id`` mirror ``TrackerStatus``, so a snapshot can be
+    passed wherever the drawing helpers expect one.
+    """
+
+    frame: np.ndarray
+    tracked_boxes: Any
+    fps: float
+    proc_time: float
+    last_ptz_command: str
+    coverage: float
+    frame_index: int
+    phase: TrackingPhase
+    target_id: int | None
+    input_mode: bool = False
+    input_buf: str = ""
+    orig_frame: np.ndarray | None = None
+    viewport_rect: tuple[int, int, int, int] | None = None
+    target_bbox: tuple[int, int, int, int] | None = None
+
+
+class OverlayRenderer:
+    """Show overlay snapshots inline, from a background thread, or not at all.
+
+    Args:
+        render: Draws a snapshot and returns ``{window_name: image}``.
+        mode: See the module docstring.
+        max_fps: Display rate cap in ``threaded`` mode.
+        window: Main window; closing it sets ``closed``.
+        name: Thread name.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[OverlaySnapshot], dict[str, np.ndarray]],
+        *,
+        mode: DisplayMode = "inline",
+        max_fps: float = 15.0,
+        window: str = "Detection",
+        name: str = "overlay-renderer",
+    ) -> None:
+        self.render = render
+        self.mode = mode
+        self.period_s = 1.0 / max_fps
+        self.window = window
+        self.rendered = 0
+        self.dropped = 0
+        self._latest: OverlaySnapshot | None = None
+        self._cond = threading.Condition()
+        self._keys: queue.SimpleQueue[int] = queue.SimpleQueue()
+        self._shown = False
+        self._closed = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    @property
+    def headless(self) -> bool:
+        return self.mode == "headless"
+
+    @property
+    def closed(self) -> bool:
+        """True once the main window has been closed by the user."""
+        return self._closed.is_set()
+
+    def start(self) -> None:
+        """Start the render thread (``threaded`` mode only)."""
+        if self.mode == "threaded" and not self._thread.is_alive():
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        """Stop rendering and close any windows."""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        elif self.mode == "inline":
+            cv2.destroyAllWindows()
+
+    def publish(self, snapshot: OverlaySnapshot) -> None:
+        """Hand over the latest frame state; never blocks in ``threaded`` mode."""
+        if self.mode == "headless":
+            return
+        if self.mode == "inline":
+            self._show(snapshot)
+            self._pump_events()
+            return
+        with self._cond:
+            if self._latest is not None:
+                self.dropped += 1
+            self._latest = snapshot
+            self._cond.notify()
+
+    def poll_key(self) -> int | None:
+        """Next key pressed in the window, if any."""
+        try:
+            return self._keys.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _show(self, snapshot: OverlaySnapshot) -> None:
+        for name, image in self.render(snapshot).items():
+            cv2.imshow(name, image)
+        self._shown = True
+        self.rendered += 1
+
+    def _pump_events(self) -> None:
+        key = cv2.waitKey(1) & 0xFF
+        if key != 0xFF:
+            self._keys.put(key)
+        if self._shown and cv2.getWindowProperty(self.window, cv2.WND_PROP_VISIBLE) < 1:
+            self._closed.set()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop_event.is_set():
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._latest is not None or self._stop_event.is_set(),
+                        timeout=self.period_s,
+                    )
+                    snapshot, self._latest = self._latest, None
+                started = time.monotonic()
+                if snapshot is not None:
+                    try:
+                        self._show(snapshot)
+                    except Exception as e:
+                        logger.error(f"Overlay rendering failed: {e}")
+                self._pump_events()
+                remaining = self.period_s - (time.monotonic() - started)
+                if remaining > 0:
+                    self._stop_event.wait(remaining)
+        finally:
+            cv2.destroyAllWindows()
@@ -0,0 +1,459 @@
+"""Deterministic offline replay of recorded sessions.
+
+A recording is a video file plus an optional timestamps CSV sidecar::
+
+    frame_index,ts_unix_ms[,pan,tilt,zoom]
+
+Frames are pushed through the same pipeline a live session runs
+(``DetectionManager`` -> ``AnalyticsEngine`` -> PTZ control ->
+``TrackLifecycle``) as fast as possible, with a ``VirtualClock`` following the
+recorded timestamps so time-dependent logic behaves as it did live. PTZ is
+always ``SimulatedPTZService``; when the sidecar carries pan/tilt/zoom columns
+the simulator is pinned to the recorded position before each frame.
+
+The result is a ``ReplayReport`` with throughput and per-stage timings, so the
+pipeline can be benchmarked on CPU-only CI machines::
+
+    python -m src.replay recording.mp4 --timestamps recording.csv --output report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from src.analytics.engine import AnalyticsEngine
+from src.analytics.events import TrackLifecycle
+from src.analytics.metadata import MetadataBuilder
+from src.clock import VirtualClock
+from src.detection_manager import DetectionManager, DetectionMode
+from src.ptz_simulator import SimulatedPTZService
+from src.settings import Settings, load_settings
+from src.tracking.acquisition import SnapAcquisition
+from src.tracking.control import (
+    extract_pixel_coords,
+    normalized_zoom,
+    proportional_command,
+)
+from src.tracking.state import TrackerStatus, TrackingPhase
+
+STAGES: tuple[str, ...] = ("decode", "detect", "track", "ptz", "metadata", "events")
+
+DEFAULT_FPS = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedFrame:
+    """Timing (and optional PTZ position) recorded alongside one video frame."""
+
+    index: int
+    ts_unix_ms: int
+    ptz: tuple[float, float, float] | None = None
+
+
+def load_timestamps(path: Path) -> list[RecordedFrame]:
+    """Read a timestamps CSV sidecar, ordered by frame index."""
+    frames: list[RecordedFrame] = []
+    with Path(path).open(newline="") as fh:
+        reader = csv.DictReader(fh)
+        fieldnames = set(reader.fieldnames or ())
+        missing = {"frame_index", "ts_unix_ms"} - fieldnames
+        if missing:
+            msg = f"{path}: missing column(s) {sorted(missing)}"
+            raise ValueError(msg)
+        has_ptz = {"pan", "tilt", "zoom"} <= fieldnames
+        for row in reader:
+            ptz = None
+            if has_ptz and row["pan"] != "":
+                ptz = (float(row["pan"]), float(row["tilt"]), float(row["zoom"]))
+            frames.append(
+                RecordedFrame(
+                    index=int(row["frame_index"]),
+                    ts_unix_ms=int(float(row["ts_unix_ms"])),
+                    ptz=ptz,
+                )
+            )
+    frames.sort(key=lambda f: f.index)
+    return frames
+
+
+def iter_recording(
+    video_path: Path,
+    timestamps: list[RecordedFrame] | None = None,
+    *,
+    start_ts_unix_ms: int = 0,
+) -> Iterator[tuple[RecordedFrame, np.ndarray]]:
+    """Yield ``(RecordedFrame, frame)`` pairs from a video file.
+
+    Without ``timestamps`` the video's own frame rate is used to synthesize
+    them starting at ``start_ts_unix_ms``. With ``timestamps``, iteration stops
+    at whichever of the video and the sidecar ends first.
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        msg = f"Failed to open recording: {video_path}"
+        raise ValueError(msg)
+    fps = cap.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS
+    by_index = {f.index: f for f in timestamps} if timestamps is not None else None
+    try:
+        index = 0
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                return
+            if by_index is None:
+                recorded = RecordedFrame(
+                    index=index, ts_unix_ms=start_ts_unix_ms + round(index * 1000 / fps)
+                )
+            else:
+                recorded = by_index.get(index)
+                if recorded is None:
+                    return
+            yield recorded, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+@dataclass(slots=True)
+class StageTimer:
+    """Collects wall-clock durations per pipeline stage."""
+
+    samples: dict[str, list[float]] = field(
+        default_factory=lambda: {stage: [] for stage in STAGES}
+    )
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        out: dict[str, dict[str, float]] = {}
+        for stage, values in self.samples.items():
+            if not values:
+                continue
+            ms = np.asarray(values, dtype=np.float64) * 1000.0
+            out[stage] = {
+                "mean_ms": round(float(ms.mean()), 4),
+                "p50_ms": round(float(np.percentile(ms, 50)), 4),
+                "p95_ms": round(float(np.percentile(ms, 95)), 4),
+                "max_ms": round(float(ms.max()), 4),
+                "total_ms": round(float(ms.sum()), 4),
+            }
+        return out
+
+
+@dataclass(slots=True)
+class ReplayReport:
+    """Outcome of one replay run."""
+
+    frames: int
+    wall_s: float
+    media_s: float
+    stages: dict[str, dict[str, float]]
+    events: dict[str, int]
+    tracks: int
+    tracking_frames: int
+    ptz_source: str
+    final_ptz: dict[str, float]
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Recorded duration divided by processing time (>1 is faster than live)."""
+        return self.media_s / self.wall_s if self.wall_s > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "wall_s": round(self.wall_s, 4),
+            "media_s": round(self.media_s, 4),
+            "fps": round(self.fps, 2),
+            "realtime_factor": round(self.realtime_factor, 2),
+            "stages": self.stages,
+            "events": dict(self.events),
+            "tracks": self.tracks,
+            "tracking_frames": self.tracking_frames,
+            "ptz_source": self.ptz_source,
+            "final_ptz": self.final_ptz,
+        }
+
+
+def _class_names_list(class_names: dict[int, str] | None) -> list[str]:
+    if not class_names:
+        return ["target"]
+    max_id = max(class_names)
+    labels = [str(i) for i in range(max_id + 1)]
+    for cls_id, name in class_names.items():
+        if 0 <= cls_id <= max_id:
+            labels[cls_id] = str(name)
+    return labels
+
+
+def _best_track_id(boxes: list[Any]) -> int | None:
+    best_id: int | None = None
+    best_conf = -1.0
+    for box in boxes:
+        track_id = getattr(box, "id", None)
+        if track_id is None:
+            continue
+        if hasattr(track_id, "item"):
+            track_id = track_id.item()
+        conf = getattr(box, "conf", 0.0)
+        conf = float(conf.item() if hasattr(conf, "item") else conf)
+        if conf > best_conf:
+            best_id, best_conf = int(track_id), conf
+    return best_id
+
+
+@dataclass(slots=True)
+class ReplayEngine:
+    """Runs a recording through the analytics/PTZ pipeline under a virtual clock.
+
+    Args:
+        settings: Pipeline settings (detection, tracking and PTZ gains).
+        camera_id: Camera id stamped on ticks and events.
+        auto_target: Lock onto the highest-confidence track whenever no target is
+            selected, so PTZ control is exercised without an operator.
+        detection_manager: Pre-built manager (its services must be started);
+            by default one is created with inputs disabled.
+    """
+
+    settings: Settings
+    camera_id: str = "replay"
+    auto_target: bool = True
+    detection_manager: DetectionManager | None = None
+    clock: VirtualClock = field(init=False, repr=False)
+    ptz: SimulatedPTZService = field(init=False, repr=False)
+    _owns_manager: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.detection_manager is None:
+            self.detection_manager = DetectionManager(settings=self.settings)
+            self.detection_manager.start(start_inputs=False)
+            self._owns_manager = True
+
+    def run(
+        self,
+        frames: Iterable[tuple[RecordedFrame, np.ndarray]],
+        *,
+        max_frames: int | None = None,
+    ) -> ReplayReport:
+        manager = self.detection_manager
+        assert manager is not None
+        mode: DetectionMode = manager.get_tracking_priority()
+        service = manager.get_service(mode)
+        if service is None:
+            msg = f"Detection pipeline '{mode}' is not enabled"
+            raise ValueError(msg)
+        class_names = _class_names_list(service.get_class_names())
+
+        tracker_status = TrackerStatus(
+            loss_grace_s=self.settings.tracking.end_after_ms / 1000.0
+        )
+        analytics = AnalyticsEngine(
+            detection=service,
+            metadata=MetadataBuilder(session_id="replay", camera_id=self.camera_id),
+            tracker_status=tracker_status,
+        )
+        lifecycle = TrackLifecycle(
+            session_id="replay",
+            camera_id=self.camera_id,
+            confirm_after=self.settings.tracking.confirm_after,
+            end_after_ms=self.settings.tracking.end_after_ms,
+        )
+
+        timer = StageTimer()
+        events: Counter[str] = Counter()
+        track_ids: set[int] = set()
+        tracking_frames = 0
+        count = 0
+        first_ts: int | None = None
+        last_ts = 0
+        used_recorded_ptz = False
+        self.clock = VirtualClock()
+        self.ptz = SimulatedPTZService(settings=self.settings, clock=self.clock)
+        clock, ptz = self.clock, self.ptz
+        acquisition = SnapAcquisition(self.settings, clock=clock)
+
+        iterator = iter(frames)
+        started = time.perf_counter()
+        while max_frames is None or count < max_frames:
+            t0 = time.perf_counter()
+            try:
+                recorded, frame = next(iterator)
+            except StopIteration:
+                break
+            t1 = time.perf_counter()
+            timer.record("decode", t1 - t0)
+
+            if first_ts is None:
+                first_ts = recorded.ts_unix_ms
+                # The recording defines the time base; start the PTZ model there.
+                self.clock = clock = VirtualClock(start=first_ts / 1000.0)
+                self.ptz = ptz = SimulatedPTZService(settings=self.settings, clock=clock)
+                tracker_status.clock = clock
+                acquisition.clock = clock
+            # Recordings occasionally carry out-of-order stamps; never rewind.
+            now = clock.set(max(clock.time(), recorded.ts_unix_ms / 1000.0))
+            last_ts = recorded.ts_unix_ms
+
+            if recorded.ptz is not None:
+                # Pin the pose the frame was captured at (also feeds motion
+                # compensation in the detection manager).
+                used_recorded_ptz = True
+                ptz.pan_pos, ptz.tilt_pos, ptz.zoom_level = recorded.ptz
+
+            manager.submit_frame(mode, frame, capture_ts=now)
+            results = manager.get_detections(now=now, ptz=ptz)
+            result = next((r for r in results if r.mode == mode), None)
+            boxes = list(result.boxes) if result is not None else []
+            frame_h, frame_w = frame.shape[:2]
+            t2 = time.perf_counter()
+            timer.record("detect", t2 - t1)
+
+            if self.auto_target and tracker_status.target_id is None:
+                target_id = _best_track_id(boxes)
+                if target_id is not None:
+                    tracker_status.set_target(target_id, now=now)
+            best_det = analytics.update_tracking(boxes, now=now)
+            acquisition.observe(tracker_status.phase, tracker_status.target_id)
+            t3 = time.perf_counter()
+            timer.record("track", t3 - t2)
+
+            if tracker_status.phase == TrackingPhase.TRACKING:
+                tracking_frames += 1
+                if best_det is not None:
+                    bbox = extract_pixel_coords(best_det, frame_w, frame_h)
+                    if not acquisition.update(ptz, bbox, frame_w, frame_h):
+                        ptz.continuous_move(
+                            *proportional_command(
+                                bbox,
+                                frame_w,
+                                frame_h,
+                                self.settings,
+                                zoom_level=normalized_zoom(ptz),
+                            )
+                        )
+                else:
+                    ptz.stop()
+            elif ptz.active:
+                ptz.stop()
+            if self.auto_target and tracker_status.phase == TrackingPhase.LOST:
+                tracker_status.clear_target()
+            t4 = time.perf_counter()
+            timer.record("ptz", t4 - t3)
+
+            tick = analytics.build_tick(
+                boxes,
+                frame_index=recorded.index,
+                frame_w=frame_w,
+                frame_h=frame_h,
+                class_names=class_names,
+                ptz=ptz,
+                ts_unix_ms=recorded.ts_unix_ms,
+                ts_mono_ms=int(clock.monotonic() * 1000),
+            )
+            t5 = time.perf_counter()
+            timer.record("metadata", t5 - t4)
+
+            for event in lifecycle.update(
+                tracks=tick["tracks"], ts_unix_ms=tick["ts_unix_ms"]
+            ):
+                events[event["event"]] += 1
+                track_ids.add(int(event["after"]["id"]))
+            timer.record("events", time.perf_counter() - t5)
+            count += 1
+
+        wall_s = time.perf_counter() - started
+        return ReplayReport(
+            frames=count,
+            wall_s=wall_s,
+            media_s=(last_ts - first_ts) / 1000.0 if first_ts is not None else 0.0,
+            stages=timer.summary(),
+            events=dict(events),
+            tracks=len(track_ids),
+            tracking_frames=tracking_frames,
+            ptz_source="recorded" if used_recorded_ptz else "simulated",
+            final_ptz={
+                "pan": round(ptz.pan_pos, 6),
+                "tilt": round(ptz.tilt_pos, 6),
+                "zoom": round(ptz.zoom_level, 6),
+            },
+        )
+
+    def close(self) -> None:
+        if self._owns_manager and self.detection_manager is not None:
+            self.detection_manager.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded session through the analytics pipeline"
+    )
+    parser.add_argument("video", type=Path, help="Recorded video file")
+    parser.add_argument(
+        "--timestamps",
+        type=Path,
+        default=None,
+        help="CSV sidecar: frame_index,ts_unix_ms[,pan,tilt,zoom]",
+    )
+    parser.add_argument("--config", type=Path, default=None, help="config.yaml path")
+    parser.add_argument("--camera-id", default="replay")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument(
+        "--no-auto-target",
+        action="store_true",
+        help="Do not lock onto a target automatically (PTZ stays idle)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the JSON report here"
+    )
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.config)
+    timestamps = load_timestamps(args.timestamps) if args.timestamps else None
+    engine = ReplayEngine(
+        settings=settings,
+        camera_id=args.camera_id,
+        auto_target=not args.no_auto_target,
+    )
+    try:
+        report = engine.run(
+            iter_recording(args.video, timestamps), max_frames=args.max_frames
+        )
+    finally:
+        engine.close()
+
+    payload = json.dumps(report.to_dict(), indent=2)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload + "\n")
+        logger.info("Replay report written to {}", args.output)
+    sys.stdout.write(payload + "\n")
+    logger.info(
+        "Replayed {} frames in {:.2f}s ({:.1f} fps, {:.1f}x real time)",
+        report.frames,
+        report.wall_s,
+        report.fps,
+        report.realtime_factor,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
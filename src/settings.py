@@ -94,6 +94,10 @@ class LoggingSettings(BaseModel):
     log_diagnose: bool = True
     write_log_file: bool = True
     reset_log_on_start: bool = True
+    # Write the log file as one JSON object per line (format is ignored)
+    log_json: bool = False
+    # Per-call-site cap for hot_log lines in the frame loops (0: no cap)
+    hot_path_max_per_s: float = Field(default=1.0, ge=0.0)
 
     model_config = ConfigDict(extra="ignore")
 
@@ -104,11 +108,27 @@ class BackupSettings(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
 
+class SyntheticSceneConfig(BaseModel):
+    """Generated scene for source="synthetic" (see src/synthetic_scene.py)."""
+
+    targets: int = Field(default=5, ge=0)
+    style: Literal["drone", "thermal"] = "drone"
+    min_size: int = Field(default=12, gt=0)
+    max_size: int = Field(default=48, gt=0)
+    max_speed: float = Field(default=200.0, ge=0.0)  # pixels per second
+    noise_std: float = Field(default=0.0, ge=0.0)
+    seed: int = 0
+    # False: deliver every frame in lockstep with detection instead of at fps
+    realtime: bool = True
+
+    model_config = ConfigDict(extra="ignore")
+
+
 class CameraSourceConfig(BaseModel):
     """Unified camera source configuration for any detection mode."""
 
-    # Source type: local camera, RTSP, WebRTC, or SkyShield reference
-    source: Literal["camera", "rtsp", "webrtc", "skyshield"] = "camera"
+    # Source type: local camera, RTSP, WebRTC, SkyShield reference, or generated
+    source: Literal["camera", "rtsp", "webrtc", "skyshield", "synthetic"] = "camera"
 
     # For source="camera" (local device)
     camera_index: int = Field(default=0, ge=0)
@@ -123,6 +143,9 @@ class CameraSourceConfig(BaseModel):
     # WebRTC URL is derived: http://{skyshield_host}:8889/camera_{id}/
     skyshield_camera_id: int | None = None
 
+    # For source="synthetic"
+    synthetic: SyntheticSceneConfig = Field(default_factory=SyntheticSceneConfig)
+
     # Resolution & FPS
     resolution_width: int = Field(default=1280, gt=0)
     resolution_height: int = Field(default=720, gt=0)
@@ -150,6 +173,8 @@ class CameraSourceConfig(BaseModel):
             return f"webrtc:{self.webrtc_url}"
         if self.source == "skyshield":
             return f"skyshield:{self.skyshield_camera_id}"
+        if self.source == "synthetic":
+            return f"synthetic:{self.synthetic.seed}"
         return "unknown"
 
 
@@ -191,6 +216,16 @@ class SecondaryDetectionConfig(BaseModel):
         return value
 
 
+class FOVSample(BaseModel):
+    """Measured field of view at one normalized zoom level (see ptz_calibration)."""
+
+    zoom: float = Field(ge=0.0, le=1.0)
+    pan: float = Field(gt=0.0)
+    tilt: float = Field(gt=0.0)
+
+    model_config = ConfigDict(extra="ignore")
+
+
 class PTZSettings(BaseModel):
     ptz_movement_gain: float = Field(default=2.0, ge=0)
     ptz_movement_threshold: float = Field(default=0.05, ge=0.0, le=1.0)
@@ -212,6 +247,33 @@ class PTZSettings(BaseModel):
     invert_tilt: bool = False
     enable_zoom_compensation: bool = True
     zoom_max_magnification: float = Field(default=20.0, ge=1.0)
+    # Field of view at the widest zoom, in normalized pan/tilt position units
+    fov_pan: float = Field(default=0.5, gt=0.0, le=2.0)
+    fov_tilt: float = Field(default=0.3, gt=0.0, le=2.0)
+    # Calibrated FOV per zoom level; empty falls back to fov_pan/fov_tilt
+    # divided by the linear zoom_max_magnification model
+    fov_table: list[FOVSample] = Field(default_factory=list)
+    # Pose units per second at full continuous-move velocity; dead-reckons the
+    # pose between position polls for ptz motion compensation
+    pan_rate: float = Field(default=2.0, gt=0.0)
+    tilt_rate: float = Field(default=2.0, gt=0.0)
+    # "predictive" leads the target by the measured pipeline latency (main()
+    # only; API sessions always use proportional control)
+    control_strategy: Literal["pid", "predictive"] = "pid"
+    prediction_window_s: float = Field(default=0.5, gt=0.0)
+    prediction_max_lead_s: float = Field(default=0.5, ge=0.0)
+    actuation_latency_s: float = Field(default=0.1, ge=0.0)
+    # "snap" slews onto a newly locked target with one absolute move
+    acquisition_mode: Literal["continuous", "snap"] = "continuous"
+    acquisition_zoom: bool = False
+    acquisition_min_offset: float = Field(default=0.1, ge=0.0, le=0.5)
+    acquisition_settle_s: float = Field(default=0.3, ge=0.0)
+    # "threaded" runs the servo in its own fixed-rate thread between detections
+    control_loop: Literal["inline", "threaded"] = "inline"
+    control_rate_hz: float = Field(default=50.0, gt=0.0, le=200.0)
+    estimator_alpha: float = Field(default=0.5, gt=0.0, le=1.0)
+    estimator_beta: float = Field(default=0.1, ge=0.0, le=2.0)
+    estimate_timeout_s: float = Field(default=0.5, gt=0.0)
 
     model_config = ConfigDict(extra="ignore")
 
@@ -221,6 +283,17 @@ class PerformanceSettings(BaseModel):
     zoom_dead_zone: float = Field(default=0.03, ge=0.0, le=1.0)
     frame_queue_maxsize: int = Field(default=1, gt=0)
     publish_hz: float = Field(default=10.0, ge=1.0, le=60.0)
+    # In WebSocket delta mode, send a full keyframe every N messages.
+    delta_keyframe_interval: int = Field(default=50, ge=1)
+    # "threaded" draws off the control thread; "headless" never opens a window
+    display: Literal["inline", "threaded", "headless"] = "inline"
+    display_max_fps: float = Field(default=15.0, gt=0.0, le=120.0)
+    # Annotated MJPEG preview served by the API (encoded only while watched)
+    preview_max_width: int = Field(default=640, ge=64)
+    preview_max_fps: float = Field(default=5.0, gt=0.0, le=30.0)
+    preview_jpeg_quality: int = Field(default=70, ge=1, le=100)
+    # Hot-path timing spans (GET/POST /debug/spans toggles them at runtime)
+    timing_spans: bool = False
 
     model_config = ConfigDict(extra="ignore")
 
@@ -235,6 +308,7 @@ class SimulatorSettings(BaseModel):
     sim_zoom_step: float = Field(default=0.1, ge=0.0)
     sim_zoom_min_scale: float = Field(default=0.3, ge=0.0, le=1.0)
     sim_draw_original_viewport_box: bool = True
+    sim_show_original: bool = True
 
     model_config = ConfigDict(extra="ignore")
 
@@ -306,6 +380,10 @@ class TrackingConfig(BaseModel):
     # Ultralytics YOLO Tracker Selection
     tracker_type: Literal["botsort", "bytetrack"] = "bytetrack"
 
+    # Camera-motion compensation applied to track predictions before association
+    motion_compensation: Literal["none", "ptz", "optical_flow"] = "ptz"
+    flow_max_width: int = Field(default=160, ge=32)
+
     # Timeline settings
     confirm_after: int = Field(default=2, ge=1)
     end_after_ms: int = Field(default=1000, ge=0)
@@ -313,6 +391,29 @@ class TrackingConfig(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
 
+class EventStoreSettings(BaseModel):
+    """Persistent track event history (SQLite)."""
+
+    enabled: bool = True
+    path: str = "data/events.sqlite3"
+    retention_days: float = Field(default=30.0, gt=0.0)
+    batch_size: int = Field(default=256, ge=1)
+    flush_interval_s: float = Field(default=1.0, gt=0.0)
+    queue_maxsize: int = Field(default=10_000, ge=1)
+
+    model_config = ConfigDict(extra="ignore")
+
+
+class TrajectorySettings(BaseModel):
+    """Per-track trajectory recording (.npz per track)."""
+
+    enabled: bool = False
+    output_dir: str = "data/trajectories"
+    max_samples_per_track: int = Field(default=100_000, ge=1)
+
+    model_config = ConfigDict(extra="ignore")
+
+
 class Settings(BaseSettings):
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
     backups: BackupSettings = Field(default_factory=BackupSettings)
@@ -330,6 +431,8 @@ class Settings(BaseSettings):
     performance: PerformanceSettings = Field(default_factory=PerformanceSettings)
     simulator: SimulatorSettings = Field(default_factory=SimulatorSettings)
     tracking: TrackingConfig = Field(default_factory=TrackingConfig)
+    event_store: EventStoreSettings = Field(default_factory=EventStoreSettings)
+    trajectory: TrajectorySettings = Field(default_factory=TrajectorySettings)
     octagon: OctagonSettings = Field(default_factory=OctagonSettings)
     octagon_devices: OctagonDevices = Field(default_factory=OctagonDevices)
 
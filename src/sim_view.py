@@ -0,0 +1,120 @@
+"""Simulated PTZ viewport: crop the source frame to the virtual camera's view.
+
+Simulation mode is where tracking performance is benchmarked, so the viewport
+should cost as little as possible on top of what is being measured.
+``SimulatedViewport`` keeps the crop geometry while pan/tilt/zoom are
+unchanged and resizes into a preallocated output buffer. It picks the
+interpolation from the scale: a plain copy at 1:1, ``INTER_AREA`` for an exact
+2x downscale (as fast as linear there, and alias-free), ``INTER_LINEAR``
+otherwise. ``INTER_AREA`` at other ratios costs 5-7x more than linear.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import cv2
+import numpy as np
+
+from src.settings import Settings
+
+
+def viewport_rect(
+    frame_w: int,
+    frame_h: int,
+    pan: float,
+    tilt: float,
+    zoom: float,
+    zoom_min_scale: float,
+) -> tuple[int, int, int, int]:
+    """Crop ``(x1, y1, x2, y2)`` seen at ``pan``/``tilt`` in ``[-1, 1]`` and ``zoom`` in ``[0, 1]``."""
+    scale = 1.0 - zoom * (1.0 - zoom_min_scale)
+    crop_w = max(1, round(frame_w * scale))
+    crop_h = max(1, round(frame_h * scale))
+
+    cx = frame_w / 2 + pan * (frame_w / 2 - crop_w / 2)
+    cy = frame_h / 2 - tilt * (frame_h / 2 - crop_h / 2)
+
+    x1 = max(0, min(frame_w - crop_w, round(cx - crop_w / 2)))
+    y1 = max(0, min(frame_h - crop_h, round(cy - crop_h / 2)))
+    return x1, y1, min(frame_w, x1 + crop_w), min(frame_h, y1 + crop_h)
+
+
+def resize_interpolation(
+    src_size: tuple[int, int], dst_size: tuple[int, int]
+) -> int | None:
+    """Interpolation for resizing ``src_size`` to ``dst_size`` (None: plain copy)."""
+    if src_size == dst_size:
+        return None
+    if src_size == (dst_size[0] * 2, dst_size[1] * 2):
+        return cv2.INTER_AREA
+    return cv2.INTER_LINEAR
+
+
+class SimulatedViewport:
+    """Render the simulated PTZ view of source frames.
+
+    Args:
+        settings: Provides ``simulator.sim_zoom_min_scale`` and the output
+            resolution (``visible_detection.camera``).
+        reuse_output: Resize into one preallocated buffer. Each ``render``
+            then overwrites the previous view, so only enable this when the
+            caller is done with a view before rendering the next one.
+    """
+
+    def __init__(self, settings: Settings, *, reuse_output: bool = True) -> None:
+        camera = settings.visible_detection.camera
+        self.output_size = (camera.resolution_width, camera.resolution_height)
+        self.zoom_min_scale = settings.simulator.sim_zoom_min_scale
+        self.reuse_output = reuse_output
+        self._pose_key: tuple[Any, ...] | None = None
+        self._rect = (0, 0, 0, 0)
+        self._interpolation: int | None = None
+        self._buffer: np.ndarray | None = None
+
+    def render(
+        self, frame: np.ndarray, ptz: Any
+    ) -> tuple[np.ndarray, tuple[int, int, int, int]]:
+        """Return ``(view, viewport_rect)`` for ``ptz``'s current pose.
+
+        ``viewport_rect`` is ``(x1, y1, x2, y2)`` in ``frame`` coordinates.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        if hasattr(ptz, "zmin") and hasattr(ptz, "zmax"):
+            zoom = (ptz.zoom_level - ptz.zmin) / (ptz.zmax - ptz.zmin + 1e-6)
+        else:
+            zoom = 0.0
+        zoom = max(0.0, min(1.0, zoom))
+        pan = getattr(ptz, "pan_pos", 0.0)
+        tilt = getattr(ptz, "tilt_pos", 0.0)
+
+        pose_key = (frame_w, frame_h, pan, tilt, zoom)
+        if pose_key != self._pose_key:
+            self._rect = viewport_rect(
+                frame_w, frame_h, pan, tilt, zoom, self.zoom_min_scale
+            )
+            x1, y1, x2, y2 = self._rect
+            self._interpolation = resize_interpolation((x2 - x1, y2 - y1), self.output_size)
+            self._pose_key = pose_key
+
+        x1, y1, x2, y2 = self._rect
+        roi = frame[y1:y2, x1:x2]
+        out = self._output(frame)
+        if self._interpolation is None:
+            np.copyto(out, roi)
+        else:
+            cv2.resize(roi, self.output_size, dst=out, interpolation=self._interpolation)
+        return out, self._rect
+
+    def _output(self, frame: np.ndarray) -> np.ndarray:
+        out_w, out_h = self.output_size
+        shape = (out_h, out_w, *frame.shape[2:])
+        if not self.reuse_output:
+            return np.empty(shape, dtype=frame.dtype)
+        if (
+            self._buffer is None
+            or self._buffer.shape != shape
+            or self._buffer.dtype != frame.dtype
+        ):
+            self._buffer = np.empty(shape, dtype=frame.dtype)
+        return self._buffer
@@ -0,0 +1,150 @@
+"""Cached, pre-rendered text for overlay drawing.
+
+Anti-aliased ``cv2.putText`` rasterizes the glyph outlines on every call, and
+the overlay draws about twenty mostly unchanging lines per frame (model path,
+resolution, camera index, PTZ status). ``TextSpriteCache`` rasterizes each
+distinct ``(text, font, scale, color, thickness)`` once into a sprite: the
+premultiplied color plus the inverse alpha mask. Drawing is then two saturated
+uint8 operations on the text's bounding box, and the text size comes for free.
+The result matches ``putText`` to within one intensity level.
+
+Lines whose text changes every frame (frame counter, FPS) miss the cache and
+cost one extra rasterization into a small buffer. A bounded LRU keeps them
+from growing the cache.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+DEFAULT_FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+@dataclass(frozen=True, slots=True)
+class TextSprite:
+    """Rasterized text, positioned relative to the ``putText`` origin.
+
+    Attributes:
+        premultiplied: ``color * alpha`` per pixel (HxWx3 uint8).
+        inverse_alpha: ``255 - alpha`` per pixel and channel (HxWx3 uint8).
+        offset: Top-left corner relative to the text origin (bottom-left of
+            the baseline), as ``(dx, dy)``.
+        size: ``(width, height)`` as reported by ``cv2.getTextSize``.
+        baseline: Baseline as reported by ``cv2.getTextSize``.
+    """
+
+    premultiplied: np.ndarray
+    inverse_alpha: np.ndarray
+    offset: tuple[int, int]
+    size: tuple[int, int]
+    baseline: int
+
+
+def render_sprite(
+    text: str,
+    font_scale: float,
+    color: tuple[int, int, int],
+    thickness: int,
+    font: int = DEFAULT_FONT,
+) -> TextSprite:
+    """Rasterize ``text`` the way ``cv2.putText(..., cv2.LINE_AA)`` would."""
+    (width, height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+    pad = thickness + 1
+    mask = np.zeros((height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8)
+    cv2.putText(mask, text, (pad, pad + height), font, font_scale, 255, thickness, cv2.LINE_AA)
+    alpha = cv2.merge((mask, mask, mask))
+    solid = np.empty_like(alpha)
+    solid[:] = color
+    return TextSprite(
+        premultiplied=cv2.multiply(solid, alpha, scale=1 / 255),
+        inverse_alpha=cv2.bitwise_not(alpha),
+        offset=(-pad, -pad - height),
+        size=(width, height),
+        baseline=baseline,
+    )
+
+
+def blit(frame: np.ndarray, sprite: TextSprite, org: tuple[int, int]) -> None:
+    """Alpha-blend ``sprite`` onto ``frame`` in place, clipped to the frame."""
+    sprite_h, sprite_w = sprite.inverse_alpha.shape[:2]
+    x0 = int(org[0]) + sprite.offset[0]
+    y0 = int(org[1]) + sprite.offset[1]
+    frame_h, frame_w = frame.shape[:2]
+    fx0, fy0 = max(x0, 0), max(y0, 0)
+    fx1, fy1 = min(x0 + sprite_w, frame_w), min(y0 + sprite_h, frame_h)
+    if fx0 >= fx1 or fy0 >= fy1:
+        return
+    sx0, sy0 = fx0 - x0, fy0 - y0
+    sx1, sy1 = sx0 + (fx1 - fx0), sy0 + (fy1 - fy0)
+    roi = frame[fy0:fy1, fx0:fx1]
+    cv2.multiply(roi, sprite.inverse_alpha[sy0:sy1, sx0:sx1], dst=roi, scale=1 / 255)
+    cv2.add(roi, sprite.premultiplied[sy0:sy1, sx0:sx1], dst=roi)
+
+
+class TextSpriteCache:
+    """Thread-safe LRU of ``TextSprite``s.
+
+    Args:
+        max_entries: Sprites kept before the least recently used is evicted.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._sprites: OrderedDict[tuple, TextSprite] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def sprite(
+        self,
+        text: str,
+        font_scale: float,
+        color: tuple[int, int, int],
+        thickness: int,
+        font: int = DEFAULT_FONT,
+    ) -> TextSprite:
+        """Return the cached sprite for this text and style, rendering it on a miss."""
+        color = (int(color[0]), int(color[1]), int(color[2]))
+        key = (text, font, float(font_scale), color, int(thickness))
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+                self.hits += 1
+                return sprite
+            self.misses += 1
+        # Rasterize outside the lock; a concurrent duplicate render is harmless
+        sprite = render_sprite(text, font_scale, color, thickness, font)
+        with self._lock:
+            self._sprites[key] = sprite
+            while len(self._sprites) > self.max_entries:
+                self._sprites.popitem(last=False)
+        return sprite
+
+    def put_text(
+        self,
+        frame: np.ndarray,
+        text: str,
+        org: tuple[int, int],
+        font_scale: float,
+        color: tuple[int, int, int],
+        thickness: int,
+        font: int = DEFAULT_FONT,
+    ) -> tuple[int, int]:
+        """Drop-in for ``cv2.putText(..., cv2.LINE_AA)``; returns the text size."""
+        sprite = self.sprite(text, font_scale, color, thickness, font)
+        blit(frame, sprite, org)
+        return sprite.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sprites.clear()
+            self.hits = self.misses = 0
@@ -18,6 +18,15 @@ import cv2
 import numpy as np
 from loguru import logger
 
+from src.tracking.motion_compensation import CameraMotion
+
+# Association gate: a detection may join a track whose (motion-compensated)
+# position is within max(_GATE_MIN_PX, _GATE_SIZE_RATIO * target size).
+_GATE_MIN_PX = 40.0
+_GATE_SIZE_RATIO = 1.5
+# Tracks unmatched for more than this many frames are dropped.
+_MAX_MISSED_FRAMES = 10
+
 
 class ThermalDetectionMethod(str, Enum):
     """Available thermal detection methods."""
@@ -156,6 +165,21 @@ class KalmanCentroidTracker:
 
         return (float(corrected[0, 0]), float(corrected[1, 0]))
 
+    def warp(self, affine: np.ndarray) -> None:
+        """Move the filter state by a 2x3 image affine (camera ego-motion).
+
+        Position is transformed fully; velocity only by the linear part.
+        """
+        if not self._initialized:
+            return
+        state = self.kf.statePost.astype(np.float64).reshape(4)
+        linear = affine[:, :2]
+        position = linear @ state[:2] + affine[:, 2]
+        velocity = linear @ state[2:]
+        self.kf.statePost = np.array(
+            [[position[0]], [position[1]], [velocity[0]], [velocity[1]]], dtype=np.float32
+        )
+
     def reset(self) -> None:
         """Reset the filter state."""
         self._initialized = False
@@ -224,6 +248,9 @@ class ThermalDetectionService:
         # Initialize Kalman trackers (one per tracked target, keyed by ID)
         self._kalman_trackers: dict[int, KalmanCentroidTracker] = {}
         self._next_track_id = 1
+        # Last known centroid and consecutive missed frames per track ID
+        self._track_centroids: dict[int, tuple[float, float]] = {}
+        self._track_misses: dict[int, int] = {}
 
         logger.info(
             "ThermalDetectionService initialized: method={}, use_otsu={}, min_area={}, use_kalman={}",
@@ -455,11 +482,15 @@ class ThermalDetectionService:
 
         return targets
 
-    def detect(self, frame: np.ndarray) -> list[ThermalTarget]:
+    def detect(
+        self, frame: np.ndarray, motion: CameraMotion | None = None
+    ) -> list[ThermalTarget]:
         """Detect thermal targets in a frame.
 
         Args:
             frame: Input frame (grayscale thermal image preferred).
+            motion: Camera ego-motion since the previous frame; existing tracks
+                are warped by it before association.
 
         Returns:
             List of detected ThermalTarget objects with centroids.
@@ -481,7 +512,7 @@ class ThermalDetectionService:
                 targets = self._detect_contour(gray, enhanced)
 
             # Assign track IDs and apply Kalman filtering
-            targets = self._apply_tracking(targets)
+            targets = self._apply_tracking(targets, motion)
 
             logger.debug(
                 "Thermal detection: method={}, targets={}",
@@ -495,22 +526,32 @@ class ThermalDetectionService:
             logger.error(f"Thermal detection failed: {e}")
             return []
 
-    def _apply_tracking(self, targets: list[ThermalTarget]) -> list[ThermalTarget]:
-        """Apply simple nearest-neighbor tracking and optional Kalman filtering.
+    def _apply_tracking(
+        self, targets: list[ThermalTarget], motion: CameraMotion | None = None
+    ) -> list[ThermalTarget]:
+        """Associate targets with existing tracks and apply optional Kalman filtering.
+
+        Track positions are first warped by ``motion`` so a camera slew does not
+        move targets out of their association gate. Detections are then matched
+        greedily to the nearest gated track; unmatched detections start new
+        tracks.
 
         Args:
             targets: Detected targets without track IDs.
+            motion: Camera ego-motion since the previous frame.
 
         Returns:
             Targets with assigned track IDs and smoothed centroids.
         """
-        if not targets:
-            return []
+        if motion is not None and not motion.is_identity():
+            self._warp_tracks(motion)
 
-        # Simple approach: assign sequential IDs for now
-        # In production, use Hungarian algorithm for multi-target association
+        matches = self._associate(targets)
         for i, target in enumerate(targets):
-            track_id = i + 1
+            track_id = matches.get(i)
+            if track_id is None:
+                track_id = self._next_track_id
+                self._next_track_id += 1
             target.track_id = track_id
 
             if self._use_kalman:
@@ -522,8 +563,60 @@ class ThermalDetectionService:
                 smoothed = kalman.correct(target.centroid)
                 target.centroid = smoothed
 
+            self._track_centroids[track_id] = target.centroid
+            self._track_misses[track_id] = 0
+
+        seen = {target.track_id for target in targets}
+        for track_id in list(self._track_centroids):
+            if track_id in seen:
+                continue
+            self._track_misses[track_id] += 1
+            if self._track_misses[track_id] > _MAX_MISSED_FRAMES:
+                self._track_centroids.pop(track_id)
+                self._track_misses.pop(track_id)
+                self._kalman_trackers.pop(track_id, None)
+
         return targets
 
+    def _warp_tracks(self, motion: CameraMotion) -> None:
+        """Move every live track by the camera's image-plane motion."""
+        if not self._track_centroids:
+            return
+        track_ids = list(self._track_centroids)
+        warped = motion.apply(np.array([self._track_centroids[t] for t in track_ids]))
+        affine = motion.affine()
+        for track_id, (x, y) in zip(track_ids, warped, strict=True):
+            self._track_centroids[track_id] = (float(x), float(y))
+            kalman = self._kalman_trackers.get(track_id)
+            if kalman is not None:
+                kalman.warp(affine)
+
+    def _associate(self, targets: list[ThermalTarget]) -> dict[int, int]:
+        """Greedy nearest-neighbour matching of detections to tracks.
+
+        Returns:
+            Mapping of target index to matched track ID.
+        """
+        if not targets or not self._track_centroids:
+            return {}
+        track_ids = list(self._track_centroids)
+        tracks = np.array([self._track_centroids[t] for t in track_ids], dtype=np.float64)
+        points = np.array([t.centroid for t in targets], dtype=np.float64)
+        distances = np.linalg.norm(points[:, None, :] - tracks[None, :, :], axis=2)
+        gates = np.array(
+            [max(_GATE_MIN_PX, _GATE_SIZE_RATIO * max(t.bbox[2], t.bbox[3])) for t in targets]
+        )
+
+        matches: dict[int, int] = {}
+        used: set[int] = set()
+        for flat in np.argsort(distances, axis=None):
+            i, j = (int(k) for k in np.unravel_index(flat, distances.shape))
+            if i in matches or j in used or distances[i, j] > gates[i]:
+                continue
+            matches[i] = track_ids[j]
+            used.add(j)
+        return matches
+
     def get_primary_target(self, targets: list[ThermalTarget]) -> ThermalTarget | None:
         """Get the primary (largest/hottest) target from detection results.
 
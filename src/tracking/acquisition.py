@@ -0,0 +1,119 @@
+"""Snap-to-target acquisition.
+
+Continuous PID convergence can take seconds for a target locked near the frame
+edge. In ``ptz.acquisition_mode: snap`` the first tracked frame of a new lock
+computes the absolute pose that centers the target (``snap_pose``). One
+``absolute_move`` sends the camera there, and continuous tracking then takes
+over. For ``ptz.acquisition_settle_s`` after the move, continuous commands are
+held back: detections still in flight were captured before the move and would
+steer the camera back.
+
+The snap is computed from the head's reported pose. A ``PTZService`` only
+caches ``abs_pan``/``abs_tilt`` between polls, so ``update_position()`` is
+called first and the snap is skipped when that read fails.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from src.clock import SYSTEM_CLOCK, Clock
+from src.settings import Settings
+from src.tracking.control import snap_pose
+from src.tracking.motion_compensation import ptz_pose
+from src.tracking.state import TrackingPhase
+
+
+@dataclass(slots=True)
+class SnapAcquisition:
+    """Issue one absolute move whenever tracking (re)acquires a target.
+
+    Call ``observe`` every frame with the tracker's phase and target, and
+    ``update`` from the tracking branch with the target's bbox.
+    """
+
+    settings: Settings
+    clock: Clock = field(default=SYSTEM_CLOCK, repr=False)
+    snaps: int = 0
+    _last: tuple[TrackingPhase, int | None] | None = field(default=None, repr=False)
+    _armed: bool = field(default=False, repr=False)
+    _hold_until: float = field(default=0.0, repr=False)
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.ptz.acquisition_mode == "snap"
+
+    def observe(self, phase: TrackingPhase, target_id: int | None) -> None:
+        """Arm a snap on every transition into TRACKING or onto a new target."""
+        current = (phase, target_id)
+        if phase != TrackingPhase.TRACKING:
+            self._armed = False
+        elif current != self._last:
+            self._armed = True
+        self._last = current
+
+    def update(
+        self, ptz: Any, bbox: tuple[int, int, int, int], frame_w: int, frame_h: int
+    ) -> bool:
+        """Snap if armed; return True while continuous commands should be held."""
+        now = self.clock.monotonic()
+        if self._armed:
+            self._armed = False
+            if self.enabled:
+                self._snap(ptz, bbox, frame_w, frame_h, now)
+        return now < self._hold_until
+
+    def reset(self) -> None:
+        self._last = None
+        self._armed = False
+        self._hold_until = 0.0
+
+    def _snap(
+        self,
+        ptz: Any,
+        bbox: tuple[int, int, int, int],
+        frame_w: int,
+        frame_h: int,
+        now: float,
+    ) -> None:
+        settings = self.settings.ptz
+        x1, y1, x2, y2 = bbox
+        dx = ((x1 + x2) / 2 - frame_w / 2) / frame_w
+        dy = ((y1 + y2) / 2 - frame_h / 2) / frame_h
+        if (
+            not hasattr(ptz, "absolute_move")
+            or max(abs(dx), abs(dy)) < settings.acquisition_min_offset
+        ):
+            return
+        # The cached pose can be many frames old; an absolute move computed
+        # from it would jump the camera away from the target
+        refresh = getattr(ptz, "update_position", None)
+        if callable(refresh) and not refresh():
+            logger.warning("Snap acquisition skipped: PTZ position read failed")
+            return
+        pose = ptz_pose(ptz)
+        if pose is None:
+            return
+
+        pan, tilt, zoom = snap_pose(
+            self.settings,
+            bbox,
+            frame_w,
+            frame_h,
+            pose,
+            with_zoom=settings.acquisition_zoom,
+        )
+        device_zoom = None
+        if settings.acquisition_zoom:
+            zmin = getattr(ptz, "zmin", 0.0)
+            device_zoom = zmin + zoom * (getattr(ptz, "zmax", 1.0) - zmin)
+        if ptz.absolute_move(pan, tilt, device_zoom):
+            self.snaps += 1
+            self._hold_until = now + settings.acquisition_settle_s
+            logger.info(
+                f"Snap acquisition: offset=({dx:.2f}, {dy:.2f}) -> "
+                f"pan={pan:.3f}, tilt={tilt:.3f}, zoom={zoom:.3f}"
+            )
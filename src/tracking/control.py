@@ -0,0 +1,157 @@
+"""Proportional PTZ control law shared by live sessions and offline replay."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.ptz_calibration import FOVTable
+from src.settings import Settings
+
+
+def extract_pixel_coords(
+    det: Any, frame_w: int, frame_h: int
+) -> tuple[int, int, int, int]:
+    """Extract pixel coordinates from any detection type (YOLO or Thermal)."""
+    # Try YOLO xyxy attribute first
+    xyxy = getattr(det, "xyxy", None)
+    if xyxy is not None:
+        x1, y1, x2, y2 = xyxy[0]
+        if all(0 <= v <= 1.0 for v in [x1, y1, x2, y2]):
+            return int(x1 * frame_w), int(y1 * frame_h), int(x2 * frame_w), int(y2 * frame_h)
+        return int(x1), int(y1), int(x2), int(y2)
+
+    # Try Thermal target attributes
+    x = getattr(det, "x", 0)
+    y = getattr(det, "y", 0)
+    w = getattr(det, "w", 0)
+    h = getattr(det, "h", 0)
+    return x, y, x + w, y + h
+
+
+def normalized_zoom(ptz: Any) -> float:
+    """A PTZ service's zoom position mapped from ``[zmin, zmax]`` to ``[0, 1]``."""
+    try:
+        zoom = float(getattr(ptz, "zoom_level", 0.0))
+        zmin = float(getattr(ptz, "zmin", 0.0))
+        zmax = float(getattr(ptz, "zmax", 1.0))
+    except (TypeError, ValueError):
+        return 0.0
+    if zmax > zmin:
+        zoom = (zoom - zmin) / (zmax - zmin)
+    return max(0.0, min(1.0, zoom))
+
+
+def zoom_magnification(settings: Settings, zoom_level: float) -> float:
+    """Linear magnification estimate for a normalized zoom level in ``[0, 1]``."""
+    z = max(0.0, min(1.0, zoom_level))
+    return 1.0 + z * (settings.ptz.zoom_max_magnification - 1.0)
+
+
+def field_of_view(settings: Settings, zoom_level: float) -> tuple[float, float]:
+    """Visible ``(pan, tilt)`` span in normalized position units at ``zoom_level``.
+
+    Uses the calibrated ``ptz.fov_table`` when configured, otherwise the linear
+    magnification model.
+    """
+    if settings.ptz.fov_table:
+        fov_pan, fov_tilt = FOVTable.from_settings(settings).lookup(zoom_level)
+        return float(fov_pan), float(fov_tilt)
+    magnification = zoom_magnification(settings, zoom_level)
+    return (
+        settings.ptz.fov_pan / magnification,
+        settings.ptz.fov_tilt / magnification,
+    )
+
+
+def zoom_compensation(settings: Settings, zoom_level: float) -> tuple[float, float]:
+    """Per-axis gain scale ``fov(zoom) / fov(widest)``.
+
+    Gains are tuned at the widest zoom; scaling the frame-normalized error by
+    this ratio turns it into the same angle error at any zoom. With the linear
+    model both factors equal ``1 / zoom_magnification``.
+    """
+    if not settings.ptz.enable_zoom_compensation:
+        return 1.0, 1.0
+    wide_pan, wide_tilt = field_of_view(settings, 0.0)
+    fov_pan, fov_tilt = field_of_view(settings, zoom_level)
+    return fov_pan / wide_pan, fov_tilt / wide_tilt
+
+
+def snap_pose(
+    settings: Settings,
+    bbox: tuple[int, int, int, int],
+    frame_w: int,
+    frame_h: int,
+    pose: tuple[float, float, float],
+    *,
+    with_zoom: bool = False,
+) -> tuple[float, float, float]:
+    """Absolute ``(pan, tilt, zoom)`` that centers ``bbox`` in one move.
+
+    ``pose`` is the camera's current ``(pan, tilt, normalized zoom)``. The
+    target's angular offset comes from the field of view at that zoom. With
+    ``with_zoom`` the zoom is also chosen so the target covers
+    ``ptz.zoom_target_coverage`` of the frame; otherwise it is left unchanged.
+    """
+    ptz = settings.ptz
+    pan, tilt, zoom = pose
+    x1, y1, x2, y2 = bbox
+    dx = ((x1 + x2) / 2 - frame_w / 2) / frame_w
+    dy = ((y1 + y2) / 2 - frame_h / 2) / frame_h
+    fov_pan, fov_tilt = field_of_view(settings, zoom)
+    pan_sign = -1.0 if ptz.invert_pan else 1.0
+    tilt_sign = -1.0 if ptz.invert_tilt else 1.0
+    target_pan = pan + pan_sign * dx * fov_pan
+    target_tilt = tilt - tilt_sign * dy * fov_tilt
+
+    target_zoom = zoom
+    coverage = max((x2 - x1) / frame_w, (y2 - y1) / frame_h)
+    if with_zoom and coverage > 0 and ptz.zoom_target_coverage > 0:
+        wanted_fov = fov_pan * coverage / ptz.zoom_target_coverage
+        table = FOVTable.from_settings(settings)
+        target_zoom = float(table.zoom_for_pan_fov(wanted_fov))
+    return target_pan, target_tilt, max(0.0, min(1.0, target_zoom))
+
+
+def proportional_command(
+    bbox: tuple[int, int, int, int],
+    frame_w: int,
+    frame_h: int,
+    settings: Settings,
+    zoom_level: float = 0.0,
+) -> tuple[float, float, float]:
+    """Return clamped ``(pan, tilt, zoom)`` velocities that center ``bbox``.
+
+    Pan/tilt are proportional to the target's angular offset from the frame
+    center (with a dead band), see ``zoom_compensation``; zoom drives the
+    target's coverage toward ``ptz.zoom_target_coverage``.
+    """
+    ptz = settings.ptz
+    x1, y1, x2, y2 = bbox
+    cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+    dx = (cx - frame_w // 2) / frame_w
+    dy = (cy - frame_h // 2) / frame_h
+    pan_scale, tilt_scale = zoom_compensation(settings, zoom_level)
+
+    pan = (
+        dx * ptz.ptz_movement_gain * pan_scale
+        if abs(dx) > ptz.ptz_movement_threshold
+        else 0.0
+    )
+    tilt = (
+        -dy * ptz.ptz_movement_gain * tilt_scale
+        if abs(dy) > ptz.ptz_movement_threshold
+        else 0.0
+    )
+
+    box_w, box_h = x2 - x1, y2 - y1
+    coverage = max(box_w / frame_w, box_h / frame_h)
+    diff = ptz.zoom_target_coverage - coverage
+    zoom_dead_zone = settings.performance.zoom_dead_zone
+    zoom = diff * ptz.zoom_velocity_gain if abs(diff) > zoom_dead_zone else 0.0
+
+    return (
+        max(-1.0, min(1.0, pan)),
+        max(-1.0, min(1.0, tilt)),
+        max(-1.0, min(1.0, zoom)),
+    )
@@ -0,0 +1,274 @@
+"""Fixed-rate PTZ control, decoupled from the detection rate.
+
+Inline control issues one velocity command per detection tick, so the servo
+runs at inference rate (often 10-15 fps on CPU) and steps the camera in coarse
+increments. ``PTZControlLoop`` runs the servo in its own thread at
+``ptz.control_rate_hz`` instead. Detections only update an alpha-beta estimate
+of the target's absolute pan/tilt angle; every control tick extrapolates that
+estimate to the current time and steers toward it. ``PTZService`` ramping and
+the PID then act at the control rate.
+
+Both the estimate and the error are absolute angles, so they need the current
+pose. The thread never polls the head: ``PTZService`` is not thread-safe, so
+``update_position()`` stays with the main loop's periodic poll. Between polls
+a ``PoseTracker`` dead-reckons the pose from the commanded velocity; a stale
+cached pose would otherwise make the error jump on every poll. Detections are
+paired with the pose at their capture time.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from src.clock import SYSTEM_CLOCK, Clock
+from src.ptz_servo import PTZServo
+from src.settings import Settings
+from src.tracking.control import field_of_view, normalized_zoom, zoom_compensation
+from src.tracking.motion_compensation import PoseTracker
+
+
+class AlphaBetaFilter:
+    """Constant-velocity alpha-beta filter over a 2D position.
+
+    Args:
+        alpha: Position correction gain in ``(0, 1]``.
+        beta: Velocity correction gain (``0`` disables velocity tracking).
+    """
+
+    def __init__(self, alpha: float = 0.5, beta: float = 0.1) -> None:
+        self.alpha = alpha
+        self.beta = beta
+        self.position: np.ndarray | None = None
+        self.velocity = np.zeros(2)
+        self.timestamp = 0.0
+
+    @property
+    def initialized(self) -> bool:
+        return self.position is not None
+
+    def update(self, timestamp: float, measurement: tuple[float, float]) -> None:
+        """Fold in a measurement taken at ``timestamp``; stale ones are ignored."""
+        z = np.asarray(measurement, dtype=np.float64)
+        if self.position is None:
+            self.position = z
+            self.velocity = np.zeros(2)
+            self.timestamp = timestamp
+            return
+        dt = timestamp - self.timestamp
+        if dt <= 0.0:
+            return
+        predicted = self.position + self.velocity * dt
+        residual = z - predicted
+        self.position = predicted + self.alpha * residual
+        self.velocity = self.velocity + (self.beta / dt) * residual
+        self.timestamp = timestamp
+
+    def predict(self, timestamp: float) -> np.ndarray:
+        """Extrapolated position at ``timestamp`` (never backwards in time)."""
+        if self.position is None:
+            msg = "filter has no measurement yet"
+            raise ValueError(msg)
+        return self.position + self.velocity * max(0.0, timestamp - self.timestamp)
+
+    def reset(self) -> None:
+        self.position = None
+        self.velocity = np.zeros(2)
+        self.timestamp = 0.0
+
+
+class PTZControlLoop:
+    """Drive ``ptz`` from a filtered target estimate at a fixed rate.
+
+    The detection loop calls ``submit`` with each tracked bbox and ``reset``
+    when the target is lost or switched. ``step`` is one control tick; the
+    background thread started by ``start`` calls it every
+    ``1 / ptz.control_rate_hz`` seconds. A lock serializes ticks with
+    ``submit``/``reset``, so once ``reset`` returns no further velocity
+    command is sent until the next ``submit``.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        ptz: Any,
+        servo: PTZServo,
+        *,
+        clock: Clock | None = None,
+        name: str = "ptz-control",
+    ) -> None:
+        self.settings = settings
+        self.ptz = ptz
+        self.servo = servo
+        self.clock = clock or SYSTEM_CLOCK
+        self.period_s = 1.0 / settings.ptz.control_rate_hz
+        self.last_command = "None"
+        self.ticks = 0
+        self._filter = AlphaBetaFilter(
+            settings.ptz.estimator_alpha, settings.ptz.estimator_beta
+        )
+        self._pose_tracker = PoseTracker(settings)
+        self._coverage = 0.0
+        self._last_measurement: float | None = None
+        self._last_zoom_time = 0.0
+        self._moving = False
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    @property
+    def has_target(self) -> bool:
+        return self._last_measurement is not None
+
+    def start(self) -> None:
+        """Start the control thread."""
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 1.0) -> None:
+        """Stop the control thread and halt any motion it started."""
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        with self._lock:
+            self._halt()
+
+    def submit(
+        self,
+        bbox: tuple[int, int, int, int],
+        frame_w: int,
+        frame_h: int,
+        capture_ts: float | None = None,
+    ) -> None:
+        """Update the target estimate from a detection.
+
+        Args:
+            bbox: Target ``(x1, y1, x2, y2)`` in pixels.
+            frame_w: Frame width in pixels.
+            frame_h: Frame height in pixels.
+            capture_ts: Time the frame was captured (defaults to now).
+        """
+        now = self.clock.time()
+        ts = now if capture_ts is None else capture_ts
+        x1, y1, x2, y2 = bbox
+        dx = ((x1 + x2) / 2 - frame_w / 2) / frame_w
+        dy = ((y1 + y2) / 2 - frame_h / 2) / frame_h
+        pan_sign, tilt_sign = self._signs()
+        with self._lock:
+            pan, tilt, zoom = self._pose(now, ts)
+            fov_pan, fov_tilt = field_of_view(self.settings, zoom)
+            target = (pan + pan_sign * dx * fov_pan, tilt - tilt_sign * dy * fov_tilt)
+            self._filter.update(ts, target)
+            self._coverage = max((x2 - x1) / frame_w, (y2 - y1) / frame_h)
+            self._last_measurement = ts
+
+    def reset(self) -> None:
+        """Forget the target and the servo state without commanding the camera."""
+        with self._lock:
+            self._filter.reset()
+            self.servo.reset()
+            self._last_measurement = None
+            self._moving = False
+
+    def step(self, now: float | None = None) -> tuple[float, float, float] | None:
+        """Run one control tick.
+
+        Returns:
+            The commanded ``(pan, tilt, zoom)`` velocities, or None when there
+            is no (fresh) target estimate.
+        """
+        now = self.clock.time() if now is None else now
+        ptz_settings = self.settings.ptz
+        with self._lock:
+            self.ticks += 1
+            if self._last_measurement is None:
+                return None
+            if now - self._last_measurement > ptz_settings.estimate_timeout_s:
+                # Detections stopped arriving: don't extrapolate blindly
+                self._filter.reset()
+                self.servo.reset()
+                self._last_measurement = None
+                self._halt()
+                return None
+
+            lead = 0.0
+            if ptz_settings.control_strategy == "predictive":
+                lead = min(ptz_settings.actuation_latency_s, ptz_settings.prediction_max_lead_s)
+            target_pan, target_tilt = self._filter.predict(now + lead)
+            pan, tilt, zoom = self._pose(now)
+            fov_pan, fov_tilt = field_of_view(self.settings, zoom)
+            pan_sign, tilt_sign = self._signs()
+            dx = pan_sign * (target_pan - pan) / fov_pan
+            dy = -tilt_sign * (target_tilt - tilt) / fov_tilt
+
+            # Same error shaping as the inline control path in main()
+            pan_scale, tilt_scale = zoom_compensation(self.settings, zoom)
+            err_x = dx * ptz_settings.ptz_movement_gain * pan_scale
+            err_y = -dy * ptz_settings.ptz_movement_gain * tilt_scale
+            if ptz_settings.invert_pan:
+                err_x = -err_x
+            if ptz_settings.invert_tilt:
+                err_y = -err_y
+            x_speed, y_speed = self.servo.control(error_x=err_x, error_y=err_y)
+
+            zoom_velocity = 0.0
+            coverage_diff = ptz_settings.zoom_target_coverage - self._coverage
+            if (
+                abs(coverage_diff) > self.settings.performance.zoom_dead_zone
+                and now - self._last_zoom_time >= ptz_settings.zoom_min_interval
+            ):
+                zoom_velocity = max(
+                    -1.0, min(1.0, coverage_diff * ptz_settings.zoom_velocity_gain)
+                )
+                if zoom_velocity != 0.0:
+                    self._last_zoom_time = now
+
+            if x_speed != 0 or y_speed != 0 or zoom_velocity != 0:
+                self.ptz.continuous_move(x_speed, y_speed, zoom_velocity)
+                self._moving = True
+                self.last_command = (
+                    f"continuous_move({x_speed:.2f}, {y_speed:.2f}, {zoom_velocity:.2f})"
+                )
+            else:
+                # Stop once on settling instead of on every tick
+                self._halt()
+            return x_speed, y_speed, zoom_velocity
+
+    def _halt(self) -> None:
+        if self._moving:
+            self.ptz.stop()
+            self._moving = False
+            self.last_command = "stop()"
+
+    def _pose(
+        self, now: float, when: float | None = None
+    ) -> tuple[float, float, float]:
+        # Without position feedback the estimate lives in frame-offset space
+        pose = self._pose_tracker.at(self.ptz, now, now if when is None else when)
+        return pose or (0.0, 0.0, normalized_zoom(self.ptz))
+
+    def _signs(self) -> tuple[float, float]:
+        ptz_settings = self.settings.ptz
+        return (
+            -1.0 if ptz_settings.invert_pan else 1.0,
+            -1.0 if ptz_settings.invert_tilt else 1.0,
+        )
+
+    def _run(self) -> None:
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                self.step()
+            except Exception as e:
+                logger.error(f"PTZ control tick failed: {e}")
+            next_tick += self.period_s
+            delay = next_tick - time.monotonic()
+            if delay < 0.0:
+                # Overran the period: skip missed ticks rather than bursting
+                next_tick = time.monotonic()
+                delay = 0.0
+            self._stop_event.wait(delay)
@@ -0,0 +1,287 @@
+"""Camera ego-motion compensation for track association.
+
+When the PTZ head slews, every track jumps in the image by the camera's own
+motion. Trackers that predict with a constant-velocity model then look for the
+target where it *would* have been on a static camera and lose it (ID switches,
+SEARCHING/LOST stalls). This module estimates the frame-to-frame image motion
+caused by the camera so predicted track positions can be warped before the next
+association step.
+
+Two estimators are available:
+
+* ``PTZMotionEstimator`` derives the motion from the PTZ pose reported by
+  ``SimulatedPTZService`` / ``PTZService`` and the zoom-dependent field of view.
+  ``PTZService`` only refreshes its pose when polled, so between polls the
+  pose is dead-reckoned from the commanded velocity.
+* ``OpticalFlowMotionEstimator`` measures it from sparse Lucas-Kanade flow on a
+  downscaled copy of the frame (for cameras whose position feedback is slow).
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import cv2
+import numpy as np
+
+from src.settings import Settings
+from src.tracking.control import field_of_view, normalized_zoom
+
+
+@dataclass(frozen=True, slots=True)
+class CameraMotion:
+    """Image-plane motion between two frames: ``p' = scale * p + (tx, ty)``.
+
+    Rotation is ignored; a pan/tilt/zoom head only translates and scales the
+    image.
+    """
+
+    scale: float = 1.0
+    tx: float = 0.0
+    ty: float = 0.0
+
+    def is_identity(self, tol: float = 1e-6) -> bool:
+        return abs(self.scale - 1.0) <= tol and abs(self.tx) <= tol and abs(self.ty) <= tol
+
+    def affine(self) -> np.ndarray:
+        """The motion as a 2x3 affine matrix (OpenCV / Ultralytics GMC layout)."""
+        return np.array(
+            [[self.scale, 0.0, self.tx], [0.0, self.scale, self.ty]], dtype=np.float64
+        )
+
+    def apply(self, points: np.ndarray) -> np.ndarray:
+        """Warp ``(N, 2)`` pixel positions from the previous frame into the current one."""
+        return np.asarray(points, dtype=np.float64) * self.scale + (self.tx, self.ty)
+
+
+IDENTITY = CameraMotion()
+
+
+def ptz_pose(ptz: Any) -> tuple[float, float, float] | None:
+    """Return ``(pan, tilt, zoom)`` for a PTZ service, zoom normalized to ``[0, 1]``.
+
+    Understands ``SimulatedPTZService`` (``pan_pos``/``tilt_pos``) and
+    ``PTZService`` (``abs_pan``/``abs_tilt``). Returns None when the object does
+    not expose a position.
+    """
+    pan = getattr(ptz, "pan_pos", None)
+    if pan is None:
+        pan = getattr(ptz, "abs_pan", None)
+    tilt = getattr(ptz, "tilt_pos", None)
+    if tilt is None:
+        tilt = getattr(ptz, "abs_tilt", None)
+    if pan is None or tilt is None:
+        return None
+    try:
+        pan, tilt = float(pan), float(tilt)
+    except (TypeError, ValueError):
+        return None
+    return pan, tilt, normalized_zoom(ptz)
+
+
+def motion_from_pose_change(
+    settings: Settings,
+    previous: tuple[float, float, float],
+    current: tuple[float, float, float],
+    frame_w: int,
+    frame_h: int,
+) -> CameraMotion:
+    """Image motion caused by moving the camera from ``previous`` to ``current``.
+
+    Panning right moves the scene left; tilting up moves it down; zooming in
+    scales it about the frame center.
+    """
+    fov_pan, fov_tilt = field_of_view(settings, previous[2])
+    dx = -(current[0] - previous[0]) / fov_pan * frame_w
+    dy = (current[1] - previous[1]) / fov_tilt * frame_h
+    scale = fov_pan / field_of_view(settings, current[2])[0]
+    cx, cy = frame_w / 2.0, frame_h / 2.0
+    return CameraMotion(
+        scale=scale,
+        tx=scale * dx + (1.0 - scale) * cx,
+        ty=scale * dy + (1.0 - scale) * cy,
+    )
+
+
+class PoseTracker:
+    """PTZ pose kept current between position polls.
+
+    A reported pan/tilt that changed since the previous read is a fresh
+    reading and is used as is. While it stays unchanged, the head may still be
+    moving with a stale cached pose (``PTZService`` between
+    ``update_position`` polls), so the pose is advanced by the commanded
+    ``last_vel_pan`` / ``last_vel_tilt`` times ``ptz.pan_rate`` /
+    ``ptz.tilt_rate``.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.pose: tuple[float, float, float] | None = None
+        self._reported: tuple[float, float, float] | None = None
+        self._time = 0.0
+
+    def update(self, ptz: Any, now: float) -> tuple[float, float, float] | None:
+        """Return the pose at ``now``, or None when ``ptz`` exposes none."""
+        reported = ptz_pose(ptz)
+        if reported is None:
+            self.reset()
+            return None
+        if self.pose is None or reported[:2] != self._reported[:2]:
+            pose = reported
+        else:
+            dt = max(0.0, now - self._time)
+            pose = self._dead_reckon(ptz, self.pose, reported[2], dt)
+        self.pose, self._reported, self._time = pose, reported, now
+        return pose
+
+    def at(
+        self, ptz: Any, now: float, when: float
+    ) -> tuple[float, float, float] | None:
+        """Return the pose at ``when`` after updating the tracker at ``now``.
+
+        ``when`` is usually a frame's capture time: the pose is moved back
+        along the commanded velocity so offsets measured in that frame pair
+        with where the camera was pointing when it was taken.
+        """
+        pose = self.update(ptz, now)
+        if pose is None:
+            return None
+        return self._dead_reckon(ptz, pose, pose[2], when - now)
+
+    def _dead_reckon(
+        self, ptz: Any, pose: tuple[float, float, float], zoom: float, dt: float
+    ) -> tuple[float, float, float]:
+        try:
+            vel_pan = float(getattr(ptz, "last_vel_pan", 0.0))
+            vel_tilt = float(getattr(ptz, "last_vel_tilt", 0.0))
+        except (TypeError, ValueError):
+            return pose[0], pose[1], zoom
+        settings = self.settings.ptz
+        return (
+            pose[0] + vel_pan * settings.pan_rate * dt,
+            pose[1] + vel_tilt * settings.tilt_rate * dt,
+            zoom,
+        )
+
+    def reset(self) -> None:
+        self.pose = None
+        self._reported = None
+
+
+class PTZMotionEstimator:
+    """Frame-to-frame motion from the PTZ pose.
+
+    The pose comes from a ``PoseTracker``; without its dead reckoning the
+    motion of a whole poll interval would land on a single frame.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._tracker = PoseTracker(settings)
+
+    def update(
+        self, ptz: Any, frame_w: int, frame_h: int, now: float | None = None
+    ) -> CameraMotion:
+        """Return the motion since the previous call.
+
+        Args:
+            ptz: PTZ service exposing a pose (see ``ptz_pose``).
+            frame_w: Frame width in pixels.
+            frame_h: Frame height in pixels.
+            now: Frame time in seconds (defaults to ``time.monotonic()``).
+        """
+        previous = self._tracker.pose
+        pose = self._tracker.update(ptz, time.monotonic() if now is None else now)
+        if pose is None or previous is None:
+            return IDENTITY
+        return motion_from_pose_change(self.settings, previous, pose, frame_w, frame_h)
+
+    def reset(self) -> None:
+        self._tracker.reset()
+
+
+class OpticalFlowMotionEstimator:
+    """Global motion from sparse optical flow on a downscaled grayscale frame.
+
+    Args:
+        max_width: Frames wider than this are downscaled before tracking corners.
+        max_corners: Corners tracked per frame.
+        min_points: Fewer successfully tracked corners than this yields identity.
+    """
+
+    def __init__(
+        self, max_width: int = 160, max_corners: int = 80, min_points: int = 8
+    ) -> None:
+        self.max_width = max_width
+        self.max_corners = max_corners
+        self.min_points = min_points
+        self._previous: np.ndarray | None = None
+
+    def update(self, frame: np.ndarray) -> CameraMotion:
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        ratio = min(1.0, self.max_width / gray.shape[1])
+        if ratio < 1.0:
+            gray = cv2.resize(gray, None, fx=ratio, fy=ratio, interpolation=cv2.INTER_AREA)
+        previous, self._previous = self._previous, gray
+        if previous is None or previous.shape != gray.shape:
+            return IDENTITY
+
+        corners = cv2.goodFeaturesToTrack(
+            previous, maxCorners=self.max_corners, qualityLevel=0.01, minDistance=4
+        )
+        if corners is None or len(corners) < self.min_points:
+            return IDENTITY
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(previous, gray, corners, None)
+        good = status.reshape(-1) == 1
+        if int(good.sum()) < self.min_points:
+            return IDENTITY
+        matrix, _ = cv2.estimateAffinePartial2D(
+            corners[good], moved[good], method=cv2.RANSAC, ransacReprojThreshold=1.0
+        )
+        if matrix is None:
+            return IDENTITY
+        return CameraMotion(
+            scale=math.hypot(matrix[0, 0], matrix[1, 0]),
+            tx=float(matrix[0, 2]) / ratio,
+            ty=float(matrix[1, 2]) / ratio,
+        )
+
+    def reset(self) -> None:
+        self._previous = None
+
+
+class MotionCompensator:
+    """Selects the estimator configured in ``tracking.motion_compensation``.
+
+    Keep one instance per camera stream: each remembers the previous frame/pose
+    of its own stream.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.mode = settings.tracking.motion_compensation
+        self._ptz = PTZMotionEstimator(settings)
+        self._flow = OpticalFlowMotionEstimator(max_width=settings.tracking.flow_max_width)
+
+    def estimate(
+        self, frame: np.ndarray, ptz: Any | None = None, now: float | None = None
+    ) -> CameraMotion:
+        """Return the camera-induced motion since the previous call.
+
+        ``ptz`` must be the head this stream's camera is mounted on; ``now``
+        is the frame time used to dead-reckon the pose between polls.
+        """
+        if self.mode == "none" or frame is None or frame.size == 0:
+            return IDENTITY
+        if self.mode == "optical_flow":
+            return self._flow.update(frame)
+        if ptz is None:
+            return IDENTITY
+        frame_h, frame_w = frame.shape[:2]
+        return self._ptz.update(ptz, frame_w, frame_h, now)
+
+    def reset(self) -> None:
+        self._ptz.reset()
+        self._flow.reset()
@@ -6,7 +6,8 @@ Manages tracking phases (IDLE, SEARCHING, TRACKING, LOST) and phase transitions.
 
 from dataclasses import dataclass, field
 from enum import Enum
-from time import time
+
+from src.clock import SYSTEM_CLOCK, Clock
 
 
 class TrackingPhase(Enum):
@@ -26,19 +27,25 @@ class TrackerStatus:
     Attributes:
         phase: Current tracking phase.
         target_id: Currently locked target ID (None if idle).
-        last_seen_ts: Timestamp when target was last seen.
+        last_seen_ts: Timestamp when target was last seen (defaults to now).
         loss_grace_s: Grace period (seconds) before transitioning to LOST.
+        clock: Time source used whenever ``now`` is not passed explicitly.
     """
 
     phase: TrackingPhase = TrackingPhase.IDLE
     target_id: int | None = None
-    last_seen_ts: float = field(default_factory=time)
+    last_seen_ts: float | None = None
     loss_grace_s: float = 2.0
+    clock: Clock = field(default=SYSTEM_CLOCK, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.last_seen_ts is None:
+            self.last_seen_ts = self.clock.time()
 
     def mark_seen(self, now: float | None = None) -> None:
         """Mark target as seen at the given timestamp."""
         if now is None:
-            now = time()
+            now = self.clock.time()
         self.last_seen_ts = now
 
     def mark_missing(self) -> None:
@@ -48,7 +55,7 @@ class TrackerStatus:
     def set_target(self, target_id: int | None, now: float | None = None) -> None:
         """Set a new target ID and initialize tracking."""
         if now is None:
-            now = time()
+            now = self.clock.time()
         self.target_id = target_id
         if target_id is not None:
             self.last_seen_ts = now
@@ -72,7 +79,7 @@ class TrackerStatus:
             The computed phase.
         """
         if now is None:
-            now = time()
+            now = self.clock.time()
 
         # If no target is locked, stay IDLE
         if self.target_id is None:
@@ -18,8 +18,9 @@ from typing import Optional
 
 import aiohttp
 from aiortc import RTCPeerConnection, RTCSessionDescription
+from loguru import logger
 
-logger = logging.getLogger(__name__)
+from src.logging_config import hot_log
 
 
 class H264InitializationFilter(logging.Filter):
@@ -71,8 +72,6 @@ class H264InitializationFilter(logging.Filter):
 _h264_filter = H264InitializationFilter()
 logging.getLogger("aiortc.codecs.h264").addFilter(_h264_filter)
 
-logger = logging.getLogger(__name__)
-
 
 async def _single_session(
     frame_queue,
@@ -132,7 +131,7 @@ async def _single_session(
         cand = event.candidate
         if cand is None:
             return
-        logger.debug("Local ICE candidate generated: %s", cand)
+        logger.debug("Local ICE candidate generated: {}", cand)
         queued_candidates.append(cand)
 
         # if session_url is available, send immediately
@@ -151,16 +150,16 @@ async def _single_session(
                             session_url_ref["url"], data=frag, headers=headers
                         ) as presp:
                             logger.info(
-                                "PATCH %s -> %s", session_url_ref["url"], presp.status
+                                "PATCH {} -> {}", session_url_ref["url"], presp.status
                             )
                 except Exception as exc:
-                    logger.debug("Failed to send candidates: %s", exc)
+                    logger.debug("Failed to send candidates: {}", exc)
 
             asyncio.ensure_future(_send())
 
     @pc.on("track")
     def on_track(track):
-        logger.info("Remote track received: kind=%s", track.kind)
+        logger.info("Remote track received: kind={}", track.kind)
 
         if track.kind != "video":
             return
@@ -177,7 +176,7 @@ async def _single_session(
                 try:
                     frame = await track.recv()  # av.VideoFrame (already decoded)
                 except Exception as exc:
-                    logger.info("Track receive ended: %s", exc)
+                    logger.info("Track receive ended: {}", exc)
                     break
 
                 try:
@@ -189,7 +188,7 @@ async def _single_session(
                             _h264_filter.mark_successful_frame()
                             logger.info("First frame decoded successfully, H264 decoder initialized")
                     except Exception as nd_exc:
-                        logger.warning(f"Frame to ndarray failed: {nd_exc}")
+                        hot_log.warning("Frame to ndarray failed: {}", nd_exc)
                         # Fallback conversion
                         img = frame.to_image().convert("RGB")
                         import numpy as np
@@ -204,7 +203,7 @@ async def _single_session(
                     frame_queue.put_nowait(img)
                     
                 except Exception as frame_exc:
-                    logger.error(f"Error processing frame: {frame_exc}")
+                    hot_log.error("Error processing frame: {}", frame_exc)
                     continue
 
         asyncio.ensure_future(recv_loop())
@@ -220,7 +219,7 @@ async def _single_session(
         if post_url.endswith("/"):
             post_url = post_url + "offer"
 
-        logger.info("Posting SDP offer to %s (WHEP or /offer fallback)", url)
+        logger.info("Posting SDP offer to {} (WHEP or /offer fallback)", url)
         data = None
         session_url: Optional[str] = None
         async with aiohttp.ClientSession() as sess:
@@ -233,7 +232,7 @@ async def _single_session(
                 ]
                 for wh_url in candidates_whep:
                     try:
-                        logger.debug("Attempting WHEP POST to %s", wh_url)
+                        logger.debug("Attempting WHEP POST to {}", wh_url)
                         async with sess.post(
                             wh_url,
                             data=pc.localDescription.sdp,
@@ -241,7 +240,7 @@ async def _single_session(
                         ) as resp:
                             text = await resp.text()
                             logger.info(
-                                "WHEP POST %s -> status=%s len=%d",
+                                "WHEP POST {} -> status={} len={}",
                                 wh_url,
                                 resp.status,
                                 len(text) if text is not None else 0,
@@ -251,11 +250,11 @@ async def _single_session(
                                 data = {"sdp": text, "type": "answer"}
                                 break
                     except Exception as exc:
-                        logger.debug("WHEP POST to %s failed: %s", wh_url, exc)
+                        logger.debug("WHEP POST to {} failed: {}", wh_url, exc)
                 # if not found, try posting to the base URL as a fallback
                 if data is None:
                     wh_url = url.rstrip("/")
-                    logger.debug("Attempting WHEP POST to base %s", wh_url)
+                    logger.debug("Attempting WHEP POST to base {}", wh_url)
                     async with sess.post(
                         wh_url,
                         data=pc.localDescription.sdp,
@@ -263,7 +262,7 @@ async def _single_session(
                     ) as resp:
                         text = await resp.text()
                         logger.info(
-                            "WHEP POST %s -> status=%s len=%d",
+                            "WHEP POST {} -> status={} len={}",
                             wh_url,
                             resp.status,
                             len(text) if text is not None else 0,
@@ -272,7 +271,7 @@ async def _single_session(
                             session_url = resp.headers.get("location")
                             data = {"sdp": text, "type": "answer"}
             except Exception as exc:
-                logger.debug("WHEP POST failed: %s", exc)
+                logger.debug("WHEP POST failed: {}", exc)
 
             # If WHEP didn't succeed, try legacy /offer JSON endpoints as fallback
             if data is None:
@@ -287,7 +286,7 @@ async def _single_session(
                         continue
                     tried.append(candidate)
                     try:
-                        logger.debug("Attempting JSON POST to %s", candidate)
+                        logger.debug("Attempting JSON POST to {}", candidate)
                         async with sess.post(
                             candidate,
                             json={
@@ -297,7 +296,7 @@ async def _single_session(
                         ) as resp:
                             text = await resp.text()
                             logger.info(
-                                "JSON POST %s -> status=%s len=%d",
+                                "JSON POST {} -> status={} len={}",
                                 candidate,
                                 resp.status,
                                 len(text) if text is not None else 0,
@@ -311,7 +310,7 @@ async def _single_session(
                             else:
                                 continue
                     except Exception as exc:
-                        logger.debug("POST to %s failed: %s", candidate, exc)
+                        logger.debug("POST to {} failed: {}", candidate, exc)
                         continue
                 else:
                     raise RuntimeError(
@@ -327,7 +326,7 @@ async def _single_session(
 
             session_url_abs = urljoin(url, session_url)
             session_url_ref["url"] = session_url_abs
-            logger.info("WHEP session established: %s", session_url_abs)
+            logger.info("WHEP session established: {}", session_url_abs)
 
             # send any queued candidates immediately
             if queued_candidates:
@@ -343,27 +342,27 @@ async def _single_session(
                             session_url_ref["url"], data=frag, headers=headers
                         ) as presp:
                             logger.info(
-                                "Initial PATCH %s -> %s",
+                                "Initial PATCH {} -> {}",
                                 session_url_ref["url"],
                                 presp.status,
                             )
                 except Exception as exc:
-                    logger.debug("Failed to send initial candidates: %s", exc)
+                    logger.debug("Failed to send initial candidates: {}", exc)
 
         answer = RTCSessionDescription(sdp=data["sdp"], type=data["type"])
-        logger.debug("Server SDP Answer: %s", answer.sdp)
+        logger.debug("Server SDP Answer: {}", answer.sdp)
         logger.info("Setting remote description from server answer")
         await pc.setRemoteDescription(answer)
 
         @pc.on("connectionstatechange")
         def _on_statechange():
-            logger.info("PeerConnection state changed: %s", pc.connectionState)
+            logger.info("PeerConnection state changed: {}", pc.connectionState)
 
         # Wait until stop_event is set or connection closes
         idle_since = time.time()
         while not stop_event.is_set():
             if pc.connectionState in ("failed", "closed", "disconnected"):
-                logger.info("PC connection state changed to %s", pc.connectionState)
+                logger.info("PC connection state changed to {}", pc.connectionState)
                 break
             # If no frames arrive for a while, log an info message (helps debugging)
             if time.time() - idle_since > 5.0:
@@ -393,7 +392,7 @@ async def _run_client_loop(
             await _single_session(frame_queue, url, stop_event, width, height, fps)
             backoff = 1.0
         except Exception as exc:  # pragma: no cover - best-effort runtime behaviour
-            logger.exception("WebRTC client session failed: %s", exc)
+            logger.exception("WebRTC client session failed: {}", exc)
             # exponential backoff with cap
             await asyncio.sleep(backoff)
             backoff = min(backoff * 2, 30.0)
@@ -451,7 +450,7 @@ def start_webrtc_client(
         daemon=True,
     )
     t.start()
-    logger.info("WebRTC client started connecting to %s", url)
+    logger.info("WebRTC client started connecting to {}", url)
     return t
 
 
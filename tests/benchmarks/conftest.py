@@ -0,0 +1,44 @@
+"""
+Shared setup for the hot-path benchmark suite.
+
+The suite needs pytest-benchmark. Without it the benchmark modules are not
+collected, so the regular test run is unaffected. See the ``bench`` and
+``bench-save`` pixi tasks for storing baselines and failing on regressions.
+"""
+
+import importlib.util
+
+import pytest
+from loguru import logger
+
+from src.synthetic_scene import SyntheticScene
+
+if importlib.util.find_spec("pytest_benchmark") is None:
+    collect_ignore_glob = ["test_*.py"]
+
+# (width, height) of the frames fed to per-frame benchmarks
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _quiet_logging():
+    """Keep log sinks out of the measurements."""
+    logger.disable("src")
+    yield
+    logger.enable("src")
+
+
+@pytest.fixture(scope="session")
+def thermal_frames() -> dict[str, list]:
+    """A few synthetic thermal frames per resolution, with 20 targets each."""
+    frames = {}
+    for name, (width, height) in RESOLUTIONS.items():
+        scene = SyntheticScene(
+            width, height, targets=20, style="thermal", noise_std=3.0, seed=7
+        )
+        frames[name] = [scene.next_frame()[0] for _ in range(8)]
+    return frames
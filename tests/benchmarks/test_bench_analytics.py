@@ -0,0 +1,111 @@
+"""Benchmarks for metadata building, track events and tick encoding."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.analytics.events import TrackLifecycle
+from src.analytics.metadata import MetadataBuilder, tracks_from_detections
+from src.api.encoding import encode_message
+from src.tracking.state import TrackerStatus
+
+CLASS_NAMES = ["drone", "bird", "airplane", "aircraft"]
+FRAME_W, FRAME_H = 1920, 1080
+
+
+def _detections(count: int) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=i,
+            cls=i % len(CLASS_NAMES),
+            conf=0.5 + (i % 50) / 100,
+            xyxy=[(10.0 + i, 20.0 + i, 60.0 + i, 80.0 + i)],
+        )
+        for i in range(count)
+    ]
+
+
+def _ptz() -> SimpleNamespace:
+    return SimpleNamespace(
+        control_mode="onvif", connected=True, active=True,
+        last_pan=0.25, last_tilt=-0.1, last_zoom=0.0,
+    )
+
+
+def _tick(count: int) -> dict:
+    tracks = tracks_from_detections(
+        _detections(count), class_names=CLASS_NAMES, frame_w=FRAME_W, frame_h=FRAME_H
+    )
+    return MetadataBuilder("bench", "cam").build_tick(
+        frame_index=1234,
+        frame_w=FRAME_W,
+        frame_h=FRAME_H,
+        tracks=tracks,
+        tracker_status=TrackerStatus(target_id=3),
+        ptz=_ptz(),
+        ts_unix_ms=1_700_000_000_000,
+        ts_mono_ms=123_456,
+    )
+
+
+@pytest.mark.benchmark(group="metadata")
+@pytest.mark.parametrize("count", [10, 100])
+def test_tracks_from_detections(benchmark, count):
+    detections = _detections(count)
+
+    tracks = benchmark(
+        tracks_from_detections,
+        detections,
+        class_names=CLASS_NAMES,
+        frame_w=FRAME_W,
+        frame_h=FRAME_H,
+    )
+
+    assert len(tracks) == count
+
+
+@pytest.mark.benchmark(group="metadata")
+@pytest.mark.parametrize("count", [10, 100])
+def test_build_tick_from_detections(benchmark, count):
+    builder = MetadataBuilder("bench", "cam")
+    detections = _detections(count)
+    status = TrackerStatus(target_id=3)
+    ptz = _ptz()
+
+    benchmark(
+        lambda: builder.build_tick_from_detections(
+            detections,
+            frame_index=1234,
+            frame_w=FRAME_W,
+            frame_h=FRAME_H,
+            class_names=CLASS_NAMES,
+            tracker_status=status,
+            ptz=ptz,
+            ts_unix_ms=1_700_000_000_000,
+        )
+    )
+
+
+@pytest.mark.benchmark(group="track-lifecycle")
+@pytest.mark.parametrize("count", [50, 500])
+def test_track_lifecycle_update(benchmark, count):
+    lifecycle = TrackLifecycle("bench", "cam")
+    tracks = tracks_from_detections(
+        _detections(count), class_names=CLASS_NAMES, frame_w=FRAME_W, frame_h=FRAME_H
+    )
+    lifecycle.update(tracks=tracks, ts_unix_ms=0)
+    clock = iter(range(33, 10**9, 33))
+
+    # Steady state: every track is known and refreshed each tick
+    benchmark(lambda: lifecycle.update(tracks=tracks, ts_unix_ms=next(clock)))
+
+
+@pytest.mark.benchmark(group="tick-encoding")
+@pytest.mark.parametrize("count", [10, 100])
+def test_json_tick_encoding(benchmark, count):
+    tick = _tick(count)
+
+    payload = benchmark(encode_message, tick, "json")
+
+    assert json.loads(payload)["frame_index"] == 1234
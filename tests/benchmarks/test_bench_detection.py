@@ -0,0 +1,45 @@
+"""Benchmarks for per-frame detection work."""
+
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from src.detection import DetectionService
+from src.settings import Settings
+from src.thermal_detection import ThermalDetectionMethod, ThermalDetectionService
+from tests.benchmarks.conftest import RESOLUTIONS
+
+
+@pytest.mark.benchmark(group="thermal-detect")
+@pytest.mark.parametrize("resolution", list(RESOLUTIONS))
+@pytest.mark.parametrize("method", [m.value for m in ThermalDetectionMethod])
+def test_thermal_detect(benchmark, thermal_frames, method, resolution):
+    settings = Settings()
+    settings.thermal_detection.detection_method = method
+    service = ThermalDetectionService(settings=settings)
+    frames = itertools.cycle(thermal_frames[resolution])
+
+    benchmark(lambda: service.detect(next(frames)))
+
+
+def _boxes(count: int) -> list[SimpleNamespace]:
+    return [SimpleNamespace(cls=i % 4, conf=0.8) for i in range(count)]
+
+
+@pytest.mark.benchmark(group="filter-labels")
+def test_filter_by_target_labels(benchmark, mock_yolo_model, settings):  # noqa: ARG001 - mock_yolo_model needed for fixture
+    service = DetectionService(settings)
+    boxes = _boxes(200)
+
+    result = benchmark(service.filter_by_target_labels, boxes)
+
+    assert len(result) == 50
+
+
+@pytest.mark.benchmark(group="filter-labels")
+def test_thermal_filter_by_target_labels(benchmark):
+    service = ThermalDetectionService(settings=Settings())
+    boxes = _boxes(200)
+
+    benchmark(service.filter_by_target_labels, boxes)
@@ -0,0 +1,31 @@
+"""Benchmarks for frame hand-off and loop latency bookkeeping."""
+
+import numpy as np
+import pytest
+
+from src.frame_buffer import FrameBuffer
+from src.latency_monitor import LatencyMonitor
+
+
+@pytest.mark.benchmark(group="frame-buffer")
+@pytest.mark.parametrize(("width", "height"), [(1280, 720), (3840, 2160)])
+def test_frame_buffer_put_get(benchmark, width, height):
+    buffer = FrameBuffer(max_size=2)
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+
+    def put_get():
+        buffer.put(frame)
+        return buffer.get_nowait()
+
+    assert benchmark(put_get) is not None
+
+
+@pytest.mark.benchmark(group="latency-monitor")
+def test_latency_monitor_snapshot(benchmark):
+    monitor = LatencyMonitor(window_size=512)
+    rng = np.random.default_rng(0)
+    monitor.extend(rng.uniform(0.005, 0.05, size=512))
+
+    snapshot = benchmark(monitor.snapshot)
+
+    assert snapshot.count == 512
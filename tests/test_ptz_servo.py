@@ -6,7 +6,14 @@ import time
 
 import pytest
 
-from src.ptz_servo import GAINS_BALANCED, GAINS_RESPONSIVE, GAINS_SMOOTH, PTZServo
+from src.clock import VirtualClock
+from src.ptz_servo import (
+    GAINS_BALANCED,
+    GAINS_RESPONSIVE,
+    GAINS_SMOOTH,
+    PredictivePTZServo,
+    PTZServo,
+)
 
 
 def test_servo_initialization():
@@ -161,5 +168,79 @@ def test_servo_steady_state():
     assert variance < 0.1, "Output should stabilize at steady state"
 
 
+
+def test_servo_uses_injected_clock():
+    """Integral accumulates over virtual time, independent of wall time."""
+    clock = VirtualClock(start=100.0)
+    servo = PTZServo(GAINS_BALANCED, clock=clock)
+
+    for _ in range(5):
+        clock.advance(0.05)
+        servo.control(0.5, 0.0)
+
+    assert servo.integral_x == pytest.approx(5 * 0.5 * 0.05)
+    assert servo.last_time == pytest.approx(100.25)
+
+
+
+def _feed_constant_velocity(servo, *, target_v, camera_v=0.0, fov=0.5, n=10, dt=0.1):
+    """Observe a target moving at target_v while the camera pans at camera_v."""
+    clock = servo.clock
+    assert isinstance(clock, VirtualClock)
+    result = (0.0, 0.0)
+    for _ in range(n):
+        clock.advance(dt)
+        capture_ts = clock.time() - 0.2  # detection is 200 ms old
+        t = capture_ts - 1000.0
+        camera = camera_v * t
+        dx = (target_v * t - camera) / fov
+        result = servo.lead_offsets(
+            dx,
+            0.0,
+            capture_ts=capture_ts,
+            camera_pan=camera,
+            camera_tilt=0.0,
+            fov_x=fov,
+            fov_y=fov,
+        )
+    return result, dx
+
+
+def test_predictive_servo_leads_moving_target():
+    """Offset is extrapolated by target velocity over detection age + actuation."""
+    servo = PredictivePTZServo(
+        GAINS_BALANCED, clock=VirtualClock(start=1000.0), actuation_latency_s=0.1
+    )
+    (lead_dx, lead_dy), dx = _feed_constant_velocity(servo, target_v=0.2)
+
+    assert servo.last_lead_s == pytest.approx(0.3)
+    assert lead_dx == pytest.approx(dx + 0.2 * 0.3 / 0.5)
+    assert lead_dy == pytest.approx(0.0)
+
+
+def test_predictive_servo_accounts_for_camera_motion():
+    """A camera already following the target adds no lead."""
+    servo = PredictivePTZServo(GAINS_BALANCED, clock=VirtualClock(start=1000.0))
+    (lead_dx, _), dx = _feed_constant_velocity(servo, target_v=0.2, camera_v=0.2)
+    assert lead_dx == pytest.approx(dx)
+
+
+def test_predictive_servo_caps_lead_and_resets_history():
+    servo = PredictivePTZServo(
+        GAINS_BALANCED,
+        clock=VirtualClock(start=1000.0),
+        actuation_latency_s=1.0,
+        max_lead_s=0.25,
+    )
+    (lead_dx, _), dx = _feed_constant_velocity(servo, target_v=0.2)
+    assert servo.last_lead_s == pytest.approx(0.25)
+    assert lead_dx == pytest.approx(dx + 0.2 * 0.25 / 0.5)
+
+    servo.reset()
+    assert servo.velocities() == (0.0, 0.0, 0.0, 0.0)
+    (lead_dx, _), dx = _feed_constant_velocity(servo, target_v=0.2, n=2)
+    assert lead_dx == pytest.approx(dx)  # too few samples for a fit
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
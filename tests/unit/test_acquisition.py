@@ -0,0 +1,133 @@
+import pytest
+
+from src.clock import VirtualClock
+from src.ptz_simulator import SimulatedPTZService
+from src.settings import load_settings
+from src.tracking.acquisition import SnapAcquisition
+from src.tracking.control import field_of_view, snap_pose
+from src.tracking.state import TrackingPhase
+
+W, H = 640, 480
+EDGE_BBOX = (560, 220, 600, 260)  # centered at x=580: dx = 0.40625
+
+
+@pytest.fixture
+def settings():
+    settings = load_settings()
+    settings.ptz.acquisition_mode = "snap"
+    return settings
+
+
+class TestSnapPose:
+    def test_centers_target(self, settings):
+        fov_pan, fov_tilt = field_of_view(settings, 0.0)
+        pan, tilt, zoom = snap_pose(settings, (300, 420, 340, 460), W, H, (0.1, 0.2, 0.0))
+        assert pan == pytest.approx(0.1)
+        assert tilt == pytest.approx(0.2 - (440 / H - 0.5) * fov_tilt)
+        assert zoom == 0.0
+
+        pan, _, _ = snap_pose(settings, EDGE_BBOX, W, H, (0.1, 0.2, 0.0))
+        assert pan == pytest.approx(0.1 + (580 / W - 0.5) * fov_pan)
+
+    def test_inverted_pan(self, settings):
+        settings.ptz.invert_pan = True
+        fov_pan, _ = field_of_view(settings, 0.0)
+        pan, _, _ = snap_pose(settings, EDGE_BBOX, W, H, (0.0, 0.0, 0.0))
+        assert pan == pytest.approx(-(580 / W - 0.5) * fov_pan)
+
+    def test_zoom_for_target_coverage(self, settings):
+        settings.ptz.zoom_target_coverage = 0.25
+        bbox = (300, 220, 340, 260)  # coverage 40 / 480 (height dominates)
+        _, _, zoom = snap_pose(settings, bbox, W, H, (0.0, 0.0, 0.0), with_zoom=True)
+        coverage_after = (40 / H) * field_of_view(settings, 0.0)[0] / field_of_view(settings, zoom)[0]
+        assert coverage_after == pytest.approx(0.25, rel=1e-3)
+
+
+class TestSnapAcquisition:
+    @pytest.fixture
+    def clock(self):
+        return VirtualClock(start=100.0)
+
+    @pytest.fixture
+    def ptz(self, settings, clock):
+        return SimulatedPTZService(settings=settings, clock=clock)
+
+    def test_snaps_once_per_lock_and_holds(self, settings, clock, ptz):
+        acquisition = SnapAcquisition(settings, clock=clock)
+        acquisition.observe(TrackingPhase.TRACKING, 7)
+
+        assert acquisition.update(ptz, EDGE_BBOX, W, H) is True
+        expected_pan, _, _ = snap_pose(settings, EDGE_BBOX, W, H, (0.0, 0.0, 0.0))
+        assert ptz.pan_pos == pytest.approx(expected_pan)
+        assert acquisition.snaps == 1
+
+        # Still locked on the same target: no second snap, hold until settled
+        acquisition.observe(TrackingPhase.TRACKING, 7)
+        assert acquisition.update(ptz, EDGE_BBOX, W, H) is True
+        clock.advance(settings.ptz.acquisition_settle_s + 0.01)
+        acquisition.observe(TrackingPhase.TRACKING, 7)
+        assert acquisition.update(ptz, EDGE_BBOX, W, H) is False
+        assert acquisition.snaps == 1
+
+    def test_reacquisition_snaps_again(self, settings, clock, ptz):
+        acquisition = SnapAcquisition(settings, clock=clock)
+        for phase in (TrackingPhase.TRACKING, TrackingPhase.SEARCHING, TrackingPhase.TRACKING):
+            acquisition.observe(phase, 7)
+            if phase == TrackingPhase.TRACKING:
+                acquisition.update(ptz, EDGE_BBOX, W, H)
+        assert acquisition.snaps == 2
+
+    def test_small_offsets_use_continuous_tracking(self, settings, clock, ptz):
+        acquisition = SnapAcquisition(settings, clock=clock)
+        acquisition.observe(TrackingPhase.TRACKING, 7)
+        assert acquisition.update(ptz, (310, 230, 350, 270), W, H) is False
+        assert acquisition.snaps == 0
+        assert ptz.pan_pos == 0.0
+
+    def test_continuous_mode_never_snaps(self, settings, clock, ptz):
+        settings.ptz.acquisition_mode = "continuous"
+        acquisition = SnapAcquisition(settings, clock=clock)
+        acquisition.observe(TrackingPhase.TRACKING, 7)
+        assert acquisition.update(ptz, EDGE_BBOX, W, H) is False
+        assert ptz.pan_pos == 0.0
+
+
+class _PolledPTZ:
+    """PTZ whose cached ``abs_pan``/``abs_tilt`` lag its real pose until polled."""
+
+    def __init__(self, real_pan: float, *, readable: bool = True) -> None:
+        self.abs_pan = 0.0
+        self.abs_tilt = 0.0
+        self.real_pan = real_pan
+        self.readable = readable
+        self.moves: list[tuple[float, float, float | None]] = []
+
+    def update_position(self) -> bool:
+        if self.readable:
+            self.abs_pan = self.real_pan
+        return self.readable
+
+    def absolute_move(self, pan: float, tilt: float, zoom: float | None) -> bool:
+        self.moves.append((pan, tilt, zoom))
+        return True
+
+
+class TestSnapPoseRefresh:
+    def test_snap_uses_refreshed_pose(self, settings):
+        ptz = _PolledPTZ(real_pan=0.3)
+        acquisition = SnapAcquisition(settings, clock=VirtualClock())
+        acquisition.observe(TrackingPhase.TRACKING, 7)
+        acquisition.update(ptz, EDGE_BBOX, W, H)
+
+        expected_pan, _, _ = snap_pose(settings, EDGE_BBOX, W, H, (0.3, 0.0, 0.0))
+        assert len(ptz.moves) == 1
+        assert ptz.moves[0][0] == pytest.approx(expected_pan)
+
+    def test_failed_position_read_skips_snap(self, settings):
+        ptz = _PolledPTZ(real_pan=0.3, readable=False)
+        acquisition = SnapAcquisition(settings, clock=VirtualClock())
+        acquisition.observe(TrackingPhase.TRACKING, 7)
+
+        assert acquisition.update(ptz, EDGE_BBOX, W, H) is False
+        assert ptz.moves == []
+        assert acquisition.snaps == 0
@@ -102,3 +102,23 @@ class TestMetadataBuilderFixtures:
         )
 
         assert tick == expected
+
+    def test_reported_pose_is_included(self) -> None:
+        @dataclass(slots=True)
+        class PositionedPtz(DummyPtz):
+            abs_pan: float = 0.25
+            abs_tilt: float = -0.1
+            zoom_level: float = 0.5
+
+        builder = MetadataBuilder(session_id="s", camera_id="c")
+        tick = builder.build_tick(
+            frame_index=None,
+            frame_w=640,
+            frame_h=480,
+            tracks=[],
+            tracker_status=TrackerStatus(phase=TrackingPhase.IDLE, target_id=None),
+            ptz=PositionedPtz(),
+            ts_unix_ms=0,
+        )
+
+        assert tick["ptz"]["pose"] == {"pan": 0.25, "tilt": -0.1, "zoom": 0.5}
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from typing import Any
+
+from src.api.broadcast import SessionHub
+
+
+class ListenerSession:
+    def __init__(self) -> None:
+        self.listeners: list[Any] = []
+        self.backlog: list[dict[str, Any]] = []
+        self.latest: dict[str, Any] | None = None
+
+    def add_listener(self, callback: Any) -> list[dict[str, Any]]:
+        self.listeners.append(callback)
+        return list(self.backlog)
+
+    def remove_listener(self, callback: Any) -> None:
+        self.listeners.remove(callback)
+
+    def get_latest_tick(self) -> dict[str, Any] | None:
+        return self.latest
+
+    def push(self, tick: dict[str, Any], events: list[dict[str, Any]]) -> None:
+        self.latest = tick
+        for listener in list(self.listeners):
+            listener(tick, events)
+
+
+class PollingSession:
+    def __init__(self) -> None:
+        self.tick_calls = 0
+
+    def get_latest_tick(self) -> dict[str, Any] | None:
+        self.tick_calls += 1
+        return {"type": "metadata_tick", "ts_mono_ms": 1, "tracks": []}
+
+
+def _tick(ts: int) -> dict[str, Any]:
+    return {"type": "metadata_tick", "ts_mono_ms": ts, "tracks": []}
+
+
+def _event(n: int) -> dict[str, Any]:
+    return {"type": "track_event", "event": "new", "n": n}
+
+
+def test_hub_shares_payload_across_subscribers() -> None:
+    async def _run() -> None:
+        session = ListenerSession()
+        hub = SessionHub(session)
+        a = hub.subscribe()
+        b = hub.subscribe()
+        assert len(session.listeners) == 1
+
+        hub.publish(_tick(1), [_event(1)])
+        tick_a, events_a = await a.get()
+        tick_b, events_b = await b.get()
+        assert tick_a is tick_b
+        assert events_a[0] is events_b[0]
+        assert tick_a.get("json") is tick_b.get("json")
+
+        hub.unsubscribe(a)
+        hub.unsubscribe(b)
+        assert session.listeners == []
+
+    asyncio.run(_run())
+
+
+def test_thread_pushes_are_coalesced_latest_only() -> None:
+    async def _run() -> None:
+        session = ListenerSession()
+        hub = SessionHub(session)
+        sub = hub.subscribe()
+
+        def worker() -> None:
+            for i in range(1, 6):
+                session.push(_tick(i), [_event(i)])
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        tick, events = await asyncio.wait_for(sub.get(), timeout=1)
+        assert tick is not None
+        assert tick.message["ts_mono_ms"] == 5
+        assert [e.message["n"] for e in events] == [1, 2, 3, 4, 5]
+
+    asyncio.run(_run())
+
+
+def test_late_subscriber_gets_recent_events_and_slow_one_overflows() -> None:
+    async def _run() -> None:
+        session = ListenerSession()
+        session.backlog = [_event(0)]
+        hub = SessionHub(session, max_events=3)
+        slow = hub.subscribe()
+        hub.publish(None, [_event(1), _event(2)])
+
+        late = hub.subscribe()
+        _, events = await late.get()
+        assert [e.message["n"] for e in events] == [0, 1, 2]
+        assert slow.overflowed is False
+
+        # The replayed event 0 does not count: three live events fit
+        hub.publish(None, [_event(3)])
+        assert slow.overflowed is False
+        hub.publish(None, [_event(4)])
+        assert slow.overflowed is True
+
+        hub.publish(_tick(1))
+        hub.publish(_tick(2))
+        assert slow.dropped_ticks == 1
+
+    asyncio.run(_run())
+
+
+def test_full_replay_leaves_room_for_live_events() -> None:
+    async def _run() -> None:
+        session = ListenerSession()
+        hub = SessionHub(session, max_events=3)
+        hub.subscribe()
+        hub.publish(None, [_event(n) for n in range(5)])
+
+        late = hub.subscribe()
+        hub.publish(None, [_event(5), _event(6), _event(7)])
+        assert late.overflowed is False
+        _, events = await late.get()
+        assert [e.message["n"] for e in events] == [2, 3, 4, 5, 6, 7]
+
+    asyncio.run(_run())
+
+
+def test_polling_fallback_uses_one_task_for_all_subscribers() -> None:
+    async def _run() -> None:
+        session = PollingSession()
+        hub = SessionHub(session, poll_interval_s=0.01)
+        subs = [hub.subscribe() for _ in range(5)]
+        await asyncio.sleep(0.055)
+        calls = session.tick_calls
+        assert 2 <= calls <= 10
+        for sub in subs:
+            tick, _ = await asyncio.wait_for(sub.get(), timeout=1)
+            assert tick is not None
+        hub.close()
+
+    asyncio.run(_run())
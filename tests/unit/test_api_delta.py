@@ -0,0 +1,94 @@
+import pytest
+
+from src.api.delta import DELTA_TYPE, DeltaEncoder, apply_delta
+
+
+def _tick(ts: int, tracks: list[dict], pan: float = 0.0) -> dict:
+    return {
+        "schema": "drone-ptz-metadata/1",
+        "type": "metadata_tick",
+        "session_id": "s1",
+        "camera_id": "cam_01",
+        "ts_unix_ms": 1700000000000 + ts,
+        "ts_mono_ms": ts,
+        "space": "source",
+        "frame_size": {"w": 1280, "h": 720},
+        "selected_target_id": None,
+        "tracking_phase": "tracking",
+        "ptz": {
+            "control_mode": "sim",
+            "connected": True,
+            "active": True,
+            "cmd": {"pan": pan, "tilt": 0.0, "zoom": 0.0},
+        },
+        "tracks": tracks,
+    }
+
+
+def _track(track_id: int, x: float) -> dict:
+    return {
+        "id": track_id,
+        "label": "drone",
+        "conf": 0.9,
+        "bbox": {"x": x, "y": 0.2, "w": 0.1, "h": 0.1},
+    }
+
+
+def test_first_message_is_keyframe_then_deltas() -> None:
+    encoder = DeltaEncoder(keyframe_interval=10)
+    first = encoder.encode(_tick(1, [_track(1, 0.1), _track(2, 0.5)]))
+    assert first["type"] == "metadata_tick"
+    assert first["keyframe"] is True
+    assert first["seq"] == 1
+
+    delta = encoder.encode(_tick(2, [_track(1, 0.1), _track(3, 0.7)], pan=0.25))
+    assert delta["type"] == DELTA_TYPE
+    assert delta["seq"] == 2
+    assert delta["base_seq"] == 1
+    assert delta["tracks"] == [_track(3, 0.7)]
+    assert delta["removed"] == [2]
+    assert delta["ptz"] == {"cmd": {"pan": 0.25}}
+    assert "frame_size" not in delta
+    assert "schema" not in delta
+
+
+def test_unchanged_tick_produces_minimal_delta() -> None:
+    encoder = DeltaEncoder()
+    encoder.encode(_tick(1, [_track(1, 0.1)]))
+    delta = encoder.encode(_tick(2, [_track(1, 0.1)]))
+    assert set(delta) == {"type", "seq", "base_seq", "ts_unix_ms", "ts_mono_ms"}
+
+
+def test_keyframe_interval_and_resync() -> None:
+    encoder = DeltaEncoder(keyframe_interval=3)
+    kinds = [
+        encoder.encode(_tick(i, [_track(1, 0.1)])).get("keyframe", False)
+        for i in range(7)
+    ]
+    assert kinds == [True, False, False, True, False, False, True]
+
+    encoder.request_keyframe()
+    assert encoder.encode(_tick(8, [])).get("keyframe") is True
+
+
+def test_apply_delta_reconstructs_full_tick() -> None:
+    encoder = DeltaEncoder(keyframe_interval=100)
+    ticks = [
+        _tick(1, [_track(1, 0.1), _track(2, 0.5)]),
+        _tick(2, [_track(1, 0.15), _track(2, 0.5)], pan=0.3),
+        _tick(3, [_track(2, 0.5), _track(4, 0.9)], pan=0.3),
+        _tick(4, [], pan=-0.1),
+    ]
+    state = None
+    for tick in ticks:
+        state = apply_delta(state, encoder.encode(tick))
+        expected = dict(tick, seq=state["seq"])
+        assert state == expected
+
+
+def test_apply_delta_detects_gap() -> None:
+    encoder = DeltaEncoder()
+    state = apply_delta(None, encoder.encode(_tick(1, [])))
+    encoder.encode(_tick(2, []))  # lost in transit
+    with pytest.raises(ValueError, match="resync"):
+        apply_delta(state, encoder.encode(_tick(3, [])))
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from src.api.encoding import (
+    BBOX_SCALE,
+    EncodingError,
+    TickPayloadCache,
+    decode_message,
+    encode_message,
+    encoding_from_subprotocol,
+    resolve_encoding,
+    subprotocols,
+    to_fixed_point,
+)
+
+
+def _tick(ts_mono_ms: int = 100) -> dict:
+    return {
+        "schema": "drone-ptz-metadata/1",
+        "type": "metadata_tick",
+        "session_id": "s1",
+        "camera_id": "cam_01",
+        "ts_unix_ms": 1700000000000,
+        "ts_mono_ms": ts_mono_ms,
+        "space": "source",
+        "frame_size": {"w": 1280, "h": 720},
+        "selected_target_id": None,
+        "tracking_phase": "tracking",
+        "tracks": [
+            {
+                "id": 3,
+                "label": "drone",
+                "conf": 0.87,
+                "bbox": {"x": 0.123456, "y": 0.5, "w": 0.05, "h": 0.0625},
+            }
+        ],
+    }
+
+
+def test_json_encoding_is_compact_and_lossless() -> None:
+    tick = _tick()
+    encoded = encode_message(tick, "json")
+    assert isinstance(encoded, str)
+    assert ", " not in encoded
+    assert json.loads(encoded) == tick
+
+
+def test_fixed_point_does_not_mutate_input() -> None:
+    tick = _tick()
+    fixed = to_fixed_point(tick)
+    assert fixed["bbox_scale"] == BBOX_SCALE
+    assert fixed["tracks"][0]["bbox"] == [1235, 5000, 500, 625]
+    assert tick["tracks"][0]["bbox"]["x"] == 0.123456
+
+
+@pytest.mark.parametrize("encoding", ["msgpack", "cbor"])
+def test_binary_roundtrip(encoding: str) -> None:
+    pytest.importorskip("msgpack" if encoding == "msgpack" else "cbor2")
+    tick = _tick()
+    encoded = encode_message(tick, encoding)
+    assert isinstance(encoded, bytes)
+    assert len(encoded) < len(encode_message(tick, "json"))
+
+    decoded = decode_message(encoded, encoding)
+    assert decoded["tracks"][0]["bbox"] == [1235, 5000, 500, 625]
+    assert decoded["tracks"][0]["conf"] == pytest.approx(0.87, abs=1e-6)
+
+
+def test_resolve_encoding_rejects_unknown() -> None:
+    assert resolve_encoding(None) == "json"
+    assert resolve_encoding(" JSON ") == "json"
+    with pytest.raises(EncodingError):
+        resolve_encoding("xml")
+
+
+def test_subprotocols_prefer_binary() -> None:
+    offered = subprotocols()
+    assert offered[-1] == "drone-ptz.json"
+    assert encoding_from_subprotocol("drone-ptz.json") == "json"
+    assert encoding_from_subprotocol("other") is None
+    assert encoding_from_subprotocol(None) is None
+
+
+def test_tick_cache_encodes_once_per_tick() -> None:
+    cache = TickPayloadCache()
+    first = cache.payload_for(_tick(100))
+    assert cache.payload_for(_tick(100)) is first
+    assert first.get("json") is first.get("json")
+    assert cache.payload_for(_tick(101)) is not first
@@ -1,10 +1,18 @@
 import asyncio
+import json
+import threading
 from dataclasses import dataclass
+from types import SimpleNamespace
 from typing import Any
 
+import cv2
+import numpy as np
+import pytest
 from aiohttp.test_utils import TestClient, TestServer
 
+from src.analytics.event_store import EventStore
 from src.api.app import create_app
+from src.api.preview import PreviewFrame
 from src.api.session_manager import SessionManager
 from src.api.settings_manager import SettingsManager
 from src.settings import load_settings
@@ -198,3 +206,510 @@ def test_ws_sends_tick_and_accepts_commands() -> None:
                 await ws.close()
 
     asyncio.run(_run())
+
+
+def test_ws_msgpack_subprotocol_encodes_ticks_and_commands(tmp_path) -> None:
+    msgpack = pytest.importorskip("msgpack")
+
+    async def _run() -> None:
+        def factory(
+            session_id: str, camera_id: str, _settings_manager: Any
+        ) -> FakeSession:
+            return FakeSession(session_id=session_id, camera_id=camera_id)
+
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"],
+            session_factory=factory,
+            settings_manager=settings_manager,
+        )
+        app = create_app(manager, settings_manager, publish_hz=100.0)
+        created = manager.get_or_create_session(camera_id="cam_01")
+        created.session.start()
+        session_id = created.session.session_id
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            ws = await client.ws_connect(
+                f"/ws/sessions/{session_id}", protocols=("drone-ptz.msgpack",)
+            )
+            try:
+                assert ws.protocol == "drone-ptz.msgpack"
+                tick = msgpack.unpackb(await ws.receive_bytes(timeout=1))
+                assert tick["type"] == "metadata_tick"
+                assert tick["bbox_scale"] == 10_000
+
+                event = msgpack.unpackb(await ws.receive_bytes(timeout=1))
+                assert event["type"] == "track_event"
+                assert event["after"]["best_bbox"] == [1000, 2000, 1000, 1000]
+
+                await ws.send_bytes(
+                    msgpack.packb({"type": "set_target_id", "target_id": 7})
+                )
+                ack = msgpack.unpackb(await ws.receive_bytes(timeout=1))
+                assert ack == {
+                    "type": "ack",
+                    "command": "set_target_id",
+                    "target_id": 7,
+                }
+            finally:
+                await ws.close()
+
+            resp = await client.get(f"/ws/sessions/{session_id}?encoding=xml")
+            assert resp.status == 400
+
+    asyncio.run(_run())
+
+
+def test_ws_delta_mode_sends_keyframe_and_resyncs(tmp_path) -> None:
+    async def _run() -> None:
+        def factory(
+            session_id: str, camera_id: str, _settings_manager: Any
+        ) -> FakeSession:
+            return FakeSession(session_id=session_id, camera_id=camera_id)
+
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"],
+            session_factory=factory,
+            settings_manager=settings_manager,
+        )
+        app = create_app(manager, settings_manager, publish_hz=100.0)
+        created = manager.get_or_create_session(camera_id="cam_01")
+        created.session.start()
+        session_id = created.session.session_id
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            ws = await client.ws_connect(f"/ws/sessions/{session_id}?mode=delta")
+            try:
+                keyframe = await ws.receive_json(timeout=1)
+                assert keyframe["type"] == "metadata_tick"
+                assert keyframe["keyframe"] is True
+                assert keyframe["seq"] == 1
+
+                event = await ws.receive_json(timeout=1)
+                assert event["type"] == "track_event"
+
+                await ws.send_json({"type": "resync"})
+                ack = await ws.receive_json(timeout=1)
+                assert ack == {"type": "ack", "command": "resync"}
+                keyframe = await ws.receive_json(timeout=1)
+                assert keyframe["keyframe"] is True
+                assert keyframe["seq"] == 2
+            finally:
+                await ws.close()
+
+            resp = await client.get(f"/ws/sessions/{session_id}?mode=bogus")
+            assert resp.status == 400
+
+    asyncio.run(_run())
+
+
+def test_events_long_poll_replays_from_cursor(tmp_path) -> None:
+    async def _run() -> None:
+        def factory(
+            session_id: str, camera_id: str, _settings_manager: Any
+        ) -> FakeSession:
+            return FakeSession(session_id=session_id, camera_id=camera_id)
+
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"],
+            session_factory=factory,
+            settings_manager=settings_manager,
+        )
+        app = create_app(manager, settings_manager)
+        created = manager.get_or_create_session(camera_id="cam_01")
+        created.session.start()
+        session_id = created.session.session_id
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            resp = await client.get(f"/sessions/{session_id}/events")
+            assert resp.status == 200
+            body = await resp.json()
+            assert body["cursor"] == 1
+            assert [e["event"] for e in body["events"]] == ["new"]
+
+            resp = await client.get(
+                f"/sessions/{session_id}/events", params={"cursor": 1, "timeout": 0.1}
+            )
+            body = await resp.json()
+            assert body == {"session_id": session_id, "cursor": 1, "events": []}
+
+            resp = await client.get(
+                f"/sessions/{session_id}/events", params={"cursor": "x"}
+            )
+            assert resp.status == 400
+
+    asyncio.run(_run())
+
+
+async def _read_sse_frames(resp: Any, count: int) -> list[dict[str, str]]:
+    frames: list[dict[str, str]] = []
+    frame: dict[str, str] = {}
+    while len(frames) < count:
+        line = (await asyncio.wait_for(resp.content.readline(), timeout=1)).decode()
+        line = line.rstrip("\n")
+        if not line:
+            if frame:
+                frames.append(frame)
+            frame = {}
+        elif not line.startswith(":"):
+            key, _, value = line.partition(": ")
+            frame[key] = value
+    return frames
+
+
+def test_sse_stream_sends_ticks_and_resumes_events(tmp_path) -> None:
+    async def _run() -> None:
+        def factory(
+            session_id: str, camera_id: str, _settings_manager: Any
+        ) -> FakeSession:
+            return FakeSession(session_id=session_id, camera_id=camera_id)
+
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"],
+            session_factory=factory,
+            settings_manager=settings_manager,
+        )
+        app = create_app(manager, settings_manager, auto_start_session=False)
+        created = manager.get_or_create_session(camera_id="cam_01")
+        created.session.start()
+        session_id = created.session.session_id
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            # A new subscriber starts at the head: no backlog replay
+            resp = await client.get(f"/sessions/{session_id}/stream")
+            assert resp.status == 200
+            assert resp.headers["Content-Type"].startswith("text/event-stream")
+            retry, tick = await _read_sse_frames(resp, 2)
+            assert retry == {"retry": "2000"}
+            assert tick["event"] == "metadata_tick"
+            assert json.loads(tick["data"])["session_id"] == session_id
+            with pytest.raises(asyncio.TimeoutError):
+                await _read_sse_frames(resp, 1)
+            resp.close()
+
+            resp = await client.get(
+                f"/sessions/{session_id}/stream", params={"since": "0"}
+            )
+            _, _, event = await _read_sse_frames(resp, 3)
+            assert event["event"] == "track_event"
+            assert event["id"] == "1"
+            assert json.loads(event["data"])["event"] == "new"
+            resp.close()
+
+            resp = await client.get(
+                f"/sessions/{session_id}/stream", headers={"Last-Event-ID": "1"}
+            )
+            _, tick = await _read_sse_frames(resp, 2)
+            assert tick["event"] == "metadata_tick"
+            with pytest.raises(asyncio.TimeoutError):
+                await _read_sse_frames(resp, 1)
+            resp.close()
+
+            resp = await client.get(
+                f"/sessions/{session_id}/stream", headers={"Last-Event-ID": "abc"}
+            )
+            assert resp.status == 400
+
+            resp = await client.get("/tick")
+            assert resp.status == 200
+            assert (await resp.json())["session_id"] == session_id
+
+    asyncio.run(_run())
+
+
+def test_history_endpoints_query_event_store(tmp_path) -> None:
+    async def _run() -> None:
+        def factory(
+            session_id: str, camera_id: str, _settings_manager: Any
+        ) -> FakeSession:
+            return FakeSession(session_id=session_id, camera_id=camera_id)
+
+        # FakeSession events are from 2023; keep them through startup compaction.
+        store = EventStore(path=tmp_path / "events.sqlite3", retention_days=36_500)
+        store.start()
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"],
+            session_factory=factory,
+            settings_manager=settings_manager,
+            event_store=store,
+        )
+        app = create_app(manager, settings_manager, auto_start_session=False)
+        session = FakeSession(session_id="s1", camera_id="cam_01")
+        session.start()
+        for event in session.get_events_since(None)[1]:
+            store.append(event)
+        store.flush()
+
+        try:
+            async with TestServer(app) as server, TestClient(server) as client:
+                resp = await client.get(
+                    "/history/events",
+                    params={"camera_id": "cam_01", "since": 1700000000000},
+                )
+                assert resp.status == 200
+                body = await resp.json()
+                assert body["count"] == 1
+                assert body["events"][0]["after"]["id"] == 7
+
+                resp = await client.get("/history/cameras/cam_01/tracks/7")
+                assert resp.status == 200
+                assert len((await resp.json())["events"]) == 1
+
+                resp = await client.get("/history/cameras/cam_01/tracks/8")
+                assert resp.status == 404
+
+                resp = await client.get("/history/events", params={"since": "x"})
+                assert resp.status == 400
+        finally:
+            store.stop()
+
+    asyncio.run(_run())
+
+
+class PreviewSession(FakeSession):
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.preview_calls = 0
+
+    def get_preview_frame(self) -> Any:
+        self.preview_calls += 1
+        box = SimpleNamespace(cls=0, conf=0.9, id=7, xyxy=[(100, 100, 300, 260)])
+        return PreviewFrame(
+            frame=np.full((720, 1280, 3), 40, dtype=np.uint8),
+            boxes=[box],
+            target_id=7,
+            class_names={0: "drone"},
+            frame_index=self.preview_calls,
+        )
+
+
+async def _read_mjpeg_part(resp: Any) -> bytes:
+    boundary = await asyncio.wait_for(resp.content.readline(), timeout=5)
+    assert boundary == b"--frame\r\n"
+    headers = {}
+    while (line := await resp.content.readline()) != b"\r\n":
+        key, _, value = line.decode().strip().partition(": ")
+        headers[key] = value
+    assert headers["Content-Type"] == "image/jpeg"
+    body = await resp.content.readexactly(int(headers["Content-Length"]))
+    await resp.content.readexactly(2)
+    return body
+
+
+def test_mjpeg_preview_is_shared_and_stops_without_viewers(tmp_path) -> None:
+    if not hasattr(cv2, "__file__"):
+        pytest.skip("cv2 is replaced by a mock in this test session")
+
+    async def _run() -> None:
+        def factory(
+            session_id: str, camera_id: str, _settings_manager: Any
+        ) -> FakeSession:
+            cls = PreviewSession if camera_id == "cam_01" else FakeSession
+            return cls(session_id=session_id, camera_id=camera_id)
+
+        settings = load_settings(tmp_path / "missing.yaml")
+        settings.performance.preview_max_width = 320
+        settings.performance.preview_max_fps = 20.0
+        settings_manager = SettingsManager(settings)
+        manager = SessionManager(
+            cameras=["cam_01", "cam_02"],
+            session_factory=factory,
+            settings_manager=settings_manager,
+        )
+        app = create_app(manager, settings_manager, auto_start_session=False)
+        session = manager.get_or_create_session(camera_id="cam_01").session
+        plain = manager.get_or_create_session(camera_id="cam_02").session
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            assert session.preview_calls == 0  # nothing encoded before a viewer
+
+            url = f"/sessions/{session.session_id}/preview.mjpg"
+            first = await client.get(url)
+            second = await client.get(url)
+            assert first.headers["Content-Type"].startswith("multipart/x-mixed-replace")
+            jpeg = await _read_mjpeg_part(first)
+            await _read_mjpeg_part(second)
+
+            image = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+            assert image.shape == (180, 320, 3)  # capped resolution
+            assert (image[:, :, 1] > 200).any()  # locked target drawn in green
+
+            stream = app["preview_streams"][session.session_id]
+            assert stream.viewer_count == 2
+            first.close()
+            second.close()
+            for _ in range(100):
+                if stream.viewer_count == 0:
+                    break
+                await asyncio.sleep(0.02)
+            assert stream.viewer_count == 0
+            calls = session.preview_calls
+            await asyncio.sleep(0.2)
+            assert session.preview_calls == calls  # encoder stopped
+
+            resp = await client.get(f"/sessions/{plain.session_id}/preview.mjpg")
+            assert resp.status == 501
+            resp = await client.get("/sessions/unknown/preview.mjpg")
+            assert resp.status == 404
+
+    asyncio.run(_run())
+
+
+def test_readyz_waits_for_auto_started_sessions(tmp_path) -> None:
+    class WarmingSession(FakeSession):
+        models_loaded = False
+
+        def is_ready(self) -> bool:
+            return self._running and self.models_loaded
+
+    async def _run() -> None:
+        sessions: list[WarmingSession] = []
+
+        def factory(
+            session_id: str, camera_id: str, _settings_manager: Any
+        ) -> WarmingSession:
+            session = WarmingSession(session_id=session_id, camera_id=camera_id)
+            sessions.append(session)
+            return session
+
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"], session_factory=factory, settings_manager=settings_manager
+        )
+        app = create_app(manager, settings_manager, camera_id="cam_01")
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            resp = await client.get("/healthz")
+            assert resp.status == 200
+
+            for _ in range(200):
+                if app["warmup"]["phase"] == "done":
+                    break
+                await asyncio.sleep(0.01)
+            assert sessions
+            assert all(s.is_running() for s in sessions)
+
+            resp = await client.get("/readyz")
+            assert resp.status == 503
+            body = await resp.json()
+            assert body["status"] == "starting"
+            assert set(body["sessions"]) == {s.session_id for s in sessions}
+
+            for session in sessions:
+                session.models_loaded = True
+            resp = await client.get("/readyz")
+            assert resp.status == 200
+            assert (await resp.json())["status"] == "ready"
+
+    asyncio.run(_run())
+
+
+def test_readyz_without_auto_start_is_ready(tmp_path) -> None:
+    async def _run() -> None:
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"],
+            session_factory=lambda *_args: None,
+            settings_manager=settings_manager,
+        )
+        app = create_app(manager, settings_manager, auto_start_session=False)
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            resp = await client.get("/readyz")
+            assert resp.status == 200
+            assert (await resp.json())["sessions"] == {}
+
+    asyncio.run(_run())
+
+
+async def _wait_for_warm_up(app: Any) -> None:
+    for _ in range(200):
+        if app["warmup"]["phase"] == "done":
+            return
+        await asyncio.sleep(0.01)
+
+
+def test_readyz_reports_failed_auto_start(tmp_path) -> None:
+    def factory(*_args: Any) -> FakeSession:
+        msg = "camera unreachable"
+        raise RuntimeError(msg)
+
+    async def _run() -> None:
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"], session_factory=factory, settings_manager=settings_manager
+        )
+        app = create_app(manager, settings_manager, camera_id="cam_01")
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            await _wait_for_warm_up(app)
+            resp = await client.get("/readyz")
+            assert resp.status == 503
+            body = await resp.json()
+            assert body["status"] == "failed"
+            assert "camera unreachable" in body["error"]
+            assert body["sessions"] == {}
+
+    asyncio.run(_run())
+
+
+def test_readyz_fails_when_auto_started_session_is_deleted(tmp_path) -> None:
+    async def _run() -> None:
+        settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+        manager = SessionManager(
+            cameras=["cam_01"],
+            session_factory=lambda session_id, camera_id, _settings: FakeSession(
+                session_id=session_id, camera_id=camera_id
+            ),
+            settings_manager=settings_manager,
+        )
+        app = create_app(manager, settings_manager, camera_id="cam_01")
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            await _wait_for_warm_up(app)
+            resp = await client.get("/readyz")
+            assert resp.status == 200
+
+            (session_id,) = app["warmup"]["session_ids"]
+            assert manager.delete_session(session_id)
+            resp = await client.get("/readyz")
+            assert resp.status == 503
+            body = await resp.json()
+            assert body["status"] == "failed"
+            assert body["missing"] == [session_id]
+
+    asyncio.run(_run())
+
+
+def test_shutdown_during_warm_up_stops_auto_start(tmp_path) -> None:
+    creating = threading.Event()
+    release = threading.Event()
+    sessions: list[FakeSession] = []
+
+    def factory(session_id: str, camera_id: str, _settings_manager: Any) -> FakeSession:
+        creating.set()
+        release.wait(timeout=5)
+        session = FakeSession(session_id=session_id, camera_id=camera_id)
+        sessions.append(session)
+        return session
+
+    settings_manager = SettingsManager(load_settings(tmp_path / "missing.yaml"))
+    manager = SessionManager(
+        cameras=["cam_01"], session_factory=factory, settings_manager=settings_manager
+    )
+
+    async def _run() -> None:
+        app = create_app(manager, settings_manager, camera_id="cam_01")
+        async with TestServer(app):
+            assert await asyncio.to_thread(creating.wait, 5)
+        # The worker thread outlives cleanup; asyncio.run waits for it to finish
+        release.set()
+
+    asyncio.run(_run())
+    assert sessions
+    assert not sessions[0].is_running()
+    assert manager.list_sessions() == []
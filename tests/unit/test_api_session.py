@@ -17,6 +17,7 @@ def test_threaded_analytics_session_initializes(tmp_path: Path) -> None:
     assert session.get_latest_tick() is None
     assert session.get_status() == {
         "running": False,
+        "ready": False,
         "selected_target_id": None,
         "tracking_phase": "idle",
         "last_tick_ts_unix_ms": None,
@@ -0,0 +1,31 @@
+import time
+
+import pytest
+
+from src.clock import SYSTEM_CLOCK, VirtualClock
+
+
+def test_system_clock_tracks_real_time() -> None:
+    assert SYSTEM_CLOCK.time() == pytest.approx(time.time(), abs=1.0)
+    assert SYSTEM_CLOCK.monotonic() <= time.monotonic()
+
+
+def test_virtual_clock_only_moves_when_driven() -> None:
+    clock = VirtualClock(start=100.0)
+    assert clock.time() == 100.0
+    assert clock.monotonic() == 0.0
+
+    clock.advance(0.5)
+    assert clock.time() == 100.5
+    assert clock.monotonic() == 0.5
+
+    clock.set(102.0)
+    assert clock.monotonic() == 2.0
+
+
+def test_virtual_clock_rejects_going_backwards() -> None:
+    clock = VirtualClock(start=10.0)
+    with pytest.raises(ValueError, match="backwards"):
+        clock.advance(-1.0)
+    with pytest.raises(ValueError, match="backwards"):
+        clock.set(9.0)
@@ -0,0 +1,167 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.clock import VirtualClock
+from src.ptz_servo import PTZServo
+from src.ptz_simulator import SimulatedPTZService
+from src.settings import load_settings
+from src.tracking.control import field_of_view
+from src.tracking.control_loop import AlphaBetaFilter, PTZControlLoop
+
+W, H = 640, 480
+RIGHT_BBOX = (480, 220, 520, 260)
+
+
+@pytest.fixture
+def settings():
+    settings = load_settings()
+    settings.ptz.control_loop = "threaded"
+    return settings
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(start=100.0)
+
+
+@pytest.fixture
+def ptz(settings, clock):
+    return SimulatedPTZService(settings=settings, clock=clock)
+
+
+@pytest.fixture
+def loop(settings, clock, ptz):
+    return PTZControlLoop(settings, ptz, PTZServo(clock=clock), clock=clock)
+
+
+class TestAlphaBetaFilter:
+    def test_converges_to_constant_velocity(self):
+        f = AlphaBetaFilter(alpha=0.5, beta=0.1)
+        for i in range(200):
+            t = i * 0.1
+            f.update(t, (2.0 * t, -1.0 * t))
+        np.testing.assert_allclose(f.velocity, [2.0, -1.0], atol=1e-3)
+        np.testing.assert_allclose(f.predict(20.0), [40.0, -20.0], atol=1e-2)
+
+    def test_ignores_stale_measurements_and_never_predicts_backwards(self):
+        f = AlphaBetaFilter()
+        f.update(1.0, (0.5, 0.5))
+        f.update(1.0, (9.0, 9.0))
+        np.testing.assert_allclose(f.predict(0.0), [0.5, 0.5])
+
+    def test_predict_requires_measurement(self):
+        with pytest.raises(ValueError, match="no measurement"):
+            AlphaBetaFilter().predict(0.0)
+
+
+class TestPTZControlLoop:
+    def test_no_target_no_command(self, loop, ptz):
+        assert loop.step() is None
+        assert ptz.active is False
+
+    def test_steers_toward_target(self, loop, clock):
+        loop.submit(RIGHT_BBOX, W, H)
+        clock.advance(0.02)
+        pan, tilt, _ = loop.step()
+        assert pan > 0.0
+        assert tilt == pytest.approx(0.0)
+        assert loop.last_command.startswith("continuous_move")
+
+    def test_ticks_between_detections_follow_camera_motion(self, loop, clock, ptz):
+        """The error shrinks across ticks as the camera closes in, without new detections."""
+        loop.submit(RIGHT_BBOX, W, H)
+        fov_pan, _ = field_of_view(loop.settings, 0.0)
+        target = 0.25 * fov_pan
+        errors = []
+        for _ in range(10):
+            clock.advance(0.02)
+            loop.step()
+            errors.append(target - ptz.pan_pos)
+        assert errors[-1] < errors[0]
+
+    def test_stale_estimate_stops_once(self, loop, clock, ptz, settings):
+        loop.submit(RIGHT_BBOX, W, H)
+        clock.advance(0.02)
+        loop.step()
+        assert ptz.active
+
+        clock.advance(settings.ptz.estimate_timeout_s + 0.1)
+        assert loop.step() is None
+        assert loop.last_command == "stop()"
+        assert not ptz.active
+        assert not loop.has_target
+
+    def test_reset_silences_loop(self, loop, clock):
+        loop.submit(RIGHT_BBOX, W, H)
+        loop.reset()
+        clock.advance(0.02)
+        assert loop.step() is None
+
+    def test_thread_runs_at_control_rate(self, settings, ptz):
+        settings.ptz.control_rate_hz = 100.0
+        loop = PTZControlLoop(settings, ptz, PTZServo())
+        loop.start()
+        try:
+            time.sleep(0.2)
+        finally:
+            loop.stop()
+        assert 5 <= loop.ticks <= 40
+
+
+class _PolledHead:
+    """PTZService-like head whose cached pose only changes when polled."""
+
+    def __init__(self) -> None:
+        self.abs_pan = 0.0
+        self.abs_tilt = 0.0
+        self.last_vel_pan = 0.0
+        self.last_vel_tilt = 0.0
+        self.polls = 0
+        self.commands: list[tuple[float, float, float]] = []
+
+    def update_position(self) -> bool:
+        self.polls += 1
+        return True
+
+    def continuous_move(self, pan: float, tilt: float, zoom: float) -> None:
+        self.commands.append((pan, tilt, zoom))
+
+    def stop(self) -> None:
+        self.commands.append((0.0, 0.0, 0.0))
+
+
+class TestStalePose:
+    def test_submit_leaves_polling_to_the_main_loop(self, settings, clock):
+        head = _PolledHead()
+        loop = PTZControlLoop(settings, head, PTZServo(clock=clock), clock=clock)
+        loop.submit(RIGHT_BBOX, W, H)
+        loop.step()
+        assert head.polls == 0
+
+    def test_detection_uses_pose_at_capture_time(self, settings, clock):
+        # Centered target seen in an older frame, head slewing right since
+        commands = []
+        for age in (0.0, 0.05):
+            head = _PolledHead()
+            head.last_vel_pan = 0.25
+            loop = PTZControlLoop(settings, head, PTZServo(clock=clock), clock=clock)
+            loop.submit((300, 220, 340, 260), W, H, capture_ts=clock.time())
+            clock.advance(0.1)
+            loop.submit((300, 220, 340, 260), W, H, capture_ts=clock.time() - age)
+            commands.append(loop.step()[0])
+        # The older frame puts the target further left
+        assert commands[1] < commands[0]
+
+    def test_ticks_dead_reckon_between_polls(self, settings, clock):
+        # Centered target, head already slewing right with an unchanged cache
+        head = _PolledHead()
+        head.last_vel_pan = 0.5
+        loop = PTZControlLoop(settings, head, PTZServo(clock=clock), clock=clock)
+        loop.submit((300, 220, 340, 260), W, H)
+
+        clock.advance(0.1)
+        pan, _, _ = loop.step()
+        # The camera has passed the target: steer back left
+        assert pan < 0.0
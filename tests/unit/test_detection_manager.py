@@ -2,6 +2,9 @@ import pytest
 import threading
 import queue
 import time
+
+import numpy as np
+
 from src.settings import Settings
 from src.detection_manager import DetectionManager, DetectionMode, DetectionResult
 
@@ -49,3 +52,27 @@ def test_detection_manager_start_stop():
     manager.start()
     manager.stop()
     assert manager._stop_event.is_set()
+
+
+def test_results_carry_capture_time():
+    from src.clock import VirtualClock
+
+    class _Service:
+        def detect(self, frame, motion=None):
+            return []
+
+    settings = Settings()
+    clock = VirtualClock(start=100.0)
+    manager = DetectionManager(settings, clock=clock)
+    manager._thermal_service = _Service()
+
+    manager.submit_frame(DetectionMode.THERMAL, np.zeros((4, 4), dtype=np.uint8))
+    clock.advance(0.25)
+    manager.submit_frame(
+        DetectionMode.THERMAL, np.zeros((4, 4), dtype=np.uint8), capture_ts=100.2
+    )
+    clock.advance(0.25)
+    (result,) = manager.get_detections(now=clock.time())
+
+    assert result.capture_ts == 100.2
+    assert result.timestamp == 100.5
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from src.analytics.event_log import EventLog, freeze, thaw
+from src.api.encoding import encode_message
+
+
+def _event(n: int) -> dict:
+    return {
+        "type": "track_event",
+        "event": "new",
+        "after": {"id": n, "best_bbox": {"x": 0.1, "y": 0.2, "w": 0.1, "h": 0.1}},
+        "zones": ["a"],
+    }
+
+
+def test_read_since_returns_only_new_events() -> None:
+    log = EventLog(capacity=10)
+    assert log.read_since(None) == (None, [])
+    for n in range(1, 4):
+        assert log.append(_event(n))[0] == n
+
+    cursor, events = log.read_since(None)
+    assert cursor == 3
+    assert [e["after"]["id"] for e in events] == [1, 2, 3]
+
+    cursor, events = log.read_since(2)
+    assert cursor == 3
+    assert [e["after"]["id"] for e in events] == [3]
+
+    assert log.read_since(3) == (3, [])
+    assert log.read_since(2, limit=0) == (2, [])
+
+
+def test_ring_overwrites_oldest_and_clamps_stale_cursor() -> None:
+    log = EventLog(capacity=3)
+    for n in range(1, 8):
+        log.append(_event(n))
+    assert log.first_seq == 5
+    assert log.last_seq == 7
+    assert len(log) == 3
+
+    cursor, events = log.read_since(1)
+    assert cursor == 7
+    assert [e["after"]["id"] for e in events] == [5, 6, 7]
+
+    cursor, events = log.read_since(4, limit=2)
+    assert cursor == 6
+    assert [e["after"]["id"] for e in events] == [5, 6]
+
+
+def test_payloads_are_frozen_and_shared() -> None:
+    log = EventLog()
+    source = _event(1)
+    _, stored = log.append(source)
+    source["after"]["id"] = 99
+
+    _, first = log.read_since(None)
+    _, second = log.read_since(None)
+    assert first[0] is second[0] is stored
+    assert stored["after"]["id"] == 1
+    assert thaw(stored) == _event(1)
+    with pytest.raises(TypeError):
+        stored["event"] = "end"  # type: ignore[index]
+
+
+def test_frozen_payloads_encode() -> None:
+    frozen = freeze(_event(1))
+    assert json.loads(encode_message(frozen, "json")) == _event(1)
+    msgpack = pytest.importorskip("msgpack")
+    decoded = msgpack.unpackb(encode_message(frozen, "msgpack"))
+    assert decoded["after"]["best_bbox"] == [1000, 2000, 1000, 1000]
@@ -0,0 +1,87 @@
+import time
+
+from src.analytics.event_log import freeze
+from src.analytics.event_store import EventStore
+
+NOW_MS = int(time.time() * 1000)
+
+
+def _event(camera_id: str, track_id: int, ts: int, kind: str = "new") -> dict:
+    return {
+        "schema": "drone-ptz-metadata/1",
+        "type": "track_event",
+        "event": kind,
+        "session_id": f"session-{camera_id}",
+        "camera_id": camera_id,
+        "ts_unix_ms": ts,
+        "before": None,
+        "after": {"id": track_id, "label": "drone", "top_conf": 0.9},
+    }
+
+
+def test_batched_writes_and_time_range_queries(tmp_path) -> None:
+    store = EventStore(path=tmp_path / "db" / "events.sqlite3", flush_interval_s=0.05)
+    store.start()
+    try:
+        store.append(_event("cam_01", 1, NOW_MS + 1000))
+        store.append(_event("cam_01", 1, NOW_MS + 2000, "update"))
+        store.listener(None, [freeze(_event("cam_02", 5, NOW_MS + 1500))])
+        store.append(_event("cam_01", 2, NOW_MS + 3000))
+        store.append(_event("cam_01", 1, NOW_MS + 4000, "end"))
+        store.flush()
+
+        rows = store.query(
+            camera_id="cam_01", since_ms=NOW_MS + 1500, until_ms=NOW_MS + 4000
+        )
+        assert [(r["after"]["id"], r["event"]) for r in rows] == [
+            (1, "update"),
+            (2, "new"),
+        ]
+        assert [r["event"] for r in store.track_history("cam_01", 1)] == [
+            "new",
+            "update",
+            "end",
+        ]
+        assert store.query(event="new", limit=1)[0]["ts_unix_ms"] == NOW_MS + 1000
+        assert store.query(camera_id="cam_02")[0]["after"]["id"] == 5
+    finally:
+        store.stop()
+
+    reopened = EventStore(path=tmp_path / "db" / "events.sqlite3")
+    reopened.start()
+    try:
+        assert len(reopened.query()) == 5
+    finally:
+        reopened.stop()
+
+
+def test_retention_compaction(tmp_path) -> None:
+    day_ms = 86_400_000
+    store = EventStore(path=tmp_path / "events.sqlite3", retention_days=2.0)
+    store.start()
+    try:
+        for day in range(5):
+            store.append(_event("cam_01", day, NOW_MS + day * day_ms))
+        store.flush()
+        assert store.compact(now_ms=NOW_MS + 5 * day_ms) == 3
+        assert [r["after"]["id"] for r in store.query()] == [3, 4]
+    finally:
+        store.stop()
+
+
+def test_append_never_blocks_when_queue_is_full(tmp_path) -> None:
+    store = EventStore(path=tmp_path / "events.sqlite3", queue_maxsize=1)
+    assert store.append(_event("cam_01", 1, 1)) is True
+    assert store.append(_event("cam_01", 2, 2)) is False
+    assert store.dropped == 1
+
+
+def test_row_id_is_not_overwritten_by_payload(tmp_path) -> None:
+    store = EventStore(path=tmp_path / "events.sqlite3")
+    store.start()
+    try:
+        store.append({**_event("cam_01", 1, NOW_MS), "id": "spoofed"})
+        store.flush()
+        assert store.query()[0]["id"] == 1
+    finally:
+        store.stop()
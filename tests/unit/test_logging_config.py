@@ -0,0 +1,87 @@
+"""Tests for the sampled hot-path logger and the JSON log sink."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from loguru import logger
+
+from src.logging_config import HotPathLogger, setup_logging
+from src.settings import Settings
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Unformattable:
+    def __format__(self, spec: str) -> str:
+        raise AssertionError("formatted a filtered message")
+
+
+@pytest.fixture
+def records():
+    captured = []
+    sink_id = logger.add(lambda message: captured.append(message.record), level="TRACE")
+    yield captured
+    logger.remove(sink_id)
+
+
+def test_filtered_levels_are_not_formatted(records):
+    hot = HotPathLogger(level="INFO")
+    assert hot.debug("value={}", _Unformattable()) is False
+    assert records == []
+
+
+def test_every_keeps_one_call_in_n(records):
+    hot = HotPathLogger()
+    emitted = [hot.info("tick {}", i, every=3) for i in range(7)]
+    assert emitted == [True, False, False, True, False, False, True]
+    assert [r["message"] for r in records] == ["tick 0", "tick 3", "tick 6"]
+
+
+def test_rate_cap_reports_suppressed_calls(records):
+    clock = _FakeClock()
+    hot = HotPathLogger(max_per_s=2.0, clock=clock)
+    for now in (0.0, 0.1, 0.2, 0.3, 0.5):
+        clock.now = now
+        hot.warning("slow")
+
+    assert [r["message"] for r in records] == ["slow", "slow (+3 suppressed)"]
+    assert records[0]["function"] == "test_rate_cap_reports_suppressed_calls"
+
+
+def test_call_sites_and_keys_are_limited_separately(records):
+    hot = HotPathLogger(max_per_s=1.0, clock=_FakeClock())
+    hot.info("a")
+    hot.info("b")
+    hot.info("c", key="camera-1")
+    hot.info("d", key="camera-1")
+    hot.info("e", key="camera-2", camera="thermal")
+
+    assert [r["message"] for r in records] == ["a", "b", "c", "e"]
+    assert records[-1]["extra"]["camera"] == "thermal"
+
+
+def test_json_log_file(tmp_path):
+    settings = Settings()
+    settings.logging.log_file = str(tmp_path / "app.log")
+    settings.logging.log_json = True
+    settings.logging.log_enqueue = False
+    settings.logging.log_level = "INFO"
+    try:
+        setup_logging(settings)
+        logger.bind(session_id="s1").info("hello {}", "world")
+    finally:
+        logger.remove()
+        logger.add(lambda _message: None)
+
+    line = (tmp_path / "app.log").read_text().splitlines()[-1]
+    record = json.loads(line)["record"]
+    assert record["message"] == "hello world"
+    assert record["extra"]["session_id"] == "s1"
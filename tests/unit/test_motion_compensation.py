@@ -0,0 +1,229 @@
+from types import SimpleNamespace
+from typing import ClassVar
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.detection import DetectionService
+from src.ptz_simulator import SimulatedPTZService
+from src.settings import load_settings
+from src.thermal_detection import (
+    KalmanCentroidTracker,
+    ThermalDetectionService,
+    ThermalTarget,
+)
+from src.tracking.control import field_of_view
+from src.tracking.motion_compensation import (
+    IDENTITY,
+    CameraMotion,
+    MotionCompensator,
+    OpticalFlowMotionEstimator,
+    PoseTracker,
+    PTZMotionEstimator,
+    motion_from_pose_change,
+    ptz_pose,
+)
+
+W, H = 640, 480
+FRAME = np.zeros((H, W), dtype=np.uint8)
+
+
+@pytest.fixture
+def settings():
+    return load_settings()
+
+
+def _requires_real_cv2():
+    if not hasattr(cv2, "__file__"):
+        pytest.skip("cv2 is replaced by a mock in this test session")
+
+
+def _target(x: float, y: float, size: int = 10) -> ThermalTarget:
+    half = size // 2
+    return ThermalTarget(
+        centroid=(x, y),
+        area=float(size * size),
+        bbox=(int(x) - half, int(y) - half, size, size),
+        intensity=220.0,
+    )
+
+
+class TestPoseMotion:
+    def test_pan_right_moves_scene_left(self, settings):
+        fov_pan, _ = field_of_view(settings, 0.0)
+        motion = motion_from_pose_change(settings, (0.0, 0.0, 0.0), (fov_pan / 4, 0.0, 0.0), W, H)
+        assert motion.scale == pytest.approx(1.0)
+        assert motion.tx == pytest.approx(-W / 4)
+        assert motion.ty == pytest.approx(0.0)
+
+    def test_tilt_up_moves_scene_down(self, settings):
+        _, fov_tilt = field_of_view(settings, 0.0)
+        motion = motion_from_pose_change(settings, (0.0, 0.0, 0.0), (0.0, fov_tilt / 10, 0.0), W, H)
+        assert motion.ty == pytest.approx(H / 10)
+
+    def test_zoom_scales_about_center(self, settings):
+        motion = motion_from_pose_change(settings, (0.0, 0.0, 0.0), (0.0, 0.0, 0.5), W, H)
+        assert motion.scale > 1.0
+        center = motion.apply(np.array([[W / 2, H / 2]]))
+        assert center[0] == pytest.approx([W / 2, H / 2])
+
+    def test_estimator_tracks_simulator_pose(self, settings):
+        ptz = SimulatedPTZService(settings=settings)
+        estimator = PTZMotionEstimator(settings)
+        assert estimator.update(ptz, W, H) is IDENTITY  # no previous pose yet
+
+        ptz.pan_pos += 0.01
+        motion = estimator.update(ptz, W, H)
+        fov_pan, _ = field_of_view(settings, ptz_pose(ptz)[2])
+        assert motion.tx == pytest.approx(-0.01 / fov_pan * W)
+        assert estimator.update(ptz, W, H).is_identity()
+
+    def test_estimator_dead_reckons_between_polls(self, settings):
+        # PTZService-like head: abs_pan is only refreshed by update_position()
+        ptz = SimpleNamespace(abs_pan=0.0, abs_tilt=0.0, last_vel_pan=0.5, last_vel_tilt=0.0)
+        estimator = PTZMotionEstimator(settings)
+        fov_pan, _ = field_of_view(settings, 0.0)
+        step = 0.5 * settings.ptz.pan_rate * 0.1
+
+        assert estimator.update(ptz, W, H, now=0.0) is IDENTITY
+        for i in range(1, 4):
+            motion = estimator.update(ptz, W, H, now=0.1 * i)
+            assert motion.tx == pytest.approx(-step / fov_pan * W)
+
+        # A poll that agrees with the dead-reckoned pose adds no extra jump
+        ptz.abs_pan = 4 * step
+        motion = estimator.update(ptz, W, H, now=0.4)
+        assert motion.tx == pytest.approx(-step / fov_pan * W)
+
+        ptz.last_vel_pan = 0.0
+        assert estimator.update(ptz, W, H, now=0.5).is_identity()
+
+    def test_pose_at_capture_time(self, settings):
+        ptz = SimpleNamespace(abs_pan=1.0, abs_tilt=0.0, last_vel_pan=0.5, last_vel_tilt=0.0)
+        tracker = PoseTracker(settings)
+        tracker.update(ptz, 0.0)
+        rate = 0.5 * settings.ptz.pan_rate
+
+        pan, tilt, _ = tracker.at(ptz, 1.0, 0.8)
+        assert pan == pytest.approx(1.0 + rate * 0.8)
+        assert tilt == 0.0
+        # Looking back does not move the tracked pose itself
+        assert tracker.pose[0] == pytest.approx(1.0 + rate)
+        assert tracker.at(object(), 1.0, 0.8) is None
+
+    def test_objects_without_pose_yield_identity(self, settings):
+        compensator = MotionCompensator(settings)
+        frame = np.zeros((H, W), dtype=np.uint8)
+        assert ptz_pose(object()) is None
+        assert compensator.estimate(frame, object()).is_identity()
+        assert compensator.estimate(frame, None).is_identity()
+
+    def test_disabled_mode(self, settings):
+        settings.tracking.motion_compensation = "none"
+        ptz = SimulatedPTZService(settings=settings)
+        compensator = MotionCompensator(settings)
+        frame = np.zeros((H, W), dtype=np.uint8)
+        compensator.estimate(frame, ptz)
+        ptz.pan_pos += 0.05
+        assert compensator.estimate(frame, ptz) is IDENTITY
+
+
+def test_optical_flow_recovers_translation():
+    _requires_real_cv2()
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur(rng.integers(0, 255, (H + 64, W + 64), dtype=np.uint8), (5, 5), 0)
+    estimator = OpticalFlowMotionEstimator(max_width=320)
+
+    estimator.update(scene[32 : 32 + H, 32 : 32 + W])
+    # Camera moves right/down by 16 px: the scene moves left/up.
+    motion = estimator.update(scene[48 : 48 + H, 48 : 48 + W])
+
+    assert motion.scale == pytest.approx(1.0, abs=0.02)
+    assert motion.tx == pytest.approx(-16.0, abs=2.0)
+    assert motion.ty == pytest.approx(-16.0, abs=2.0)
+
+
+@pytest.fixture
+def track(settings, monkeypatch):
+    """Run ``ThermalDetectionService.detect`` on canned targets."""
+    settings.thermal_detection.use_kalman = False
+
+    def make():
+        service = ThermalDetectionService(settings=settings)
+        service.set_method("contour")
+
+        def run(targets, motion=None):
+            monkeypatch.setattr(service, "_detect_contour", lambda *_: list(targets))
+            return service.detect(FRAME, motion)
+
+        return run
+
+    return make
+
+
+class TestThermalAssociation:
+    def test_ids_follow_targets_across_frames(self, track):
+        run = track()
+        first = run([_target(100, 100), _target(300, 200)])
+        second = run([_target(305, 198), _target(104, 101)])
+        assert [t.track_id for t in first] == [1, 2]
+        assert [t.track_id for t in second] == [2, 1]
+
+    def test_camera_motion_keeps_ids_during_slew(self, track):
+        run = track()
+        run([_target(100, 100), _target(300, 200)])
+        slew = CameraMotion(tx=-80.0)
+
+        without = track()
+        without([_target(100, 100), _target(300, 200)])
+        switched = without([_target(20, 100), _target(220, 200)])
+        kept = run([_target(20, 100), _target(220, 200)], slew)
+
+        assert [t.track_id for t in kept] == [1, 2]
+        assert {t.track_id for t in switched}.isdisjoint({1, 2})
+
+    def test_stale_tracks_expire(self, track):
+        run = track()
+        run([_target(100, 100)])
+        for _ in range(11):
+            run([])
+        assert [t.track_id for t in run([_target(100, 100)])] == [2]
+
+    def test_kalman_state_is_warped(self):
+        _requires_real_cv2()
+        kalman = KalmanCentroidTracker()
+        kalman.correct((100.0, 50.0))
+        kalman.warp(CameraMotion(scale=2.0, tx=-10.0, ty=5.0).affine())
+        assert kalman.kf.statePost[:2, 0] == pytest.approx([190.0, 105.0])
+
+
+class _FakeTrack:
+    calls: ClassVar[list[tuple[int, np.ndarray]]] = []
+
+    @staticmethod
+    def multi_gmc(stracks, matrix):
+        _FakeTrack.calls.append((len(stracks), matrix.copy()))
+
+
+def test_detection_service_warps_ultralytics_tracks(settings):
+    _FakeTrack.calls = []
+    bytetrack = SimpleNamespace(tracked_stracks=[_FakeTrack()], lost_stracks=[_FakeTrack()])
+    botsort = SimpleNamespace(
+        tracked_stracks=[_FakeTrack()], lost_stracks=[], gmc=SimpleNamespace(method="sift")
+    )
+    model = SimpleNamespace(
+        names={0: "drone"},
+        predictor=SimpleNamespace(trackers=[bytetrack, botsort]),
+        track=lambda **_: [SimpleNamespace(boxes=None)],
+    )
+    with patch("src.detection.get_yolo", return_value=lambda _path: model):
+        service = DetectionService(settings)
+
+    assert service.detect(np.zeros((H, W, 3), dtype=np.uint8), CameraMotion(tx=-12.0)) == []
+
+    assert len(_FakeTrack.calls) == 1  # BoT-SORT runs its own GMC
+    count, affine = _FakeTrack.calls[0]
+    assert count == 2
+    np.testing.assert_allclose(affine, [[1.0, 0.0, -12.0], [0.0, 1.0, 0.0]])
@@ -0,0 +1,104 @@
+"""Tests for timing spans, the stack sampler and the /debug routes."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.api.debug_routes import get_spans, run_profile, update_spans
+from src.profiling import SPANS, SpanRecorder, sample_stacks
+
+
+def test_disabled_spans_record_nothing():
+    recorder = SpanRecorder()
+    with recorder.span("work"):
+        pass
+    assert recorder.snapshot() == {}
+    assert recorder.span("a") is recorder.span("b")
+
+
+def test_enabled_spans_report_percentiles():
+    recorder = SpanRecorder(enabled=True)
+    for _ in range(3):
+        with recorder.span("work"):
+            time.sleep(0.002)
+
+    stats = recorder.snapshot()["work"]
+    assert stats["count"] == 3
+    assert 1.5 <= stats["p50_ms"] <= stats["max_ms"]
+
+    recorder.reset()
+    assert recorder.snapshot() == {}
+
+
+def _busy_worker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sample_stacks_folds_named_threads():
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=_busy_worker, args=(stop,), name="session-test", daemon=True
+    )
+    worker.start()
+    try:
+        profile = sample_stacks(0.2, interval_s=0.005, thread_prefix="session-")
+    finally:
+        stop.set()
+        worker.join(timeout=2)
+
+    assert profile.samples > 5
+    assert profile.stacks
+    for line in profile.folded().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("session-test;")
+        assert int(count) > 0
+    assert any("test_profiling:_busy_worker" in stack for stack in profile.stacks)
+
+
+def test_sample_stacks_rejects_bad_arguments():
+    with pytest.raises(ValueError, match="positive"):
+        sample_stacks(0)
+
+
+def test_debug_routes_toggle_spans_and_profile():
+    async def _run() -> None:
+        app = web.Application()
+        app.router.add_get("/debug/spans", get_spans)
+        app.router.add_post("/debug/spans", update_spans)
+        app.router.add_post("/debug/profile", run_profile)
+
+        async with TestServer(app) as server, TestClient(server) as client:
+            resp = await client.post("/debug/spans", json={"enabled": True, "reset": True})
+            assert resp.status == 200
+            assert (await resp.json()) == {"enabled": True, "spans": {}}
+
+            with SPANS.span("stage"):
+                pass
+            body = await (await client.get("/debug/spans")).json()
+            assert body["spans"]["stage"]["count"] == 1
+
+            resp = await client.post("/debug/spans", json={"enabled": "yes"})
+            assert resp.status == 400
+
+            resp = await client.post("/debug/profile", params={"seconds": "120"})
+            assert resp.status == 400
+
+            resp = await client.post(
+                "/debug/profile", params={"seconds": "0.1", "interval_ms": "5"}
+            )
+            assert resp.status == 200
+            assert int(resp.headers["X-Profile-Samples"]) > 0
+            assert resp.content_type == "text/plain"
+
+    try:
+        asyncio.run(_run())
+    finally:
+        SPANS.enabled = False
+        SPANS.reset()
@@ -0,0 +1,96 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.ptz_calibration import FOVTable, calibrate_fov, format_table, synthetic_scene
+from src.ptz_simulator import SimulatedPTZService
+from src.settings import FOVSample, load_settings
+from src.tracking.control import (
+    field_of_view,
+    proportional_command,
+    zoom_compensation,
+    zoom_magnification,
+)
+
+
+@pytest.fixture
+def settings():
+    return load_settings()
+
+
+class TestFOVTable:
+    def test_linear_model_matches_magnification(self, settings):
+        table = FOVTable.from_settings(settings)
+        for zoom in (0.0, 0.3, 1.0):
+            fov_pan, fov_tilt = table.lookup(zoom)
+            magnification = zoom_magnification(settings, zoom)
+            assert fov_pan == pytest.approx(settings.ptz.fov_pan / magnification)
+            assert fov_tilt == pytest.approx(settings.ptz.fov_tilt / magnification)
+
+    def test_lookup_is_vectorized_and_clamped(self):
+        table = FOVTable.from_samples([(1.0, 0.1, 0.05), (0.0, 0.4, 0.2)])
+        fov_pan, fov_tilt = table.lookup(np.array([-1.0, 0.0, 0.5, 1.0, 2.0]))
+        np.testing.assert_allclose(fov_pan, [0.4, 0.4, 0.2, 0.1, 0.1])
+        np.testing.assert_allclose(fov_tilt, [0.2, 0.2, 0.1, 0.05, 0.05])
+
+    def test_pixel_to_angle(self):
+        table = FOVTable.from_samples([(0.0, 0.4, 0.3)])
+        pan, tilt = table.pixel_to_angle(
+            np.array([160.0, -320.0]), np.array([120.0, 0.0]), 640, 480, 0.0
+        )
+        np.testing.assert_allclose(pan, [0.1, -0.2])
+        # Below center is a downward (negative) tilt error
+        np.testing.assert_allclose(tilt, [-0.075, 0.0])
+
+    @pytest.mark.parametrize(
+        "rows", [[], [(0.0, 0.0, 0.3)], [(0.0, 0.4, float("inf"))]]
+    )
+    def test_rejects_invalid_samples(self, rows):
+        with pytest.raises(ValueError):
+            FOVTable.from_samples(rows)
+
+    def test_configured_table_drives_control(self, settings):
+        settings.ptz.fov_table = [
+            FOVSample(zoom=0.0, pan=0.8, tilt=0.6),
+            FOVSample(zoom=1.0, pan=0.2, tilt=0.3),
+        ]
+        assert field_of_view(settings, 1.0) == pytest.approx((0.2, 0.3))
+        assert zoom_compensation(settings, 1.0) == pytest.approx((0.25, 0.5))
+
+        bbox = (500, 100, 540, 140)
+        wide_pan, wide_tilt, _ = proportional_command(bbox, 640, 480, settings)
+        tele_pan, tele_tilt, _ = proportional_command(bbox, 640, 480, settings, zoom_level=1.0)
+        assert tele_pan == pytest.approx(wide_pan * 0.25)
+        assert tele_tilt == pytest.approx(wide_tilt * 0.5)
+
+    def test_zoom_compensation_disabled(self, settings):
+        settings.ptz.enable_zoom_compensation = False
+        assert zoom_compensation(settings, 1.0) == (1.0, 1.0)
+
+
+def test_calibrate_against_simulator(settings):
+    if not hasattr(cv2, "__file__"):
+        pytest.skip("cv2 is replaced by a mock in this test session")
+    from src.main import simulate_ptz_view
+
+    settings.visible_detection.camera.resolution_width = 320
+    settings.visible_detection.camera.resolution_height = 240
+    scene = synthetic_scene(640, 480)
+    ptz = SimulatedPTZService(settings=settings)
+
+    table = calibrate_fov(
+        ptz,
+        lambda p: simulate_ptz_view(scene, p, settings)[0],
+        (0.0, 0.5, 1.0),
+        step=0.1,  # the simulator snaps its crop to whole pixels
+    )
+
+    # The full-width view cannot pan, so zoom 0 is not measurable.
+    np.testing.assert_allclose(table.zoom, [0.5, 1.0])
+    # The simulator crops a fraction s of the scene: fov = 2s / (1 - s).
+    min_scale = settings.simulator.sim_zoom_min_scale
+    crop = 1.0 - table.zoom * (1.0 - min_scale)
+    expected = 2.0 * crop / (1.0 - crop)
+    np.testing.assert_allclose(table.pan, expected, rtol=0.1)
+    np.testing.assert_allclose(table.tilt, expected, rtol=0.1)
+    assert "fov_table:" in format_table(table)
@@ -608,3 +608,68 @@ class TestPTZServiceGetZoom:
         # Assert
         # Should return zmin as fallback
         assert zoom_level == ptz_service.zmin
+
+
+class TestPTZServiceAbsoluteMove:
+    """Test PTZService.absolute_move() (snap acquisition)."""
+
+    @pytest.fixture
+    def ptz_service(self):
+        """PTZService with a mocked ONVIF PTZ client (no connection)."""
+        ptz_service = PTZService.__new__(PTZService)
+        ptz_service.settings = Settings()
+        ptz_service.control_mode = "onvif"
+        ptz_service.ptz = MagicMock()
+        ptz_service.profile = MagicMock(token="profile_1")
+        ptz_service.xmin, ptz_service.xmax = -1.0, 1.0
+        ptz_service.ymin, ptz_service.ymax = -1.0, 1.0
+        ptz_service.zmin, ptz_service.zmax = 0.0, 1.0
+        ptz_service.zoom_level = ptz_service.abs_zoom = 0.2
+        ptz_service.abs_pan = ptz_service.abs_tilt = 0.0
+        ptz_service.last_vel_pan = 0.5
+        ptz_service.last_vel_tilt = 0.5
+        ptz_service.last_vel_zoom = 0.0
+        ptz_service.active = True
+        return ptz_service
+
+    def test_onvif_absolute_move(self, ptz_service):
+        """AbsoluteMove carries the clamped pose and updates internal state."""
+        assert ptz_service.absolute_move(0.4, 1.5) is True
+
+        request = ptz_service.ptz.AbsoluteMove.call_args[0][0]
+        assert request.Position.PanTilt.x == 0.4
+        assert request.Position.PanTilt.y == 1.0
+        assert request.Position.Zoom == 0.2  # zoom kept
+        assert (ptz_service.abs_pan, ptz_service.abs_tilt) == (0.4, 1.0)
+        assert ptz_service.last_vel_pan == 0.0
+        assert ptz_service.active is False
+
+    def test_onvif_absolute_move_with_zoom(self, ptz_service):
+        """An explicit zoom is sent and recorded."""
+        ptz_service.absolute_move(0.0, 0.0, 0.8)
+        request = ptz_service.ptz.AbsoluteMove.call_args[0][0]
+        assert request.Position.Zoom == 0.8
+        assert ptz_service.zoom_level == 0.8
+
+    def test_onvif_failure_returns_false(self, ptz_service):
+        """ONVIF errors are logged and reported, state is untouched."""
+        ptz_service.ptz.AbsoluteMove.side_effect = Exception("AbsoluteMove failed")
+        assert ptz_service.absolute_move(0.4, 0.1) is False
+        assert ptz_service.abs_pan == 0.0
+
+    def test_octagon_is_not_supported(self, ptz_service):
+        """Octagon mode has no confirmed position command: nothing is sent."""
+        ptz_service.control_mode = "octagon"
+
+        with patch("src.ptz_controller.requests.get") as mock_get:
+            assert ptz_service.absolute_move(12.5, -3.0) is False
+
+        mock_get.assert_not_called()
+        ptz_service.ptz.AbsoluteMove.assert_not_called()
+        assert (ptz_service.abs_pan, ptz_service.abs_tilt) == (0.0, 0.0)
+
+    def test_disabled_control_mode(self, ptz_service):
+        """control_mode none never moves the camera."""
+        ptz_service.control_mode = "none"
+        assert ptz_service.absolute_move(0.4, 0.1) is False
+        ptz_service.ptz.AbsoluteMove.assert_not_called()
@@ -259,6 +259,28 @@ class TestSetHomePosition:
         assert ptz.active is False
 
 
+class TestAbsoluteMove:
+    """Test absolute (snap) moves."""
+
+    def test_absolute_move_jumps_and_stops(self):
+        """absolute_move should set the pose directly and stop continuous motion."""
+        ptz = SimulatedPTZService()
+        ptz.continuous_move(0.5, 0.5, 0.0)
+        assert ptz.absolute_move(0.3, -0.2, 0.6) is True
+        assert (ptz.pan_pos, ptz.tilt_pos, ptz.zoom_level) == pytest.approx((0.3, -0.2, 0.6))
+        assert ptz.pan_vel == ptz.tilt_vel == 0.0
+        assert ptz.active is False
+
+    def test_absolute_move_clamps_and_keeps_zoom(self):
+        """Out-of-range targets clamp; zoom=None leaves zoom unchanged."""
+        ptz = SimulatedPTZService()
+        ptz.zoom_level = 0.4
+        ptz.absolute_move(3.0, -3.0)
+        assert ptz.pan_pos == pytest.approx(ptz.xmax)
+        assert ptz.tilt_pos == pytest.approx(ptz.ymin)
+        assert ptz.zoom_level == pytest.approx(0.4)
+
+
 class TestViewportMath:
     """Test viewport cropping and resizing math from main.py."""
 
@@ -393,3 +415,33 @@ class TestBoundsClamping:
         ptz.zoom_level = -1.0
         ptz.zoom_level = max(ptz.zmin, min(ptz.zmax, ptz.zoom_level))
         assert ptz.zoom_level == pytest.approx(ptz.zmin)
+
+
+class TestSimulatedPTZServiceClock:
+    """Test motion integration against an injected clock."""
+
+    def test_virtual_clock_drives_integration(self):
+        """Position advances by the virtual time step, not wall time."""
+        from src.clock import VirtualClock
+
+        clock = VirtualClock(start=1000.0)
+        ptz = SimulatedPTZService(clock=clock)
+        ptz.pan_vel = ptz.ramp_rate  # already at the first ramp step
+        clock.advance(0.1)
+        ptz.continuous_move(1.0, 0.0, 0.0)
+        assert ptz.pan_pos == pytest.approx(ptz.ramp_rate * ptz.sim_pan_rate * 0.1)
+
+    def test_repeated_command_keeps_moving(self):
+        """An unchanged command keeps integrating instead of freezing the camera."""
+        from src.clock import VirtualClock
+
+        clock = VirtualClock(start=1000.0)
+        ptz = SimulatedPTZService(clock=clock)
+        for _ in range(8):
+            clock.advance(0.1)
+            ptz.continuous_move(1.0, 0.0, 0.0)
+        settled_cmd_pos = ptz.pan_pos
+        clock.advance(0.1)
+        ptz.continuous_move(1.0, 0.0, 0.0)
+        assert ptz.last_pan == 1.0
+        assert ptz.pan_pos > settled_cmd_pos
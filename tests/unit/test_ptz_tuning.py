@@ -0,0 +1,145 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.analytics.trajectory import TrackBuffer, save_trajectory
+from src.clock import VirtualClock
+from src.ptz_servo import (
+    GAINS_BALANCED,
+    GAINS_RESPONSIVE,
+    GAINS_SMOOTH,
+    PIDGains,
+    PTZServo,
+)
+from src.ptz_simulator import SimulatedPTZService
+from src.ptz_tuning import (
+    Candidates,
+    PlantModel,
+    Trajectory,
+    format_presets,
+    grid_candidates,
+    random_candidates,
+    simulate,
+    step_trajectory,
+    sweep_trajectory,
+    trajectory_from_npz,
+    tune,
+)
+from src.settings import FOVSample, load_settings
+from src.tracking.control import field_of_view
+
+
+def _scalar_run(gains: PIDGains, trajectory: Trajectory, plant: PlantModel, settings):
+    clock = VirtualClock(start=float(trajectory.ts[0]))
+    servo = PTZServo(gains, clock=clock)
+    sim = SimulatedPTZService(settings=settings, clock=clock)
+    hidden = False
+    for ts, target in zip(trajectory.ts, trajectory.target, strict=True):
+        clock.set(float(ts))
+        if np.isnan(target).any():
+            hidden = True
+            if sim.active:
+                sim.stop()
+            continue
+        if hidden:
+            servo.reset()
+            hidden = False
+        x, y = servo.control(
+            (target[0] - sim.pan_pos) * plant.error_scale,
+            (target[1] - sim.tilt_pos) * plant.error_scale,
+        )
+        if x != 0 or y != 0:
+            sim.continuous_move(x, y, 0.0)
+        else:
+            sim.stop()
+    return sim.pan_pos, sim.tilt_pos
+
+
+def test_vectorized_simulation_matches_scalar_servo_and_simulator(tmp_path: Path) -> None:
+    settings = load_settings(tmp_path / "missing.yaml")
+    plant = PlantModel.from_settings(settings)
+    base = sweep_trajectory(duration_s=3.0)
+    target = base.target.copy()
+    target[40:50] = np.nan  # target briefly hidden
+    trajectory = Trajectory(ts=base.ts + 1_000.0, target=target)
+    gains = [GAINS_BALANCED, GAINS_RESPONSIVE, GAINS_SMOOTH]
+
+    result = simulate(Candidates.from_gains(gains), trajectory, plant)
+
+    for i, g in enumerate(gains):
+        expected = _scalar_run(g, trajectory, plant, settings)
+        assert tuple(result.final_position[i]) == pytest.approx(expected, abs=1e-9)
+
+
+def test_plant_error_scale_follows_calibrated_fov_table(tmp_path: Path) -> None:
+    settings = load_settings(tmp_path / "missing.yaml")
+    settings.ptz.fov_table = [
+        FOVSample(zoom=0.0, pan=0.5, tilt=0.3),
+        FOVSample(zoom=1.0, pan=0.05, tilt=0.03),
+    ]
+    fov_wide = field_of_view(settings, 0.0)[0]
+    fov_zoomed = field_of_view(settings, 0.5)[0]
+    gain = settings.ptz.ptz_movement_gain
+
+    settings.ptz.enable_zoom_compensation = False
+    plant = PlantModel.from_settings(settings, fov=fov_wide, zoom_level=0.5)
+    assert plant.error_scale == pytest.approx(gain / fov_zoomed)
+
+    # Compensation cancels the narrower field of view, as in the live servo
+    settings.ptz.enable_zoom_compensation = True
+    plant = PlantModel.from_settings(settings, fov=fov_wide, zoom_level=0.5)
+    assert plant.error_scale == pytest.approx(gain / fov_wide)
+
+
+def test_grid_candidates_is_cartesian_product_with_defaults() -> None:
+    candidates = grid_candidates(kp=[1.0, 2.0, 3.0], kd=[0.0, 0.5])
+    assert len(candidates) == 6
+    assert set(candidates.kp) == {1.0, 2.0, 3.0}
+    assert set(candidates.ki) == {PIDGains().ki}
+    assert candidates.gains(5) == PIDGains(kp=3.0, kd=0.5)
+
+
+def test_step_metrics_penalize_weak_and_oscillating_gains() -> None:
+    candidates = Candidates.from_gains(
+        [PIDGains(kp=0.05, ki=0.0, kd=0.0), GAINS_BALANCED]
+    )
+    metrics = simulate(candidates, step_trajectory(duration_s=6.0)).metrics
+
+    sluggish, balanced = 0, 1
+    assert metrics.settling_s[sluggish] == np.inf
+    assert metrics.settling_s[balanced] < 6.0
+    assert metrics.rms_error[balanced] < metrics.rms_error[sluggish]
+    assert np.all(metrics.jitter >= 0)
+    assert np.all(metrics.overshoot >= 0)
+
+
+def test_tune_ranks_candidates_and_formats_presets() -> None:
+    candidates = random_candidates(64, seed=1)
+    result = tune(candidates, [step_trajectory(), sweep_trajectory()])
+    best = result.best(2)
+
+    assert len(best) == 2
+    assert best[0][1]["cost"] <= best[1][1]["cost"]
+    assert best[0][1]["cost"] == pytest.approx(float(result.cost.min()))
+    text = format_presets(best)
+    assert text.startswith("GAINS_TUNED_1 = PIDGains(kp=")
+    assert "GAINS_TUNED_2" in text
+
+    with pytest.raises(ValueError, match="trajectory"):
+        tune(candidates, [])
+
+
+def test_trajectory_from_recorded_track(tmp_path: Path) -> None:
+    # The camera pans right by 0.05 per sample while the target drifts right
+    buffer = TrackBuffer(camera_id="cam", track_id=1, label="drone", max_samples=10)
+    for i in range(3):
+        bbox = (0.45 + i * 0.1, 0.45, 0.1, 0.1, 0.9)
+        pose = (i * 0.05, 0.2, 0.0)
+        buffer.append(1_000 + i * 100, (*bbox, *pose, 0.5, 0.0, 0.0))
+    path = save_trajectory(tmp_path / "t.npz", buffer)
+
+    trajectory = trajectory_from_npz(path, fov=0.5)
+    assert trajectory.ts.tolist() == pytest.approx([0.0, 0.1, 0.2])
+    assert trajectory.target[:, 0] == pytest.approx([0.0, 0.1, 0.2], abs=1e-6)
+    assert trajectory.target[:, 1] == pytest.approx([0.2, 0.2, 0.2], abs=1e-6)
@@ -0,0 +1,87 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.renderer import OverlayRenderer, OverlaySnapshot
+from src.tracking.state import TrackingPhase
+
+
+def _snapshot(index: int = 0) -> OverlaySnapshot:
+    return OverlaySnapshot(
+        frame=np.zeros((48, 64, 3), dtype=np.uint8),
+        tracked_boxes=[],
+        fps=0.0,
+        proc_time=0.0,
+        last_ptz_command="None",
+        coverage=0.0,
+        frame_index=index,
+        phase=TrackingPhase.IDLE,
+        target_id=None,
+    )
+
+
+@pytest.fixture
+def cv2_mock():
+    mock = MagicMock()
+    mock.waitKey.return_value = -1
+    mock.getWindowProperty.return_value = 1.0
+    with patch("src.renderer.cv2", mock):
+        yield mock
+
+
+def _render(snapshot):
+    return {"Detection": snapshot.frame}
+
+
+def test_headless_never_draws(cv2_mock):
+    render = MagicMock(side_effect=_render)
+    renderer = OverlayRenderer(render, mode="headless")
+    renderer.start()
+    renderer.publish(_snapshot())
+    renderer.stop()
+
+    render.assert_not_called()
+    cv2_mock.imshow.assert_not_called()
+    cv2_mock.destroyAllWindows.assert_not_called()
+    assert renderer.headless
+
+
+def test_inline_shows_and_forwards_keys(cv2_mock):
+    cv2_mock.waitKey.return_value = ord("q")
+    renderer = OverlayRenderer(_render, mode="inline")
+    renderer.publish(_snapshot())
+
+    cv2_mock.imshow.assert_called_once()
+    assert renderer.poll_key() == ord("q")
+    assert renderer.poll_key() is None
+    assert not renderer.closed
+
+    cv2_mock.getWindowProperty.return_value = 0.0
+    renderer.publish(_snapshot(1))
+    assert renderer.closed
+
+
+def test_threaded_drops_stale_snapshots_and_caps_rate(cv2_mock):
+    rendered = []
+
+    def render(snapshot):
+        rendered.append(snapshot.frame_index)
+        return _render(snapshot)
+
+    renderer = OverlayRenderer(render, mode="threaded", max_fps=20.0)
+    renderer.start()
+    try:
+        for i in range(40):
+            renderer.publish(_snapshot(i))
+            time.sleep(0.005)
+        time.sleep(0.1)
+    finally:
+        renderer.stop()
+
+    assert 1 <= len(rendered) <= 8
+    assert rendered == sorted(rendered)
+    assert rendered[-1] == 39  # the latest snapshot is always shown
+    assert renderer.dropped + len(rendered) == 40
+    cv2_mock.destroyAllWindows.assert_called_once()
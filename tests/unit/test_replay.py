@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from src.replay import (
+    STAGES,
+    RecordedFrame,
+    ReplayEngine,
+    iter_recording,
+    load_timestamps,
+)
+from src.settings import load_settings
+
+START_MS = 1_700_000_000_000
+
+
+def _settings(tmp_path: Path):
+    settings = load_settings(tmp_path / "missing.yaml")
+    settings.visible_detection.enabled = False
+    settings.secondary_detection.enabled = False
+    settings.thermal_detection.enabled = True
+    settings.tracking.priority = "thermal"
+    return settings
+
+
+def _frame(i: int) -> np.ndarray:
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    x = 40 + i * 3
+    frame[100:130, x : x + 30] = 255
+    return frame
+
+
+def _recording(n: int = 40, *, ptz: bool = False):
+    for i in range(n):
+        recorded = RecordedFrame(
+            index=i,
+            ts_unix_ms=START_MS + i * 33,
+            ptz=(0.1, -0.1, 0.2) if ptz else None,
+        )
+        yield recorded, _frame(i)
+
+
+def test_load_timestamps_reads_optional_ptz_columns(tmp_path: Path) -> None:
+    path = tmp_path / "ts.csv"
+    path.write_text(
+        "frame_index,ts_unix_ms,pan,tilt,zoom\n"
+        "1,1033,0.5,0.25,0.1\n"
+        "0,1000,,,\n"
+    )
+    frames = load_timestamps(path)
+    assert frames == [
+        RecordedFrame(index=0, ts_unix_ms=1000, ptz=None),
+        RecordedFrame(index=1, ts_unix_ms=1033, ptz=(0.5, 0.25, 0.1)),
+    ]
+
+
+def test_load_timestamps_requires_columns(tmp_path: Path) -> None:
+    path = tmp_path / "ts.csv"
+    path.write_text("frame,ts\n0,1000\n")
+    with pytest.raises(ValueError, match="missing column"):
+        load_timestamps(path)
+
+
+def test_iter_recording_pairs_frames_with_timestamps(tmp_path: Path) -> None:
+    if not hasattr(cv2, "__file__"):
+        pytest.skip("cv2 is replaced by a mock in this test session")
+    video = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter.fourcc(*"MJPG"), 10.0, (320, 240))
+    for i in range(5):
+        writer.write(_frame(i))
+    writer.release()
+
+    synthesized = [r for r, _ in iter_recording(video, start_ts_unix_ms=START_MS)]
+    assert [r.ts_unix_ms for r in synthesized] == [START_MS + i * 100 for i in range(5)]
+
+    stamps = [RecordedFrame(index=i, ts_unix_ms=START_MS + i * 7) for i in range(3)]
+    replayed = list(iter_recording(video, stamps))
+    assert [r for r, _ in replayed] == stamps
+    assert replayed[0][1].shape == (240, 320, 3)
+
+
+def test_replay_reports_throughput_and_stage_timings(tmp_path: Path) -> None:
+    engine = ReplayEngine(settings=_settings(tmp_path))
+    try:
+        report = engine.run(_recording())
+    finally:
+        engine.close()
+
+    assert report.frames == 40
+    assert report.media_s == pytest.approx(39 * 0.033)
+    assert report.fps > 0
+    assert set(report.stages) == set(STAGES)
+    assert report.events.get("new") == 1
+    assert report.tracking_frames > 0
+    assert report.ptz_source == "simulated"
+    assert report.final_ptz["pan"] != 0.0
+    assert report.to_dict()["stages"]["detect"]["p95_ms"] >= 0
+
+
+def test_replay_is_deterministic(tmp_path: Path) -> None:
+    reports = []
+    for _ in range(2):
+        engine = ReplayEngine(settings=_settings(tmp_path))
+        try:
+            reports.append(engine.run(_recording()))
+        finally:
+            engine.close()
+    first, second = reports
+    assert first.final_ptz == second.final_ptz
+    assert first.events == second.events
+    assert first.tracking_frames == second.tracking_frames
+
+
+def test_replay_pins_simulator_to_recorded_ptz(tmp_path: Path) -> None:
+    engine = ReplayEngine(settings=_settings(tmp_path), auto_target=False)
+    try:
+        report = engine.run(_recording(5, ptz=True), max_frames=3)
+    finally:
+        engine.close()
+    assert report.frames == 3
+    assert report.ptz_source == "recorded"
+    assert report.tracking_frames == 0
+    assert report.final_ptz == {"pan": 0.1, "tilt": -0.1, "zoom": 0.2}
@@ -0,0 +1,82 @@
+"""Tests for the simulated PTZ viewport."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from src.settings import Settings
+from src.sim_view import SimulatedViewport, resize_interpolation
+
+if not hasattr(cv2, "__file__"):  # another test module replaced cv2 with a mock
+    pytest.skip("requires real OpenCV", allow_module_level=True)
+
+
+def _settings(width: int = 320, height: int = 180) -> Settings:
+    settings = Settings()
+    settings.visible_detection.camera.resolution_width = width
+    settings.visible_detection.camera.resolution_height = height
+    settings.simulator.sim_zoom_min_scale = 0.3
+    return settings
+
+
+def _ptz(pan: float = 0.0, tilt: float = 0.0, zoom: float = 0.0) -> SimpleNamespace:
+    return SimpleNamespace(pan_pos=pan, tilt_pos=tilt, zoom_level=zoom, zmin=0.0, zmax=1.0)
+
+
+def _frame(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(360, 640, 3), dtype=np.uint8)
+
+
+def test_view_matches_crop_and_resize():
+    frame = _frame()
+    view, rect = SimulatedViewport(_settings()).render(frame, _ptz(0.5, -0.25, 0.6))
+
+    x1, y1, x2, y2 = rect
+    assert (x2 - x1, y2 - y1) == (371, 209)
+    expected = cv2.resize(frame[y1:y2, x1:x2], (320, 180))
+    np.testing.assert_array_equal(view, expected)
+
+
+def test_output_buffer_and_geometry_are_reused():
+    viewport = SimulatedViewport(_settings())
+    ptz = _ptz(0.1, 0.2, 0.3)
+    first, rect = viewport.render(_frame(0), ptz)
+    second, rect_again = viewport.render(_frame(1), ptz)
+
+    assert second is first
+    assert rect_again == rect
+    np.testing.assert_array_equal(
+        second, cv2.resize(_frame(1)[rect[1]:rect[3], rect[0]:rect[2]], (320, 180))
+    )
+
+    ptz.pan_pos = -0.4
+    _, moved = viewport.render(_frame(1), ptz)
+    assert moved != rect
+
+
+def test_fresh_views_without_reuse():
+    viewport = SimulatedViewport(_settings(), reuse_output=False)
+    first, _ = viewport.render(_frame(), _ptz())
+    second, _ = viewport.render(_frame(), _ptz())
+    assert first is not second
+
+
+def test_unscaled_view_is_a_copy():
+    frame = _frame()
+    view, rect = SimulatedViewport(_settings(640, 360)).render(frame, _ptz())
+
+    assert rect == (0, 0, 640, 360)
+    assert view is not frame
+    np.testing.assert_array_equal(view, frame)
+
+
+def test_resize_interpolation_by_scale():
+    assert resize_interpolation((640, 360), (640, 360)) is None
+    assert resize_interpolation((1280, 720), (640, 360)) == cv2.INTER_AREA
+    assert resize_interpolation((900, 500), (640, 360)) == cv2.INTER_LINEAR
+    assert resize_interpolation((320, 180), (640, 360)) == cv2.INTER_LINEAR
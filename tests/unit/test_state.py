@@ -346,3 +346,23 @@ class TestTrackerStatusMarkMissing:
         assert status.target_id == 42
         assert status.last_seen_ts == now
         assert status.phase == TrackingPhase.TRACKING
+
+
+class TestTrackerStatusClock:
+    """Test TrackerStatus with an injected clock."""
+
+    def test_defaults_use_injected_clock(self):
+        """Implicit timestamps come from the clock, not wall time."""
+        from src.clock import VirtualClock
+
+        clock = VirtualClock(start=1000.0)
+        status = TrackerStatus(loss_grace_s=1.0, clock=clock)
+        assert status.last_seen_ts == 1000.0
+
+        status.set_target(7)
+        assert status.compute_phase(True) == TrackingPhase.TRACKING
+
+        clock.advance(0.5)
+        assert status.compute_phase(False) == TrackingPhase.SEARCHING
+        clock.advance(1.0)
+        assert status.compute_phase(False) == TrackingPhase.LOST
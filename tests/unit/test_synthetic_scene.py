@@ -0,0 +1,153 @@
+"""Tests for the synthetic scene source and ground-truth scoring."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from src.settings import Settings
+from src.synthetic_scene import (
+    GroundTruth,
+    GroundTruthBox,
+    SceneScore,
+    SyntheticFrame,
+    SyntheticScene,
+    synthetic_frame_source,
+)
+
+if not hasattr(cv2, "__file__"):  # another test module replaced cv2 with a mock
+    pytest.skip("requires real OpenCV", allow_module_level=True)
+
+
+def test_scene_is_reproducible_and_targets_stay_in_frame():
+    scenes = [
+        SyntheticScene(320, 240, fps=60, targets=8, max_speed=2000, seed=3)
+        for _ in range(2)
+    ]
+    for _ in range(120):
+        (frame_a, truth_a), (frame_b, truth_b) = (s.next_frame() for s in scenes)
+        np.testing.assert_array_equal(frame_a, frame_b)
+        assert truth_a == truth_b
+        for box in truth_a.boxes:
+            x1, y1, x2, y2 = box.bbox
+            assert 0 <= x1 < x2 <= 320
+            assert 0 <= y1 < y2 <= 240
+    assert truth_a.frame_index == 119
+    assert truth_a.timestamp == pytest.approx(119 / 60)
+
+
+@pytest.mark.parametrize("style", ["drone", "thermal"])
+def test_targets_are_drawn_inside_their_boxes(style):
+    scene = SyntheticScene(200, 200, targets=1, style=style, min_size=30, max_size=30)
+    frame, truth = scene.next_frame()
+    background = scene._backgrounds[0]
+
+    x1, y1, x2, y2 = truth.boxes[0].bbox
+    changed = np.any(frame != background, axis=2)
+    assert changed[y1:y2, x1:x2].any()
+    changed[y1:y2, x1:x2] = False
+    assert not changed.any()
+
+
+def test_queued_frames_carry_their_ground_truth():
+    # A slow consumer must still get the truth of the frame it takes, however
+    # many frames the realtime source produced in the meantime
+    scene = SyntheticScene(64, 64, fps=1000.0, targets=1, min_size=8, max_size=8)
+    frames: queue.Queue = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=synthetic_frame_source, args=(frames, stop, scene), daemon=True
+    )
+    thread.start()
+    time.sleep(0.1)
+    item = frames.get(timeout=2)
+    stop.set()
+    thread.join(timeout=2)
+
+    assert isinstance(item, SyntheticFrame)
+    assert item.ground_truth.frame_index > 8
+    x1, y1, x2, y2 = item.ground_truth.boxes[0].bbox
+    changed = np.any(item.image != scene._backgrounds[0], axis=2)
+    assert changed[y1:y2, x1:x2].any()
+    changed[y1:y2, x1:x2] = False
+    assert not changed.any()
+
+
+def test_invalid_sizes_are_rejected():
+    with pytest.raises(ValueError, match="target sizes"):
+        SyntheticScene(32, 32, min_size=8, max_size=64)
+
+
+def test_lockstep_source_delivers_every_frame():
+    scene = SyntheticScene(32, 32, fps=1.0, targets=1, min_size=4, max_size=4)
+    frames: queue.Queue = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=synthetic_frame_source,
+        args=(frames, stop, scene),
+        kwargs={"realtime": False},
+        daemon=True,
+    )
+    thread.start()
+    indices = [frames.get(timeout=2).ground_truth.frame_index for _ in range(5)]
+    stop.set()
+    thread.join(timeout=2)
+
+    # fps=1 would take seconds in realtime mode; lockstep ignores it
+    assert indices == [0, 1, 2, 3, 4]
+
+
+def test_scene_score_counts_matches_and_id_switches():
+    truth = GroundTruth(
+        0, 0.0, (GroundTruthBox(0, (10, 10, 30, 30)), GroundTruthBox(1, (60, 60, 80, 80)))
+    )
+
+    def det(box, track_id):
+        return SimpleNamespace(xyxy=[box], id=track_id)
+
+    score = SceneScore()
+    score.update(truth, [det((11, 11, 31, 31), 7), det((200, 200, 210, 210), 8)], 320, 240)
+    score.update(truth, [det((10, 10, 30, 30), 9), det((60, 60, 80, 80), 4)], 320, 240)
+
+    assert score.true_positives == 3
+    assert score.false_positives == 1
+    assert score.false_negatives == 1
+    assert score.id_switches == 1
+    assert score.precision == pytest.approx(0.75)
+    assert score.recall == pytest.approx(0.75)
+    assert score.mota == pytest.approx(1 - 3 / 4)
+
+
+def test_detection_manager_attaches_ground_truth():
+    from src.detection_manager import DetectionManager, DetectionMode
+
+    settings = Settings()
+    settings.visible_detection.enabled = False
+    settings.secondary_detection.enabled = False
+    settings.thermal_detection.enabled = True
+    camera = settings.thermal_detection.camera
+    camera.source = "synthetic"
+    camera.resolution_width, camera.resolution_height = 320, 240
+    camera.synthetic.style = "thermal"
+    camera.synthetic.realtime = False
+
+    manager = DetectionManager(settings)
+    manager.start()
+    try:
+        deadline = time.monotonic() + 5
+        results = []
+        while not results and time.monotonic() < deadline:
+            results = manager.get_detections()
+    finally:
+        manager.stop()
+
+    assert results
+    assert results[0].mode == DetectionMode.THERMAL
+    assert results[0].ground_truth is not None
+    assert len(results[0].ground_truth.boxes) == camera.synthetic.targets
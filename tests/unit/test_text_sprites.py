@@ -0,0 +1,76 @@
+"""Tests for the cached overlay text sprites."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from src.text_sprites import TextSpriteCache, blit
+
+if not hasattr(cv2, "__file__"):  # another test module replaced cv2 with a mock
+    pytest.skip("requires real OpenCV", allow_module_level=True)
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def _background() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(120, 320, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize(
+    ("text", "scale", "color", "thickness"),
+    [
+        ("Resolution: 1280x720", 0.7, (0, 128, 255), 2),
+        ("Enter ID: 12_", 1.2, (0, 255, 255), 3),
+        ("Viewport", 0.6, (255, 255, 0), 1),
+    ],
+)
+def test_put_text_matches_opencv(text, scale, color, thickness):
+    expected = _background()
+    cv2.putText(expected, text, (12, 60), FONT, scale, color, thickness, cv2.LINE_AA)
+    actual = _background()
+    size = TextSpriteCache().put_text(actual, text, (12, 60), scale, color, thickness)
+
+    assert size == cv2.getTextSize(text, FONT, scale, thickness)[0]
+    diff = np.abs(actual.astype(np.int16) - expected.astype(np.int16))
+    assert diff.max() <= 2
+
+
+def test_repeated_text_is_rendered_once():
+    cache = TextSpriteCache()
+    frame = np.zeros((60, 200, 3), dtype=np.uint8)
+    for _ in range(3):
+        cache.put_text(frame, "Camera: 0", (5, 30), 0.7, (0, 255, 0), 2)
+    cache.put_text(frame, "Camera: 0", (5, 30), 0.7, (255, 0, 0), 2)
+
+    assert cache.misses == 2
+    assert cache.hits == 2
+    assert len(cache) == 2
+
+
+def test_least_recently_used_sprite_is_evicted():
+    cache = TextSpriteCache(max_entries=2)
+    first = cache.sprite("a", 0.7, (0, 255, 0), 2)
+    cache.sprite("b", 0.7, (0, 255, 0), 2)
+    cache.sprite("a", 0.7, (0, 255, 0), 2)
+    cache.sprite("c", 0.7, (0, 255, 0), 2)
+
+    assert len(cache) == 2
+    assert cache.sprite("a", 0.7, (0, 255, 0), 2) is first
+    misses = cache.misses
+    cache.sprite("b", 0.7, (0, 255, 0), 2)
+    assert cache.misses == misses + 1
+
+
+def test_blit_clips_to_frame_edges():
+    cache = TextSpriteCache()
+    sprite = cache.sprite("Frame: 12345", 0.7, (255, 255, 255), 2)
+    frame = np.zeros((20, 40, 3), dtype=np.uint8)
+
+    blit(frame, sprite, (-30, 10))
+    blit(frame, sprite, (30, 45))
+    blit(frame, sprite, (500, 500))  # entirely outside: no-op
+
+    assert frame.any()
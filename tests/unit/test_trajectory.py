@@ -0,0 +1,125 @@
+import numpy as np
+
+from src.analytics.trajectory import (
+    FIELDS,
+    TrackBuffer,
+    TrajectoryRecorder,
+    load_trajectory,
+)
+
+TS0 = 1700000000000
+
+
+def _tick(ts: int, tracks: list[dict]) -> dict:
+    return {
+        "type": "metadata_tick",
+        "camera_id": "cam_01",
+        "ts_unix_ms": ts,
+        "ptz": {
+            "cmd": {"pan": 0.25, "tilt": -0.5, "zoom": 0.0},
+            "pose": {"pan": 0.1 + ts % 1000 / 1000, "tilt": -0.2, "zoom": 0.5},
+        },
+        "tracks": tracks,
+    }
+
+
+def _track(track_id: int, x: float) -> dict:
+    return {
+        "id": track_id,
+        "label": "drone",
+        "conf": 0.8,
+        "bbox": {"x": x, "y": 0.2, "w": 0.1, "h": 0.05},
+    }
+
+
+def _end(track_id: int, ts: int) -> dict:
+    return {
+        "type": "track_event",
+        "event": "end",
+        "camera_id": "cam_01",
+        "ts_unix_ms": ts,
+        "after": {"id": track_id},
+    }
+
+
+def test_track_buffer_grows_and_caps() -> None:
+    buffer = TrackBuffer(camera_id="c", track_id=1, label="drone", max_samples=100)
+    for i in range(150):
+        buffer.append(TS0 + i, (i / 1000.0,) * len(FIELDS))
+    assert buffer.size == 100
+    assert buffer.dropped == 50
+    columns = buffer.columns()
+    assert columns["ts_unix_ms"].dtype == np.int64
+    assert columns["x"].dtype == np.float32
+    assert columns["x"].shape == (100,)
+    assert columns["ts_unix_ms"][-1] == TS0 + 99
+
+
+def test_recorder_saves_npz_on_track_end(tmp_path) -> None:
+    recorder = TrajectoryRecorder(output_dir=tmp_path)
+    for i in range(5):
+        recorder.listener(
+            _tick(TS0 + i * 100, [_track(1, 0.1 + i * 0.01), _track(2, 0.5)]), []
+        )
+    futures = recorder.handle_events([_end(1, TS0 + 1500)])
+    path = futures[0].result(timeout=5)
+    assert recorder.active_tracks == 1
+
+    assert path is not None
+    assert path == tmp_path / "cam_01" / "2023-11-14" / f"{TS0}_1.npz"
+    data = load_trajectory(path)
+    assert data["camera_id"] == "cam_01"
+    assert data["track_id"] == 1
+    assert data["label"] == "drone"
+    np.testing.assert_array_equal(data["ts_unix_ms"], TS0 + np.arange(5) * 100)
+    np.testing.assert_allclose(data["x"], 0.1 + np.arange(5) * 0.01, rtol=1e-6)
+    np.testing.assert_allclose(data["pan"], 0.1 + np.arange(5) * 0.1, rtol=1e-6)
+    np.testing.assert_allclose(data["tilt"], -0.2)
+    np.testing.assert_allclose(data["zoom"], 0.5)
+    np.testing.assert_allclose(data["cmd_pan"], 0.25)
+    np.testing.assert_allclose(data["cmd_tilt"], -0.5)
+
+    recorder.close()
+    assert recorder.saved == 2
+    assert (tmp_path / "cam_01" / "2023-11-14" / f"{TS0}_2.npz").exists()
+
+
+def test_short_tracks_are_discarded(tmp_path) -> None:
+    recorder = TrajectoryRecorder(output_dir=tmp_path, min_samples=3)
+    recorder.record_tick(_tick(TS0, [_track(1, 0.1)]))
+    assert recorder.handle_events([_end(1, TS0 + 1000)])[0].result(timeout=5) is None
+    recorder.close()
+    assert recorder.saved == 0
+
+
+def test_unconfirmed_tracks_do_not_leak_buffers(tmp_path) -> None:
+    # TrackLifecycle drops never-confirmed tracks without an end event
+    recorder = TrajectoryRecorder(output_dir=tmp_path, stale_after_ms=1000)
+    for i in range(1000):
+        recorder.listener(_tick(TS0 + i * 100, [_track(10_000 + i, 0.3)]), [])
+    assert recorder.active_tracks <= 11
+    assert recorder.discarded >= 989
+    recorder.close()
+
+
+def test_track_ending_on_eviction_tick_is_still_saved(tmp_path) -> None:
+    recorder = TrajectoryRecorder(output_dir=tmp_path, stale_after_ms=1000)
+    for i in range(3):
+        recorder.listener(_tick(TS0 + i * 100, [_track(1, 0.1)]), [])
+    recorder.listener(_tick(TS0 + 2000, []), [_end(1, TS0 + 2000)])
+    recorder.close()
+    assert recorder.saved == 1
+    assert recorder.discarded == 0
+
+
+def test_missing_pose_is_recorded_as_nan(tmp_path) -> None:
+    recorder = TrajectoryRecorder(output_dir=tmp_path)
+    for i in range(2):
+        tick = _tick(TS0 + i * 100, [_track(1, 0.1)])
+        tick["ptz"] = {"cmd": {"pan": 0.25, "tilt": 0.0, "zoom": 0.0}}
+        recorder.record_tick(tick)
+    path = recorder.handle_events([_end(1, TS0 + 1000)])[0].result(timeout=5)
+    data = load_trajectory(path)
+    assert np.isnan(data["pan"]).all()
+    np.testing.assert_allclose(data["cmd_pan"], 0.25)
+    recorder.close()